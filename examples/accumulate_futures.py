@@ -15,6 +15,7 @@ Usage:
     python examples/accumulate_futures.py --year 2024               # all 12 months of 2024
     python examples/accumulate_futures.py --futures-source ibkr     # use IBKR for futures
     python examples/accumulate_futures.py --pair ETH                # ETH pair from config
+    python examples/accumulate_futures.py --year 2025 --append      # add only rows newer than the CSV's last date
 """
 
 import argparse
@@ -25,6 +26,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from crypto_data.data.accumulator import FuturesAccumulator, format_contract_name
+from crypto_data.data.spot_cache import spot_cache_from_config
 from crypto_data.utils.config import ConfigLoader
 from crypto_data.utils.expiry import get_front_month_expiry_str, get_last_friday_of_month
 
@@ -64,11 +66,15 @@ def main():
     parser.add_argument("--databento-dir", help="Databento data directory (default: from config or 'databento')")
     parser.add_argument("--end-on-expiry", action="store_true",
                         help="Date range: prev expiry+1 to curr expiry (default: prev expiry to curr expiry-1)")
+    parser.add_argument("--append", action="store_true",
+                        help="Fetch only bars after the last date in the output CSV and append them")
     parser.add_argument("--config", "-c", default="config/config.json", help="Config file path")
     args = parser.parse_args()
 
     config_loader = ConfigLoader(args.config)
-    acc = FuturesAccumulator.from_config(config_loader.ibkr)
+    acc = FuturesAccumulator.from_config(
+        config_loader.ibkr, spot_cache=spot_cache_from_config(config_loader.spot_cache)
+    )
 
     # Resolve pair config
     pair_name = args.pair or config_loader.default_pair
@@ -96,26 +102,43 @@ def main():
     else:
         expiry_list = [get_front_month_expiry_str()]
 
-    # Accumulate data for each expiry
+    if args.year:
+        default_output = f"data/{pair_name}_futures_basis_{args.year}.csv"
+    else:
+        default_output = f"data/{pair_name}_futures_basis_{expiry_list[0]}.csv"
+    output_file = args.output or default_output
+
+    # Accumulate data for each expiry (spot is fetched once for the whole span)
+    windows = [(expiry_str, *get_date_range(expiry_str, args.end_on_expiry)) for expiry_str in expiry_list]
+
+    # Incremental mode: only fetch days after the CSV's last row
+    last_date = acc.last_csv_date(output_file) if args.append else None
+    if last_date is not None:
+        resume = last_date + timedelta(days=1)
+        windows = [(e, max(start, resume), end) for e, start, end in windows if end >= resume]
+        print(f"[*] Appending to {output_file} after {last_date.strftime('%Y-%m-%d')}")
+        if not windows:
+            print(f"[OK] {output_file} is up to date")
+            if needs_ibkr:
+                acc.fetcher.disconnect()
+            return
+
+    results = acc.accumulate_many(
+        windows,
+        symbol=futures_symbol,
+        exchange=futures_exchange,
+        spot_source="ibkr",
+        spot_config=spot_config,
+        futures_source=args.futures_source,
+        databento_dir=databento_dir,
+    )
+
     all_data = []
-    for expiry_str in expiry_list:
-        start_date, end_date = get_date_range(expiry_str, args.end_on_expiry)
+    for expiry_str, start_date, end_date in windows:
         contract_name = format_contract_name(futures_symbol, expiry_str)
-
+        data = results[expiry_str]
         if len(expiry_list) > 1:
-            print(f"\n--- {contract_name}: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')} ---")
-
-        data = acc.accumulate(
-            start_date=start_date,
-            end_date=end_date,
-            expiry=expiry_str,
-            symbol=futures_symbol,
-            exchange=futures_exchange,
-            spot_source="ibkr",
-            spot_config=spot_config,
-            futures_source=args.futures_source,
-            databento_dir=databento_dir,
-        )
+            print(f"--- {contract_name}: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}: {len(data)} rows")
 
         if data:
             all_data.extend(data)
@@ -146,14 +169,13 @@ def main():
         )
 
     # Export to CSV
-    if args.year:
-        default_output = f"data/{pair_name}_futures_basis_{args.year}.csv"
-    else:
-        default_output = f"data/{pair_name}_futures_basis_{expiry_list[0]}.csv"
-    output_file = args.output or default_output
     Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    acc.to_csv(all_data, output_file)
-    print(f"\nSaved {len(all_data)} rows to {output_file}")
+    if args.append:
+        appended = acc.append_csv(all_data, output_file)
+        print(f"\nAppended {appended} rows to {output_file}")
+    else:
+        acc.to_csv(all_data, output_file)
+        print(f"\nSaved {len(all_data)} rows to {output_file}")
 
 
 if __name__ == "__main__":
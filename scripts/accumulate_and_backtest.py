@@ -15,18 +15,25 @@ Usage:
     python scripts/accumulate_and_backtest.py --expiry 202402 --pair ETH
     python scripts/accumulate_and_backtest.py --expiry 202603 --holding-days 15
     python scripts/accumulate_and_backtest.py --futures-source ibkr --holding-days 30
+    python scripts/accumulate_and_backtest.py --year 2024 --all-pairs        # every configured pair in parallel
+    python scripts/accumulate_and_backtest.py --state data/BTC_live_state.json  # daily job: resume, apply new rows only
 """
 
 import argparse
 import json
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.incremental import IncrementalBacktester
+from crypto_data.backtest.multi_pair import PairJob, format_pairs_report, run_pairs
 from crypto_data.data.accumulator import FuturesAccumulator, format_contract_name
+from crypto_data.data.spot_cache import spot_cache_from_config
+from crypto_data.data.registry import configure_registry
 from crypto_data.utils.config import ConfigLoader
 from crypto_data.utils.expiry import get_front_month_expiry_str, get_last_friday_of_month
 
@@ -53,6 +60,62 @@ def get_date_range(expiry_str, end_on_expiry):
     return start_date, end_date
 
 
+def get_expiry_list(args):
+    """Expiries selected by --year / --expiry (default: front-month)."""
+    if args.year:
+        return [f"{args.year}{m:02d}" for m in range(1, 13)]
+    if args.expiry:
+        return [args.expiry]
+    return [get_front_month_expiry_str()]
+
+
+def run_all_pairs(args, config_loader):
+    """Accumulate + backtest every configured pair in a process pool."""
+    expiry_list = get_expiry_list(args)
+    windows = [(expiry_str, *get_date_range(expiry_str, args.end_on_expiry)) for expiry_str in expiry_list]
+    label = str(args.year) if args.year else expiry_list[0]
+    databento_base = args.databento_dir or config_loader.databento.get("data_dir", "databento")
+    spot_cache = config_loader.spot_cache
+    spot_cache_path = spot_cache.get("path") if spot_cache.get("enabled", True) else None
+
+    jobs = []
+    for pair_name, pair_config in config_loader.pairs.items():
+        jobs.append(PairJob(
+            pair=pair_name,
+            spot_config=pair_config["spot"],
+            futures_symbol=pair_config["futures"]["symbol"],
+            futures_exchange=pair_config["futures"].get("exchange", "CME"),
+            windows=windows,
+            futures_source=args.futures_source,
+            databento_dir=str(Path(databento_base) / pair_name),
+            output_file=f"data/{pair_name}_futures_basis_{label}.{args.format}",
+            spot_cache_path=spot_cache_path,
+            holding_days=args.holding_days,
+            account_size=config_loader.get("account_size", 200000),
+            funding_cost_annual=config_loader.get("funding_cost_annual", 0.05),
+            entry_threshold=args.entry_threshold,
+            stop_loss_threshold=args.stop_loss_threshold,
+            exit_threshold=args.exit_threshold,
+        ))
+
+    Path("data").mkdir(parents=True, exist_ok=True)
+    print(f"\n*** Accumulate + Backtest: {len(jobs)} pairs ({', '.join(job.pair for job in jobs)}) {label} ***")
+    print(f"    Futures: {'Databento' if args.futures_source == 'databento' else 'IBKR'}, "
+          f"workers: {args.workers or len(jobs)}\n")
+
+    started = time.monotonic()
+    results = run_pairs(jobs, ibkr_config=config_loader.ibkr, workers=args.workers)
+    elapsed = time.monotonic() - started
+
+    print(f"\n{'='*84}")
+    print("COMBINED BACKTEST RESULTS")
+    print(f"{'='*84}")
+    print(format_pairs_report(results))
+    print(f"\nWall time: {elapsed:.1f}s")
+    if all(outcome.error for outcome in results):
+        sys.exit(1)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Accumulate futures basis data and run backtest")
     group = parser.add_mutually_exclusive_group()
@@ -60,7 +123,9 @@ def main():
     group.add_argument("--year", type=int, help="Accumulate all 12 months of a year (e.g. 2024)")
     parser.add_argument("--pair", help="Investment pair from config (e.g. BTC, ETH). Default: config's default_pair")
     parser.add_argument("--symbol", help="Override futures symbol (default: from pair config)")
-    parser.add_argument("--output", "-o", help="Output CSV path")
+    parser.add_argument("--output", "-o", help="Output path (.csv, or .cols for binary columnar)")
+    parser.add_argument("--format", choices=["csv", "cols"], default="csv",
+                        help="Default output format: csv (2 decimals) or cols (binary, full precision)")
     parser.add_argument("--futures-source", choices=["databento", "ibkr"], default="databento",
                         help="Futures data source (default: databento)")
     parser.add_argument("--databento-dir", help="Databento data directory (default: from config or 'databento')")
@@ -74,6 +139,12 @@ def main():
     parser.add_argument("--exit-threshold", type=float, default=0.035,
                         help="Monthly basis exit threshold as decimal (default: 0.035 = 3.5%%)")
     parser.add_argument("--params", help="Load signal params from JSON file (from optimize_signals.py --save-params)")
+    parser.add_argument("--all-pairs", action="store_true",
+                        help="Run every configured pair in parallel worker processes and print a combined report")
+    parser.add_argument("--workers", type=int, help="Worker processes for --all-pairs (default: one per pair)")
+    parser.add_argument("--state",
+                        help="Incremental backtest state file (JSON): resume from it, apply only rows after "
+                             "its last date, save it back. Created with the current params if missing")
     parser.add_argument("--config", "-c", default="config/config.json", help="Config file path")
     args = parser.parse_args()
 
@@ -92,7 +163,14 @@ def main():
             args.holding_days = params["holding_days"]
 
     config_loader = ConfigLoader(args.config)
-    acc = FuturesAccumulator.from_config(config_loader.ibkr)
+    if args.all_pairs:
+        run_all_pairs(args, config_loader)
+        return
+
+    registry = configure_registry(config_loader.databento.get("memory_budget_mb"))
+    acc = FuturesAccumulator.from_config(
+        config_loader.ibkr, spot_cache=spot_cache_from_config(config_loader.spot_cache)
+    )
 
     # Resolve pair config
     pair_name = args.pair or config_loader.default_pair
@@ -113,37 +191,31 @@ def main():
             sys.exit(1)
 
     # Build list of expiries
-    if args.year:
-        expiry_list = [f"{args.year}{m:02d}" for m in range(1, 13)]
-    elif args.expiry:
-        expiry_list = [args.expiry]
-    else:
-        expiry_list = [get_front_month_expiry_str()]
+    expiry_list = get_expiry_list(args)
 
     # --- Step 1: Accumulate ---
     label = str(args.year) if args.year else format_contract_name(futures_symbol, expiry_list[0])
     print(f"\n*** Accumulate + Backtest: {pair_name} {label} ***")
     print(f"    Futures: {'Databento' if args.futures_source == 'databento' else 'IBKR'}\n")
 
+    # Spot is fetched once for the whole span, then sliced per contract
+    windows = [(expiry_str, *get_date_range(expiry_str, args.end_on_expiry)) for expiry_str in expiry_list]
+    results = acc.accumulate_many(
+        windows,
+        symbol=futures_symbol,
+        exchange=futures_exchange,
+        spot_source="ibkr",
+        spot_config=spot_config,
+        futures_source=args.futures_source,
+        databento_dir=databento_dir,
+    )
+
     all_data = []
-    for expiry_str in expiry_list:
-        start_date, end_date = get_date_range(expiry_str, args.end_on_expiry)
+    for expiry_str, start_date, end_date in windows:
         contract_name = format_contract_name(futures_symbol, expiry_str)
-
+        data = results[expiry_str]
         if len(expiry_list) > 1:
-            print(f"\n--- {contract_name}: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')} ---")
-
-        data = acc.accumulate(
-            start_date=start_date,
-            end_date=end_date,
-            expiry=expiry_str,
-            symbol=futures_symbol,
-            exchange=futures_exchange,
-            spot_source="ibkr",
-            spot_config=spot_config,
-            futures_source=args.futures_source,
-            databento_dir=databento_dir,
-        )
+            print(f"--- {contract_name}: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}: {len(data)} rows")
 
         if data:
             all_data.extend(data)
@@ -153,6 +225,10 @@ def main():
     if needs_ibkr:
         acc.fetcher.disconnect()
 
+    if args.futures_source == "databento":
+        stats = registry.stats()
+        print(f"    Datasets: {stats['loads']} loaded, {stats['hits']} reused from memory")
+
     if not all_data:
         print("[X] No data returned.")
         sys.exit(1)
@@ -173,14 +249,14 @@ def main():
             f"{row['days_to_expiry']:>5d}"
         )
 
-    # Export to CSV
+    # Export to CSV (or binary columnar)
     if args.year:
-        default_output = f"data/{pair_name}_futures_basis_{args.year}.csv"
+        default_output = f"data/{pair_name}_futures_basis_{args.year}.{args.format}"
     else:
-        default_output = f"data/{pair_name}_futures_basis_{expiry_list[0]}.csv"
+        default_output = f"data/{pair_name}_futures_basis_{expiry_list[0]}.{args.format}"
     output_file = args.output or default_output
     Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    acc.to_csv(all_data, output_file)
+    acc.export(all_data, output_file)
     print(f"\nSaved {len(all_data)} rows to {output_file}")
 
     # --- Step 2: Backtest ---
@@ -195,12 +271,31 @@ def main():
     backtester = Backtester(backtest_config)
     bt_data = backtester.load_historical_data(output_file)
 
-    print(f"\nRunning backtest on {len(bt_data)} data points (holding: {args.holding_days}d, "
-          f"entry: {args.entry_threshold:.1%}, stop: {args.stop_loss_threshold:.1%}, exit: {args.exit_threshold:.1%})...")
-    result = backtester.run_backtest(bt_data, holding_days=args.holding_days)
+    if args.state:
+        if Path(args.state).exists():
+            incremental = IncrementalBacktester.load(args.state)
+            print(f"\nResuming backtest from {args.state} ({incremental.rows} rows, last: "
+                  f"{incremental.last_date.strftime('%Y-%m-%d') if incremental.last_date else '-'}); "
+                  f"params from the state file")
+        else:
+            incremental = IncrementalBacktester(backtest_config, holding_days=args.holding_days)
+            print(f"\nStarting incremental backtest in {args.state}")
+        applied = incremental.rows
+        # Trades closed by this run's rows, then the open trade (if any)
+        closed = incremental.update_many(bt_data)
+        print(f"Applied {incremental.rows - applied} new data points, {len(closed)} trade(s) closed")
+        incremental.save(args.state)
+        result = incremental.result()
+        trades = closed + result.trades
+    else:
+        print(f"\nRunning backtest on {len(bt_data)} data points (holding: {args.holding_days}d, "
+              f"entry: {args.entry_threshold:.1%}, stop: {args.stop_loss_threshold:.1%}, "
+              f"exit: {args.exit_threshold:.1%})...")
+        result = backtester.run_backtest(bt_data, holding_days=args.holding_days)
+        trades = result.trades
 
     # Trade log
-    if result.trades:
+    if trades:
         print(f"\n{'='*100}")
         print("TRADE LOG")
         print(f"{'='*100}")
@@ -211,7 +306,7 @@ def main():
         )
         print(header)
         print("-" * 100)
-        for i, trade in enumerate(result.trades, 1):
+        for i, trade in enumerate(trades, 1):
             exit_date = trade.exit_date.strftime("%Y-%m-%d") if trade.exit_date else "-"
             exit_basis = f"{trade.exit_basis:>11,.2f}" if trade.exit_basis is not None else "          -"
             return_pct = f"{trade.return_pct * 100:>7.2f}%" if trade.return_pct is not None else "       -"
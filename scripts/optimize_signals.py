@@ -14,6 +14,24 @@ Usage:
     python scripts/optimize_signals.py --year 2024
     python scripts/optimize_signals.py --year 2024 --pair ETH
 
+    # Binary columnar data file (full precision, no CSV parsing on reload)
+    python scripts/optimize_signals.py --year 2024 --format cols
+    python scripts/optimize_signals.py --data data/BTC_futures_basis_2024.cols
+
+    # Grid search on 8 worker processes
+    python scripts/optimize_signals.py --year 2024 --workers 8
+
+    # Adaptive search on a finer lattice, with a backtest budget
+    python scripts/optimize_signals.py --year 2024 --search refine --budget 400
+    python scripts/optimize_signals.py --year 2024 --search halving --budget 400
+    python scripts/optimize_signals.py --year 2024 --search random --budget 400 --seed 7
+
+    # Walk-forward: optimize on 365 days, trade the next 90, roll, across several years
+    python scripts/optimize_signals.py --data data/BTC_futures_basis_2022.csv \
+        data/BTC_futures_basis_2023.csv data/BTC_futures_basis_2024.csv --walk-forward
+    python scripts/optimize_signals.py --data data/BTC_continuous_2024-01-01_2026-02-10.csv \
+        --walk-forward --train-days 180 --test-days 30
+
     # Show more results
     python scripts/optimize_signals.py --data data/BTC_futures_basis_202402.csv --top 30
 """
@@ -22,13 +40,17 @@ import argparse
 import json
 import sys
 from datetime import timedelta
-from itertools import product
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.grid import grid_points, run_grid, run_grid_parallel, sweep_available
+from crypto_data.backtest.search import DEFAULT_SPACE, Evaluator, run_search
+from crypto_data.backtest.walkforward import walk_forward
 from crypto_data.data.accumulator import FuturesAccumulator, format_contract_name
+from crypto_data.data.spot_cache import spot_cache_from_config
+from crypto_data.data.registry import configure_registry
 from crypto_data.utils.config import ConfigLoader
 from crypto_data.utils.expiry import get_front_month_expiry_str, get_last_friday_of_month
 
@@ -65,55 +87,123 @@ def frange(start, stop, step):
     return values
 
 
-def run_optimization(bt_data, account_size, funding_cost_annual, top_n=20, save_params=None):
-    """Run grid search over signal thresholds and holding days."""
+def print_progress(done, total):
+    """Progress line for parallel grid search."""
+    print(f"    [*] {done}/{total} combinations ({done / total * 100:.0f}%)", flush=True)
+
 
-    # Parameter grid
+def grid_values():
+    """Entry, stop, exit and holding-day values of the fixed parameter grid."""
     entry_values = frange(0.002, 0.020, 0.002)
     stop_values = frange(0.001, 0.005, 0.001)
     exit_values = frange(0.020, 0.060, 0.005)
     holding_values = [10, 20, 30, 40, 50, 60]
+    return entry_values, stop_values, exit_values, holding_values
+
+
+def run_grid_search(bt_data, account_size, funding_cost_annual, workers=1):
+    """Exhaustive search over the fixed parameter grid."""
+    entry_values, stop_values, exit_values, holding_values = grid_values()
 
     total_combos = len(entry_values) * len(stop_values) * len(exit_values) * len(holding_values)
     print(f"\nGrid search: {total_combos} combinations "
           f"({len(entry_values)} entry x {len(stop_values)} stop x "
           f"{len(exit_values)} exit x {len(holding_values)} hold)")
 
-    results = []
-    for i, (entry, stop, exit_t, hold) in enumerate(
-        product(entry_values, stop_values, exit_values, holding_values)
-    ):
-        # Skip invalid: entry must be above stop_loss
-        if entry <= stop:
-            continue
-        # Skip invalid: exit must be above entry
-        if exit_t <= entry:
-            continue
-
-        config = type("Config", (), {
-            "account_size": account_size,
-            "funding_cost_annual": funding_cost_annual,
-            "entry_threshold": entry,
-            "stop_loss_threshold": stop,
-            "exit_threshold": exit_t,
-        })()
-
-        backtester = Backtester(config)
-        result = backtester.run_backtest(bt_data, holding_days=hold)
-
-        results.append({
-            "entry": entry,
-            "stop": stop,
-            "exit": exit_t,
-            "hold": hold,
-            "return": result.total_return,
-            "sharpe": result.sharpe_ratio,
-            "max_dd": result.max_drawdown,
-            "trades": result.total_trades,
-            "win_rate": result.win_rate,
-            "wins": result.winning_trades,
-            "losses": result.losing_trades,
-        })
+    points = grid_points(entry_values, stop_values, exit_values, holding_values)
+    if workers > 1:
+        # Same results, in the same order, as the serial run
+        print(f"Running on {workers} worker processes")
+        results = run_grid_parallel(bt_data, points, account_size, funding_cost_annual,
+                                    workers=workers, progress=print_progress)
+    else:
+        results = run_grid(bt_data, points, account_size, funding_cost_annual)
+    return results
+
+
+def run_adaptive_search(bt_data, account_size, funding_cost_annual, strategy, budget, seed=0, workers=1):
+    """Budgeted random / successive-halving / coarse-to-fine search on the fine lattice."""
+    space = DEFAULT_SPACE
+    print(f"\n{strategy.capitalize()} search: budget {budget} backtests "
+          f"(exhaustive at this resolution: {space.size()} combinations)")
+
+    evaluator = Evaluator(bt_data, account_size, funding_cost_annual, workers=workers)
+    search = run_search(strategy, evaluator, budget, space=space, seed=seed)
+    for line in search.rounds:
+        print(f"    [*] {line}")
+    print(f"Spent {search.cost:.1f} full-data backtests ({search.backtests} runs)")
+    return search.results
+
+
+def save_best_params(best, save_params):
+    """Write best params as JSON for accumulate_and_backtest.py --params."""
+    params = {
+        "entry_threshold": best["entry"],
+        "stop_loss_threshold": best["stop"],
+        "exit_threshold": best["exit"],
+        "holding_days": best["hold"],
+    }
+    Path(save_params).parent.mkdir(parents=True, exist_ok=True)
+    with open(save_params, "w") as f:
+        json.dump(params, f, indent=2)
+    print(f"\nSaved best params to {save_params}")
+
+
+def print_window(window):
+    """One walk-forward window: train/test span, chosen params, in- and out-of-sample return."""
+    span = f"{window.train_start:%Y-%m-%d}  {window.test_start:%Y-%m-%d} - {window.test_end:%Y-%m-%d}"
+    best = window.best
+    if best is None:
+        print(f"{span}  {'(no trades in train window)':>35}")
+        return
+    test = window.test
+    print(
+        f"{span}  {best['entry']*100:>6.2f}% {best['stop']*100:>5.3f}% "
+        f"{best['exit']*100:>5.2f}% {best['hold']:>5} "
+        f"{best['return']*100:>7.2f}% {test.total_return*100:>7.2f}% {test.total_trades:>7}"
+    )
+
+
+def run_walk_forward(bt_data, account_size, funding_cost_annual, train_days=365, test_days=90, step_days=None,
+                     save_params=None):
+    """Walk-forward optimization over the fixed grid, with stitched out-of-sample results."""
+    points = grid_points(*grid_values())
+    step = step_days or test_days
+    print(f"\nWalk-forward: train {train_days} days, test {test_days} days, step {step} days, "
+          f"{len(points)} combinations per window")
+
+    print(f"\n{'Train from':<10}  {'Test period':<23}  {'Entry%':>7} {'Stop%':>6} {'Exit%':>6} {'Hold':>5} "
+          f"{'IS Ret%':>8} {'OOS Ret%':>8} {'Trades':>7}")
+    print("-" * 100)
+    wf = walk_forward(bt_data, points, account_size, funding_cost_annual, train_days=train_days,
+                      test_days=test_days, step_days=step_days, progress=print_window)
+
+    if not wf.windows:
+        print(f"[X] Not enough data: need more than {train_days} days for one train window")
+        return wf
+
+    oos = wf.oos
+    print(f"\n{'Out-of-sample':>40}: {oos.start_date:%Y-%m-%d} to {oos.end_date:%Y-%m-%d} "
+          f"({len(wf.windows)} windows)")
+    print(f"{'Stitched result':>40}: return={oos.total_return*100:.2f}%, "
+          f"sharpe={oos.sharpe_ratio:.2f}, max_dd={oos.max_drawdown*100:.2f}%, "
+          f"trades={oos.total_trades}, win_rate={oos.win_rate*100:.1f}%")
+
+    traded = [w for w in wf.windows if w.best is not None]
+    if save_params and traded:
+        # The most recent train window's params
+        save_best_params(traded[-1].best, save_params)
+    return wf
+
+
+def run_optimization(bt_data, account_size, funding_cost_annual, top_n=20, save_params=None, workers=1,
+                     search="grid", budget=400, seed=0):
+    """Run grid or adaptive search over signal thresholds and holding days."""
+    if search == "grid":
+        results = run_grid_search(bt_data, account_size, funding_cost_annual, workers=workers)
+    else:
+        results = run_adaptive_search(bt_data, account_size, funding_cost_annual, search, budget,
+                                      seed=seed, workers=workers)
 
     # Also run with default params for comparison
     default_config = type("Config", (), {
@@ -124,7 +214,7 @@ def run_optimization(bt_data, account_size, funding_cost_annual, top_n=20, save_
         "exit_threshold": 0.035,
     })()
     default_bt = Backtester(default_config)
-    default_result = default_bt.run_backtest(bt_data, holding_days=30)
+    default_result = default_bt.run_backtest(bt_data, holding_days=30, trade_log="none")
 
     # Sort by total return descending
     results.sort(key=lambda x: x["return"], reverse=True)
@@ -139,8 +229,8 @@ def run_optimization(bt_data, account_size, funding_cost_annual, top_n=20, save_
 
     for i, r in enumerate(valid[:top_n], 1):
         print(
-            f"{i:>4}  {r['entry']*100:>6.1f}% {r['stop']*100:>5.1f}% "
-            f"{r['exit']*100:>5.1f}% {r['hold']:>5} "
+            f"{i:>4}  {r['entry']*100:>6.2f}% {r['stop']*100:>5.3f}% "
+            f"{r['exit']*100:>5.2f}% {r['hold']:>5} "
             f"{r['return']*100:>7.2f}% {r['sharpe']:>7.2f} "
             f"{-r['max_dd']*100:>6.2f}% {r['trades']:>7} "
             f"{r['win_rate']*100:>6.1f}%"
@@ -155,24 +245,15 @@ def run_optimization(bt_data, account_size, funding_cost_annual, top_n=20, save_
 
     if valid:
         best = valid[0]
-        print(f"\n{'Best params':>40}: entry={best['entry']*100:.1f}%, "
-              f"stop={best['stop']*100:.1f}%, exit={best['exit']*100:.1f}%, hold={best['hold']}")
+        print(f"\n{'Best params':>40}: entry={best['entry']*100:.2f}%, "
+              f"stop={best['stop']*100:.3f}%, exit={best['exit']*100:.2f}%, hold={best['hold']}")
         print(f"{'Best result':>40}: return={best['return']*100:.2f}%, "
               f"sharpe={best['sharpe']:.2f}, "
               f"trades={best['trades']}, "
               f"win_rate={best['win_rate']*100:.1f}%")
 
         if save_params:
-            params = {
-                "entry_threshold": best["entry"],
-                "stop_loss_threshold": best["stop"],
-                "exit_threshold": best["exit"],
-                "holding_days": best["hold"],
-            }
-            Path(save_params).parent.mkdir(parents=True, exist_ok=True)
-            with open(save_params, "w") as f:
-                json.dump(params, f, indent=2)
-            print(f"\nSaved best params to {save_params}")
+            save_best_params(best, save_params)
 
     return results
 
@@ -182,7 +263,9 @@ def main():
 
     # Data source: either pre-existing CSV or accumulate
     data_group = parser.add_mutually_exclusive_group()
-    data_group.add_argument("--data", help="Pre-existing CSV file path (skip accumulation)")
+    data_group.add_argument("--data", nargs="+",
+                            help="Pre-existing CSV or .cols file path(s) (skip accumulation); "
+                                 "several files are joined in date order")
     data_group.add_argument("--expiry", help="Futures expiry YYYYMM to accumulate")
     data_group.add_argument("--year", type=int, help="Accumulate all 12 months of a year (e.g. 2024)")
 
@@ -192,10 +275,31 @@ def main():
     parser.add_argument("--databento-dir", help="Databento data directory")
     parser.add_argument("--end-on-expiry", action="store_true",
                         help="Date range: prev expiry+1 to curr expiry")
+    parser.add_argument("--format", choices=["csv", "cols"], default="csv",
+                        help="Format of the accumulated data file: csv or cols (binary, full precision)")
     parser.add_argument("--save-params", help="Save best params to JSON file (e.g. data/best_params.json)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes for the grid search (default: 1)")
+    parser.add_argument("--search", choices=["grid", "random", "halving", "refine"], default="grid",
+                        help="Search strategy: full grid (default), random, successive halving, "
+                             "or coarse-to-fine refinement on a finer lattice")
+    parser.add_argument("--budget", type=int, default=400,
+                        help="Backtest budget for random/halving/refine search (default: 400)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for random/halving search")
+    parser.add_argument("--walk-forward", action="store_true",
+                        help="Walk-forward optimization: fit the grid on rolling train windows, "
+                             "report stitched out-of-sample results")
+    parser.add_argument("--train-days", type=int, default=365, help="Walk-forward train window (default: 365)")
+    parser.add_argument("--test-days", type=int, default=90, help="Walk-forward test window (default: 90)")
+    parser.add_argument("--step-days", type=int,
+                        help="Days between walk-forward windows, at least --test-days (default: --test-days)")
     parser.add_argument("--top", type=int, default=20, help="Number of top results to show (default: 20)")
     parser.add_argument("--config", "-c", default="config/config.json", help="Config file path")
     args = parser.parse_args()
+    if args.walk_forward and args.search != "grid":
+        parser.error("--walk-forward searches the fixed grid; --search is not supported with it")
+    if args.step_days is not None and args.step_days < args.test_days:
+        parser.error("--step-days must be at least --test-days (test windows would overlap)")
 
     config_loader = ConfigLoader(args.config)
     account_size = config_loader.get("account_size", 200000)
@@ -203,11 +307,14 @@ def main():
 
     if args.data:
         # Use pre-existing CSV
-        csv_path = args.data
-        print(f"\n*** Signal Optimizer: {csv_path} ***")
+        data_paths = args.data
+        print(f"\n*** Signal Optimizer: {', '.join(data_paths)} ***")
     else:
         # Accumulate data first
-        acc = FuturesAccumulator.from_config(config_loader.ibkr)
+        registry = configure_registry(config_loader.databento.get("memory_budget_mb"))
+        acc = FuturesAccumulator.from_config(
+            config_loader.ibkr, spot_cache=spot_cache_from_config(config_loader.spot_cache)
+        )
         pair_name = args.pair or config_loader.default_pair
         pair_config = config_loader.get_pair(pair_name)
         spot_config = pair_config["spot"]
@@ -235,51 +342,62 @@ def main():
 
         print(f"\n*** Signal Optimizer: {pair_name} {label} ***")
 
+        # Spot is fetched once for the whole span, then sliced per contract
+        windows = [(expiry_str, *get_date_range(expiry_str, args.end_on_expiry)) for expiry_str in expiry_list]
+        results = acc.accumulate_many(
+            windows,
+            symbol=futures_symbol,
+            exchange=futures_exchange,
+            spot_source="ibkr",
+            spot_config=spot_config,
+            futures_source=args.futures_source,
+            databento_dir=databento_dir,
+        )
+
         all_data = []
         for expiry_str in expiry_list:
-            start_date, end_date = get_date_range(expiry_str, args.end_on_expiry)
-            contract_name = format_contract_name(futures_symbol, expiry_str)
-
-            if len(expiry_list) > 1:
-                print(f"  Accumulating {contract_name}...")
-
-            data = acc.accumulate(
-                start_date=start_date,
-                end_date=end_date,
-                expiry=expiry_str,
-                symbol=futures_symbol,
-                exchange=futures_exchange,
-                spot_source="ibkr",
-                spot_config=spot_config,
-                futures_source=args.futures_source,
-                databento_dir=databento_dir,
-            )
-            if data:
-                all_data.extend(data)
+            all_data.extend(results[expiry_str])
 
         if needs_ibkr:
             acc.fetcher.disconnect()
 
+        if args.futures_source == "databento":
+            stats = registry.stats()
+            print(f"    Datasets: {stats['loads']} loaded, {stats['hits']} reused from memory")
+
         if not all_data:
             print("[X] No data returned.")
             sys.exit(1)
 
-        # Save to temp CSV for backtester
+        # Save data file for backtester
         if args.year:
-            csv_path = f"data/{pair_name}_futures_basis_{args.year}.csv"
+            csv_path = f"data/{pair_name}_futures_basis_{args.year}.{args.format}"
         else:
-            csv_path = f"data/{pair_name}_futures_basis_{expiry_list[0]}.csv"
+            csv_path = f"data/{pair_name}_futures_basis_{expiry_list[0]}.{args.format}"
         Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
-        acc.to_csv(all_data, csv_path)
+        acc.export(all_data, csv_path)
         print(f"Saved {len(all_data)} rows to {csv_path}")
+        data_paths = [csv_path]
 
     # Load data and run optimization
     backtester = Backtester()
-    bt_data = backtester.load_historical_data(csv_path)
+    bt_data = []
+    for path in data_paths:
+        bt_data.extend(backtester.load_historical_data(path))
+    if len(data_paths) > 1:
+        bt_data.sort(key=lambda row: row["date"])
     print(f"Loaded {len(bt_data)} data points")
+    if not sweep_available():
+        print("[!] numpy not installed, running one backtest per combination")
+
+    if args.walk_forward:
+        run_walk_forward(bt_data, account_size, funding_cost_annual, train_days=args.train_days,
+                         test_days=args.test_days, step_days=args.step_days, save_params=args.save_params)
+        return
 
     run_optimization(bt_data, account_size, funding_cost_annual, top_n=args.top,
-                     save_params=args.save_params)
+                     save_params=args.save_params, workers=args.workers,
+                     search=args.search, budget=args.budget, seed=args.seed)
 
 
 if __name__ == "__main__":
@@ -15,6 +15,7 @@ setup(
     ],
     extras_require={
         "ibkr": ["ib-insync>=0.9.86"],
+        "fast": ["numpy>=1.22"],
         "dev": ["pytest", "black", "flake8"],
     },
     entry_points={
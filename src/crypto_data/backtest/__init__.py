@@ -1,11 +1,12 @@
 """Backtesting engine for cryptocurrency trading strategies."""
 
-from crypto_data.backtest.engine import Backtester, Trade, BacktestResult
+from crypto_data.backtest.engine import Backtester, Trade, TradeLedger, BacktestResult
 from crypto_data.backtest.costs import TradingCosts
 
 __all__ = [
     "Backtester",
     "Trade",
+    "TradeLedger",
     "BacktestResult",
     "TradingCosts",
 ]
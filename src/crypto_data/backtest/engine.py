@@ -6,12 +6,21 @@ Standalone version without external dependencies.
 """
 
 import csv
+import math
+from array import array
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any
+from typing import Iterable, Iterator, List, Dict, NamedTuple, Optional, Any, Tuple
 import statistics
 from enum import Enum
 
+# run_backtest(trade_log=...): Trade objects, TradeLedger columns, or statistics only
+TRADE_LOGS = ("objects", "ledger", "none")
+
+# Trade.status values, indexed by TradeLedger status code
+TRADE_STATUSES = ("open", "closed", "stopped_out", "contract_roll", "forced_close")
+_STATUS_CODES = {status: code for code, status in enumerate(TRADE_STATUSES)}
+
 
 class Signal(Enum):
     """Trading signals."""
@@ -77,11 +86,167 @@ class Trade:
         }
 
 
+class OpenPosition(NamedTuple):
+    """The open trade of a backtest, as plain values."""
+
+    entry_date: datetime
+    entry_spot: float
+    entry_futures: float
+    entry_basis: float
+    contract: Optional[str]  # contract of the entry row, for roll detection
+
+
+class ClosedTrade(NamedTuple):
+    """A trade closed by Backtester.step(), in the argument order of a trade recorder."""
+
+    entry_date: datetime
+    entry_spot: float
+    entry_futures: float
+    entry_basis: float
+    exit_date: datetime
+    exit_spot: float
+    exit_futures: float
+    exit_basis: Optional[float]
+    realized_pnl: float
+    status: str
+
+    def to_trade(self) -> Trade:
+        return Trade(position_size=1.0, **self._asdict())
+
+
+class TradeLedger:
+    """
+    Closed trades as parallel columns (struct of arrays).
+
+    Prices and P&L are float64 arrays (NaN for a missing exit basis), the
+    status is an int8 code into TRADE_STATUSES, and the date lists refer to
+    the input rows' own datetimes. Nothing is allocated per trade beyond
+    the array slots; Trade objects are only built on access.
+    """
+
+    def __init__(self):
+        self.entry_date: List[datetime] = []
+        self.exit_date: List[datetime] = []
+        self.entry_spot = array("d")
+        self.entry_futures = array("d")
+        self.entry_basis = array("d")
+        self.exit_spot = array("d")
+        self.exit_futures = array("d")
+        self.exit_basis = array("d")
+        self.position_size = array("d")
+        self.realized_pnl = array("d")
+        self.status = array("b")
+
+    def append(
+        self,
+        entry_date: datetime,
+        entry_spot: float,
+        entry_futures: float,
+        entry_basis: float,
+        exit_date: datetime,
+        exit_spot: float,
+        exit_futures: float,
+        exit_basis: Optional[float],
+        realized_pnl: float,
+        status: str,
+        position_size: float = 1.0,
+    ) -> None:
+        """Add a closed trade."""
+        self.entry_date.append(entry_date)
+        self.exit_date.append(exit_date)
+        self.entry_spot.append(entry_spot)
+        self.entry_futures.append(entry_futures)
+        self.entry_basis.append(entry_basis)
+        self.exit_spot.append(exit_spot)
+        self.exit_futures.append(exit_futures)
+        self.exit_basis.append(math.nan if exit_basis is None else exit_basis)
+        self.position_size.append(position_size)
+        self.realized_pnl.append(realized_pnl)
+        self.status.append(_STATUS_CODES[status])
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def __getitem__(self, i: int) -> Trade:
+        """Trade ``i`` as a Trade object."""
+        exit_basis = self.exit_basis[i]
+        return Trade(
+            entry_date=self.entry_date[i],
+            entry_spot=self.entry_spot[i],
+            entry_futures=self.entry_futures[i],
+            entry_basis=self.entry_basis[i],
+            exit_date=self.exit_date[i],
+            exit_spot=self.exit_spot[i],
+            exit_futures=self.exit_futures[i],
+            exit_basis=None if math.isnan(exit_basis) else exit_basis,
+            position_size=self.position_size[i],
+            realized_pnl=self.realized_pnl[i],
+            status=TRADE_STATUSES[self.status[i]],
+        )
+
+    def __iter__(self) -> Iterator[Trade]:
+        return (self[i] for i in range(len(self)))
+
+    def return_pcts(self) -> List[Optional[float]]:
+        """Trade.return_pct of every trade, without building Trade objects."""
+        return [
+            pnl / (spot * size) if pnl else None
+            for pnl, spot, size in zip(self.realized_pnl, self.entry_spot, self.position_size)
+        ]
+
+
+class _TradeTally:
+    """
+    Running trade counts and return sums for the summary statistics.
+
+    Holds exactly what _compute_statistics() needs, so trades can be
+    counted as they close instead of being kept and walked afterwards.
+    """
+
+    __slots__ = ("count", "wins", "losses", "win_sum", "loss_sum")
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.losses = 0
+        self.win_sum = 0.0
+        self.loss_sum = 0.0
+
+    def add(self, realized_pnl: Optional[float], cost_basis: float) -> None:
+        """Count a closed trade (cost_basis: entry_spot * position_size)."""
+        self.count += 1
+        if realized_pnl and realized_pnl > 0:
+            self.wins += 1
+            self.win_sum += realized_pnl / cost_basis
+        elif realized_pnl and realized_pnl < 0:
+            self.losses += 1
+            self.loss_sum += realized_pnl / cost_basis
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade]) -> "_TradeTally":
+        tally = cls()
+        for trade in trades:
+            tally.add(trade.realized_pnl, trade.entry_spot * trade.position_size)
+        return tally
+
+    def apply(self, result: "BacktestResult") -> None:
+        """Set the trade counts and average win/loss of ``result``."""
+        result.total_trades = self.count
+        if self.count > 0:
+            result.winning_trades = self.wins
+            result.losing_trades = self.losses
+            if self.wins:
+                result.avg_win = self.win_sum / self.wins
+            if self.losses:
+                result.avg_loss = self.loss_sum / self.losses
+
+
 @dataclass
 class BacktestResult:
     """Results from backtesting."""
 
     trades: List[Trade] = field(default_factory=list)
+    ledger: Optional[TradeLedger] = None  # closed trades when run with trade_log="ledger"
     total_return: float = 0.0
     total_trades: int = 0
     winning_trades: int = 0
@@ -132,7 +297,7 @@ class BacktestResult:
                 "start_date": self.start_date.isoformat() if self.start_date else None,
                 "end_date": self.end_date.isoformat() if self.end_date else None,
             },
-            "trades": [t.to_dict() for t in self.trades],
+            "trades": [t.to_dict() for t in (self.ledger if self.ledger is not None else self.trades)],
         }
 
 
@@ -195,16 +360,20 @@ class Backtester:
 
     def load_historical_data(self, csv_path: str) -> List[Dict]:
         """
-        Load historical basis data from CSV.
+        Load historical basis data from CSV or a binary columnar file.
 
         Expected columns: date, spot_price, futures_price, futures_expiry
 
         Args:
-            csv_path: Path to CSV file
+            csv_path: Path to CSV file, or a '.cols' file written by
+                      FuturesAccumulator.to_columns()
 
         Returns:
             List of data points
         """
+        if str(csv_path).endswith(".cols"):
+            return self.load_historical_columns(csv_path)
+
         data = []
         with open(csv_path, "r") as f:
             reader = csv.DictReader(f)
@@ -220,6 +389,46 @@ class Backtester:
                 data.append(entry)
         return data
 
+    def load_historical_columns(self, path: str) -> List[Dict]:
+        """
+        Load historical basis data from a binary columnar file.
+
+        The file is memory-mapped and read column-wise: no text parsing,
+        and prices keep full float precision.
+
+        Args:
+            path: '.cols' file written by FuturesAccumulator.to_columns()
+
+        Returns:
+            List of data points (same keys as load_historical_data)
+        """
+        from crypto_data.data.basis_store import BasisColumns
+
+        basis = BasisColumns.load(path)
+        if basis is None:
+            raise ValueError(f"Not a basis columnar file: {path}")
+        try:
+            dates = basis.dates()
+            expiries = basis.dates("futures_expiry")
+            spot = basis["spot_price"].tolist()
+            futures = basis["futures_price"].tolist()
+            contracts = [basis.contracts[c] for c in basis["contract"]]
+        finally:
+            basis.close()
+
+        data = []
+        for i in range(len(dates)):
+            entry = {
+                "date": dates[i],
+                "spot_price": spot[i],
+                "futures_price": futures[i],
+                "futures_expiry": expiries[i],
+            }
+            if contracts[i]:
+                entry["contract"] = contracts[i]
+            data.append(entry)
+        return data
+
     def generate_sample_data(
         self,
         start_date: datetime,
@@ -272,6 +481,7 @@ class Backtester:
         self,
         historical_data: List[Dict],
         holding_days: int = 30,
+        trade_log: str = "objects",
     ) -> BacktestResult:
         """
         Run backtest on historical data.
@@ -279,148 +489,201 @@ class Backtester:
         Args:
             historical_data: List of historical data points
             holding_days: Maximum holding period
+            trade_log: How closed trades are kept: "objects" (Trade objects
+                       in result.trades), "ledger" (columns in result.ledger)
+                       or "none" (statistics only, e.g. for parameter sweeps)
 
         Returns:
             BacktestResult with all metrics
         """
         result = BacktestResult(initial_capital=self.account_size)
-        current_trade: Optional[Trade] = None
-        trade_contract: Optional[str] = None
+        tally = _TradeTally()
+        record = self._trade_recorder(result, trade_log)
+        position: Optional[OpenPosition] = None
         equity_curve = [result.initial_capital]
         daily_returns = []
 
         result.start_date = historical_data[0]["date"]
         result.end_date = historical_data[-1]["date"]
 
+        step = self.step
         for data_point in historical_data:
-            spot_price = data_point["spot_price"]
-            futures_price = data_point["futures_price"]
-            expiry = data_point["futures_expiry"]
-            current_date = data_point["date"]
-            current_contract = data_point.get("contract")
-
-            days_to_expiry = (expiry - current_date).days
-            signal = self.generate_signal(spot_price, futures_price, days_to_expiry)
-
-            basis_absolute = futures_price - spot_price
-
-            # Check if we have an open trade
-            if current_trade:
-                trade_holding_days = (current_date - current_trade.entry_date).days
-
-                # Exit conditions
-                should_exit = False
-
-                # Force-close at contract boundary
-                if current_contract and trade_contract and current_contract != trade_contract:
-                    should_exit = True
-                    current_trade.status = "contract_roll"
-                elif signal in [Signal.STOP_LOSS, Signal.FULL_EXIT]:
-                    should_exit = True
-                    current_trade.status = (
-                        "stopped_out" if signal == Signal.STOP_LOSS else "closed"
-                    )
-                elif trade_holding_days >= holding_days:
-                    should_exit = True
-                    current_trade.status = "closed"
-
-                if should_exit:
-                    # Close trade
-                    current_trade.exit_date = current_date
-                    current_trade.exit_spot = spot_price
-                    current_trade.exit_futures = futures_price
-                    current_trade.exit_basis = basis_absolute
-
-                    # Calculate P&L (long spot, short futures)
-                    spot_pnl = (
-                        current_trade.exit_spot - current_trade.entry_spot
-                    ) * current_trade.position_size
-                    futures_pnl = (
-                        current_trade.entry_futures - current_trade.exit_futures
-                    ) * current_trade.position_size
-
-                    # Funding cost
-                    holding_days_actual = (
-                        current_trade.exit_date - current_trade.entry_date
-                    ).days
-                    funding_cost = (
-                        (self.funding_cost_annual / 365)
-                        * holding_days_actual
-                        * (current_trade.entry_spot * current_trade.position_size)
-                    )
-
-                    current_trade.realized_pnl = spot_pnl + futures_pnl - funding_cost
-
-                    # Update equity
-                    equity_curve.append(equity_curve[-1] + current_trade.realized_pnl)
-
-                    # Track daily return
-                    if len(equity_curve) > 1:
-                        daily_return = (
-                            equity_curve[-1] - equity_curve[-2]
-                        ) / equity_curve[-2]
-                        daily_returns.append(daily_return)
-
-                    result.trades.append(current_trade)
-                    current_trade = None
-
-            # Entry conditions (no open trade)
-            if current_trade is None:
-                if signal in [Signal.STRONG_ENTRY, Signal.ACCEPTABLE_ENTRY]:
-                    current_trade = Trade(
-                        entry_date=current_date,
-                        entry_spot=spot_price,
-                        entry_futures=futures_price,
-                        entry_basis=basis_absolute,
-                        position_size=1.0,
-                    )
-                    trade_contract = current_contract
+            position, closed = step(position, data_point, holding_days)
+            if closed:
+                tally.add(closed.realized_pnl, closed.entry_spot)
+                if record:
+                    record(*closed)
+
+                # Update equity and track the return of this trade
+                equity_curve.append(equity_curve[-1] + closed.realized_pnl)
+                daily_returns.append((equity_curve[-1] - equity_curve[-2]) / equity_curve[-2])
 
         # Close any remaining open trade
-        if current_trade:
+        if position:
             last_data = historical_data[-1]
-            current_trade.exit_date = last_data["date"]
-            current_trade.exit_spot = last_data["spot_price"]
-            current_trade.exit_futures = last_data["futures_price"]
-            current_trade.status = "forced_close"
-
-            spot_pnl = (
-                current_trade.exit_spot - current_trade.entry_spot
-            ) * current_trade.position_size
-            futures_pnl = (
-                current_trade.entry_futures - current_trade.exit_futures
-            ) * current_trade.position_size
-            holding_days_actual = (
-                current_trade.exit_date - current_trade.entry_date
-            ).days
-            funding_cost = (
-                (self.funding_cost_annual / 365)
-                * holding_days_actual
-                * (current_trade.entry_spot * current_trade.position_size)
+            closed = self.close_position(
+                position, last_data["date"], last_data["spot_price"], last_data["futures_price"], None, "forced_close"
             )
-            current_trade.realized_pnl = spot_pnl + futures_pnl - funding_cost
+            tally.add(closed.realized_pnl, closed.entry_spot)
+            if record:
+                record(*closed)
 
-            result.trades.append(current_trade)
+        self._compute_statistics(result, equity_curve, daily_returns, tally)
+        return result
 
-        # Calculate statistics
-        result.total_trades = len(result.trades)
+    def run_backtest_vectorized(
+        self, data: Any, holding_days: int = 30, trade_log: str = "objects"
+    ) -> BacktestResult:
+        """
+        Run the backtest with the NumPy engine (crypto_data.backtest.vectorized).
 
-        if result.total_trades > 0:
-            wins = [t for t in result.trades if t.realized_pnl and t.realized_pnl > 0]
-            losses = [t for t in result.trades if t.realized_pnl and t.realized_pnl < 0]
+        Produces the same trades and statistics as run_backtest(), much
+        faster on long (e.g. hourly) series. Requires numpy.
+
+        Args:
+            data: List of historical data points, a BasisColumns dataset or
+                  a BacktestFrame (reuse one frame for repeated runs)
+            holding_days: Maximum holding period
+            trade_log: "objects", "ledger" or "none", as for run_backtest()
+
+        Returns:
+            BacktestResult with all metrics
+        """
+        from crypto_data.backtest.vectorized import BacktestFrame, run_frame
+
+        frame = data if isinstance(data, BacktestFrame) else BacktestFrame.build(data)
+        return run_frame(self, frame, holding_days, trade_log)
+
+    def step(
+        self, position: Optional[OpenPosition], data_point: Dict[str, Any], holding_days: int
+    ) -> Tuple[Optional[OpenPosition], Optional[ClosedTrade]]:
+        """
+        Apply one data point: one iteration of run_backtest()'s loop.
+
+        The open trade is closed when an exit rule fires (contract roll,
+        then stop-loss or full exit, then the holding period); a new trade
+        opens on an entry signal when none is open, possibly on the same row.
+
+        Args:
+            position: Open trade before this row, or None
+            data_point: Row with date, spot_price, futures_price,
+                        futures_expiry and optionally contract
+            holding_days: Maximum holding period
 
-            result.winning_trades = len(wins)
-            result.losing_trades = len(losses)
+        Returns:
+            (position after this row, trade closed on this row or None)
+        """
+        spot_price = data_point["spot_price"]
+        futures_price = data_point["futures_price"]
+        current_date = data_point["date"]
+        current_contract = data_point.get("contract")
+
+        days_to_expiry = (data_point["futures_expiry"] - current_date).days
+        signal = self.generate_signal(spot_price, futures_price, days_to_expiry)
+
+        basis_absolute = futures_price - spot_price
+
+        closed = None
+        if position:
+            # Exit conditions
+            status = None
+
+            # Force-close at contract boundary
+            if current_contract and position.contract and current_contract != position.contract:
+                status = "contract_roll"
+            elif signal in [Signal.STOP_LOSS, Signal.FULL_EXIT]:
+                status = "stopped_out" if signal == Signal.STOP_LOSS else "closed"
+            elif (current_date - position.entry_date).days >= holding_days:
+                status = "closed"
+
+            if status:
+                closed = self.close_position(position, current_date, spot_price, futures_price, basis_absolute, status)
+                position = None
+
+        # Entry conditions (no open trade)
+        if position is None and signal in [Signal.STRONG_ENTRY, Signal.ACCEPTABLE_ENTRY]:
+            position = OpenPosition(current_date, spot_price, futures_price, basis_absolute, current_contract)
+        return position, closed
+
+    def close_position(
+        self,
+        position: OpenPosition,
+        exit_date: datetime,
+        exit_spot: float,
+        exit_futures: float,
+        exit_basis: Optional[float],
+        status: str,
+    ) -> ClosedTrade:
+        """Close ``position`` at the given prices, with its realized P&L (long spot, short futures)."""
+        entry_date, entry_spot, entry_futures, entry_basis, _ = position
+        pnl = self._trade_pnl(entry_date, entry_spot, entry_futures, exit_date, exit_spot, exit_futures)
+        return ClosedTrade(
+            entry_date, entry_spot, entry_futures, entry_basis,
+            exit_date, exit_spot, exit_futures, exit_basis, pnl, status,
+        )
+
+    def _trade_pnl(
+        self,
+        entry_date: datetime,
+        entry_spot: float,
+        entry_futures: float,
+        exit_date: datetime,
+        exit_spot: float,
+        exit_futures: float,
+        position_size: float = 1.0,
+    ) -> float:
+        """Realized P&L of a basis trade (long spot, short futures), net of funding."""
+        spot_pnl = (exit_spot - entry_spot) * position_size
+        futures_pnl = (entry_futures - exit_futures) * position_size
+
+        # Funding cost
+        holding_days_actual = (exit_date - entry_date).days
+        funding_cost = (
+            (self.funding_cost_annual / 365)
+            * holding_days_actual
+            * (entry_spot * position_size)
+        )
+        return spot_pnl + futures_pnl - funding_cost
+
+    @staticmethod
+    def _trade_recorder(result: BacktestResult, trade_log: str):
+        """
+        Function that stores a closed trade for ``trade_log``, or None.
 
-            if wins:
-                result.avg_win = sum(t.return_pct for t in wins if t.return_pct) / len(
-                    wins
-                )
-            if losses:
-                result.avg_loss = sum(
-                    t.return_pct for t in losses if t.return_pct
-                ) / len(losses)
+        Called as record(entry_date, entry_spot, entry_futures, entry_basis,
+        exit_date, exit_spot, exit_futures, exit_basis, realized_pnl, status).
+        """
+        if trade_log == "objects":
+            trades = result.trades
+
+            def record(*closed):
+                trades.append(ClosedTrade(*closed).to_trade())
+            return record
+        if trade_log == "ledger":
+            result.ledger = TradeLedger()
+            return result.ledger.append
+        if trade_log == "none":
+            return None
+        raise ValueError(f"Unknown trade_log '{trade_log}', expected one of {TRADE_LOGS}")
+
+    @staticmethod
+    def _compute_statistics(
+        result: BacktestResult,
+        equity_curve: List[float],
+        daily_returns: List[float],
+        tally: Optional[_TradeTally] = None,
+    ) -> None:
+        """
+        Fill the summary statistics of ``result`` from its trades and equity curve.
+
+        Args:
+            tally: Trades counted as they closed (default: count result.trades)
+        """
+        if tally is None:
+            tally = _TradeTally.from_trades(result.trades)
+        tally.apply(result)
 
+        if result.total_trades > 0:
             # Total return
             result.total_return = (equity_curve[-1] - equity_curve[0]) / equity_curve[0]
 
@@ -441,5 +704,3 @@ class Backtester:
                 std_return = statistics.stdev(daily_returns)
                 if std_return > 0:
                     result.sharpe_ratio = (avg_return / std_return) * (365**0.5)
-
-        return result
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Grid search over signal thresholds, serial or across worker processes.
+
+run_grid() backtests a list of (entry, stop, exit, hold) points, with the
+batched sweep engine when numpy is installed and one Backtester per point
+otherwise. run_grid_parallel() splits the points into chunks for a process
+pool. The series is copied once into a multiprocessing.shared_memory
+block (SharedSeries); each worker attaches to it when it starts, instead
+of receiving the rows with every task. Chunk results stream back as they
+finish and are reassembled in grid order, so the output (and any ranking
+of it) is identical to run_grid() on the same points.
+
+Usage:
+    points = grid_points(entry_values, stop_values, exit_values, holding_values)
+    results = run_grid_parallel(bt_data, points, account_size, funding_cost_annual, workers=8)
+"""
+
+import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import product
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from crypto_data.backtest.engine import Backtester
+
+try:
+    from crypto_data.backtest.sweep import PARAM_DTYPE, result_dicts, run_sweep
+    from crypto_data.backtest.vectorized import BacktestFrame, DAY_US
+except ImportError:  # numpy not installed: one Backtester per point
+    run_sweep = None
+
+# (entry, stop, exit, hold)
+GridPoint = Tuple[float, float, float, int]
+
+# Shared block layout: 8-byte columns first, so every column stays aligned
+SHARED_COLUMNS = (
+    ("date", "q"),
+    ("futures_expiry", "q"),
+    ("spot_price", "d"),
+    ("futures_price", "d"),
+    ("contract", "i"),
+)
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def sweep_available() -> bool:
+    """True when run_grid() uses the batched sweep engine (numpy installed)."""
+    return run_sweep is not None
+
+
+def grid_points(
+    entry_values: Iterable[float],
+    stop_values: Iterable[float],
+    exit_values: Iterable[float],
+    holding_values: Iterable[int],
+) -> List[GridPoint]:
+    """Valid (entry, stop, exit, hold) points in itertools.product order."""
+    return [
+        (entry, stop, exit_t, hold)
+        for entry, stop, exit_t, hold in product(entry_values, stop_values, exit_values, holding_values)
+        # Skip invalid: entry must be above stop_loss, exit above entry
+        if entry > stop and exit_t > entry
+    ]
+
+
+def backtest_points(
+    bt_data: List[Dict],
+    points: Sequence[GridPoint],
+    account_size: float,
+    funding_cost_annual: float,
+) -> List[Dict[str, Any]]:
+    """Backtest each point with its own Backtester (same keys as sweep.result_dicts())."""
+    results = []
+    for entry, stop, exit_t, hold in points:
+        config = type("Config", (), {
+            "account_size": account_size,
+            "funding_cost_annual": funding_cost_annual,
+            "entry_threshold": entry,
+            "stop_loss_threshold": stop,
+            "exit_threshold": exit_t,
+        })()
+
+        backtester = Backtester(config)
+        result = backtester.run_backtest(bt_data, holding_days=hold, trade_log="none")
+
+        results.append({
+            "entry": entry,
+            "stop": stop,
+            "exit": exit_t,
+            "hold": hold,
+            "return": result.total_return,
+            "sharpe": result.sharpe_ratio,
+            "max_dd": result.max_drawdown,
+            "trades": result.total_trades,
+            "win_rate": result.win_rate,
+            "wins": result.winning_trades,
+            "losses": result.losing_trades,
+            "avg_win": result.avg_win,
+            "avg_loss": result.avg_loss,
+        })
+    return results
+
+
+def _sweep_points(frame, points: Sequence[GridPoint], account_size: float, funding_cost_annual: float):
+    import numpy as np
+
+    results = run_sweep(frame, np.array(points, dtype=PARAM_DTYPE), account_size, funding_cost_annual)
+    return result_dicts(results)
+
+
+def run_grid(
+    bt_data: List[Dict],
+    points: Sequence[GridPoint],
+    account_size: float,
+    funding_cost_annual: float,
+) -> List[Dict[str, Any]]:
+    """
+    Backtest every grid point in this process.
+
+    Args:
+        bt_data: Rows from Backtester.load_historical_data()
+        points: Points from grid_points()
+        account_size: Initial capital
+        funding_cost_annual: Annual funding cost rate
+
+    Returns:
+        One result dict per point, in point order
+    """
+    if not points:
+        return []
+    if run_sweep is not None:
+        return _sweep_points(BacktestFrame.build(bt_data), points, account_size, funding_cost_annual)
+    return backtest_points(bt_data, points, account_size, funding_cost_annual)
+
+
+@dataclass
+class SeriesHandle:
+    """Picklable reference to a SharedSeries block."""
+
+    name: str
+    length: int
+    origin: Optional[datetime]
+    contracts: List[str]
+
+
+class SharedSeries:
+    """
+    Backtest input columns in one multiprocessing.shared_memory block.
+
+    Dates and expiries are stored as int64 microseconds from the first
+    date, prices as float64 and contracts as int32 ids (-1 for none), so
+    rows rebuilt from the block equal the originals.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, handle: SeriesHandle, owner: bool = False):
+        self.shm = shm
+        self.handle = handle
+        self.owner = owner
+
+    @classmethod
+    def create(cls, bt_data: Sequence[Dict]) -> "SharedSeries":
+        """Copy rows into a new shared block (owned: unlink() when done)."""
+        n = len(bt_data)
+        origin = bt_data[0]["date"] if n else None
+        contract_ids: Dict[str, int] = {}
+        columns = {
+            "date": array("q", ((row["date"] - origin) // _MICROSECOND for row in bt_data)),
+            "futures_expiry": array("q", ((row["futures_expiry"] - origin) // _MICROSECOND for row in bt_data)),
+            "spot_price": array("d", (row["spot_price"] for row in bt_data)),
+            "futures_price": array("d", (row["futures_price"] for row in bt_data)),
+            "contract": array("i", (
+                contract_ids.setdefault(row["contract"], len(contract_ids)) if row.get("contract") else -1
+                for row in bt_data
+            )),
+        }
+        size = sum(col.itemsize * n for col in columns.values())
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        offset = 0
+        for name, _ in SHARED_COLUMNS:
+            blob = memoryview(columns[name]).cast("B")
+            shm.buf[offset : offset + len(blob)] = blob
+            offset += len(blob)
+        return cls(shm, SeriesHandle(shm.name, n, origin, list(contract_ids)), owner=True)
+
+    @classmethod
+    def attach(cls, handle: SeriesHandle) -> "SharedSeries":
+        """Map an existing block (in a worker process)."""
+        return cls(shared_memory.SharedMemory(name=handle.name), handle)
+
+    def columns(self) -> Dict[str, memoryview]:
+        """Typed views over the block, by column name."""
+        n = self.handle.length
+        views = {}
+        offset = 0
+        for name, typecode in SHARED_COLUMNS:
+            size = array(typecode).itemsize * n
+            views[name] = self.shm.buf[offset : offset + size].cast(typecode)
+            offset += size
+        return views
+
+    def rows(self) -> List[Dict]:
+        """Rebuild the row dicts (as loaded by Backtester.load_historical_data())."""
+        cols = self.columns()
+        origin = self.handle.origin
+        contracts = self.handle.contracts
+        rows = []
+        for date, expiry, spot, futures, contract in zip(
+            cols["date"], cols["futures_expiry"], cols["spot_price"], cols["futures_price"], cols["contract"]
+        ):
+            row = {
+                "date": origin + timedelta(microseconds=date),
+                "spot_price": spot,
+                "futures_price": futures,
+                "futures_expiry": origin + timedelta(microseconds=expiry),
+            }
+            if contract >= 0:
+                row["contract"] = contracts[contract]
+            rows.append(row)
+        for view in cols.values():
+            view.release()
+        return rows
+
+    def frame(self) -> "BacktestFrame":
+        """BacktestFrame whose price and date arrays are views of the block."""
+        import numpy as np
+
+        n = self.handle.length
+        offsets = {}
+        offset = 0
+        for name, typecode in SHARED_COLUMNS:
+            offsets[name] = offset
+            offset += array(typecode).itemsize * n
+
+        def column(name, dtype):
+            return np.frombuffer(self.shm.buf, dtype=dtype, count=n, offset=offsets[name])
+
+        timestamps = column("date", np.int64)
+        return BacktestFrame(
+            timestamps,
+            column("spot_price", np.float64),
+            column("futures_price", np.float64),
+            (column("futures_expiry", np.int64) - timestamps) // DAY_US,
+            column("contract", np.int32),
+            origin=self.handle.origin,
+        )
+
+    def close(self) -> None:
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Free the block (owner only)."""
+        if self.owner:
+            self.shm.unlink()
+
+
+# Per-process worker state, set by _init_worker
+_worker_data = None
+
+
+def _init_worker(handle: SeriesHandle) -> None:
+    """Attach to the shared series once per worker process."""
+    global _worker_data
+    series = SharedSeries.attach(handle)
+    if run_sweep is not None:
+        # The frame keeps views of the block, so it stays mapped
+        _worker_data = (series, series.frame())
+    else:
+        _worker_data = (series, series.rows())
+        series.close()
+
+
+def _run_chunk(
+    index: int,
+    points: Sequence[GridPoint],
+    account_size: float,
+    funding_cost_annual: float,
+) -> Tuple[int, List[Dict[str, Any]]]:
+    data = _worker_data[1]
+    if run_sweep is not None:
+        return index, _sweep_points(data, points, account_size, funding_cost_annual)
+    return index, backtest_points(data, points, account_size, funding_cost_annual)
+
+
+def run_grid_parallel(
+    bt_data: List[Dict],
+    points: Sequence[GridPoint],
+    account_size: float,
+    funding_cost_annual: float,
+    workers: int,
+    chunk_size: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Backtest grid points in a process pool over shared-memory data.
+
+    Args:
+        bt_data: Rows from Backtester.load_historical_data()
+        points: Points from grid_points()
+        account_size: Initial capital
+        funding_cost_annual: Annual funding cost rate
+        workers: Worker processes
+        chunk_size: Points per task (default: about 4 tasks per worker)
+        progress: Called as progress(done, total) after each finished chunk
+
+    Returns:
+        One result dict per point, in point order (same as run_grid())
+    """
+    total = len(points)
+    if total == 0:
+        return []
+    chunk_size = chunk_size or max(1, math.ceil(total / (workers * 4)))
+    chunks = [points[start : start + chunk_size] for start in range(0, total, chunk_size)]
+
+    series = SharedSeries.create(bt_data)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(series.handle,)
+        ) as pool:
+            futures = [
+                pool.submit(_run_chunk, index, chunk, account_size, funding_cost_annual)
+                for index, chunk in enumerate(chunks)
+            ]
+            chunk_results: List[Optional[List[Dict[str, Any]]]] = [None] * len(chunks)
+            done = 0
+            for future in as_completed(futures):
+                index, results = future.result()
+                chunk_results[index] = results
+                done += len(results)
+                if progress:
+                    progress(done, total)
+    finally:
+        series.close()
+        series.unlink()
+
+    return [result for results in chunk_results for result in results]
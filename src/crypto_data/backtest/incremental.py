@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Online backtest that advances one data point at a time.
+
+Backtester.run_backtest() replays the whole history on every call. For a
+daily job that only appends new rows, IncrementalBacktester keeps the
+running state instead: the open trade, the equity, a running peak for the
+max drawdown, the win/loss tally, and a Welford running mean and variance
+of the per-trade equity returns for the Sharpe ratio. Each row is one
+Backtester.step(), the same per-row step run_backtest() takes, and the
+state is a small JSON document (save()/load()), so the next run resumes
+where the last one stopped.
+
+Trades, equity and every summary statistic follow run_backtest() on the
+same rows; the Sharpe ratio agrees to floating-point rounding (Welford
+instead of statistics.stdev over the whole series). Closed trades are
+returned by update() but not kept.
+
+Usage:
+    backtester = IncrementalBacktester.load(state_path)  # or IncrementalBacktester(config)
+    backtester.update_many(new_rows)
+    backtester.save(state_path)
+    print(backtester.result().total_return)
+"""
+
+import copy
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from crypto_data.backtest.engine import Backtester, BacktestResult, OpenPosition, Trade, _TradeTally
+
+STATE_VERSION = 1
+
+_TRADE_DATES = ("entry_date", "exit_date")
+
+
+def _dump_trade(trade: Trade) -> Dict[str, Any]:
+    state = asdict(trade)
+    for name in _TRADE_DATES:
+        if state[name] is not None:
+            state[name] = state[name].isoformat()
+    return state
+
+
+def _load_trade(state: Dict[str, Any]) -> Trade:
+    values = {f.name: state[f.name] for f in fields(Trade) if f.name in state}
+    for name in _TRADE_DATES:
+        if values.get(name) is not None:
+            values[name] = datetime.fromisoformat(values[name])
+    return Trade(**values)
+
+
+def _load_date(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class IncrementalBacktester:
+    """Basis trade backtest with O(1) updates and resumable state."""
+
+    def __init__(self, config=None, holding_days: int = 30):
+        """
+        Args:
+            config: Configuration object with account_size, funding_cost_annual
+                    and signal thresholds (as for Backtester)
+            holding_days: Maximum holding period
+        """
+        self.backtester = Backtester(config)
+        self.holding_days = holding_days
+
+        self.rows = 0
+        self.start_date: Optional[datetime] = None
+        self.last_date: Optional[datetime] = None
+        self.last_spot: Optional[float] = None
+        self.last_futures: Optional[float] = None
+
+        self.position: Optional[OpenPosition] = None
+
+        self.equity = float(self.backtester.account_size)
+        self.peak = self.equity
+        self.max_drawdown = 0.0
+        self.tally = _TradeTally()
+
+        # Welford accumulators over per-trade equity returns
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+
+    def update(self, data_point: Dict[str, Any]) -> Optional[Trade]:
+        """
+        Apply one data point, as one iteration of run_backtest()'s loop.
+
+        Args:
+            data_point: Row with date, spot_price, futures_price,
+                        futures_expiry and optionally contract
+
+        Returns:
+            The trade closed on this row, if any
+        """
+        current_date = data_point["date"]
+        if self.rows == 0:
+            self.start_date = current_date
+        self.rows += 1
+        self.last_date = current_date
+        self.last_spot = data_point["spot_price"]
+        self.last_futures = data_point["futures_price"]
+
+        self.position, closed = self.backtester.step(self.position, data_point, self.holding_days)
+        if closed is None:
+            return None
+        self._record_close(closed.realized_pnl, closed.entry_spot)
+        return closed.to_trade()
+
+    @property
+    def closed_trades(self) -> int:
+        """Trades closed so far (the open trade not included)."""
+        return self.tally.count
+
+    def update_many(self, data: Iterable[Dict[str, Any]]) -> List[Trade]:
+        """
+        Apply the rows dated after the last applied row, in order.
+
+        Rows at or before the last applied date are skipped, so a job can
+        pass the full (re-accumulated) period on every run.
+
+        Returns:
+            Trades closed by the applied rows
+        """
+        closed = []
+        for data_point in data:
+            if self.last_date is not None and data_point["date"] <= self.last_date:
+                continue
+            trade = self.update(data_point)
+            if trade:
+                closed.append(trade)
+        return closed
+
+    def _record_close(self, realized_pnl: float, entry_spot: float) -> None:
+        """Update the tally, equity, drawdown and return moments for a closed trade."""
+        self.tally.add(realized_pnl, entry_spot)
+
+        previous = self.equity
+        self.equity = previous + realized_pnl
+        if self.equity > self.peak:
+            self.peak = self.equity
+        drawdown = (self.peak - self.equity) / self.peak
+        if drawdown > self.max_drawdown:
+            self.max_drawdown = drawdown
+
+        # Welford update
+        daily_return = (self.equity - previous) / previous
+        self.return_count += 1
+        delta = daily_return - self.return_mean
+        self.return_mean += delta / self.return_count
+        self.return_m2 += delta * (daily_return - self.return_mean)
+
+    @property
+    def sharpe_ratio(self) -> float:
+        """Annualized Sharpe ratio of the per-trade equity returns."""
+        if self.return_count < 2:
+            return 0.0
+        std_return = math.sqrt(self.return_m2 / (self.return_count - 1))
+        if std_return > 0:
+            return (self.return_mean / std_return) * (365**0.5)
+        return 0.0
+
+    def result(self) -> BacktestResult:
+        """
+        Summary of all rows so far, as run_backtest() would report it.
+
+        An open trade is force-closed on the last row, on a copy, exactly
+        like the end of run_backtest(); it is the only entry in ``trades``.
+        """
+        result = BacktestResult(initial_capital=self.backtester.account_size)
+        result.start_date = self.start_date
+        result.end_date = self.last_date
+
+        tally = self.tally
+        if self.position:
+            forced = self.backtester.close_position(
+                self.position, self.last_date, self.last_spot, self.last_futures, None, "forced_close"
+            )
+            result.trades.append(forced.to_trade())
+            # Count it like run_backtest(): a trade, but no equity change
+            tally = copy.copy(tally)
+            tally.add(forced.realized_pnl, forced.entry_spot)
+
+        tally.apply(result)
+        if result.total_trades > 0:
+            result.total_return = (self.equity - result.initial_capital) / result.initial_capital
+            result.max_drawdown = self.max_drawdown
+            result.sharpe_ratio = self.sharpe_ratio
+        return result
+
+    def state_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (parameters included)."""
+        backtester = self.backtester
+        return {
+            "version": STATE_VERSION,
+            "params": {
+                "account_size": backtester.account_size,
+                "funding_cost_annual": backtester.funding_cost_annual,
+                "entry_threshold": backtester.entry_threshold,
+                "stop_loss_threshold": backtester.stop_loss_threshold,
+                "exit_threshold": backtester.exit_threshold,
+                "holding_days": self.holding_days,
+            },
+            "rows": self.rows,
+            "start_date": self.start_date.isoformat() if self.start_date else None,
+            "last": {
+                "date": self.last_date.isoformat(),
+                "spot_price": self.last_spot,
+                "futures_price": self.last_futures,
+            } if self.last_date else None,
+            "trade": _dump_trade(Trade(*self.position[:4])) if self.position else None,
+            "trade_contract": self.position.contract if self.position else None,
+            "equity": self.equity,
+            "peak": self.peak,
+            "max_drawdown": self.max_drawdown,
+            "closed_trades": self.tally.count,
+            "wins": self.tally.wins,
+            "losses": self.tally.losses,
+            "win_sum": self.tally.win_sum,
+            "loss_sum": self.tally.loss_sum,
+            "returns": {
+                "count": self.return_count,
+                "mean": self.return_mean,
+                "m2": self.return_m2,
+            },
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "IncrementalBacktester":
+        """Rebuild a backtester from state_dict() output."""
+        if state.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported incremental backtest state version: {state.get('version')}")
+        params = dict(state["params"])
+        holding_days = params.pop("holding_days")
+        backtester = cls(type("Config", (), params)(), holding_days=holding_days)
+
+        backtester.rows = state["rows"]
+        backtester.start_date = _load_date(state["start_date"])
+        last = state["last"]
+        if last:
+            backtester.last_date = datetime.fromisoformat(last["date"])
+            backtester.last_spot = last["spot_price"]
+            backtester.last_futures = last["futures_price"]
+        if state["trade"]:
+            trade = _load_trade(state["trade"])
+            backtester.position = OpenPosition(
+                trade.entry_date, trade.entry_spot, trade.entry_futures, trade.entry_basis, state["trade_contract"]
+            )
+        for name in ("equity", "peak", "max_drawdown"):
+            setattr(backtester, name, state[name])
+        tally = backtester.tally
+        tally.count = state["closed_trades"]
+        for name in ("wins", "losses", "win_sum", "loss_sum"):
+            setattr(tally, name, state[name])
+        backtester.return_count = state["returns"]["count"]
+        backtester.return_mean = state["returns"]["mean"]
+        backtester.return_m2 = state["returns"]["m2"]
+        return backtester
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the state as JSON (atomically: a crash keeps the old file)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.state_dict(), f, indent=2)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IncrementalBacktester":
+        """Read a state file written by save()."""
+        with open(path) as f:
+            return cls.from_state(json.load(f))
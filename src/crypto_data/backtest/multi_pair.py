@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Accumulate and backtest several investment pairs in parallel.
+
+Each pair runs in its own worker process: Databento loading, the basis
+merge, export and the backtest all happen there, so the wall time is close
+to that of the slowest pair. All IBKR traffic (spot history, and futures
+with futures_source='ibkr') goes through one IBKRBroker connection in the
+parent process, which sends the pending requests of all workers together
+through its pacing scheduler. Workers share the on-disk spot cache (SQLite handles the
+cross-process locking).
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from crypto_data.backtest.engine import Backtester, BacktestResult
+from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.ibkr import IBKRHistoricalFetcher
+from crypto_data.data.ibkr_broker import BrokerClient, BrokeredAccumulator, IBKRBroker
+from crypto_data.data.spot_cache import SpotCache
+
+
+@dataclass
+class PairJob:
+    """Everything one worker needs to accumulate and backtest a pair."""
+
+    pair: str
+    spot_config: Dict[str, str]
+    futures_symbol: str
+    windows: List[Tuple[str, datetime, datetime]]
+    futures_exchange: str = "CME"
+    futures_source: str = "databento"
+    spot_source: str = "ibkr"
+    databento_dir: Optional[str] = None
+    output_file: Optional[str] = None
+    spot_cache_path: Optional[str] = None
+    holding_days: int = 30
+    # Backtester settings (read by Backtester via getattr)
+    account_size: float = 200000
+    funding_cost_annual: float = 0.05
+    entry_threshold: float = 0.005
+    stop_loss_threshold: float = 0.002
+    exit_threshold: float = 0.035
+
+    @property
+    def needs_ibkr(self) -> bool:
+        return self.spot_source == "ibkr" or self.futures_source == "ibkr"
+
+
+@dataclass
+class PairResult:
+    """Outcome of one PairJob."""
+
+    pair: str
+    rows: int = 0
+    output_file: Optional[str] = None
+    result: Optional[BacktestResult] = None
+    elapsed: float = 0.0
+    error: Optional[str] = None
+    contracts: Dict[str, int] = field(default_factory=dict)
+
+
+def run_pair(job: PairJob, client: Optional[BrokerClient] = None) -> PairResult:
+    """
+    Accumulate one pair, export it and run its backtest.
+
+    Args:
+        job: Pair settings
+        client: Broker client for IBKR calls; None runs without IBKR
+                (only valid for jobs that do not need it)
+
+    Returns:
+        PairResult (with ``error`` set instead of raising)
+    """
+    started = time.monotonic()
+    spot_cache = SpotCache(job.spot_cache_path) if job.spot_cache_path else None
+    if client is not None:
+        acc = BrokeredAccumulator(client, spot_cache=spot_cache)
+    else:
+        acc = FuturesAccumulator(IBKRHistoricalFetcher(), spot_cache=spot_cache)
+
+    results = acc.accumulate_many(
+        job.windows,
+        symbol=job.futures_symbol,
+        exchange=job.futures_exchange,
+        spot_source=job.spot_source,
+        spot_config=job.spot_config,
+        futures_source=job.futures_source,
+        databento_dir=job.databento_dir,
+    )
+    rows = [row for expiry, _, _ in job.windows for row in results[expiry]]
+    outcome = PairResult(
+        pair=job.pair,
+        rows=len(rows),
+        output_file=job.output_file,
+        contracts={expiry: len(results[expiry]) for expiry, _, _ in job.windows},
+    )
+    if not rows:
+        outcome.error = "No data returned"
+        outcome.elapsed = time.monotonic() - started
+        return outcome
+
+    backtester = Backtester(job)
+    if job.output_file:
+        acc.export(rows, job.output_file)
+        bt_data = backtester.load_historical_data(job.output_file)
+    else:
+        bt_data = rows
+    # Trades as compact columns: the result is pickled back to the parent
+    outcome.result = backtester.run_backtest(bt_data, holding_days=job.holding_days, trade_log="ledger")
+    outcome.elapsed = time.monotonic() - started
+    return outcome
+
+
+def run_pairs(
+    jobs: List[PairJob],
+    ibkr_config: Optional[Dict[str, Any]] = None,
+    workers: Optional[int] = None,
+    broker_accumulator: Optional[FuturesAccumulator] = None,
+) -> List[PairResult]:
+    """
+    Run pair jobs in a process pool, sharing one IBKR connection.
+
+    Args:
+        jobs: Pair jobs
+        ibkr_config: IBKR connection settings for the broker
+        workers: Worker processes (default: one per job)
+        broker_accumulator: Accumulator whose fetcher the broker uses
+                            (default: FuturesAccumulator.from_config(ibkr_config))
+
+    Returns:
+        One PairResult per job, in input order
+    """
+    if not jobs:
+        return []
+    workers = workers or len(jobs)
+    needs_ibkr = any(job.needs_ibkr for job in jobs)
+
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        broker = None
+        if needs_ibkr:
+            broker = IBKRBroker(broker_accumulator or FuturesAccumulator.from_config(ibkr_config or {}), manager)
+        futures = [
+            pool.submit(run_pair, job, broker.client() if job.needs_ibkr else None)
+            for job in jobs
+        ]
+        try:
+            if broker is not None:
+                broker.serve(done=lambda: all(f.done() for f in futures))
+        finally:
+            if broker is not None:
+                broker.close()
+
+        results = []
+        for job, future in zip(jobs, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(PairResult(pair=job.pair, error=str(e)))
+    return results
+
+
+def pairs_report(results: List[PairResult]) -> Dict[str, Any]:
+    """
+    Combine per-pair results into one report.
+
+    Returns:
+        Dict with 'pairs' (per-pair summary, or error) and 'combined'
+        (capital-weighted totals over the pairs that ran)
+    """
+    pairs = {}
+    initial = final = 0.0
+    trades = wins = 0
+    for outcome in results:
+        if outcome.result is None:
+            pairs[outcome.pair] = {"rows": outcome.rows, "error": outcome.error}
+            continue
+        summary = outcome.result.to_dict()["summary"]
+        summary.update({"rows": outcome.rows, "output_file": outcome.output_file, "elapsed": outcome.elapsed})
+        pairs[outcome.pair] = summary
+        initial += outcome.result.initial_capital
+        final += outcome.result.final_capital
+        trades += outcome.result.total_trades
+        wins += outcome.result.winning_trades
+
+    return {
+        "pairs": pairs,
+        "combined": {
+            "initial_capital": initial,
+            "final_capital": final,
+            "total_return": (final - initial) / initial * 100 if initial else 0.0,
+            "total_trades": trades,
+            "win_rate": wins / trades * 100 if trades else 0.0,
+        },
+    }
+
+
+def format_pairs_report(results: List[PairResult]) -> str:
+    """Text table of pairs_report() for console output."""
+    report = pairs_report(results)
+    lines = [
+        f"{'Pair':<8} {'Rows':>6} {'Trades':>7} {'Return':>9} {'Sharpe':>7} {'MaxDD':>8} "
+        f"{'Win%':>7} {'Final Capital':>15} {'Time':>7}",
+        "-" * 84,
+    ]
+    for pair, summary in report["pairs"].items():
+        if "error" in summary:
+            lines.append(f"{pair:<8} {summary['rows']:>6}  [X] {summary['error']}")
+            continue
+        lines.append(
+            f"{pair:<8} {summary['rows']:>6} {summary['total_trades']:>7} "
+            f"{summary['total_return']:>8.2f}% {summary['sharpe_ratio']:>7.2f} "
+            f"{summary['max_drawdown']:>7.2f}% {summary['win_rate']:>6.2f}% "
+            f"${summary['final_capital']:>14,.2f} {summary['elapsed']:>6.1f}s"
+        )
+    combined = report["combined"]
+    lines.append("-" * 84)
+    lines.append(
+        f"{'ALL':<8} {'':>6} {combined['total_trades']:>7} {combined['total_return']:>8.2f}% "
+        f"{'':>7} {'':>8} {combined['win_rate']:>6.2f}% ${combined['final_capital']:>14,.2f}"
+    )
+    return "\n".join(lines)
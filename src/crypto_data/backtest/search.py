@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Adaptive searches over signal thresholds.
+
+An exhaustive grid multiplies in size with every refined step. These
+searches work on a fine parameter lattice (SearchSpace) and spend a fixed
+evaluation budget instead:
+
+    random_search        distinct random lattice points
+    successive_halving   screen many points on a short, recent window,
+                         promote the best 1/eta to an eta-times longer
+                         window, until the survivors run on all the data
+    coarse_to_fine       a coarse sub-grid, then finer neighbourhoods
+                         around the best points, halving the stride each
+                         level
+
+The budget is counted in full-data backtests: a backtest on a window
+costs its share of the rows (a quarter-length window costs 0.25).
+Results are ranked like run_optimization(): by total return, best first.
+
+Usage:
+    evaluator = Evaluator(bt_data, account_size, funding_cost_annual)
+    search = coarse_to_fine(evaluator, DEFAULT_SPACE, budget=400)
+    best = search.results[0]
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from itertools import product
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+from crypto_data.backtest.grid import GridPoint, run_grid, run_grid_parallel
+
+Number = Union[int, float]
+# Lattice coordinates of a point: indices into each ParamRange's values
+Index = Tuple[int, int, int, int]
+
+
+@dataclass(frozen=True)
+class ParamRange:
+    """Inclusive range of parameter values on a fixed step."""
+
+    low: Number
+    high: Number
+    step: Number
+
+    def values(self) -> List[Number]:
+        """All values, rounded like optimize_signals.frange (ints stay ints)."""
+        count = int(round((self.high - self.low) / self.step)) + 1
+        if all(isinstance(v, int) for v in (self.low, self.high, self.step)):
+            return [self.low + i * self.step for i in range(count)]
+        return [round(self.low + i * self.step, 6) for i in range(count)]
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    """Lattice of (entry, stop, exit, hold) points."""
+
+    entry: ParamRange
+    stop: ParamRange
+    exit: ParamRange
+    hold: ParamRange
+
+    def axes(self) -> List[List[Number]]:
+        return [self.entry.values(), self.stop.values(), self.exit.values(), self.hold.values()]
+
+    @staticmethod
+    def valid(point: GridPoint) -> bool:
+        """Same rule as grid_points(): entry above stop, exit above entry."""
+        entry, stop, exit_t, _ = point
+        return entry > stop and exit_t > entry
+
+    def size(self) -> int:
+        """Number of valid points (an exhaustive search at full resolution)."""
+        entry, stop, exit_t, hold = self.axes()
+        pairs = sum(sum(1 for s in stop if e > s) * sum(1 for x in exit_t if x > e) for e in entry)
+        return pairs * len(hold)
+
+
+# The grid of optimize_signals.run_optimization(), at 4x (entry, stop),
+# 2x (exit) and 2x (hold) finer resolution
+DEFAULT_SPACE = SearchSpace(
+    entry=ParamRange(0.002, 0.020, 0.0005),
+    stop=ParamRange(0.001, 0.005, 0.00025),
+    exit=ParamRange(0.020, 0.060, 0.0025),
+    hold=ParamRange(10, 60, 5),
+)
+
+
+class Evaluator:
+    """
+    Backtests points on the full data or on its most recent rows.
+
+    Results are cached per (point, window), and every new backtest adds
+    its window's share of the rows to ``cost``.
+    """
+
+    def __init__(
+        self,
+        bt_data: List[Dict],
+        account_size: float,
+        funding_cost_annual: float,
+        workers: int = 1,
+    ):
+        self.bt_data = bt_data
+        self.account_size = account_size
+        self.funding_cost_annual = funding_cost_annual
+        self.workers = workers
+        self.cost = 0.0
+        self.backtests = 0
+        self._cache: Dict[Tuple[GridPoint, int], Dict[str, Any]] = {}
+
+    def window_rows(self, fraction: float) -> int:
+        """Rows in a window holding ``fraction`` of the data (at least one)."""
+        return max(1, min(len(self.bt_data), math.ceil(len(self.bt_data) * fraction)))
+
+    def evaluate(self, points: Sequence[GridPoint], fraction: float = 1.0) -> List[Dict[str, Any]]:
+        """
+        Results for ``points`` on the last ``fraction`` of the rows.
+
+        Returns:
+            One result dict per point, in point order
+        """
+        rows = self.window_rows(fraction)
+        new = list(dict.fromkeys(p for p in points if (p, rows) not in self._cache))
+        if new:
+            data = self.bt_data[-rows:]
+            if self.workers > 1:
+                results = run_grid_parallel(
+                    data, new, self.account_size, self.funding_cost_annual, workers=self.workers
+                )
+            else:
+                results = run_grid(data, new, self.account_size, self.funding_cost_annual)
+            for point, result in zip(new, results):
+                self._cache[(point, rows)] = result
+            self.backtests += len(new)
+            self.cost += len(new) * rows / len(self.bt_data)
+        return [self._cache[(p, rows)] for p in points]
+
+
+@dataclass
+class SearchResult:
+    """Outcome of a search."""
+
+    strategy: str
+    results: List[Dict[str, Any]]  # full-data results, best first
+    cost: float  # full-data backtest equivalents spent
+    backtests: int  # backtests run (any window length)
+    rounds: List[str] = field(default_factory=list)  # one summary line per round
+
+
+def rank(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Results by total return, best first (stable, like run_optimization)."""
+    return sorted(results, key=lambda x: x["return"], reverse=True)
+
+
+def _sample(space: SearchSpace, count: int, rnd: random.Random) -> List[GridPoint]:
+    """Up to ``count`` distinct valid lattice points."""
+    axes = space.axes()
+    seen = set()
+    points = []
+    # Rejection sampling; give up after enough misses (small or crowded spaces)
+    misses = 0
+    while len(points) < count and misses < 50 * count + 1000:
+        point = tuple(rnd.choice(axis) for axis in axes)
+        if point in seen or not space.valid(point):
+            misses += 1
+            continue
+        seen.add(point)
+        points.append(point)
+    return points
+
+
+def random_search(evaluator: Evaluator, space: SearchSpace, budget: int, seed: int = 0) -> SearchResult:
+    """
+    Backtest ``budget`` distinct random lattice points on the full data.
+
+    Args:
+        evaluator: Evaluator over the data
+        space: Parameter lattice
+        budget: Full-data backtests to spend
+        seed: Random seed
+    """
+    start = evaluator.cost
+    points = _sample(space, budget, random.Random(seed))
+    results = evaluator.evaluate(points)
+    return SearchResult(
+        "random",
+        rank(results),
+        evaluator.cost - start,
+        len(points),
+        [f"{len(points)} random points"],
+    )
+
+
+def successive_halving(
+    evaluator: Evaluator,
+    space: SearchSpace,
+    budget: int,
+    eta: int = 3,
+    min_fraction: float = 1 / 9,
+    seed: int = 0,
+) -> SearchResult:
+    """
+    Screen random points on a short recent window and promote the best.
+
+    Each round keeps the best 1/eta of the points and multiplies the window
+    length by eta, from ``min_fraction`` of the rows up to all of them.
+    The first round's size is the largest that keeps the total within
+    ``budget``.
+
+    Args:
+        evaluator: Evaluator over the data
+        space: Parameter lattice
+        budget: Full-data backtests to spend
+        eta: Promotion ratio and window growth per round
+        min_fraction: Share of the rows in the first (screening) window
+        seed: Random seed
+    """
+    count_rounds = 1 + int(math.log(1 / min_fraction, eta) + 1e-9)
+    fractions = [eta ** -(count_rounds - 1 - k) for k in range(count_rounds)]
+
+    # Round k runs n / eta**k points on window_rows(fractions[k]) rows
+    total_rows = len(evaluator.bt_data)
+    per_point = sum(evaluator.window_rows(f) / total_rows / eta**k for k, f in enumerate(fractions))
+    count = max(1, int(budget / per_point))
+
+    start, backtests = evaluator.cost, evaluator.backtests
+    candidates = _sample(space, count, random.Random(seed))
+    rounds = []
+    results: List[Dict[str, Any]] = []
+    for k, fraction in enumerate(fractions):
+        results = rank(evaluator.evaluate(candidates, fraction))
+        rounds.append(f"{len(candidates)} points on {evaluator.window_rows(fraction)} rows")
+        if k < len(fractions) - 1:
+            keep = max(1, len(candidates) // eta)
+            candidates = [(r["entry"], r["stop"], r["exit"], r["hold"]) for r in results[:keep]]
+    return SearchResult(
+        "halving",
+        results,
+        evaluator.cost - start,
+        evaluator.backtests - backtests,
+        rounds,
+    )
+
+
+def coarse_to_fine(
+    evaluator: Evaluator,
+    space: SearchSpace,
+    budget: int,
+    top_k: int = 5,
+) -> SearchResult:
+    """
+    Coarse sub-grid first, then finer neighbourhoods of the best points.
+
+    The first level uses every ``stride``-th lattice value per axis (plus
+    the last), with the smallest power-of-two stride whose sub-grid fits
+    in half the budget.
+    Each later level halves the stride and backtests the lattice
+    neighbours (within one stride on every axis) of the ``top_k`` best
+    points so far, until stride 1 is done or the budget runs out.
+
+    Args:
+        evaluator: Evaluator over the data
+        space: Parameter lattice
+        budget: Full-data backtests to spend
+        top_k: Points refined at each level
+    """
+    axes = space.axes()
+    start, backtests = evaluator.cost, evaluator.backtests
+
+    def point(index: Index) -> GridPoint:
+        return tuple(axis[i] for axis, i in zip(axes, index))
+
+    def sub_grid(stride: int) -> List[Index]:
+        ranges = [sorted(set(range(0, len(axis), stride)) | {len(axis) - 1}) for axis in axes]
+        return [index for index in product(*ranges) if space.valid(point(index))]
+
+    stride = 1
+    while len(sub_grid(stride)) > budget // 2 and stride < max(len(axis) for axis in axes):
+        stride *= 2
+
+    evaluated: Dict[Index, Dict[str, Any]] = {}
+    rounds = []
+
+    def run(indices: List[Index], label: str) -> None:
+        remaining = int(budget - (evaluator.cost - start))
+        todo = [i for i in dict.fromkeys(indices) if i not in evaluated][: max(0, remaining)]
+        if not todo:
+            return
+        for index, result in zip(todo, evaluator.evaluate([point(i) for i in todo])):
+            evaluated[index] = result
+        rounds.append(f"{label}: {len(todo)} points")
+
+    run(sub_grid(stride), f"stride {stride}")
+    while stride > 1 and evaluator.cost - start < budget:
+        stride //= 2
+        best = sorted(evaluated, key=lambda i: evaluated[i]["return"], reverse=True)[:top_k]
+        neighbours = []
+        for center in best:
+            for offsets in product((-stride, 0, stride), repeat=len(axes)):
+                index = tuple(c + o for c, o in zip(center, offsets))
+                if all(0 <= i < len(axis) for i, axis in zip(index, axes)) and space.valid(point(index)):
+                    neighbours.append(index)
+        run(neighbours, f"stride {stride}")
+
+    return SearchResult(
+        "refine",
+        rank(list(evaluated.values())),
+        evaluator.cost - start,
+        evaluator.backtests - backtests,
+        rounds,
+    )
+
+
+def run_search(
+    strategy: str,
+    evaluator: Evaluator,
+    budget: int,
+    space: SearchSpace = DEFAULT_SPACE,
+    seed: int = 0,
+) -> SearchResult:
+    """
+    Run a search strategy by name.
+
+    Args:
+        strategy: 'random', 'halving' or 'refine'
+        evaluator: Evaluator over the data
+        budget: Full-data backtests to spend
+        space: Parameter lattice
+        seed: Random seed (random and halving)
+    """
+    if strategy == "random":
+        return random_search(evaluator, space, budget, seed=seed)
+    if strategy == "halving":
+        return successive_halving(evaluator, space, budget, seed=seed)
+    if strategy == "refine":
+        return coarse_to_fine(evaluator, space, budget)
+    raise ValueError(f"Unknown search strategy '{strategy}'")
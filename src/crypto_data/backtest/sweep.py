@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Batched parameter sweeps over one basis series.
+
+A grid search runs the same strategy thousands of times with different
+(entry, stop, exit, hold) parameters. The threshold-independent columns
+(BacktestFrame) are computed once. Signal codes for every distinct
+threshold triple come from one broadcast pass, and the "next entry / next
+exit after row i" lookups become (triples x rows) tables. All combinations
+are then simulated in lock-step: each pass closes one trade for every
+combination that still has one, using array operations across the
+combinations.
+
+P&L, equity, drawdown and win/loss statistics use the same arithmetic, in
+the same order, as Backtester.run_backtest(), so every result equals that
+of a full backtest with the same parameters. The Sharpe ratio uses
+statistics.mean/stdev like the engine, memoized over identical return
+sequences. Requires numpy.
+
+Usage:
+    frame = BacktestFrame.build(bt_data)
+    params = parameter_grid(entry_values, stop_values, exit_values, holding_values)
+    results = run_sweep(frame, params, account_size=200000)
+    best = results[rank_results(results)[0]]
+"""
+
+import statistics
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from crypto_data.backtest.vectorized import DAY_US, BacktestFrame, _holding_exit
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("numpy not installed. Install with: pip install numpy") from e
+
+# One sweep point; the fields of run_optimization()'s parameter grid
+PARAM_DTYPE = np.dtype([("entry", "f8"), ("stop", "f8"), ("exit", "f8"), ("hold", "i8")])
+
+# Result row: parameters plus the statistics run_optimization() ranks on
+RESULT_DTYPE = np.dtype(
+    PARAM_DTYPE.descr
+    + [
+        ("return", "f8"),
+        ("sharpe", "f8"),
+        ("max_dd", "f8"),
+        ("trades", "i8"),
+        ("win_rate", "f8"),
+        ("wins", "i8"),
+        ("losses", "i8"),
+        ("avg_win", "f8"),
+        ("avg_loss", "f8"),
+    ]
+)
+
+
+def parameter_grid(
+    entry_values: Iterable[float],
+    stop_values: Iterable[float],
+    exit_values: Iterable[float],
+    holding_values: Iterable[int],
+) -> "np.ndarray":
+    """
+    grid.grid_points() as a structured array with PARAM_DTYPE.
+
+    Points with entry <= stop or exit <= entry are skipped, as in
+    run_optimization().
+    """
+    # grid imports this module, so import it here
+    from crypto_data.backtest.grid import grid_points
+
+    return np.array(grid_points(entry_values, stop_values, exit_values, holding_values), dtype=PARAM_DTYPE)
+
+
+def rank_results(results: "np.ndarray") -> "np.ndarray":
+    """
+    Indices of ``results`` by total return, best first.
+
+    The sort is stable, so ties keep grid order exactly like
+    ``list.sort(key=..., reverse=True)`` on the per-combination results.
+    """
+    return np.argsort(-results["return"], kind="stable")
+
+
+def _event_tables(frame: BacktestFrame, triples: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Next-event tables for each (entry, stop, exit) triple.
+
+    Returns:
+        (next_entry, next_exit), each (triples, rows + 1) int64, where
+        table[t, i] is the first row >= i with that event under triple t
+        (rows if none). The extra column makes table[t, e + 1] valid.
+    """
+    n = len(frame)
+    entry = triples[:, 0:1]
+    stop = triples[:, 1:2]
+    exit_t = triples[:, 2:3]
+    monthly = frame.monthly_basis[None, :]
+
+    # signal_codes(): STOP_LOSS > FULL_EXIT > PARTIAL_EXIT > STRONG_ENTRY
+    stop_loss = (frame.basis_percent < 0)[None, :] | (monthly < stop)
+    full_exit = monthly > exit_t
+    is_exit = stop_loss | full_exit
+    is_entry = (monthly > entry) & ~(monthly > (entry + exit_t) / 2) & ~is_exit
+
+    rows = np.arange(n + 1)
+    tables = []
+    for mask in (is_entry, is_exit):
+        index = np.where(mask, rows[:n], n)
+        table = np.empty((len(triples), n + 1), dtype=np.int64)
+        table[:, :n] = np.minimum.accumulate(index[:, ::-1], axis=1)[:, ::-1]
+        table[:, n] = n
+        tables.append(table)
+    return tables[0], tables[1]
+
+
+def _next_roll(frame: BacktestFrame) -> "np.ndarray":
+    """Row at which a trade entered on row i is force-closed by a roll (rows if never)."""
+    n = len(frame)
+    rolls = np.append(frame.rolls, n)
+    following = rolls[rolls.searchsorted(np.arange(n), side="right")]
+    return np.where(frame.contract >= 0, following, n)
+
+
+def _holding_exits(frame: BacktestFrame, holding_days: int) -> "np.ndarray":
+    """First row after each row held at least ``holding_days`` (rows if never)."""
+    n = len(frame)
+    holding_us = int(holding_days) * DAY_US
+    if frame.is_sorted:
+        found = frame.timestamps.searchsorted(frame.timestamps + holding_us)
+        return np.maximum(np.arange(1, n + 1), found)
+    return np.array([_holding_exit(frame, i, holding_us) for i in range(n)], dtype=np.int64)
+
+
+def _sharpe_ratios(combos: "np.ndarray", returns: "np.ndarray", count: int) -> "np.ndarray":
+    """
+    Sharpe ratio per combination from its per-trade returns.
+
+    Args:
+        combos: Combination index of each return, in trade order per combination
+        returns: Trade returns (equity change / previous equity)
+        count: Number of combinations
+    """
+    sharpe = np.zeros(count)
+    order = np.argsort(combos, kind="stable")
+    sizes = np.bincount(combos, minlength=count)
+    memo: Dict[bytes, float] = {}
+    start = 0
+    for combo, size in enumerate(sizes.tolist()):
+        if size > 1:
+            series = returns[order[start : start + size]]
+            key = series.tobytes()
+            if key not in memo:
+                values = series.tolist()
+                avg_return = statistics.mean(values)
+                std_return = statistics.stdev(values)
+                memo[key] = (avg_return / std_return) * (365**0.5) if std_return > 0 else 0.0
+            sharpe[combo] = memo[key]
+        start += size
+    return sharpe
+
+
+def run_sweep(
+    frame: BacktestFrame,
+    params: "np.ndarray",
+    account_size: float = 200000,
+    funding_cost_annual: float = 0.05,
+) -> "np.ndarray":
+    """
+    Backtest every parameter point in ``params`` over ``frame``.
+
+    Args:
+        frame: Precomputed series
+        params: Structured array with PARAM_DTYPE fields (parameter_grid())
+        account_size: Initial capital
+        funding_cost_annual: Annual funding cost rate
+
+    Returns:
+        Structured array with RESULT_DTYPE, one row per point, in input order
+    """
+    n = len(frame)
+    m = len(params)
+    results = np.zeros(m, dtype=RESULT_DTYPE)
+    for name in PARAM_DTYPE.names:
+        results[name] = params[name]
+    if m == 0 or n == 0:
+        return results
+
+    triples, triple_of = np.unique(
+        np.stack([params["entry"], params["stop"], params["exit"]], axis=1),
+        axis=0,
+        return_inverse=True,
+    )
+    triple_of = triple_of.reshape(-1)
+    holds, hold_of = np.unique(params["hold"], return_inverse=True)
+    hold_of = hold_of.reshape(-1)
+
+    next_entry, next_exit = _event_tables(frame, triples)
+    next_roll = _next_roll(frame)
+    holding_exit = np.stack([_holding_exits(frame, hold) for hold in holds.tolist()])
+
+    spot = frame.spot
+    futures = frame.futures
+    timestamps = frame.timestamps
+    funding_rate = funding_cost_annual / 365
+
+    equity = np.full(m, float(account_size))
+    peak = equity.copy()
+    max_dd = np.zeros(m)
+    trades = np.zeros(m, dtype=np.int64)
+    wins = np.zeros(m, dtype=np.int64)
+    losses = np.zeros(m, dtype=np.int64)
+    win_sum = np.zeros(m)
+    loss_sum = np.zeros(m)
+    return_combos = [np.empty(0, dtype=np.int64)]
+    return_values = [np.empty(0)]
+
+    # Each pass closes the open trade of every active combination
+    position = next_entry[triple_of, 0]
+    active = np.flatnonzero(position < n)
+    while len(active):
+        entry = position[active]
+        triple = triple_of[active]
+        exit_index = np.minimum(
+            np.minimum(next_roll[entry], next_exit[triple, entry + 1]),
+            holding_exit[hold_of[active], entry],
+        )
+        forced = exit_index >= n
+        exit_row = np.where(forced, n - 1, exit_index)
+
+        # Backtester.close_position()
+        entry_spot = spot[entry]
+        held_days = (timestamps[exit_row] - timestamps[entry]) // DAY_US
+        pnl = (spot[exit_row] - entry_spot) + (futures[entry] - futures[exit_row]) - funding_rate * held_days * entry_spot
+        return_pct = pnl / entry_spot
+
+        trades[active] += 1
+        won = pnl > 0
+        lost = pnl < 0
+        wins[active[won]] += 1
+        losses[active[lost]] += 1
+        win_sum[active[won]] += return_pct[won]
+        loss_sum[active[lost]] += return_pct[lost]
+
+        # Forced closes end the run without touching equity
+        closed = ~forced
+        combos = active[closed]
+        previous = equity[combos]
+        current = previous + pnl[closed]
+        equity[combos] = current
+        return_combos.append(combos)
+        return_values.append((current - previous) / previous)
+        peak[combos] = np.maximum(peak[combos], current)
+        drawdown = (peak[combos] - current) / peak[combos]
+        max_dd[combos] = np.maximum(max_dd[combos], drawdown)
+
+        position[combos] = next_entry[triple[closed], exit_index[closed]]
+        active = combos[position[combos] < n]
+
+    traded = trades > 0
+    results["trades"] = trades
+    results["wins"] = wins
+    results["losses"] = losses
+    results["return"] = np.where(traded, (equity - account_size) / account_size, 0.0)
+    results["max_dd"] = max_dd
+    results["win_rate"] = np.where(traded, wins / np.maximum(trades, 1), 0.0)
+    results["avg_win"] = np.where(wins > 0, win_sum / np.maximum(wins, 1), 0.0)
+    results["avg_loss"] = np.where(losses > 0, loss_sum / np.maximum(losses, 1), 0.0)
+    results["sharpe"] = _sharpe_ratios(np.concatenate(return_combos), np.concatenate(return_values), m)
+    return results
+
+
+def result_dicts(results: "np.ndarray", order: Optional[Sequence[int]] = None) -> List[Dict[str, Any]]:
+    """Result rows as dicts (the shape run_optimization() used to return)."""
+    rows = results if order is None else results[order]
+    return [dict(zip(rows.dtype.names, row)) for row in rows.tolist()]
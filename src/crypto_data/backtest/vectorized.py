@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+NumPy engine for the basis trade backtest.
+
+Backtester.run_backtest() walks every row, generating a Signal per row
+with datetime arithmetic. Here the threshold-independent columns (basis
+percent, monthly basis, days to expiry, contract rolls) are computed once
+for the whole series as arrays (BacktestFrame), the signals become one
+vectorized pass of integer codes (signal_codes), and the stateful
+entry/exit logic only visits candidate event indices: entry signals,
+STOP_LOSS/FULL_EXIT signals, contract rolls and holding-period expiries.
+
+The arithmetic matches generate_signal() and run_backtest() operation for
+operation, so trades and statistics are identical to the reference
+engine. Requires numpy (pip install -e ".[fast]").
+
+Usage:
+    frame = BacktestFrame.build(backtester.load_historical_data(path))
+    result = run_frame(backtester, frame, holding_days=30)
+"""
+
+import copy
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from crypto_data.backtest.engine import BacktestResult, Signal, _TradeTally
+
+try:
+    import numpy as np
+except ImportError as e:
+    raise ImportError("numpy not installed. Install with: pip install numpy") from e
+
+# Signal codes, ordered so that code >= FULL_EXIT means "exit signal"
+NO_ENTRY = 0
+STRONG_ENTRY = 1
+PARTIAL_EXIT = 2
+FULL_EXIT = 3
+STOP_LOSS = 4
+
+SIGNALS = {
+    NO_ENTRY: Signal.NO_ENTRY,
+    STRONG_ENTRY: Signal.STRONG_ENTRY,
+    PARTIAL_EXIT: Signal.PARTIAL_EXIT,
+    FULL_EXIT: Signal.FULL_EXIT,
+    STOP_LOSS: Signal.STOP_LOSS,
+}
+
+DAY_US = 86_400_000_000
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class BacktestFrame:
+    """
+    Threshold-independent columns of a basis series.
+
+    Build once and reuse for every run over the same data (parameter
+    sweeps, repeated backtests).
+    """
+
+    def __init__(
+        self,
+        timestamps: "np.ndarray",
+        spot: "np.ndarray",
+        futures: "np.ndarray",
+        days_to_expiry: "np.ndarray",
+        contract: "np.ndarray",
+        rows: Optional[Sequence[Dict[str, Any]]] = None,
+        origin: Optional[datetime] = None,
+    ):
+        """
+        Args:
+            timestamps: int64 microseconds, relative to ``origin``
+            spot: float64 spot prices
+            futures: float64 futures prices
+            days_to_expiry: int64 whole days to expiry (timedelta.days)
+            contract: int32 contract ids, -1 where the row has no contract
+            rows: Source rows; trades then carry the rows' own values
+            origin: Datetime of timestamp 0 (for frames without rows)
+        """
+        self.timestamps = timestamps
+        self.spot = spot
+        self.futures = futures
+        self.days_to_expiry = days_to_expiry
+        self.contract = contract
+        self.rows = rows
+        self.origin = origin
+
+        # generate_signal(): days_to_expiry <= 0 counts as 1
+        self.basis_percent = (futures - spot) / spot
+        self.monthly_basis = self.basis_percent * (30 / np.where(days_to_expiry <= 0, 1, days_to_expiry))
+        self.rolls = _roll_indices(contract)
+        self.is_sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Dict[str, Any]]) -> "BacktestFrame":
+        """
+        Build a frame from row dicts (load_historical_data() or accumulate()).
+
+        Args:
+            rows: Rows with date, spot_price, futures_price, futures_expiry
+                  and optionally contract
+        """
+        n = len(rows)
+        # Offsets from the first date: timedelta floors like .days does,
+        # and naive or tz-aware dates both work
+        origin = rows[0]["date"] if n else None
+        timestamps = np.fromiter(
+            ((row["date"] - origin) // _MICROSECOND for row in rows), dtype=np.int64, count=n
+        )
+        expiry_ts = np.fromiter(
+            ((row["futures_expiry"] - origin) // _MICROSECOND for row in rows), dtype=np.int64, count=n
+        )
+
+        contract_ids: Dict[str, int] = {}
+        contract = np.fromiter(
+            (
+                contract_ids.setdefault(name, len(contract_ids)) if name else -1
+                for name in (row.get("contract") for row in rows)
+            ),
+            dtype=np.int32,
+            count=n,
+        )
+        return cls(
+            timestamps,
+            np.fromiter((row["spot_price"] for row in rows), dtype=np.float64, count=n),
+            np.fromiter((row["futures_price"] for row in rows), dtype=np.float64, count=n),
+            (expiry_ts - timestamps) // DAY_US,
+            contract,
+            rows=rows,
+            origin=origin,
+        )
+
+    @classmethod
+    def from_columns(cls, basis) -> "BacktestFrame":
+        """
+        Build a frame from a BasisColumns dataset without creating row dicts.
+
+        Args:
+            basis: crypto_data.data.basis_store.BasisColumns (copied, so it
+                   can be closed afterwards)
+        """
+        timestamps = np.frombuffer(basis["date"], dtype=np.int64).copy()
+        expiry_ts = np.frombuffer(basis["futures_expiry"], dtype=np.int64)
+        contract = np.frombuffer(basis["contract"], dtype=np.int32).copy()
+        # Unnamed contracts ("") behave like rows without a contract
+        for cid, name in enumerate(basis.contracts):
+            if not name:
+                contract[contract == cid] = -1
+        return cls(
+            timestamps,
+            np.frombuffer(basis["spot_price"], dtype=np.float64).copy(),
+            np.frombuffer(basis["futures_price"], dtype=np.float64).copy(),
+            (expiry_ts - timestamps) // DAY_US,
+            contract,
+            origin=datetime(1970, 1, 1, tzinfo=basis.tz),
+        )
+
+    @classmethod
+    def build(cls, data: Any) -> "BacktestFrame":
+        """Frame from row dicts or a BasisColumns dataset."""
+        if hasattr(data, "contracts") and hasattr(data, "columns"):
+            return cls.from_columns(data)
+        return cls.from_rows(data)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def window(self, start: int, stop: int) -> "BacktestFrame":
+        """
+        Rows [start, stop) as a frame of views into this one.
+
+        Nothing is recomputed: the derived columns are sliced, and the roll
+        indices are the ones inside the window (a roll on the window's
+        first row cannot close a trade, so it is dropped). Results equal
+        those of a frame built from the same rows.
+        """
+        window = copy.copy(self)
+        for name in ("timestamps", "spot", "futures", "days_to_expiry", "contract", "basis_percent", "monthly_basis"):
+            setattr(window, name, getattr(self, name)[start:stop])
+        if self.rows is not None:
+            window.rows = self.rows[start:stop]
+        first = self.rolls.searchsorted(start, side="right")
+        last = self.rolls.searchsorted(stop)
+        window.rolls = self.rolls[first:last] - start
+        if not self.is_sorted:
+            timestamps = window.timestamps
+            window.is_sorted = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        return window
+
+    def point(self, i: int) -> Tuple[datetime, float, float]:
+        """(date, spot_price, futures_price) of row ``i``."""
+        if self.rows is not None:
+            row = self.rows[i]
+            return row["date"], row["spot_price"], row["futures_price"]
+        date = self.origin + timedelta(microseconds=int(self.timestamps[i]))
+        return date, self.spot[i].item(), self.futures[i].item()
+
+
+def _roll_indices(contract: "np.ndarray") -> "np.ndarray":
+    """
+    Rows where an open trade would be force-closed by a contract roll.
+
+    run_backtest() compares the current row's contract with the trade's
+    (entry row's) contract, ignoring rows without one. Among rows that
+    have a contract, the first row after the entry with a different
+    contract is the next change point of that subsequence.
+    """
+    named = np.flatnonzero(contract >= 0)
+    ids = contract[named]
+    return named[np.flatnonzero(ids[1:] != ids[:-1]) + 1]
+
+
+def signal_codes(
+    frame: BacktestFrame,
+    entry_threshold: float,
+    stop_loss_threshold: float,
+    exit_threshold: float,
+) -> "np.ndarray":
+    """
+    generate_signal() for every row, as int8 signal codes.
+
+    Conditions are applied lowest priority first, so later assignments win
+    exactly as the earlier returns do in generate_signal().
+    """
+    monthly = frame.monthly_basis
+    codes = np.zeros(len(frame), dtype=np.int8)
+    codes[monthly > entry_threshold] = STRONG_ENTRY
+    codes[monthly > (entry_threshold + exit_threshold) / 2] = PARTIAL_EXIT
+    codes[monthly > exit_threshold] = FULL_EXIT
+    codes[(frame.basis_percent < 0) | (monthly < stop_loss_threshold)] = STOP_LOSS
+    return codes
+
+
+def _holding_exit(frame: BacktestFrame, entry: int, holding_us: int) -> int:
+    """First row after ``entry`` held at least the holding period (or len(frame))."""
+    timestamps = frame.timestamps
+    target = timestamps[entry] + holding_us
+    if frame.is_sorted:
+        return max(entry + 1, timestamps.searchsorted(target))
+    later = np.flatnonzero(timestamps[entry + 1 :] >= target)
+    return entry + 1 + int(later[0]) if len(later) else len(frame)
+
+
+def _events_after(events: "np.ndarray", n: int) -> "np.ndarray":
+    """
+    Event indices padded with ``n`` (meaning "none"), for lookups of the
+    first event after row i as ``padded[padded_search(i, side='right')]``.
+    """
+    return np.append(events, n)
+
+
+def run_frame(
+    backtester, frame: BacktestFrame, holding_days: int = 30, trade_log: str = "objects"
+) -> BacktestResult:
+    """
+    Backtest ``frame`` with the thresholds and costs of ``backtester``.
+
+    Args:
+        backtester: Backtester (thresholds, account size, funding cost)
+        frame: Precomputed series
+        holding_days: Maximum holding period
+        trade_log: "objects", "ledger" or "none", as for run_backtest()
+
+    Returns:
+        BacktestResult identical to backtester.run_backtest() on the same rows
+    """
+    n = len(frame)
+    codes = signal_codes(
+        frame,
+        backtester.entry_threshold,
+        backtester.stop_loss_threshold,
+        backtester.exit_threshold,
+    )
+    # Event indices, padded with n so a lookup past the last event gives n
+    entries = _events_after(np.flatnonzero(codes == STRONG_ENTRY), n)
+    exits = _events_after(np.flatnonzero(codes >= FULL_EXIT), n)
+    rolls = _events_after(frame.rolls, n)
+    contract = frame.contract
+    # (date - entry).days >= holding_days  <=>  elapsed >= ceil(holding_days) days
+    holding_us = math.ceil(holding_days) * DAY_US
+
+    result = BacktestResult(initial_capital=backtester.account_size)
+    tally = _TradeTally()
+    record = backtester._trade_recorder(result, trade_log)
+    equity_curve = [result.initial_capital]
+    daily_returns = []
+    result.start_date = frame.point(0)[0]
+    result.end_date = frame.point(n - 1)[0]
+
+    entry = int(entries[0])
+    while entry < n:
+        entry_date, entry_spot, entry_futures = frame.point(entry)
+
+        roll = rolls[rolls.searchsorted(entry, side="right")] if contract[entry] >= 0 else n
+        exit_signal = exits[exits.searchsorted(entry, side="right")]
+        exit_index = int(min(roll, exit_signal, _holding_exit(frame, entry, holding_us)))
+
+        if exit_index >= n:
+            exit_date, exit_spot, exit_futures = frame.point(n - 1)
+            exit_basis = None
+            status = "forced_close"
+        else:
+            exit_date, exit_spot, exit_futures = frame.point(exit_index)
+            exit_basis = exit_futures - exit_spot
+            if exit_index == roll:
+                status = "contract_roll"
+            elif codes[exit_index] == STOP_LOSS:
+                status = "stopped_out"
+            else:
+                status = "closed"
+
+        pnl = backtester._trade_pnl(entry_date, entry_spot, entry_futures, exit_date, exit_spot, exit_futures)
+        tally.add(pnl, entry_spot)
+        if record:
+            record(
+                entry_date, entry_spot, entry_futures, entry_futures - entry_spot,
+                exit_date, exit_spot, exit_futures, exit_basis, pnl, status,
+            )
+        if exit_index >= n:
+            break
+
+        equity_curve.append(equity_curve[-1] + pnl)
+        daily_returns.append((equity_curve[-1] - equity_curve[-2]) / equity_curve[-2])
+        # A new trade may open on the exit row
+        if codes[exit_index] == STRONG_ENTRY:
+            entry = exit_index
+        else:
+            entry = int(entries[entries.searchsorted(exit_index)])
+
+    backtester._compute_statistics(result, equity_curve, daily_returns, tally)
+    return result
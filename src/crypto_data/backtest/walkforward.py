@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Walk-forward optimization of signal thresholds.
+
+An in-sample grid search fits the thresholds to the same data it reports
+on. Walk-forward rolls a train window and the test window that follows it
+across the series: the grid is searched on each train window, the best
+point is backtested on the next test window, and the test windows are
+stitched into one out-of-sample result.
+
+The series is prepared once. With numpy, one BacktestFrame holds the
+per-row basis, monthly basis, days to expiry and contract rolls, and every
+train and test window is a view of it (BacktestFrame.window), so each
+window costs a sweep over its own rows only. Without numpy, windows are
+row slices backtested with one Backtester per point.
+
+Usage:
+    points = grid_points(entry_values, stop_values, exit_values, holding_values)
+    wf = walk_forward(bt_data, points, account_size, funding_cost_annual,
+                      train_days=365, test_days=90)
+    print(wf.oos.total_return)
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from crypto_data.backtest.engine import Backtester, BacktestResult
+from crypto_data.backtest.grid import GridPoint, backtest_points
+
+try:
+    from crypto_data.backtest.sweep import PARAM_DTYPE, result_dicts, run_sweep
+    from crypto_data.backtest.vectorized import BacktestFrame, run_frame
+except ImportError:  # numpy not installed: row slices and one Backtester per point
+    run_sweep = None
+
+
+@dataclass
+class WalkForwardWindow:
+    """One train/test step."""
+
+    train_start: datetime
+    test_start: datetime
+    test_end: datetime  # date of the last test row
+    train_rows: int
+    test_rows: int
+    best: Optional[Dict[str, Any]]  # best train result (params + in-sample stats), None if nothing traded
+    test: Optional[BacktestResult]  # out-of-sample backtest with the best params
+
+
+@dataclass
+class WalkForwardResult:
+    """Walk-forward windows and their stitched out-of-sample result."""
+
+    windows: List[WalkForwardWindow]
+    oos: BacktestResult
+
+
+def window_bounds(
+    dates: Sequence[datetime],
+    train_days: int,
+    test_days: int,
+    step_days: Optional[int] = None,
+) -> List[Tuple[int, int, int]]:
+    """
+    Row bounds of rolling train/test windows over sorted dates.
+
+    The first train window starts on the first date; each step moves both
+    windows forward by ``step_days`` (default ``test_days``, so the test
+    windows tile the series). The last test window may be shorter, and
+    windows whose train or test span falls in a gap in the data (no rows)
+    are skipped.
+
+    Args:
+        dates: Row dates, ascending
+        train_days: Train window length in days
+        test_days: Test window length in days
+        step_days: Days between window starts, at least ``test_days``
+                   (overlapping test windows would trade the same rows
+                   twice when stitched)
+
+    Returns:
+        (train_start, test_start, test_stop) row indices per window; the
+        train rows are [train_start, test_start), the test rows
+        [test_start, test_stop)
+    """
+    if train_days <= 0 or test_days <= 0 or (step_days is not None and step_days <= 0):
+        raise ValueError("Window lengths and step must be positive")
+    if step_days is not None and step_days < test_days:
+        raise ValueError(f"step_days ({step_days}) must be at least test_days ({test_days})")
+    step = timedelta(days=step_days or test_days)
+    train = timedelta(days=train_days)
+    test = timedelta(days=test_days)
+
+    bounds = []
+    n = len(dates)
+    start = dates[0] if n else None
+    while n:
+        train_start = bisect_left(dates, start)
+        test_start = bisect_left(dates, start + train, lo=train_start)
+        if test_start >= n:
+            break
+        test_stop = bisect_left(dates, start + train + test, lo=test_start)
+        if train_start < test_start < test_stop:
+            bounds.append((train_start, test_start, test_stop))
+        start += step
+    return bounds
+
+
+def best_result(results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Highest-return result with trades (first in grid order on ties), as run_optimization() ranks."""
+    valid = [r for r in results if r["trades"] > 0]
+    return max(valid, key=lambda r: r["return"]) if valid else None
+
+
+def stitch_results(results: Sequence[BacktestResult], account_size: float) -> BacktestResult:
+    """
+    Chain consecutive backtests into one result.
+
+    Trades are replayed in order on a single equity curve. As in
+    Backtester.run_backtest(), a trade force-closed at the end of its
+    backtest is counted as a trade but does not change equity.
+
+    Args:
+        results: Backtests over consecutive periods
+        account_size: Initial capital
+
+    Returns:
+        BacktestResult over all periods
+    """
+    stitched = BacktestResult(initial_capital=account_size)
+    equity_curve = [float(account_size)]
+    daily_returns = []
+    for result in results:
+        for trade in result.trades:
+            stitched.trades.append(trade)
+            if trade.status != "forced_close":
+                equity_curve.append(equity_curve[-1] + trade.realized_pnl)
+                daily_returns.append((equity_curve[-1] - equity_curve[-2]) / equity_curve[-2])
+    if results:
+        stitched.start_date = results[0].start_date
+        stitched.end_date = results[-1].end_date
+    Backtester._compute_statistics(stitched, equity_curve, daily_returns)
+    return stitched
+
+
+def _backtester(point: GridPoint, account_size: float, funding_cost_annual: float) -> Backtester:
+    entry, stop, exit_t, _ = point
+    config = type("Config", (), {
+        "account_size": account_size,
+        "funding_cost_annual": funding_cost_annual,
+        "entry_threshold": entry,
+        "stop_loss_threshold": stop,
+        "exit_threshold": exit_t,
+    })()
+    return Backtester(config)
+
+
+def walk_forward(
+    bt_data: List[Dict],
+    points: Sequence[GridPoint],
+    account_size: float,
+    funding_cost_annual: float,
+    train_days: int = 365,
+    test_days: int = 90,
+    step_days: Optional[int] = None,
+    progress: Optional[Callable[[WalkForwardWindow], None]] = None,
+) -> WalkForwardResult:
+    """
+    Optimize on each train window and backtest the best point out of sample.
+
+    Args:
+        bt_data: Rows from Backtester.load_historical_data(), sorted by date
+        points: Grid points from grid_points()
+        account_size: Initial capital
+        funding_cost_annual: Annual funding cost rate
+        train_days: Train window length in days
+        test_days: Test window length in days
+        step_days: Days between windows (default: test_days)
+        progress: Called with each finished window
+
+    Returns:
+        WalkForwardResult with per-window results and the stitched
+        out-of-sample backtest
+    """
+    dates = [row["date"] for row in bt_data]
+    if any(later < earlier for earlier, later in zip(dates, dates[1:])):
+        raise ValueError("Walk-forward needs rows sorted by date")
+    bounds = window_bounds(dates, train_days, test_days, step_days)
+
+    if run_sweep is not None:
+        import numpy as np
+
+        frame = BacktestFrame.build(bt_data)
+        params = np.array(points, dtype=PARAM_DTYPE)
+
+        def train(start: int, stop: int) -> List[Dict[str, Any]]:
+            return result_dicts(run_sweep(frame.window(start, stop), params, account_size, funding_cost_annual))
+
+        def test(point: GridPoint, start: int, stop: int) -> BacktestResult:
+            backtester = _backtester(point, account_size, funding_cost_annual)
+            return run_frame(backtester, frame.window(start, stop), point[3])
+    else:
+        def train(start: int, stop: int) -> List[Dict[str, Any]]:
+            return backtest_points(bt_data[start:stop], points, account_size, funding_cost_annual)
+
+        def test(point: GridPoint, start: int, stop: int) -> BacktestResult:
+            backtester = _backtester(point, account_size, funding_cost_annual)
+            return backtester.run_backtest(bt_data[start:stop], holding_days=point[3])
+
+    windows = []
+    for train_start, test_start, test_stop in bounds:
+        best = best_result(train(train_start, test_start)) if points else None
+        window = WalkForwardWindow(
+            train_start=dates[train_start],
+            test_start=dates[test_start],
+            test_end=dates[test_stop - 1],
+            train_rows=test_start - train_start,
+            test_rows=test_stop - test_start,
+            best=best,
+            test=None,
+        )
+        if best is not None:
+            point = (best["entry"], best["stop"], best["exit"], best["hold"])
+            window.test = test(point, test_start, test_stop)
+        windows.append(window)
+        if progress:
+            progress(window)
+
+    oos = stitch_results([w.test for w in windows if w.test is not None], account_size)
+    if windows:
+        oos.start_date = windows[0].test_start
+        oos.end_date = windows[-1].test_end
+    return WalkForwardResult(windows, oos)
@@ -2,13 +2,22 @@
 """Accumulate and export futures + spot price data over a date range."""
 
 import csv
+import io
+import os
 import time
-import requests
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Tuple, Union
 
 from crypto_data.data.ibkr import IBKRHistoricalFetcher
+from crypto_data.data.ibkr_pacing import HistoricalPlan, HistoricalRequest, as_plan, combine_plans, split_bars
 from crypto_data.data.databento import MONTH_TO_CME_CODE
+from crypto_data.data.basis import merge_basis
+from crypto_data.data.basis_store import BasisColumns, is_basis_file
+from crypto_data.data.klines import KlineClient
+from crypto_data.data.registry import DatasetRegistry, get_registry
+from crypto_data.data.spot_cache import SpotCache, SpotKey
 from crypto_data.utils.expiry import (
     get_last_friday_of_month,
     get_front_month_expiry_str,
@@ -25,6 +34,12 @@ def format_contract_name(symbol: str, expiry_yyyymm: str) -> str:
     return f"{symbol}{MONTH_TO_CME_CODE[month]}{year_digit}"
 
 
+# Bytes read per backward step when seeking the last row of a CSV
+TAIL_BLOCK_SIZE = 4096
+
+# Days fetched and merged per chunk by accumulate_stream()
+DEFAULT_CHUNK_DAYS = 30
+
 CSV_FIELDNAMES = [
     "date",
     "contract",
@@ -40,19 +55,86 @@ CSV_FIELDNAMES = [
 ]
 
 
+def read_last_csv_row(path: str, block_size: int = TAIL_BLOCK_SIZE) -> Optional[Dict[str, str]]:
+    """
+    Read the last data row of a CSV file without parsing the rest of it.
+
+    The header is read from the start of the file and the last row by
+    seeking to the end and reading backwards in ``block_size`` chunks, so
+    the cost does not grow with the file length.
+
+    Args:
+        path: CSV file with a header row
+        block_size: Bytes read per backward step
+
+    Returns:
+        Dict of header -> value for the last row, or None if the file has
+        no data rows
+    """
+    with open(path, "rb") as f:
+        header = f.readline()
+        data_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > data_start:
+            step = min(block_size, pos - data_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            if b"\n" in tail.rstrip(b"\r\n"):
+                break
+
+    last_line = tail.rstrip(b"\r\n").rsplit(b"\n", 1)[-1]
+    if not last_line.strip():
+        return None
+    fields = next(csv.reader([header.decode().strip("\r\n")]))
+    values = next(csv.reader([last_line.decode().strip("\r")]))
+    return dict(zip(fields, values))
+
+
+def date_chunks(start_date: datetime, end_date: datetime, chunk_days: int) -> List[Tuple[datetime, datetime]]:
+    """
+    Split [start_date, end_date] into consecutive windows of ``chunk_days`` days.
+
+    Returns:
+        List of inclusive (chunk_start, chunk_end) pairs in order
+    """
+    if chunk_days < 1:
+        raise ValueError(f"chunk_days must be >= 1, got {chunk_days}")
+    chunks = []
+    chunk_start = start_date
+    while chunk_start.date() <= end_date.date():
+        chunk_end = min(chunk_start + timedelta(days=chunk_days - 1), end_date)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = datetime.combine(chunk_end.date() + timedelta(days=1), datetime.min.time())
+    return chunks
+
+
 class FuturesAccumulator(LoggingMixin):
     """Accumulate futures and spot price data from IBKR + Binance over a date range."""
 
     BINANCE_SPOT_API = "https://api.binance.com/api/v3"
 
-    def __init__(self, fetcher: IBKRHistoricalFetcher):
+    def __init__(
+        self,
+        fetcher: IBKRHistoricalFetcher,
+        registry: Optional[DatasetRegistry] = None,
+        spot_cache: Optional[SpotCache] = None,
+    ):
         self.fetcher = fetcher
+        # Loaded Databento files are shared through the registry, and one
+        # fetcher is kept per data directory across accumulate() calls
+        self.registry = registry if registry is not None else get_registry()
+        self._futures_fetchers: Dict[str, Any] = {}
+        # Optional on-disk spot history; None always downloads the full range
+        self.spot_cache = spot_cache
+        self._spot_klines: Optional[KlineClient] = None
 
     @classmethod
-    def from_config(cls, config: Dict[str, Any]) -> "FuturesAccumulator":
+    def from_config(cls, config: Dict[str, Any], spot_cache: Optional[SpotCache] = None) -> "FuturesAccumulator":
         """Create FuturesAccumulator from IBKR config dict."""
         fetcher = IBKRHistoricalFetcher.from_config(config)
-        return cls(fetcher)
+        return cls(fetcher, spot_cache=spot_cache)
 
     def _fetch_binance_spot_history(
         self,
@@ -75,37 +157,19 @@ class FuturesAccumulator(LoggingMixin):
         """
         start_ms = int(start_date.timestamp() * 1000)
         end_ms = int(end_date.timestamp() * 1000)
-        result = []
-        current_start = start_ms
+
+        if self._spot_klines is None:
+            self._spot_klines = KlineClient(self.BINANCE_SPOT_API)
 
         try:
-            while current_start < end_ms:
-                url = f"{self.BINANCE_SPOT_API}/klines"
-                params = {
-                    "symbol": spot_symbol,
-                    "interval": interval,
-                    "startTime": current_start,
-                    "endTime": end_ms,
-                    "limit": 1000,
+            klines = self._spot_klines.fetch(spot_symbol, interval, start_ms, end_ms, limit=1000)
+            result = [
+                {
+                    "date": datetime.fromtimestamp(k[0] / 1000),
+                    "spot_price": float(k[4]),  # close price
                 }
-                response = requests.get(url, params=params, timeout=10)
-                response.raise_for_status()
-                klines = response.json()
-
-                if not klines:
-                    break
-
-                for k in klines:
-                    open_time = datetime.fromtimestamp(k[0] / 1000)
-                    result.append({
-                        "date": open_time,
-                        "spot_price": float(k[4]),  # close price
-                    })
-
-                current_start = int(klines[-1][6]) + 1  # closeTime + 1ms
-
-                if len(klines) < 1000:
-                    break
+                for k in klines
+            ]
 
             self.log(f"[OK] Fetched {len(result)} spot bars from Binance")
             return result
@@ -120,7 +184,8 @@ class FuturesAccumulator(LoggingMixin):
         end_date: datetime,
         bar_size: str = "1 day",
         spot_config: Dict[str, str] = None,
-    ) -> List[Dict[str, Any]]:
+        plan: bool = False,
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
         """
         Fetch historical spot prices from IBKR using Crypto contract.
 
@@ -132,9 +197,10 @@ class FuturesAccumulator(LoggingMixin):
             bar_size: Bar size ('1 day', '1 hour', etc.)
             spot_config: Dict with 'symbol', 'exchange', 'currency' keys.
                          Defaults to BTC on PAXOS in USD.
+            plan: Return a HistoricalPlan instead of fetching
 
         Returns:
-            List of dicts with date and spot_price
+            List of dicts with date and spot_price (or the plan producing it)
         """
         from ib_insync import Crypto
 
@@ -155,48 +221,51 @@ class FuturesAccumulator(LoggingMixin):
                 chunks.append((chunk_start, chunk_end))
                 chunk_start = chunk_end
 
-            result = []
-            seen_dates = set()
-
+            chunk_requests = []
             for i, (c_start, c_end) in enumerate(chunks):
                 duration_days = (c_end - c_start).days
                 if duration_days <= 0:
                     continue
-                duration_str = f"{duration_days} D"
 
                 if len(chunks) > 1:
                     self.log(f"    Chunk {i + 1}/{len(chunks)}: {c_start.date()} to {c_end.date()} ({duration_days}d)")
 
-                bars = self.fetcher.ib.reqHistoricalData(
+                chunk_requests.append(HistoricalRequest(
                     contract,
                     endDateTime=c_end,
-                    durationStr=duration_str,
+                    durationStr=f"{duration_days} D",
                     barSizeSetting=bar_size,
                     whatToShow="MIDPOINT",
                     useRTH=False,
                     formatDate=1,
-                )
-
-                for bar in bars:
-                    if isinstance(bar.date, datetime):
-                        date_obj = bar.date
-                    else:
-                        date_obj = datetime.combine(bar.date, datetime.min.time())
-
-                    date_key = date_obj.date()
-                    if date_key not in seen_dates:
-                        seen_dates.add(date_key)
-                        result.append({
-                            "date": date_obj,
-                            "spot_price": bar.close,
-                        })
-
-                if i < len(chunks) - 1:
-                    time.sleep(1)
-
-            result.sort(key=lambda x: x["date"])
-            self.log(f"[OK] Fetched {len(result)} spot bars from IBKR ({spot_config['symbol']}.{spot_config['currency']} {spot_config['exchange']})")
-            return result
+                ))
+
+            def finish(chunks: List[List[Any]]) -> List[Dict[str, Any]]:
+                result = []
+                seen_dates = set()
+                for bars in chunks:
+                    for bar in bars:
+                        if isinstance(bar.date, datetime):
+                            date_obj = bar.date
+                        else:
+                            date_obj = datetime.combine(bar.date, datetime.min.time())
+
+                        date_key = date_obj.date()
+                        if date_key not in seen_dates:
+                            seen_dates.add(date_key)
+                            result.append({
+                                "date": date_obj,
+                                "spot_price": bar.close,
+                            })
+
+                result.sort(key=lambda x: x["date"])
+                self.log(f"[OK] Fetched {len(result)} spot bars from IBKR ({spot_config['symbol']}.{spot_config['currency']} {spot_config['exchange']})")
+                return result
+
+            if plan:
+                return HistoricalPlan(chunk_requests, finish)
+            # Chunks are requested concurrently, paced by the fetcher's scheduler
+            return finish(self.fetcher.scheduler.fetch_all(chunk_requests))
 
         except Exception as e:
             self.log(f"[X] Failed to fetch IBKR spot history: {e}")
@@ -210,20 +279,167 @@ class FuturesAccumulator(LoggingMixin):
         spot_symbol: str = "BTCUSDT",
         bar_size: str = "1 day",
         spot_config: Dict[str, str] = None,
-    ) -> List[Dict[str, Any]]:
-        """Fetch spot data from the configured source."""
+        plan: bool = False,
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
+        """
+        Fetch spot data from the configured source, through the spot cache if set.
+
+        With ``plan`` and IBKR spot, return a HistoricalPlan for the
+        uncovered ranges instead of fetching; its bars are stored in the
+        spot cache when the plan finishes.
+        """
         if spot_source == "ibkr":
-            return self._fetch_ibkr_spot_history(start_date, end_date, bar_size, spot_config=spot_config)
+            if spot_config is None:
+                spot_config = {"symbol": "BTC", "exchange": "PAXOS", "currency": "USD"}
+            key = SpotKey("ibkr", spot_config["symbol"], spot_config["exchange"], spot_config["currency"], bar_size)
+
+            def download(start: datetime, end: datetime, plan: bool = False):
+                return self._fetch_ibkr_spot_history(start, end, bar_size, spot_config=spot_config, plan=plan)
+
+            if plan and self.spot_cache is None:
+                return download(start_date, end_date, plan=True)
+            if plan:
+                gaps = self.spot_cache.gaps(key, start_date, end_date)
+
+                def store_gaps(results: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+                    for (gap_start, gap_end), bars in zip(gaps, results):
+                        if bars:
+                            self.spot_cache.store(key, gap_start, gap_end, bars)
+                    return self.spot_cache.read(key, start_date, end_date)
+
+                return combine_plans([as_plan(download(s, e, plan=True)) for s, e in gaps], store_gaps)
         else:
-            return self._fetch_binance_spot_history(start_date, end_date, spot_symbol)
+            key = SpotKey("binance", spot_symbol, bar_size="1d")
+
+            def download(start: datetime, end: datetime) -> List[Dict[str, Any]]:
+                return self._fetch_binance_spot_history(start, end, spot_symbol)
+
+        if self.spot_cache is None:
+            return download(start_date, end_date)
+        return self.spot_cache.get(key, start_date, end_date, fetch=download)
+
+    def _timed_fetch(self, label: str, fetch: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Run one fetch, logging its duration and attributing any failure to ``label``."""
+        started = time.monotonic()
+        try:
+            data = fetch() or []
+        except Exception as e:
+            self.log(f"[X] {label} fetch failed: {e}")
+            return []
+        self.log(f"    {label}: {len(data)} bars in {time.monotonic() - started:.1f}s")
+        return data
+
+    def _fetch_concurrently(
+        self, tasks: List[Tuple[str, bool, Callable[[], Any]]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Run independent fetches concurrently and return results by label.
+
+        Each task is (label, uses_ibkr, fetch). Non-IBKR tasks (Databento,
+        Binance) run on worker threads. ib_insync is bound to the thread
+        running its event loop, so IBKR fetches are planned on the calling
+        thread meanwhile: each returns a HistoricalPlan (or its rows when
+        nothing needs requesting), and the requests of all plans go out
+        together through the fetcher's scheduler.
+        """
+        pool_tasks = [(label, fetch) for label, uses_ibkr, fetch in tasks if not uses_ibkr]
+        ibkr_tasks = [(label, fetch) for label, uses_ibkr, fetch in tasks if uses_ibkr]
+
+        results: Dict[str, List[Dict[str, Any]]] = {label: [] for label, _, _ in tasks}
+        with ThreadPoolExecutor(max_workers=max(1, len(pool_tasks))) as pool:
+            pending = {label: pool.submit(self._timed_fetch, label, fetch) for label, fetch in pool_tasks}
+            results.update(self._fetch_ibkr(ibkr_tasks))
+            for label, future in pending.items():
+                results[label] = future.result()
+        return results
+
+    def _fetch_ibkr(self, tasks: List[Tuple[str, Callable[[], Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Plan IBKR fetches, send their requests in one scheduler.fetch_all()
+        (concurrently on the IB event loop, as pacing allows) and finish
+        each plan with its bars. Failures are attributed to the task's label.
+        A fetch that comes back empty without requests (cached, failed)
+        stops the others from being sent, since the merge needs every series.
+        """
+        started = time.monotonic()
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        plans: Dict[str, HistoricalPlan] = {}
+        for label, fetch in tasks:
+            try:
+                plan = as_plan(fetch())
+                if plan.requests:
+                    plans[label] = plan
+                    continue
+                results[label] = plan.finish([]) or []
+            except Exception as e:
+                self.log(f"[X] {label} fetch failed: {e}")
+                results[label] = []
+                return results
+            self.log(f"    {label}: {len(results[label])} bars in {time.monotonic() - started:.1f}s")
+            if not results[label]:
+                return results
+
+        requests = [request for plan in plans.values() for request in plan.requests]
+        try:
+            bars = self.fetcher.scheduler.fetch_all(requests) if requests else []
+        except Exception as e:
+            for label in plans:
+                self.log(f"[X] {label} fetch failed: {e}")
+                results[label] = []
+            return results
+
+        for (label, plan), chunks in zip(plans.items(), split_bars(list(plans.values()), bars)):
+            try:
+                results[label] = plan.finish(chunks) or []
+            except Exception as e:
+                self.log(f"[X] {label} fetch failed: {e}")
+                results[label] = []
+                continue
+            self.log(f"    {label}: {len(results[label])} bars in {time.monotonic() - started:.1f}s")
+        return results
+
+    @staticmethod
+    def _source_labels(
+        futures_source: str,
+        exchange: str,
+        spot_source: str,
+        spot_symbol: str,
+        spot_config: Optional[Dict[str, str]],
+    ) -> Tuple[str, str]:
+        """Display labels (futures, spot) for log lines."""
+        futures_label = "Databento" if futures_source == "databento" else f"IBKR ({exchange})"
+        if spot_source == "ibkr" and spot_config:
+            spot_label = f"IBKR {spot_config['symbol']}.{spot_config['currency']} {spot_config['exchange']}"
+        elif spot_source == "ibkr":
+            spot_label = "IBKR BTC.USD PAXOS"
+        else:
+            spot_label = f"Binance {spot_symbol}"
+        return futures_label, spot_label
 
     def _get_futures_fetcher(self, futures_source: str, databento_dir: str = None):
         """Get the appropriate futures fetcher based on source."""
         if futures_source == "databento":
             from crypto_data.data.databento import DatabentoLocalFetcher
-            return DatabentoLocalFetcher(data_dir=databento_dir or "databento")
+            data_dir = databento_dir or "databento"
+            fetcher = self._futures_fetchers.get(data_dir)
+            if fetcher is None:
+                fetcher = DatabentoLocalFetcher(data_dir=data_dir, registry=self.registry)
+                self._futures_fetchers[data_dir] = fetcher
+            return fetcher
         return self.fetcher
 
+    @staticmethod
+    def _merge_basis(
+        spot_data: List[Dict[str, Any]],
+        futures_data: List[Dict[str, Any]],
+        expiry: str,
+        contract_name: str,
+        continuous_data: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Join spot and futures bars by date and compute basis rows."""
+        expiry_date = get_last_friday_of_month(int(expiry[:4]), int(expiry[4:6]))
+        return merge_basis(spot_data, futures_data, expiry_date, contract_name, continuous_data)
+
     def accumulate(
         self,
         start_date: datetime,
@@ -271,88 +487,191 @@ class FuturesAccumulator(LoggingMixin):
         if expiry is None:
             expiry = get_front_month_expiry_str()
 
-        futures_label = "Databento" if futures_source == "databento" else f"IBKR ({exchange})"
-        if spot_source == "ibkr" and spot_config:
-            spot_label = f"IBKR {spot_config['symbol']}.{spot_config['currency']} {spot_config['exchange']}"
-        elif spot_source == "ibkr":
-            spot_label = "IBKR BTC.USD PAXOS"
-        else:
-            spot_label = f"Binance {spot_symbol}"
+        futures_label, spot_label = self._source_labels(
+            futures_source, exchange, spot_source, spot_symbol, spot_config
+        )
         contract_name = format_contract_name(symbol, expiry)
         self.log(f"[*] Accumulating futures data: {start_date.date()} to {end_date.date()}")
         self.log(f"    Contract: {contract_name}, Futures: {futures_label}, Spot: {spot_label}")
 
-        spot_data = self._fetch_spot(
-            start_date=start_date,
-            end_date=end_date,
-            spot_source=spot_source,
-            spot_symbol=spot_symbol,
-            bar_size=bar_size,
-            spot_config=spot_config,
-        )
+        fut_fetcher = self._get_futures_fetcher(futures_source, databento_dir)
+        # IBKR fetches return plans, whose requests _fetch_concurrently sends together
+        ibkr_plan = {"plan": True} if futures_source == "ibkr" else {}
+        fetched = self._fetch_concurrently([
+            (f"Spot ({spot_label})", spot_source == "ibkr", lambda: self._fetch_spot(
+                start_date=start_date,
+                end_date=end_date,
+                spot_source=spot_source,
+                spot_symbol=spot_symbol,
+                bar_size=bar_size,
+                spot_config=spot_config,
+                plan=True,
+            )),
+            (f"Futures ({futures_label})", futures_source == "ibkr", lambda: fut_fetcher.get_historical_futures(
+                expiry=expiry,
+                symbol=symbol,
+                exchange=exchange,
+                start_date=start_date,
+                end_date=end_date,
+                bar_size=bar_size,
+                **ibkr_plan,
+            )),
+        ])
+        spot_data = fetched[f"Spot ({spot_label})"]
+        futures_data = fetched[f"Futures ({futures_label})"]
 
         if not spot_data:
             self.log("[X] Failed to get spot data")
             return []
 
-        fut_fetcher = self._get_futures_fetcher(futures_source, databento_dir)
-        futures_data = fut_fetcher.get_historical_futures(
-            expiry=expiry,
-            symbol=symbol,
-            exchange=exchange,
-            start_date=start_date,
-            end_date=end_date,
-            bar_size=bar_size,
-        )
-
         if not futures_data:
             self.log("[X] Failed to get futures data")
             return []
 
-        futures_by_date = {}
-        for entry in futures_data:
-            date_key = entry["date"].date()
-            futures_by_date[date_key] = entry
+        result = self._merge_basis(spot_data, futures_data, expiry, contract_name)
+        self.log(f"[OK] Accumulated {len(result)} data points")
+        return result
 
-        expiry_date = get_last_friday_of_month(int(expiry[:4]), int(expiry[4:6]))
+    def accumulate_stream(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        expiry: str = None,
+        chunk_days: int = DEFAULT_CHUNK_DAYS,
+        **kwargs: Any,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield accumulate() rows chunk by chunk with bounded memory.
 
-        result = []
-        for spot_entry in spot_data:
-            date_key = spot_entry["date"].date()
-            if date_key not in futures_by_date:
-                continue
+        The range is split into ``chunk_days`` windows. Each window is
+        fetched, merged and yielded before the next one is requested, so
+        only one chunk of spot, futures and merged rows is held at a time,
+        however long the range. The rows are the ones accumulate() returns
+        for the whole range, in the same order.
+
+        Args:
+            start_date: Start date for historical data
+            end_date: End date for historical data
+            expiry: Futures contract expiry (YYYYMM), None = front-month
+                    (resolved once, before the first chunk)
+            chunk_days: Days per fetch/merge chunk
+            **kwargs: Other accumulate() arguments (symbol, exchange,
+                      spot_source, spot_symbol, bar_size, spot_config,
+                      futures_source, databento_dir)
+
+        Yields:
+            Accumulated row dicts sorted by date
+        """
+        chunks = date_chunks(start_date, end_date, chunk_days)
+        needs_ibkr = "ibkr" in (kwargs.get("futures_source", "databento"), kwargs.get("spot_source", "ibkr"))
+        if needs_ibkr and not self.fetcher.connected:
+            if not self.fetcher.connect():
+                return
 
-            futures_entry = futures_by_date[date_key]
-            spot_price = spot_entry["spot_price"]
-            futures_price = futures_entry["futures_price"]
-            futures_expiry = futures_entry.get("expiry") or expiry_date
+        if expiry is None:
+            expiry = get_front_month_expiry_str()
 
-            basis_absolute = futures_price - spot_price
-            basis_percent = (basis_absolute / spot_price) * 100 if spot_price else 0
-            days_to_expiry = (futures_expiry - spot_entry["date"]).days
+        for chunk_start, chunk_end in chunks:
+            rows = self.accumulate(start_date=chunk_start, end_date=chunk_end, expiry=expiry, **kwargs)
+            first_day, last_day = chunk_start.date(), chunk_end.date()
+            # Sources may return bars just outside the window; each day belongs to one chunk
+            for row in rows:
+                if first_day <= row["date"].date() <= last_day:
+                    yield row
 
-            monthly_basis = (
-                basis_percent * (30 / days_to_expiry) if days_to_expiry > 0 else 0
-            )
-            annualized_basis = (
-                basis_percent * (365 / days_to_expiry) if days_to_expiry > 0 else 0
-            )
+    def accumulate_many(
+        self,
+        expiries: List[Tuple[str, datetime, datetime]],
+        symbol: str = "MBT",
+        exchange: str = "CME",
+        spot_source: str = "ibkr",
+        spot_symbol: str = "BTCUSDT",
+        bar_size: str = "1 day",
+        spot_config: Dict[str, str] = None,
+        futures_source: str = "databento",
+        databento_dir: str = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Accumulate several contracts, fetching spot once for all of them.
 
-            result.append({
-                "date": spot_entry["date"],
-                "contract": contract_name,
-                "spot_price": spot_price,
-                "futures_price": futures_price,
-                "futures_expiry": futures_expiry,
-                "basis_absolute": basis_absolute,
-                "basis_percent": basis_percent,
-                "monthly_basis": monthly_basis,
-                "annualized_basis": annualized_basis,
-                "days_to_expiry": days_to_expiry,
-            })
+        Spot is fetched once over the union of the date windows and sliced
+        per contract. Databento contracts are sliced from a single load of
+        the store; IBKR contracts are requested concurrently through the
+        fetcher's pacing scheduler.
 
-        self.log(f"[OK] Accumulated {len(result)} data points")
-        return result
+        Args:
+            expiries: List of (expiry YYYYMM, start_date, end_date) per contract
+            symbol, exchange, spot_source, spot_symbol, bar_size, spot_config,
+            futures_source, databento_dir: As for accumulate()
+
+        Returns:
+            Dict mapping each expiry to the rows accumulate() would return
+            for it (empty list when the contract has no data), in input order
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {expiry: [] for expiry, _, _ in expiries}
+        if not expiries:
+            return results
+
+        needs_ibkr = (futures_source == "ibkr") or (spot_source == "ibkr")
+        if needs_ibkr and not self.fetcher.connected:
+            if not self.fetcher.connect():
+                return results
+
+        start_date = min(start for _, start, _ in expiries)
+        end_date = max(end for _, _, end in expiries)
+        futures_label, spot_label = self._source_labels(
+            futures_source, exchange, spot_source, spot_symbol, spot_config
+        )
+        self.log(f"[*] Accumulating {len(expiries)} contracts: {start_date.date()} to {end_date.date()}")
+        self.log(f"    Symbol: {symbol}, Futures: {futures_label}, Spot: {spot_label}")
+
+        fut_fetcher = self._get_futures_fetcher(futures_source, databento_dir)
+        futures_by_expiry: Dict[str, List[Dict[str, Any]]] = {}
+
+        def collect(by_expiry: Dict[str, List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+            futures_by_expiry.update(by_expiry)
+            return [bar for bars in futures_by_expiry.values() for bar in bars]
+
+        def fetch_contracts() -> Union[List[Dict[str, Any]], HistoricalPlan]:
+            if futures_source == "databento":
+                return collect(fut_fetcher.get_historical_futures_many(expiries, symbol=symbol))
+            # IBKR: a plan, so the contracts are requested together with spot
+            return as_plan(fut_fetcher.get_historical_futures_many(
+                expiries, symbol=symbol, exchange=exchange, bar_size=bar_size, plan=True,
+            )).then(collect)
+
+        fetched = self._fetch_concurrently([
+            (f"Spot ({spot_label})", spot_source == "ibkr", lambda: self._fetch_spot(
+                start_date=start_date,
+                end_date=end_date,
+                spot_source=spot_source,
+                spot_symbol=spot_symbol,
+                bar_size=bar_size,
+                spot_config=spot_config,
+                plan=True,
+            )),
+            (f"Futures ({futures_label})", futures_source == "ibkr", fetch_contracts),
+        ])
+        spot_data = fetched[f"Spot ({spot_label})"]
+
+        if not spot_data:
+            self.log("[X] Failed to get spot data")
+            return results
+
+        spot_data = sorted(spot_data, key=lambda x: x["date"])
+        spot_days = [entry["date"].date() for entry in spot_data]
+        for expiry, start, end in expiries:
+            contract_name = format_contract_name(symbol, expiry)
+            futures_data = futures_by_expiry.get(expiry)
+            if not futures_data:
+                self.log(f"[!] No futures data for {contract_name}")
+                continue
+            lo = bisect_left(spot_days, start.date())
+            hi = bisect_right(spot_days, end.date())
+            results[expiry] = self._merge_basis(spot_data[lo:hi], futures_data, expiry, contract_name)
+            self.log(f"[OK] {contract_name}: {len(results[expiry])} data points")
+
+        return results
 
     def accumulate_continuous(
         self,
@@ -406,147 +725,296 @@ class FuturesAccumulator(LoggingMixin):
             key=lambda dt: dt,
         )
 
-        futures_label = "Databento" if futures_source == "databento" else f"IBKR ({exchange})"
-        if spot_source == "ibkr" and spot_config:
-            spot_label = f"IBKR {spot_config['symbol']}.{spot_config['currency']} {spot_config['exchange']}"
-        elif spot_source == "ibkr":
-            spot_label = "IBKR BTC.USD PAXOS"
-        else:
-            spot_label = f"Binance {spot_symbol}"
+        futures_label, spot_label = self._source_labels(
+            futures_source, exchange, spot_source, spot_symbol, spot_config
+        )
         self.log(f"[*] Accumulating continuous futures: {start_date.date()} to {end_date.date()}")
         self.log(f"    Symbol: {symbol}, Futures: {futures_label}, Spot: {spot_label}")
 
-        # Fetch spot data
-        spot_data = self._fetch_spot(
-            start_date=start_date,
-            end_date=end_date,
-            spot_source=spot_source,
-            spot_symbol=spot_symbol,
-            bar_size=bar_size,
-            spot_config=spot_config,
-        )
-
-        if not spot_data:
-            self.log("[X] Failed to get spot data")
-            return []
-
-        # Fetch front-month contract, fall back to next if expired/unavailable
         fut_fetcher = self._get_futures_fetcher(futures_source, databento_dir)
-        futures_data = []
+        uses_ibkr = futures_source == "ibkr"
+        # IBKR fetches return plans, whose requests _fetch_concurrently sends together
+        ibkr_plan = {"plan": True} if uses_ibkr else {}
         expiry_str = None
-        for candidate in candidates:
+
+        def fetch_front_contract(index: int = 0, plan: bool = False) -> Union[List[Dict[str, Any]], HistoricalPlan]:
+            # Front-month contract, falling back to the next if expired/unavailable.
+            # As a plan only the first candidate is requested with the other
+            # series; fallbacks are fetched once its bars turn out empty.
+            nonlocal expiry_str
+            if index >= len(candidates):
+                return []
+            candidate = candidates[index]
             expiry_str = f"{candidate.year:04d}{candidate.month:02d}"
-            contract_name = format_contract_name(symbol, expiry_str)
-            self.log(f"[*] Trying contract {contract_name}...")
-            futures_data = fut_fetcher.get_historical_futures(
+            self.log(f"[*] Trying contract {format_contract_name(symbol, expiry_str)}...")
+            data = fut_fetcher.get_historical_futures(
                 expiry=expiry_str,
                 symbol=symbol,
                 exchange=exchange,
                 start_date=start_date,
                 end_date=end_date,
                 bar_size=bar_size,
+                **(ibkr_plan if plan else {}),
             )
-            if futures_data:
-                self.log(f"[OK] Using contract {contract_name}")
-                break
+            if isinstance(data, HistoricalPlan):
+                return data.then(lambda rows: use_or_next(index, rows))
+            return use_or_next(index, data)
+
+        def use_or_next(index: int, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            nonlocal expiry_str
+            candidate = candidates[index]
+            expiry_str = f"{candidate.year:04d}{candidate.month:02d}"
+            if data:
+                self.log(f"[OK] Using contract {format_contract_name(symbol, expiry_str)}")
+                return data
             self.log(f"[!] No data for {expiry_str}, trying next...")
+            return fetch_front_contract(index + 1)
+
+        # Spot, front-month and continuous series are independent fetches
+        fetched = self._fetch_concurrently([
+            (f"Spot ({spot_label})", spot_source == "ibkr", lambda: self._fetch_spot(
+                start_date=start_date,
+                end_date=end_date,
+                spot_source=spot_source,
+                spot_symbol=spot_symbol,
+                bar_size=bar_size,
+                spot_config=spot_config,
+                plan=True,
+            )),
+            (f"Futures ({futures_label})", uses_ibkr, lambda: fetch_front_contract(plan=True)),
+            (f"Continuous ({futures_label})", uses_ibkr, lambda: fut_fetcher.get_historical_continuous_futures(
+                symbol=symbol,
+                exchange=exchange,
+                start_date=start_date,
+                end_date=end_date,
+                bar_size=bar_size,
+                **ibkr_plan,
+            )),
+        ])
+        spot_data = fetched[f"Spot ({spot_label})"]
+        futures_data = fetched[f"Futures ({futures_label})"]
+        cont_data = fetched[f"Continuous ({futures_label})"]
+
+        if not spot_data:
+            self.log("[X] Failed to get spot data")
+            return []
 
         if not futures_data:
             self.log("[X] Failed to get futures data for any contract")
             return []
 
-        futures_by_date = {}
-        for entry in futures_data:
-            futures_by_date[entry["date"].date()] = entry
-
-        expiry_date = get_last_friday_of_month(int(expiry_str[:4]), int(expiry_str[4:6]))
-
-        # Fetch continuous futures
-        cont_data = fut_fetcher.get_historical_continuous_futures(
-            symbol=symbol,
-            exchange=exchange,
-            start_date=start_date,
-            end_date=end_date,
-            bar_size=bar_size,
+        result = self._merge_basis(
+            spot_data,
+            futures_data,
+            expiry_str,
+            format_contract_name(symbol, expiry_str),
+            continuous_data=cont_data,
         )
-        cont_by_date = {}
-        for entry in cont_data:
-            cont_by_date[entry["date"].date()] = entry["futures_price"]
-
-        # Merge spot + futures + continuous
-        result = []
-        for spot_entry in spot_data:
-            date_key = spot_entry["date"].date()
-            if date_key not in futures_by_date:
-                continue
-
-            futures_entry = futures_by_date[date_key]
-            spot_price = spot_entry["spot_price"]
-            futures_price = futures_entry["futures_price"]
-            futures_expiry = futures_entry.get("expiry") or expiry_date
-
-            basis_absolute = futures_price - spot_price
-            basis_percent = (basis_absolute / spot_price) * 100 if spot_price else 0
-            days_to_expiry = (futures_expiry - spot_entry["date"]).days
-
-            monthly_basis = (
-                basis_percent * (30 / days_to_expiry) if days_to_expiry > 0 else 0
-            )
-            annualized_basis = (
-                basis_percent * (365 / days_to_expiry) if days_to_expiry > 0 else 0
-            )
-
-            result.append({
-                "date": spot_entry["date"],
-                "contract": format_contract_name(symbol, expiry_str),
-                "spot_price": spot_price,
-                "futures_price": futures_price,
-                "future_continuous": cont_by_date.get(date_key),
-                "futures_expiry": futures_expiry,
-                "basis_absolute": basis_absolute,
-                "basis_percent": basis_percent,
-                "monthly_basis": monthly_basis,
-                "annualized_basis": annualized_basis,
-                "days_to_expiry": days_to_expiry,
-            })
 
         self.log(f"[OK] Accumulated {len(result)} continuous data points")
         return result
 
+    @staticmethod
+    def _csv_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Format one accumulated row for CSV_FIELDNAMES."""
+        cont_price = row.get("future_continuous")
+        return {
+            "date": row["date"].strftime("%Y-%m-%d")
+            if isinstance(row["date"], datetime)
+            else row["date"],
+            "contract": row.get("contract", ""),
+            "spot_price": f"{row['spot_price']:.2f}",
+            "futures_price": f"{row['futures_price']:.2f}",
+            "future_continuous": f"{cont_price:.2f}" if cont_price is not None else "",
+            "futures_expiry": row["futures_expiry"].strftime("%Y-%m-%d")
+            if isinstance(row["futures_expiry"], datetime)
+            else row["futures_expiry"],
+            "basis_absolute": f"{row['basis_absolute']:.2f}",
+            "basis_percent": f"{row['basis_percent']:.2f}",
+            "monthly_basis": f"{row['monthly_basis']:.2f}",
+            "annualized_basis": f"{row['annualized_basis']:.2f}",
+            "days_to_expiry": row["days_to_expiry"],
+        }
+
     def to_csv(
         self,
-        data: List[Dict[str, Any]],
+        data: Iterable[Dict[str, Any]],
         output_file: str,
-    ) -> None:
+    ) -> int:
         """
         Export accumulated futures data to CSV.
 
+        Rows are written as they are consumed, so a generator such as
+        accumulate_stream() is written without being materialized.
+
         Args:
-            data: List of dicts returned by accumulate() or accumulate_continuous()
+            data: Rows returned by accumulate(), accumulate_continuous()
+                  or accumulate_stream()
             output_file: Output CSV file path
+
+        Returns:
+            Number of rows written
         """
+        count = 0
         with open(output_file, "w", newline="") as f:
             writer = csv.DictWriter(f, fieldnames=CSV_FIELDNAMES)
             writer.writeheader()
 
             for row in data:
-                cont_price = row.get("future_continuous")
-                writer.writerow({
-                    "date": row["date"].strftime("%Y-%m-%d")
-                    if isinstance(row["date"], datetime)
-                    else row["date"],
-                    "contract": row.get("contract", ""),
-                    "spot_price": f"{row['spot_price']:.2f}",
-                    "futures_price": f"{row['futures_price']:.2f}",
-                    "future_continuous": f"{cont_price:.2f}" if cont_price is not None else "",
-                    "futures_expiry": row["futures_expiry"].strftime("%Y-%m-%d")
-                    if isinstance(row["futures_expiry"], datetime)
-                    else row["futures_expiry"],
-                    "basis_absolute": f"{row['basis_absolute']:.2f}",
-                    "basis_percent": f"{row['basis_percent']:.2f}",
-                    "monthly_basis": f"{row['monthly_basis']:.2f}",
-                    "annualized_basis": f"{row['annualized_basis']:.2f}",
-                    "days_to_expiry": row["days_to_expiry"],
-                })
-
-        self.log(f"[OK] Saved {len(data)} rows to {output_file}")
+                writer.writerow(self._csv_row(row))
+                count += 1
+
+        self.log(f"[OK] Saved {count} rows to {output_file}")
+        return count
+
+    def to_columns(
+        self,
+        data: Iterable[Dict[str, Any]],
+        output_file: str,
+    ) -> int:
+        """
+        Export accumulated futures data to a binary columnar file.
+
+        Values keep full float precision and the file reloads by memory
+        mapping (see crypto_data.data.basis_store).
+
+        Args:
+            data: Rows returned by accumulate(), accumulate_continuous()
+                  or accumulate_stream()
+            output_file: Output path (conventionally ending in '.cols')
+
+        Returns:
+            Number of rows written
+        """
+        columns = BasisColumns.from_rows(data)
+        columns.save(output_file)
+        self.log(f"[OK] Saved {len(columns)} rows to {output_file}")
+        return len(columns)
+
+    def export(
+        self,
+        data: Iterable[Dict[str, Any]],
+        output_file: str,
+    ) -> int:
+        """Export with to_columns() for '.cols' paths, else to_csv()."""
+        if is_basis_file(output_file):
+            return self.to_columns(data, output_file)
+        return self.to_csv(data, output_file)
+
+    @staticmethod
+    def last_csv_date(output_file: str) -> Optional[datetime]:
+        """
+        Date of the last row of a CSV written by to_csv().
+
+        Returns:
+            The last row's date, or None if the file is missing or has no rows
+        """
+        if not os.path.exists(output_file):
+            return None
+        last_row = read_last_csv_row(output_file)
+        if last_row is None:
+            return None
+        return datetime.strptime(last_row["date"], "%Y-%m-%d")
+
+    def append_csv(
+        self,
+        data: Iterable[Dict[str, Any]],
+        output_file: str,
+    ) -> int:
+        """
+        Append rows newer than the last row of an existing CSV.
+
+        Only the file's header and tail are read. Rows dated on or before
+        the last date already in the file are skipped. The new rows are
+        written in one write and fsynced; if the write fails the file is
+        truncated back to its previous length, so readers see either all
+        of the new rows or none of them. A missing or empty file is
+        written in full with to_csv().
+
+        Args:
+            data: Rows returned by accumulate(), accumulate_continuous()
+                  or accumulate_stream()
+            output_file: CSV file previously written by to_csv()
+
+        Returns:
+            Number of rows appended
+
+        Raises:
+            ValueError: If the existing header does not match CSV_FIELDNAMES
+        """
+        if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+            return self.to_csv(data, output_file)
+
+        with open(output_file, newline="") as f:
+            header = next(csv.reader(f), [])
+        if header != CSV_FIELDNAMES:
+            raise ValueError(f"{output_file} has columns {header}, expected {CSV_FIELDNAMES}")
+
+        last_date = self.last_csv_date(output_file)
+        if last_date is None:
+            data = list(data)
+        else:
+            data = [row for row in data if row["date"].date() > last_date.date()]
+        if not data:
+            self.log(f"[OK] {output_file} is up to date")
+            return 0
+
+        buffer = io.StringIO(newline="")
+        writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDNAMES)
+        for row in data:
+            writer.writerow(self._csv_row(row))
+        payload = buffer.getvalue().encode()
+
+        with open(output_file, "r+b") as f:
+            size = f.seek(0, os.SEEK_END)
+            f.seek(size - 1)
+            if f.read(1) != b"\n":
+                payload = b"\r\n" + payload
+            try:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            except BaseException:
+                f.truncate(size)
+                raise
+
+        self.log(f"[OK] Appended {len(data)} rows to {output_file}")
+        return len(data)
+
+    def accumulate_incremental(
+        self,
+        output_file: str,
+        start_date: datetime,
+        end_date: datetime,
+        continuous: bool = False,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        """
+        Bring a basis CSV up to end_date, fetching only bars it lacks.
+
+        The fetch starts the day after the file's last row (or at
+        start_date for a new file). Daily refreshes of a long file
+        therefore cost O(new rows) in network and disk I/O.
+
+        Args:
+            output_file: CSV file to create or extend
+            start_date: Start date when the file does not exist yet
+            end_date: End date for historical data
+            continuous: Use accumulate_continuous() instead of accumulate()
+            **kwargs: Passed through to the accumulate method
+
+        Returns:
+            The rows fetched and appended
+        """
+        last_date = self.last_csv_date(output_file)
+        if last_date is not None:
+            start_date = max(start_date, last_date + timedelta(days=1))
+        if start_date.date() > end_date.date():
+            self.log(f"[OK] {output_file} is up to date")
+            return []
+
+        accumulate = self.accumulate_continuous if continuous else self.accumulate
+        data = accumulate(start_date=start_date, end_date=end_date, **kwargs)
+        if data:
+            self.append_csv(data, output_file)
+        return data
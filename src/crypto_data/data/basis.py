@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Spot/futures join and basis computation.
+
+Spot and futures bars are keyed by calendar day (date ordinal). The
+futures bars are indexed by day once; the spot bars are then walked in
+day order (stable-sorted only when they are not already sorted) in one
+loop that looks up each bar's futures bar and fills the output row with
+every basis column directly.
+
+Join semantics (shared by every accumulate method):
+    - each spot bar is matched with the futures bar of the same day
+      (several spot bars per day, e.g. hourly, share that futures bar)
+    - when a day has several futures bars, the last one wins
+    - spot bars without a same-day futures bar are dropped
+    - the continuous series is left-joined (None where it has no bar)
+"""
+
+from datetime import datetime
+from operator import itemgetter, le
+from typing import Any, Dict, List, Optional
+
+
+def merge_basis(
+    spot_data: List[Dict[str, Any]],
+    futures_data: List[Dict[str, Any]],
+    expiry_date: datetime,
+    contract_name: str,
+    continuous_data: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Join spot and futures bars by day and compute the basis columns.
+
+    Args:
+        spot_data: Spot bars with 'date' and 'spot_price'
+        futures_data: Futures bars with 'date', 'futures_price' and
+                      optionally 'expiry'
+        expiry_date: Expiry used for futures bars without one
+        contract_name: Value of the 'contract' column
+        continuous_data: Optional continuous futures bars; adds a
+                         'future_continuous' column when given
+
+    Returns:
+        Accumulated rows sorted by date (see FuturesAccumulator.accumulate).
+        Percentages are 0 where spot is 0 and the scaled rates are 0 where
+        the contract has expired.
+    """
+    # Later bars overwrite earlier ones, so the last bar of a day wins
+    futures_by_day = {entry["date"].toordinal(): entry for entry in futures_data}
+    continuous_by_day = None
+    if continuous_data is not None:
+        continuous_by_day = {entry["date"].toordinal(): entry["futures_price"] for entry in continuous_data}
+
+    spot_keys = [entry["date"].toordinal() for entry in spot_data]
+    bars = zip(spot_keys, spot_data)
+    # Already-sorted spot, the usual case, is detected in one pass
+    if not all(map(le, spot_keys, spot_keys[1:])):
+        bars = sorted(bars, key=itemgetter(0))
+
+    result = []
+    append = result.append
+    for key, entry in bars:
+        fut = futures_by_day.get(key)
+        if fut is None:
+            continue
+        date = entry["date"]
+        spot_price = entry["spot_price"]
+        futures_price = fut["futures_price"]
+        expiry = fut.get("expiry") or expiry_date
+        days_to_expiry = (expiry - date).days
+        basis = futures_price - spot_price
+        basis_percent = (basis / spot_price) * 100 if spot_price else 0
+
+        row = {
+            "date": date,
+            "contract": contract_name,
+            "spot_price": spot_price,
+            "futures_price": futures_price,
+        }
+        if continuous_by_day is not None:
+            row["future_continuous"] = continuous_by_day.get(key)
+        row["futures_expiry"] = expiry
+        row["basis_absolute"] = basis
+        row["basis_percent"] = basis_percent
+        row["monthly_basis"] = basis_percent * (30 / days_to_expiry) if days_to_expiry > 0 else 0
+        row["annualized_basis"] = basis_percent * (365 / days_to_expiry) if days_to_expiry > 0 else 0
+        row["days_to_expiry"] = days_to_expiry
+        append(row)
+    return result
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Binary columnar storage for accumulated basis datasets.
+
+Rows with the accumulator's CSV_FIELDNAMES schema are stored as typed
+columns in the memory-mapped columnar format (crypto_data.utils.columnar):
+
+    date, futures_expiry      'q'  microseconds since 1970-01-01 UTC
+    contract                  'i'  index into the header's contract list
+    prices, basis columns     'd'  full float64 precision
+    future_continuous         'd'  NaN where there is no continuous bar
+    days_to_expiry            'q'
+
+Timezone-aware dates are converted to UTC before they are stored, and the
+header records that the dataset was aware ("utc"), so loading gives back
+aware UTC datetimes for it and naive ones for a naive dataset.
+
+Loading a file maps it and exposes every column as a memoryview, so no
+text is parsed and no value is rounded (CSV export keeps 2 decimals).
+"""
+
+import math
+from array import array
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from crypto_data.utils.columnar import ColumnarFile, read_columns, write_columns
+
+BASIS_SUFFIX = ".cols"
+
+# Column typecodes, in CSV_FIELDNAMES order
+BASIS_COLUMNS = {
+    "date": "q",
+    "contract": "i",
+    "spot_price": "d",
+    "futures_price": "d",
+    "future_continuous": "d",
+    "futures_expiry": "q",
+    "basis_absolute": "d",
+    "basis_percent": "d",
+    "monthly_basis": "d",
+    "annualized_basis": "d",
+    "days_to_expiry": "q",
+}
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    """Datetime -> microseconds since 1970-01-01 (aware values as UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int, tz: Optional[tzinfo] = None) -> datetime:
+    """Microseconds since 1970-01-01 -> naive UTC datetime, or aware in ``tz`` when given."""
+    result = _EPOCH + timedelta(microseconds=value)
+    if tz is None:
+        return result
+    return result.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def is_basis_file(path: Union[str, Path]) -> bool:
+    """True when ``path`` names a basis columnar file (by suffix)."""
+    return Path(path).suffix == BASIS_SUFFIX
+
+
+class BasisColumns:
+    """
+    An accumulated basis dataset held column-wise.
+
+    Usage:
+        BasisColumns.from_rows(acc.accumulate(...)).save("data/basis.cols")
+        basis = BasisColumns.load("data/basis.cols")
+        basis["spot_price"][0], basis.dates()[0], basis.contract(0)
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, Sequence],
+        contracts: List[str],
+        store: Optional[ColumnarFile] = None,
+        utc: bool = False,
+    ):
+        """
+        Args:
+            columns: Column name -> typed sequence (see BASIS_COLUMNS)
+            contracts: Contract names, indexed by the 'contract' column
+            store: Mapped file backing the columns, closed by close()
+            utc: The source dates were timezone-aware; dates() then
+                 returns aware UTC datetimes
+        """
+        self.columns = columns
+        self.contracts = contracts
+        self._store = store
+        self.tz = timezone.utc if utc else None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "BasisColumns":
+        """
+        Build columns from accumulated row dicts in one pass.
+
+        Args:
+            rows: Rows returned by accumulate(), accumulate_continuous()
+                  or accumulate_stream()
+        """
+        columns = {name: array(typecode) for name, typecode in BASIS_COLUMNS.items()}
+        contract_ids: Dict[str, int] = {}
+        utc = None
+        for row in rows:
+            if utc is None:
+                utc = row["date"].tzinfo is not None
+            contract = row.get("contract") or ""
+            cont_price = row.get("future_continuous")
+            columns["date"].append(to_micros(row["date"]))
+            columns["contract"].append(contract_ids.setdefault(contract, len(contract_ids)))
+            columns["spot_price"].append(row["spot_price"])
+            columns["futures_price"].append(row["futures_price"])
+            columns["future_continuous"].append(math.nan if cont_price is None else cont_price)
+            columns["futures_expiry"].append(to_micros(row["futures_expiry"]))
+            columns["basis_absolute"].append(row["basis_absolute"])
+            columns["basis_percent"].append(row["basis_percent"])
+            columns["monthly_basis"].append(row["monthly_basis"])
+            columns["annualized_basis"].append(row["annualized_basis"])
+            columns["days_to_expiry"].append(row["days_to_expiry"])
+        return cls(columns, list(contract_ids), utc=bool(utc))
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the columns to ``path`` (atomically replaced)."""
+        meta = {"kind": "basis", "contracts": self.contracts, "utc": self.tz is not None}
+        write_columns(path, self.columns, meta=meta)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> Optional["BasisColumns"]:
+        """
+        Memory-map a file written by save().
+
+        Returns:
+            BasisColumns over read-only memoryviews, or None if the file is
+            missing, unreadable or not a basis dataset
+        """
+        store = read_columns(path)
+        if store is None:
+            return None
+        if store.meta.get("kind") != "basis" or any(name not in store for name in BASIS_COLUMNS):
+            store.close()
+            return None
+        contracts = list(store.meta.get("contracts", []))
+        return cls(store.columns, contracts, store, utc=store.meta.get("utc", False))
+
+    def __len__(self) -> int:
+        return len(self.columns["date"])
+
+    def __getitem__(self, name: str) -> Sequence:
+        return self.columns[name]
+
+    def dates(self, name: str = "date") -> List[datetime]:
+        """A date column ('date' or 'futures_expiry') as datetimes."""
+        return [from_micros(value, self.tz) for value in self.columns[name]]
+
+    def contract(self, i: int) -> str:
+        """Contract name of row ``i``."""
+        return self.contracts[self.columns["contract"][i]]
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Rebuild the row dicts (with full-precision values)."""
+        dates = self.dates()
+        expiries = self.dates("futures_expiry")
+        cols = self.columns
+        return [
+            {
+                "date": dates[i],
+                "contract": self.contracts[cols["contract"][i]],
+                "spot_price": cols["spot_price"][i],
+                "futures_price": cols["futures_price"][i],
+                "future_continuous": None if math.isnan(cols["future_continuous"][i]) else cols["future_continuous"][i],
+                "futures_expiry": expiries[i],
+                "basis_absolute": cols["basis_absolute"][i],
+                "basis_percent": cols["basis_percent"][i],
+                "monthly_basis": cols["monthly_basis"][i],
+                "annualized_basis": cols["annualized_basis"][i],
+                "days_to_expiry": cols["days_to_expiry"][i],
+            }
+            for i in range(len(dates))
+        ]
+
+    def close(self) -> None:
+        """Unmap the backing file, if any. Columns are unusable afterwards."""
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+            self.columns = {}
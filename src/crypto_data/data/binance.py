@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
 from crypto_data.data.base import BaseFetcher
+from crypto_data.data.klines import FUTURES_WEIGHT_PER_MINUTE, KlineClient
 
 
 class BinanceFetcher(BaseFetcher):
@@ -21,6 +22,7 @@ class BinanceFetcher(BaseFetcher):
 
     def __init__(self, timeout: int = 10):
         super().__init__(timeout)
+        self._futures_klines: Optional[KlineClient] = None
 
     def fetch_spot_price(self, symbol: str = "BTCUSDT") -> Optional[float]:
         """
@@ -215,46 +217,28 @@ class BinanceFetcher(BaseFetcher):
         end_ms = int(datetime.now().timestamp() * 1000)
         start_ms = int((datetime.now() - timedelta(days=days)).timestamp() * 1000)
 
-        all_klines = []
-        current_start = start_ms
+        if self._futures_klines is None:
+            self._futures_klines = KlineClient(
+                self.COIN_FUTURES_API,
+                weight_per_minute=FUTURES_WEIGHT_PER_MINUTE,
+                timeout=self.timeout,
+            )
 
         try:
-            while current_start < end_ms:
-                url = f"{self.COIN_FUTURES_API}/klines"
-                params = {
-                    "symbol": symbol,
-                    "interval": interval,
-                    "startTime": current_start,
-                    "endTime": end_ms,
-                    "limit": 1500,
+            klines = self._futures_klines.fetch(symbol, interval, start_ms, end_ms, limit=1500)
+            return [
+                {
+                    "date": datetime.fromtimestamp(k[0] / 1000),
+                    "open": float(k[1]),
+                    "high": float(k[2]),
+                    "low": float(k[3]),
+                    "close": float(k[4]),
+                    "volume": float(k[5]),
+                    "futures_price": float(k[4]),
+                    "expiry": expiry,
                 }
-                response = requests.get(url, params=params, timeout=self.timeout)
-                response.raise_for_status()
-                klines = response.json()
-
-                if not klines:
-                    break
-
-                for k in klines:
-                    open_time = datetime.fromtimestamp(k[0] / 1000)
-                    all_klines.append({
-                        "date": open_time,
-                        "open": float(k[1]),
-                        "high": float(k[2]),
-                        "low": float(k[3]),
-                        "close": float(k[4]),
-                        "volume": float(k[5]),
-                        "futures_price": float(k[4]),
-                        "expiry": expiry,
-                    })
-
-                # Move past the last kline
-                current_start = int(klines[-1][6]) + 1  # closeTime + 1ms
-
-                if len(klines) < 1500:
-                    break
-
-            return all_klines
+                for k in klines
+            ]
 
         except Exception as e:
             self.log_error(f"Error fetching historical klines for {symbol}: {e}")
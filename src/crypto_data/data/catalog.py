@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Catalog of Databento batch downloads in a local directory.
+
+A Databento batch job delivers one or more data files plus sidecar JSON:
+
+    manifest.json    every delivered file with its size and sha256 hash
+    metadata.json    the query (schema, start/end) and split customizations
+    condition.json   per-date data quality (available/degraded/pending/missing)
+    symbology.json   symbol -> instrument_id mapping intervals
+
+Jobs with ``split_duration`` (day/week/month) or ``split_size`` deliver many
+files named ``glbx-mdp3-YYYYMMDD[-YYYYMMDD].<schema>.csv``. The catalog
+discovers every file of a schema under the data directory (including job
+subfolders), works out the date span each file covers, and opens only the
+files that overlap a query. Each file keeps its own columnar cache, so a new
+download only parses the new file; files that need parsing are parsed in
+parallel worker processes. Loaded files are shared process-wide through the
+DatasetRegistry.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from crypto_data.data.databento import (
+    CACHE_SUFFIX,
+    NS_PER_DAY,
+    EPOCH_ORDINAL,
+    DatabentoColumns,
+    Instrument,
+    file_fingerprint,
+    load_symbology,
+    ordinal_bounds,
+)
+from crypto_data.data.registry import DatasetRegistry, get_registry
+from crypto_data.utils.logging import LoggingMixin
+
+# e.g. glbx-mdp3-20210425-20260212.ohlcv-1d.csv, glbx-mdp3-20240102.ohlcv-1d.csv
+FILENAME_PATTERN = re.compile(r"-(\d{8})(?:-(\d{8}))?\.[^.]+\.csv$")
+
+# condition.json values that mean a date's data may be incomplete
+BAD_CONDITIONS = ("degraded", "pending", "missing")
+
+
+def _read_json(path: Path) -> Any:
+    """Load a sidecar JSON file, or None if it is missing or malformed."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _parse_file(
+    csv_path: Path,
+    cache_path: Path,
+    fingerprint: Dict[str, Any],
+    use_cache: bool,
+    instruments: Optional[Dict[int, Instrument]] = None,
+) -> Tuple[DatabentoColumns, Optional[str]]:
+    """
+    Parse one CSV (and write its cache). Runs in a worker process.
+
+    Returns:
+        (columns, error) where error describes a failed cache write
+    """
+    columns = DatabentoColumns.from_csv(csv_path, instruments)
+    error = None
+    if use_cache:
+        try:
+            columns.save(cache_path, fingerprint)
+        except OSError as e:
+            error = str(e)
+    return columns, error
+
+
+class CatalogFile:
+    """One data file of a Databento download and the dates it covers."""
+
+    def __init__(
+        self,
+        path: Path,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        expected_size: Optional[int] = None,
+        expected_sha256: Optional[str] = None,
+        job_id: Optional[str] = None,
+    ):
+        self.path = path
+        # Inclusive date ordinals; None = unknown (always opened)
+        self.start = start
+        self.end = end
+        self.expected_size = expected_size
+        self.expected_sha256 = expected_sha256
+        self.job_id = job_id
+
+    def __repr__(self) -> str:
+        return f"CatalogFile({self.path.name!r}, start={self.start}, end={self.end})"
+
+    def overlaps(self, lo: Optional[int], hi: Optional[int]) -> bool:
+        """True if the file may hold bars with dates in ``[lo, hi]``."""
+        if lo is not None and self.end is not None and self.end < lo:
+            return False
+        if hi is not None and self.start is not None and self.start > hi:
+            return False
+        return True
+
+
+class DatabentoCatalog(LoggingMixin):
+    """
+    Index of the Databento files of one schema under a data directory.
+
+    Usage:
+        catalog = DatabentoCatalog("databento/BTC")
+        columns = catalog.load(datetime(2024, 1, 1), datetime(2024, 12, 31))
+    """
+
+    def __init__(
+        self,
+        data_dir,
+        schema: str = "ohlcv-1d",
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+        registry: Optional[DatasetRegistry] = None,
+    ):
+        self.data_dir = Path(data_dir)
+        self.schema = schema
+        self.use_cache = use_cache
+        self.max_workers = max_workers
+        self._files: Optional[List[CatalogFile]] = None
+        self._conditions: Dict[int, str] = {}
+        self._symbology: Dict[Path, Dict[int, Instrument]] = {}
+        self.registry = registry if registry is not None else get_registry()
+        # Most recent load() result, keyed by the files it covers
+        self._merged: Optional[Tuple[Tuple[Path, ...], DatabentoColumns]] = None
+
+    @property
+    def files(self) -> List[CatalogFile]:
+        """All data files of the schema, oldest span first."""
+        if self._files is None:
+            self.refresh()
+        return self._files
+
+    @property
+    def conditions(self) -> Dict[int, str]:
+        """Data condition per date ordinal, from every condition.json found."""
+        if self._files is None:
+            self.refresh()
+        return self._conditions
+
+    def refresh(self) -> None:
+        """Rescan the data directory (e.g. after a new download)."""
+        files = []
+        self._conditions = {}
+        self._symbology = {}
+        self._merged = None
+        if self.data_dir.exists():
+            for folder in sorted({p.parent for p in self.data_dir.rglob(f"*.{self.schema}.csv")}):
+                files.extend(self._scan_folder(folder))
+        self._files = sorted(
+            files,
+            key=lambda f: (
+                f.start if f.start is not None else 0,
+                f.end if f.end is not None else 0,
+                str(f.path),
+            ),
+        )
+
+    def _scan_folder(self, folder: Path) -> List[CatalogFile]:
+        """Catalog the data files of one download folder using its sidecars."""
+        manifest = _read_json(folder / "manifest.json") or {}
+        metadata = _read_json(folder / "metadata.json") or {}
+        conditions = _read_json(folder / "condition.json") or []
+
+        expected = {}
+        for entry in manifest.get("files", []):
+            digest = entry.get("hash", "")
+            expected[entry.get("filename")] = (
+                entry.get("size"),
+                digest.split(":", 1)[1] if digest.startswith("sha256:") else None,
+            )
+
+        # Query span: fallback for files whose names carry no dates
+        query = metadata.get("query", {})
+        query_lo = query_hi = None
+        if query.get("schema", self.schema) == self.schema:
+            if query.get("start") is not None:
+                query_lo = EPOCH_ORDINAL + int(query["start"]) // NS_PER_DAY
+            if query.get("end") is not None:
+                # Query end is exclusive
+                query_hi = EPOCH_ORDINAL + (int(query["end"]) - 1) // NS_PER_DAY
+
+        for entry in conditions:
+            try:
+                day = datetime.strptime(entry["date"], "%Y-%m-%d").toordinal()
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._conditions[day] = entry.get("condition", "")
+
+        files = []
+        for path in sorted(folder.glob(f"*.{self.schema}.csv")):
+            start, end = query_lo, query_hi
+            match = FILENAME_PATTERN.search(path.name)
+            if match:
+                start = datetime.strptime(match.group(1), "%Y%m%d").toordinal()
+                end = datetime.strptime(match.group(2) or match.group(1), "%Y%m%d").toordinal()
+            size, sha256 = expected.get(path.name, (None, None))
+            files.append(CatalogFile(path, start, end, size, sha256, metadata.get("job_id")))
+        return files
+
+    def select(self, start_date: datetime = None, end_date: datetime = None) -> List[CatalogFile]:
+        """Files whose date span overlaps ``[start_date, end_date]``."""
+        lo, hi = ordinal_bounds(start_date, end_date)
+        return [f for f in self.files if f.overlaps(lo, hi)]
+
+    def bad_dates(self, start_date: datetime = None, end_date: datetime = None) -> List[Tuple[datetime, str]]:
+        """Dates in the range that condition.json marks as not fully available."""
+        lo, hi = ordinal_bounds(start_date, end_date)
+        return [
+            (datetime.fromordinal(day), condition)
+            for day, condition in sorted(self.conditions.items())
+            if condition in BAD_CONDITIONS
+            and (lo is None or day >= lo)
+            and (hi is None or day <= hi)
+        ]
+
+    @staticmethod
+    def cache_path_for(csv_path: Path) -> Path:
+        """Path of the columnar cache for a given CSV."""
+        return csv_path.with_suffix(CACHE_SUFFIX)
+
+    def load(self, start_date: datetime = None, end_date: datetime = None) -> DatabentoColumns:
+        """
+        Columns of every file overlapping the date range, merged.
+
+        Files are opened from their caches when valid; the rest are parsed
+        (in parallel when more than one needs parsing). Results are memoized
+        per set of files, so repeated queries over the same span are free.
+        Rows outside the range are not trimmed; query methods bisect them.
+        """
+        selected = self.select(start_date, end_date)
+        key = tuple(f.path for f in selected)
+        if self._merged is not None and self._merged[0] == key:
+            return self._merged[1]
+
+        stores: Dict[Path, DatabentoColumns] = {}
+        pending = []
+        # Single-flight: a file another thread is loading is waited for,
+        # then found in the registry
+        with self.registry.loading(key):
+            for entry in selected:
+                # Shared registry first: another fetcher may have loaded this file
+                previous = self.registry.fingerprint(entry.path)
+                if previous is not None:
+                    fingerprint = file_fingerprint(entry.path, previous)
+                    shared = self.registry.get(entry.path, fingerprint)
+                    if shared is not None:
+                        stores[entry.path] = shared
+                        continue
+                fingerprint, cached = self._open_cache(entry)
+                if cached is not None:
+                    stores[entry.path] = cached
+                    self.registry.put(entry.path, fingerprint, cached)
+                else:
+                    pending.append((entry, fingerprint))
+
+            if pending:
+                stores.update(self._parse(pending))
+
+        # Where downloads overlap, bars from the most recently written file win
+        newest_last = sorted(selected, key=lambda f: f.path.stat().st_mtime_ns)
+        merged = DatabentoColumns.merge([stores[f.path] for f in newest_last])
+        self._merged = (key, merged)
+
+        bad = self.bad_dates(start_date, end_date)
+        if bad:
+            self.log(f"[!] Databento condition.json flags {len(bad)} date(s) in range as not available: "
+                     f"{', '.join(f'{d.date()} ({c})' for d, c in bad[:5])}{' ...' if len(bad) > 5 else ''}")
+        return merged
+
+    def _open_cache(self, entry: CatalogFile) -> Tuple[Dict[str, Any], Optional[DatabentoColumns]]:
+        """Validate a file against the manifest and open its cache if still valid."""
+        csv_path = entry.path
+        cache_path = self.cache_path_for(csv_path)
+        cached = DatabentoColumns.load(cache_path) if self.use_cache else None
+        fingerprint = file_fingerprint(csv_path, cached.source if cached else None)
+
+        if entry.expected_size is not None and fingerprint["size"] != entry.expected_size:
+            self.log(
+                f"[!] {csv_path.name} is {fingerprint['size']} bytes, manifest says "
+                f"{entry.expected_size} (incomplete download?)"
+            )
+        elif entry.expected_sha256 and fingerprint["sha256"] != entry.expected_sha256:
+            self.log(f"[!] {csv_path.name} does not match its manifest sha256")
+
+        if cached is not None:
+            if fingerprint == cached.source:
+                self.log(f"[OK] Loaded {len(cached)} rows from Databento cache: {cache_path}")
+                return fingerprint, cached
+            if fingerprint["sha256"] == cached.source.get("sha256"):
+                # Touched but unchanged: refresh the stamp without reparsing
+                self._save_cache(cached, cache_path, fingerprint)
+                self.log(f"[OK] Loaded {len(cached)} rows from Databento cache: {cache_path}")
+                return fingerprint, cached
+            self.log(f"[*] Databento cache is stale, rebuilding: {cache_path}")
+        return fingerprint, None
+
+    def _save_cache(self, columns: DatabentoColumns, cache_path: Path, fingerprint: Dict[str, Any]) -> None:
+        """Persist the columnar cache, logging (not raising) on failure."""
+        try:
+            columns.save(cache_path, fingerprint)
+        except OSError as e:
+            self.log(f"[!] Could not write Databento cache {cache_path}: {e}")
+
+    def _instruments(self, folder: Path) -> Dict[int, Instrument]:
+        """Contract table decoded from a folder's symbology.json (memoized)."""
+        if folder not in self._symbology:
+            self._symbology[folder] = load_symbology(folder / "symbology.json")
+        return self._symbology[folder]
+
+    def _parse(self, pending: List[Tuple[CatalogFile, Dict[str, Any]]]) -> Dict[Path, DatabentoColumns]:
+        """Parse files without a valid cache, in worker processes when several."""
+        jobs = [
+            (
+                entry.path,
+                self.cache_path_for(entry.path),
+                fingerprint,
+                self.use_cache,
+                self._instruments(entry.path.parent),
+            )
+            for entry, fingerprint in pending
+        ]
+        for csv_path, *_ in jobs:
+            self.log(f"[*] Loading Databento CSV: {csv_path}")
+
+        workers = self.max_workers or os.cpu_count() or 1
+        if len(jobs) > 1 and workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                results = list(pool.map(_parse_file, *zip(*jobs)))
+        else:
+            results = [_parse_file(*job) for job in jobs]
+
+        stores = {}
+        for (csv_path, cache_path, fingerprint, _, _), (columns, error) in zip(jobs, results):
+            if error is not None:
+                self.log(f"[!] Could not write Databento cache {cache_path}: {error}")
+            stores[csv_path] = columns
+            self.registry.put(csv_path, fingerprint, columns)
+            self.log(f"[OK] Loaded {len(columns)} rows from Databento CSV")
+        return stores
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Continuous futures construction from a Databento columnar store.
+
+Maps every trading date to its front contract in one sorted pass over the
+expiry schedule, then optionally back-adjusts prices across rolls.
+
+Roll policies:
+    calendar       Hold a contract through its expiry date (front month).
+    business_days  Hold a contract through ``roll_days`` business days
+                   before its expiry, then roll to the next month.
+    volume         Roll forward when a later contract trades more volume
+                   than the held one (or the held one has expired).
+
+Back-adjustment:
+    None           Raw front-contract prices (gaps at every roll).
+    "difference"   Shift history by the price gap at each roll.
+    "ratio"        Scale history by the price ratio at each roll.
+
+Adjustments are applied backwards, so the latest prices are unchanged.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from crypto_data.data.databento import ordinal_bounds
+from crypto_data.utils.expiry import generate_expiry_schedule
+
+ROLL_POLICIES = ("calendar", "business_days", "volume")
+ADJUSTMENTS = (None, "difference", "ratio")
+
+
+def subtract_business_days(day: datetime, n: int) -> datetime:
+    """
+    Step back ``n`` business days (Mon-Fri, no holiday calendar).
+
+    Args:
+        day: Starting date
+        n: Number of business days to subtract (0 returns ``day``)
+
+    Returns:
+        Date ``n`` business days before ``day``
+    """
+    current = day
+    while n > 0:
+        current -= timedelta(days=1)
+        if current.weekday() < 5:
+            n -= 1
+    return current
+
+
+def _price_on_or_before(columns, contract_id: int, ordinal: int) -> Optional[float]:
+    """Close of a contract on ``ordinal``, or its last close before it."""
+    start, stop = columns.contract_range(contract_id)
+    i = bisect_right(columns.date, ordinal, start, stop)
+    if i == start:
+        return None
+    return columns.close[i - 1]
+
+
+def _assign_calendar(days: List[int], last_hold: List[int]) -> List[int]:
+    """Month index per day: first month whose last holding day is >= day."""
+    months = []
+    k = 0
+    last = len(last_hold) - 1
+    for day in days:
+        # days are sorted, so the front index only ever moves forward
+        while k < last and last_hold[k] < day:
+            k += 1
+        months.append(k)
+    return months
+
+
+def _assign_volume(
+    days: List[int],
+    expiries: List[int],
+    bars: List[Dict[int, tuple]],
+) -> List[int]:
+    """Month index per day using a max-volume crossover that never rolls back."""
+    months = []
+    k = None
+    for day, day_bars in zip(days, bars):
+        if k is None or expiries[k] < day:
+            # Start (or forced roll): the busiest live month trading today
+            live = [m for m in day_bars if expiries[m] >= day]
+            candidates = live or list(day_bars)
+            k = max(candidates, key=lambda m: (day_bars[m][1], -m))
+        else:
+            held_volume = day_bars[k][1] if k in day_bars else -1
+            later = [m for m in day_bars if m > k and day_bars[m][1] > held_volume]
+            if later:
+                k = max(later, key=lambda m: (day_bars[m][1], -m))
+        months.append(k)
+    return months
+
+
+def build_continuous_series(
+    columns,
+    symbol: str,
+    start_date: datetime,
+    end_date: datetime,
+    roll: str = "calendar",
+    roll_days: int = 0,
+    adjustment: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build a continuous futures series for one base symbol.
+
+    Args:
+        columns: DatabentoColumns store
+        symbol: Base symbol (e.g., 'MBT')
+        start_date: First date (inclusive)
+        end_date: Last date (inclusive)
+        roll: Roll policy, one of ROLL_POLICIES
+        roll_days: Business days before expiry to roll ('business_days' only)
+        adjustment: Back-adjustment, one of ADJUSTMENTS
+
+    Returns:
+        List of dicts with keys: date, futures_price, contract.
+        Dates where the selected contract has no bar are skipped.
+    """
+    if roll not in ROLL_POLICIES:
+        raise ValueError(f"Unknown roll policy '{roll}'. Available: {list(ROLL_POLICIES)}")
+    if adjustment not in ADJUSTMENTS:
+        raise ValueError(f"Unknown adjustment '{adjustment}'. Available: {list(ADJUSTMENTS)}")
+
+    base_id = columns.base_index.get(symbol)
+    if base_id is None:
+        return []
+
+    lo, hi = ordinal_bounds(start_date, end_date)
+
+    # Monthly expiry schedule; map each month to its contract id (if listed)
+    schedule = generate_expiry_schedule(start_date, end_date)
+    by_month = {
+        (year, month): cid
+        for cid, (_, b, year, month) in enumerate(columns.contracts)
+        if b == base_id
+    }
+    month_ids = [by_month.get((e.year, e.month)) for e in schedule]
+    expiries = [e.toordinal() for e in schedule]
+
+    # Per-day bars of every scheduled contract inside the window
+    bars_by_day: Dict[int, Dict[int, tuple]] = {}
+    for m, cid in enumerate(month_ids):
+        if cid is None:
+            continue
+        start, stop = columns.contract_range(cid, lo, hi)
+        for i in range(start, stop):
+            bars_by_day.setdefault(columns.date[i], {}).setdefault(
+                m, (columns.close[i], columns.volume[i])
+            )
+
+    days = sorted(bars_by_day)
+    if roll == "volume":
+        months = _assign_volume(days, expiries, [bars_by_day[d] for d in days])
+    else:
+        n = roll_days if roll == "business_days" else 0
+        last_hold = [subtract_business_days(e, n).toordinal() for e in schedule]
+        months = _assign_calendar(days, last_hold)
+
+    dates_out = []
+    prices = []
+    held = []
+    for day, m in zip(days, months):
+        bar = bars_by_day[day].get(m)
+        if bar is None:
+            continue
+        dates_out.append(day)
+        prices.append(bar[0])
+        held.append(m)
+
+    if adjustment is not None:
+        raw = list(prices)
+        offset = 0.0
+        factor = 1.0
+        for j in range(len(raw) - 2, -1, -1):
+            if held[j] != held[j + 1]:
+                # Roll between j and j+1: compare both contracts on the roll day
+                old_price = _price_on_or_before(columns, month_ids[held[j]], dates_out[j + 1])
+                if old_price is not None:
+                    if adjustment == "difference":
+                        offset += raw[j + 1] - old_price
+                    elif old_price:
+                        factor *= raw[j + 1] / old_price
+            if adjustment == "difference":
+                prices[j] = raw[j] + offset
+            else:
+                prices[j] = raw[j] * factor
+
+    return [
+        {
+            "date": datetime.fromordinal(day),
+            "futures_price": price,
+            "contract": columns.contracts[month_ids[m]][0],
+        }
+        for day, price, m in zip(dates_out, prices, held)
+    ]
@@ -7,14 +7,17 @@ interface as IBKRHistoricalFetcher for futures data.
 """
 
 import csv
-from collections import defaultdict
-from datetime import datetime
+import hashlib
+import json
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
 
+from crypto_data.data.term_structure import DEFAULT_TENORS, TermStructure, build_term_structure
+from crypto_data.utils.columnar import read_columns, write_columns
 from crypto_data.utils.expiry import (
-    generate_expiry_schedule,
-    get_front_month_expiry,
     get_front_month_expiry_str,
     get_last_friday_of_month,
 )
@@ -30,10 +33,753 @@ CME_MONTH_CODES = {
 # Reverse: month number to letter
 MONTH_TO_CME_CODE = {v: k for k, v in CME_MONTH_CODES.items()}
 
-# Base year for year-digit decoding.
+# Base year for year-digit decoding when no reference date is known.
 # CME year digits cycle every 10 years. Digit "1" = 2021, ..., "6" = 2026.
+# With a reference date (listing date from symbology.json, or the first bar)
+# the digit resolves to the first matching year on or after it instead.
 YEAR_DIGIT_BASE = 2020
 
+# Columnar cache written next to each Databento CSV (see DatabentoColumns).
+CACHE_SUFFIX = ".cols"
+CACHE_VERSION = 4
+
+
+def file_fingerprint(path: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Fingerprint a file by size, mtime and SHA-256 content hash.
+
+    The hash is only recomputed when size or mtime differ from ``previous``,
+    so validating an unchanged file costs a single stat() call.
+
+    Args:
+        path: File to fingerprint
+        previous: Fingerprint from an earlier call, if any
+
+    Returns:
+        Dict with 'size', 'mtime_ns' and 'sha256' keys
+    """
+    st = path.stat()
+    if (
+        previous
+        and previous.get("size") == st.st_size
+        and previous.get("mtime_ns") == st.st_mtime_ns
+    ):
+        return previous
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+def ordinal_bounds(
+    start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Convert a datetime filter window into inclusive date-ordinal bounds.
+
+    Daily bars are stamped at midnight, so a start_date with a time
+    component excludes its own day (matching ``bar_date < start_date``).
+    """
+    lo = hi = None
+    if start_date is not None:
+        lo = start_date.toordinal()
+        if start_date != datetime.fromordinal(lo):
+            lo += 1
+    if end_date is not None:
+        hi = end_date.toordinal()
+    return lo, hi
+
+
+def resolve_year_digit(digit: int, reference: Optional[datetime] = None) -> int:
+    """
+    Decode a CME single-digit contract year.
+
+    A contract trades before it expires, so its year is the first year on
+    or after ``reference`` (a date the contract was listed or traded) that
+    ends in ``digit``. Without a reference, falls back to YEAR_DIGIT_BASE.
+    """
+    if reference is None:
+        return YEAR_DIGIT_BASE + digit
+    year = reference.year - reference.year % 10 + digit
+    if year < reference.year:
+        year += 10
+    return year
+
+
+class Instrument(NamedTuple):
+    """Decoded Databento instrument (one row of the contract table)."""
+
+    instrument_id: int
+    symbol: str
+    base: Optional[str]
+    year: Optional[int]
+    month: Optional[int]
+    is_spread: bool
+
+
+def decode_symbol(
+    symbol: str, instrument_id: int = 0, reference: Optional[datetime] = None
+) -> Optional[Instrument]:
+    """
+    Decode a Databento symbol ('MBTG6', or spread 'MBTG6-MBTH6').
+
+    Args:
+        symbol: Raw symbol
+        instrument_id: Databento instrument_id, if known
+        reference: A date the instrument was listed or traded, used to
+                   resolve the year digit (see resolve_year_digit)
+
+    Returns:
+        Instrument, or None if the symbol is not a CME futures symbol
+    """
+    if "-" in symbol:
+        return Instrument(instrument_id, symbol, None, None, None, True)
+    if len(symbol) < 4:
+        return None
+
+    year_digit = symbol[-1]
+    month_code = symbol[-2]
+    if not year_digit.isdigit() or month_code not in CME_MONTH_CODES:
+        return None
+
+    return Instrument(
+        instrument_id,
+        symbol,
+        symbol[:-2],
+        resolve_year_digit(int(year_digit), reference),
+        CME_MONTH_CODES[month_code],
+        False,
+    )
+
+
+def decode_spread_legs(
+    symbol: str, reference: Optional[datetime] = None
+) -> Optional[Tuple[Instrument, Instrument]]:
+    """
+    Decode the legs of a calendar spread like 'MBTG6-MBTH6'.
+
+    Returns:
+        (near, far) Instruments, or None unless the symbol is a two-leg
+        spread of the same base with the far leg expiring later
+    """
+    parts = symbol.split("-")
+    if len(parts) != 2:
+        return None
+    near, far = (decode_symbol(part, reference=reference) for part in parts)
+    if near is None or far is None or near.is_spread or far.is_spread:
+        return None
+    if near.base != far.base or (near.year, near.month) >= (far.year, far.month):
+        return None
+    return near, far
+
+
+def _spread_columns(rows: List[Tuple[int, float, int, int, int]]) -> Dict[str, array]:
+    """Spread rows (date, close, volume, near, far) as typed columns."""
+    return {
+        "spread_date": array("i", (r[0] for r in rows)),
+        "spread_close": array("d", (r[1] for r in rows)),
+        "spread_volume": array("q", (r[2] for r in rows)),
+        "spread_near": array("i", (r[3] for r in rows)),
+        "spread_far": array("i", (r[4] for r in rows)),
+    }
+
+
+def load_symbology(path) -> Dict[int, Instrument]:
+    """
+    Build an instrument_id-keyed contract table from a symbology.json.
+
+    Each symbol's mapping intervals give its instrument_id and the first
+    date it was live (``d0``), which pins down the contract year.
+
+    Returns:
+        Dict of instrument_id -> Instrument (empty if the file is missing)
+    """
+    try:
+        with open(path, "r") as f:
+            result = json.load(f).get("result", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+    table: Dict[int, Instrument] = {}
+    for symbol, intervals in result.items():
+        for interval in intervals or []:
+            try:
+                instrument_id = int(interval["s"])
+                listed = datetime.strptime(interval["d0"], "%Y-%m-%d")
+            except (KeyError, TypeError, ValueError):
+                continue
+            if instrument_id in table:
+                continue
+            decoded = decode_symbol(symbol, instrument_id, listed)
+            if decoded is not None:
+                table[instrument_id] = decoded
+    return table
+
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+
+# Value columns of an OHLCV record, in file order
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _format_ts(value: datetime) -> str:
+    """Format a datetime the way Databento writes pretty_ts timestamps."""
+    return f"{value:%Y-%m-%dT%H:%M:%S}.{value.microsecond * 1000:09d}Z"
+
+
+def parse_ts_event(value: str, day_cache: Optional[Dict[str, int]] = None) -> int:
+    """
+    Parse a Databento ``ts_event`` into integer nanoseconds since the epoch.
+
+    Accepts both pretty timestamps (``2024-01-05T14:30:00.000000000Z``) and
+    raw integer nanoseconds. The date part is memoized in ``day_cache``.
+    """
+    if "T" not in value:
+        return int(value)
+    day_key = value[:10]
+    day_ns = day_cache.get(day_key) if day_cache is not None else None
+    if day_ns is None:
+        day_ns = (datetime.strptime(day_key, "%Y-%m-%d").toordinal() - EPOCH_ORDINAL) * NS_PER_DAY
+        if day_cache is not None:
+            day_cache[day_key] = day_ns
+    clock = value[11:19]
+    if clock == "00:00:00":
+        seconds = 0
+    else:
+        seconds = int(clock[:2]) * 3600 + int(clock[3:5]) * 60 + int(clock[6:8])
+    fraction = value[20:-1] if len(value) > 20 else ""
+    nanos = int(fraction.ljust(9, "0")[:9]) if fraction else 0
+    return day_ns + seconds * NS_PER_SECOND + nanos
+
+
+class OHLCVBatch:
+    """
+    A fixed-size batch of OHLCV rows held as parallel typed arrays.
+
+    ``ts_event`` is int64 nanoseconds since the epoch (UTC). Symbols are
+    stored as ``symbol_id`` codes into ``symbols``, a table shared by all
+    batches of one reader. Value columns are in ``fields`` (float64 prices,
+    int64 volume).
+    """
+
+    def __init__(self, fields: Iterable[str], symbols: List[str]):
+        self.ts_event = array("q")
+        self.instrument_id = array("q")
+        self.symbol_id = array("i")
+        self.symbols = symbols
+        self.fields = {name: array("q" if name == "volume" else "d") for name in fields}
+
+    def __len__(self) -> int:
+        return len(self.ts_event)
+
+    def __getitem__(self, name: str) -> array:
+        if name in self.fields:
+            return self.fields[name]
+        return getattr(self, name)
+
+    def symbol(self, i: int) -> str:
+        """Symbol of row ``i``."""
+        return self.symbols[self.symbol_id[i]]
+
+    def timestamp(self, i: int) -> datetime:
+        """Timestamp of row ``i`` as a naive UTC datetime."""
+        ns = self.ts_event[i]
+        return datetime.fromordinal(EPOCH_ORDINAL + ns // NS_PER_DAY) + timedelta(
+            microseconds=(ns % NS_PER_DAY) // 1000
+        )
+
+
+def iter_ohlcv_batches(
+    csv_path,
+    symbols: Optional[Iterable[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 65_536,
+    fields: Iterable[str] = OHLCV_FIELDS,
+    include_spreads: bool = False,
+) -> Iterator[OHLCVBatch]:
+    """
+    Stream a Databento OHLCV CSV (any bar size) as fixed-size column batches.
+
+    Filters are pushed down ahead of parsing: each line's symbol is checked
+    (spreads, symbol set) and its timestamp compared as a string against the
+    window before any float or date conversion happens. Databento files are
+    ordered by ``ts_event``, so reading stops at the first row past ``end``.
+    Peak memory is one batch regardless of file size.
+
+    Args:
+        csv_path: Path to a Databento OHLCV CSV (e.g. ``*.ohlcv-1m.csv``)
+        symbols: Only yield these symbols (None = all)
+        start: Inclusive lower timestamp bound (naive UTC)
+        end: Inclusive upper timestamp bound (naive UTC)
+        batch_size: Maximum rows per batch
+        fields: Value columns to parse (subset of OHLCV_FIELDS)
+        include_spreads: Keep calendar-spread symbols (containing "-")
+
+    Yields:
+        OHLCVBatch objects with up to ``batch_size`` rows
+    """
+    fields = tuple(fields)
+    wanted = set(symbols) if symbols is not None else None
+    symbol_table: List[str] = []
+    symbol_codes: Dict[str, int] = {}
+    day_cache: Dict[str, int] = {}
+
+    start_key = _format_ts(start) if start is not None else None
+    end_key = _format_ts(end) if end is not None else None
+    start_ns = end_ns = None
+
+    with open(csv_path, "r", newline="") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+        if not header or header == [""]:
+            return
+        n_cols = len(header)
+        i_ts = header.index("ts_event")
+        i_symbol = header.index("symbol")
+        i_instrument = header.index("instrument_id")
+        value_index = [(header.index(name), name) for name in fields]
+        symbol_last = i_symbol == n_cols - 1
+
+        def _appenders(target: OHLCVBatch):
+            return [
+                (index, target.fields[name].append, int if name == "volume" else float)
+                for index, name in value_index
+            ]
+
+        batch = OHLCVBatch(fields, symbol_table)
+        appenders = _appenders(batch)
+        pretty = None
+        for line in f:
+            line = line.rstrip("\r\n")
+            if not line:
+                continue
+
+            # --- predicate pushdown: symbol, then timestamp, both as strings ---
+            if symbol_last:
+                symbol = line[line.rfind(",") + 1:]
+                parts = None
+            else:
+                parts = line.split(",")
+                symbol = parts[i_symbol]
+            if not include_spreads and "-" in symbol:
+                continue
+            if wanted is not None and symbol not in wanted:
+                continue
+
+            if parts is None:
+                parts = line.split(",", n_cols - 1)
+            ts = parts[i_ts]
+            if pretty is None:
+                pretty = "T" in ts
+                if not pretty:
+                    start_ns = parse_ts_event(start_key) if start_key else None
+                    end_ns = parse_ts_event(end_key) if end_key else None
+            if pretty:
+                if start_key is not None and ts < start_key:
+                    continue
+                if end_key is not None and ts > end_key:
+                    break
+                ts_ns = parse_ts_event(ts, day_cache)
+            else:
+                ts_ns = int(ts)
+                if start_ns is not None and ts_ns < start_ns:
+                    continue
+                if end_ns is not None and ts_ns > end_ns:
+                    break
+
+            # --- row passed all filters: parse values ---
+            code = symbol_codes.get(symbol)
+            if code is None:
+                code = symbol_codes[symbol] = len(symbol_table)
+                symbol_table.append(symbol)
+
+            batch.ts_event.append(ts_ns)
+            batch.instrument_id.append(int(parts[i_instrument]))
+            batch.symbol_id.append(code)
+            for index, append, convert in appenders:
+                append(convert(parts[index]))
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = OHLCVBatch(fields, symbol_table)
+                appenders = _appenders(batch)
+
+        if len(batch):
+            yield batch
+
+
+class DatabentoColumns:
+    """
+    Columnar store of outright-contract bars from a Databento OHLCV file.
+
+    Rows are held as parallel typed arrays (``array.array`` when freshly
+    parsed, ``memoryview`` over an mmap when loaded from cache):
+
+        date      int32  proleptic Gregorian ordinal of the bar date
+        close     float64
+        volume    int64
+        contract  int32  index into ``contracts``
+        base      int16  index into ``bases``
+
+    Per-contract attributes (expiry date, YYYYMM, base symbol) live in small
+    lookup tables, so they are computed once per contract instead of per row.
+
+    Rows are sorted by (contract, date), so each contract occupies the
+    contiguous slice ``offsets[cid]:offsets[cid + 1]`` and date-range queries
+    are a binary search within that slice.
+
+    Calendar spread bars are kept separately, sorted by date, with their
+    legs as contract ids (``spread_near``/``spread_far``). Term-structure
+    cubes built from both (see crypto_data.data.term_structure) are stored
+    in the same cache file.
+    """
+
+    COLUMNS = ("date", "close", "volume", "contract", "base")
+    SPREAD_COLUMNS = ("spread_date", "spread_close", "spread_volume", "spread_near", "spread_far")
+
+    def __init__(
+        self,
+        date,
+        close,
+        volume,
+        contract,
+        base,
+        contracts: List[Tuple[str, int, int, int]],
+        bases: List[str],
+        offsets: Optional[List[int]] = None,
+        source: Optional[Dict[str, Any]] = None,
+        storage=None,
+        spreads: Optional[Dict[str, Any]] = None,
+        term_structures: Optional[Dict[str, TermStructure]] = None,
+    ):
+        self.date = date
+        self.close = close
+        self.volume = volume
+        self.contract = contract
+        self.base = base
+        spreads = spreads or {}
+        self.spread_date = spreads.get("spread_date", array("i"))
+        self.spread_close = spreads.get("spread_close", array("d"))
+        self.spread_volume = spreads.get("spread_volume", array("q"))
+        self.spread_near = spreads.get("spread_near", array("i"))
+        self.spread_far = spreads.get("spread_far", array("i"))
+        self.term_structures: Dict[str, TermStructure] = dict(term_structures or {})
+        # (symbol, base_id, year, month) per contract id
+        self.contracts = [tuple(c) for c in contracts]
+        self.bases = list(bases)
+        self.source = source or {}
+        self._storage = storage
+        self.offsets = list(offsets) if offsets is not None else self._build_offsets()
+
+        self.contract_index = {c[0]: i for i, c in enumerate(self.contracts)}
+        # (base symbol, YYYYMM) -> contract id; unambiguous across decades
+        self.contract_by_expiry = {
+            (self.bases[b], f"{year:04d}{month:02d}"): i
+            for i, (_, b, year, month) in enumerate(self.contracts)
+        }
+        self.base_index = {b: i for i, b in enumerate(self.bases)}
+        self.contract_expiry = [
+            get_last_friday_of_month(year, month) for _, _, year, month in self.contracts
+        ]
+        self.contract_yyyymm = [
+            f"{year:04d}{month:02d}" for _, _, year, month in self.contracts
+        ]
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def _build_offsets(self) -> List[int]:
+        """Compute per-contract slice offsets from the (sorted) contract column."""
+        offsets = [0] * (len(self.contracts) + 1)
+        for cid in self.contract:
+            offsets[cid + 1] += 1
+        for cid in range(len(self.contracts)):
+            offsets[cid + 1] += offsets[cid]
+        return offsets
+
+    def contract_range(
+        self, contract_id: int, lo: Optional[int] = None, hi: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """
+        Row slice of one contract restricted to dates in ``[lo, hi]``.
+
+        Args:
+            contract_id: Index into ``contracts``
+            lo: Inclusive lower date ordinal (None = unbounded)
+            hi: Inclusive upper date ordinal (None = unbounded)
+
+        Returns:
+            (start, stop) row indices; empty when start == stop
+        """
+        start, stop = self.offsets[contract_id], self.offsets[contract_id + 1]
+        if lo is not None:
+            start = bisect_left(self.date, lo, start, stop)
+        if hi is not None:
+            stop = bisect_right(self.date, hi, start, stop)
+        return start, max(start, stop)
+
+    @classmethod
+    def empty(cls) -> "DatabentoColumns":
+        """Create an empty store."""
+        return cls(array("i"), array("d"), array("q"), array("i"), array("h"), [], [])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the row, spread and term-structure columns."""
+        return sum(
+            len(getattr(self, name)) * getattr(self, name).itemsize
+            for name in self.COLUMNS + self.SPREAD_COLUMNS
+        ) + sum(ts.nbytes for ts in self.term_structures.values())
+
+    def term_structure(self, symbol: str, tenors: int = DEFAULT_TENORS) -> TermStructure:
+        """
+        Date x tenor cube of outright and spread prices for a base symbol.
+
+        Cubes with the default tenor count are read from the columnar cache;
+        others are built on first use and memoized.
+        """
+        key = symbol if tenors == DEFAULT_TENORS else f"{symbol}:{tenors}"
+        cube = self.term_structures.get(key)
+        if cube is None:
+            cube = build_term_structure(self, symbol, tenors)
+            self.term_structures[key] = cube
+        return cube
+
+    @property
+    def memory_mapped(self) -> bool:
+        """True when columns are backed by a memory-mapped cache file."""
+        return self._storage is not None
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Materialize row ``i`` as a dict (same shape as the legacy loader)."""
+        cid = self.contract[i]
+        symbol, base_id, _, _ = self.contracts[cid]
+        return {
+            "date": datetime.fromordinal(self.date[i]),
+            "futures_price": self.close[i],
+            "expiry": self.contract_expiry[cid],
+            "expiry_yyyymm": self.contract_yyyymm[cid],
+            "symbol": symbol,
+            "base_symbol": self.bases[base_id],
+            "volume": self.volume[i],
+        }
+
+    @classmethod
+    def from_csv(
+        cls, csv_path: Path, instruments: Optional[Dict[int, Instrument]] = None
+    ) -> "DatabentoColumns":
+        """
+        Parse a Databento OHLCV CSV into outright and spread columns.
+
+        Rows are decoded through an instrument_id-keyed contract table, so
+        per-row work is one integer lookup plus float/int conversion.
+        Calendar spreads go to the spread columns with their legs resolved
+        to contract ids.
+        Instruments missing from ``instruments`` (or all of them, when no
+        symbology is available) are decoded from their symbol once, using
+        the date of their first bar to resolve the year digit.
+
+        Args:
+            csv_path: Path to the CSV file
+            instruments: Contract table from load_symbology(), if available
+        """
+        instruments = instruments or {}
+        date_col = array("i")
+        close_col = array("d")
+        volume_col = array("q")
+        contract_col = array("i")
+        base_col = array("h")
+
+        contracts: List[Tuple[str, int, int, int]] = []
+        contract_ids: Dict[Tuple[str, int, int], int] = {}
+        bases: List[str] = []
+        base_ids: Dict[str, int] = {}
+        # instrument_id -> (contract_id, base_id), or None for spreads/unparseable
+        instrument_ids: Dict[int, Optional[Tuple[int, int]]] = {}
+        date_ids: Dict[str, int] = {}
+        # (date, close, volume, near contract id, far contract id)
+        spread_rows: List[Tuple[int, float, int, int, int]] = []
+
+        with open(csv_path, "r", newline="") as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return cls.empty()
+            i_ts = header.index("ts_event")
+            i_instrument = header.index("instrument_id")
+            i_close = header.index("close")
+            i_volume = header.index("volume")
+            i_symbol = header.index("symbol")
+
+            def contract_id(info: Instrument) -> int:
+                if info.base not in base_ids:
+                    base_ids[info.base] = len(bases)
+                    bases.append(info.base)
+                key = (info.symbol, info.year, info.month)
+                if key not in contract_ids:
+                    contract_ids[key] = len(contracts)
+                    contracts.append((info.symbol, base_ids[info.base], info.year, info.month))
+                return contract_ids[key]
+
+            for row in reader:
+                instrument_id = int(row[i_instrument])
+                ids = instrument_ids.get(instrument_id, False)
+                if ids is False:
+                    ids = None
+                    info = instruments.get(instrument_id)
+                    first_bar = datetime.strptime(row[i_ts][:10], "%Y-%m-%d")
+                    if info is None:
+                        info = decode_symbol(row[i_symbol], instrument_id, first_bar)
+                    if info is None:
+                        pass
+                    elif not info.is_spread:
+                        ids = (contract_id(info), base_ids[info.base])
+                    else:
+                        legs = decode_spread_legs(info.symbol, first_bar)
+                        if legs is not None:
+                            # Spreads are marked by a negative contract slot
+                            ids = (-1, contract_id(legs[0]), contract_id(legs[1]))
+                    instrument_ids[instrument_id] = ids
+                if ids is None:
+                    continue
+
+                date_str = row[i_ts][:10]
+                ordinal = date_ids.get(date_str)
+                if ordinal is None:
+                    ordinal = datetime.strptime(date_str, "%Y-%m-%d").toordinal()
+                    date_ids[date_str] = ordinal
+
+                if ids[0] < 0:
+                    spread_rows.append((ordinal, float(row[i_close]), int(row[i_volume]), ids[1], ids[2]))
+                    continue
+                date_col.append(ordinal)
+                close_col.append(float(row[i_close]))
+                volume_col.append(int(row[i_volume]))
+                contract_col.append(ids[0])
+                base_col.append(ids[1])
+
+        # Sort rows by (contract, date); stable, so duplicates keep file order
+        order = sorted(range(len(date_col)), key=lambda i: (contract_col[i], date_col[i]))
+        spread_rows.sort(key=lambda r: r[0])
+        return cls(
+            array("i", (date_col[i] for i in order)),
+            array("d", (close_col[i] for i in order)),
+            array("q", (volume_col[i] for i in order)),
+            array("i", (contract_col[i] for i in order)),
+            array("h", (base_col[i] for i in order)),
+            contracts,
+            bases,
+            spreads=_spread_columns(spread_rows),
+        )
+
+    @classmethod
+    def merge(cls, stores: List["DatabentoColumns"]) -> "DatabentoColumns":
+        """
+        Combine stores parsed from separate files into one.
+
+        Contracts are matched by symbol and expiry. When the same
+        (contract, date) bar or spread bar appears in several stores, the
+        one from the later store wins, so pass stores oldest download first.
+        """
+        stores = [s for s in stores if len(s)]
+        if not stores:
+            return cls.empty()
+        if len(stores) == 1:
+            return stores[0]
+
+        contracts: List[Tuple[str, int, int, int]] = []
+        contract_ids: Dict[Tuple[str, int, int], int] = {}
+        bases: List[str] = []
+        base_ids: Dict[str, int] = {}
+        bars: Dict[Tuple[int, int], Tuple[float, int]] = {}
+        spread_bars: Dict[Tuple[int, int, int], Tuple[float, int]] = {}
+
+        for store in stores:
+            remap = []
+            for symbol, base_id, year, month in store.contracts:
+                base_symbol = store.bases[base_id]
+                if base_symbol not in base_ids:
+                    base_ids[base_symbol] = len(bases)
+                    bases.append(base_symbol)
+                key = (symbol, year, month)
+                if key not in contract_ids:
+                    contract_ids[key] = len(contracts)
+                    contracts.append((symbol, base_ids[base_symbol], year, month))
+                remap.append(contract_ids[key])
+
+            date, close, volume, contract = store.date, store.close, store.volume, store.contract
+            for i in range(len(store)):
+                bars[(remap[contract[i]], date[i])] = (close[i], volume[i])
+            for i in range(len(store.spread_date)):
+                key = (store.spread_date[i], remap[store.spread_near[i]], remap[store.spread_far[i]])
+                spread_bars[key] = (store.spread_close[i], store.spread_volume[i])
+
+        keys = sorted(bars)
+        return cls(
+            array("i", (d for _, d in keys)),
+            array("d", (bars[k][0] for k in keys)),
+            array("q", (bars[k][1] for k in keys)),
+            array("i", (c for c, _ in keys)),
+            array("h", (contracts[c][1] for c, _ in keys)),
+            contracts,
+            bases,
+            spreads=_spread_columns([
+                (d, *spread_bars[(d, near, far)], near, far)
+                for d, near, far in sorted(spread_bars)
+            ]),
+        )
+
+    def save(self, cache_path: Path, source: Dict[str, Any]) -> None:
+        """Write the store, its spreads and per-base term structures to a cache file."""
+        columns = {name: getattr(self, name) for name in self.COLUMNS + self.SPREAD_COLUMNS}
+        for base_symbol in self.bases:
+            columns.update(self.term_structure(base_symbol).columns(f"ts:{base_symbol}:"))
+        write_columns(
+            cache_path,
+            columns,
+            meta={
+                "cache_version": CACHE_VERSION,
+                "source": source,
+                "contracts": self.contracts,
+                "bases": self.bases,
+                "offsets": self.offsets,
+                "tenors": DEFAULT_TENORS,
+            },
+        )
+
+    @classmethod
+    def load(cls, cache_path: Path) -> Optional["DatabentoColumns"]:
+        """Memory-map a cache file, or return None if missing or stale format."""
+        cached = read_columns(cache_path)
+        if cached is None:
+            return None
+        meta = cached.meta
+        if meta.get("cache_version") != CACHE_VERSION or any(
+            name not in cached for name in cls.COLUMNS + cls.SPREAD_COLUMNS
+        ):
+            cached.close()
+            return None
+        term_structures = {}
+        if meta.get("tenors") == DEFAULT_TENORS:
+            for base_symbol in meta["bases"]:
+                cube = TermStructure.from_columns(base_symbol, DEFAULT_TENORS, cached, f"ts:{base_symbol}:")
+                if cube is not None:
+                    term_structures[base_symbol] = cube
+        return cls(
+            *(cached[name] for name in cls.COLUMNS),
+            contracts=meta["contracts"],
+            bases=meta["bases"],
+            offsets=meta["offsets"],
+            source=meta.get("source"),
+            storage=cached,
+            spreads={name: cached[name] for name in cls.SPREAD_COLUMNS},
+            term_structures=term_structures,
+        )
+
 
 class DatabentoLocalFetcher(LoggingMixin):
     """
@@ -41,82 +787,125 @@ class DatabentoLocalFetcher(LoggingMixin):
 
     Provides the same method interface as IBKRHistoricalFetcher for futures,
     allowing it to be used as a drop-in replacement in the accumulator.
+
+    The CSV is parsed once into a binary columnar cache stored next to it
+    (``<name>.cols``). Later runs memory-map the cache instead of reparsing;
+    it is rebuilt automatically when the CSV's size, mtime or hash changes.
     """
 
-    def __init__(self, data_dir: str = "databento"):
+    def __init__(self, data_dir: str = "databento", use_cache: bool = True, registry=None):
         self.data_dir = Path(data_dir)
+        self.use_cache = use_cache
+        # DatasetRegistry sharing loaded files between fetchers (None = process-wide)
+        self.registry = registry
+        self._catalog = None
+        self._columns: Optional[DatabentoColumns] = None
         self._data: Optional[List[Dict[str, Any]]] = None
 
     @classmethod
     def from_config(cls, config: Dict[str, Any]) -> "DatabentoLocalFetcher":
-        """Create from config dict with 'data_dir' key."""
+        """Create from config dict with 'data_dir' and optional 'use_cache' keys."""
         data_dir = config.get("data_dir", "databento")
-        return cls(data_dir=data_dir)
+        return cls(data_dir=data_dir, use_cache=config.get("use_cache", True))
 
-    def _find_csv(self) -> Optional[Path]:
-        """Find the Databento OHLCV CSV in the data directory."""
-        if not self.data_dir.exists():
-            return None
-        csv_files = list(self.data_dir.glob("*.ohlcv-1d.csv"))
-        if not csv_files:
-            return None
-        return max(csv_files, key=lambda p: p.stat().st_size)
+    @property
+    def catalog(self):
+        """DatabentoCatalog of the daily files in ``data_dir`` (created lazily)."""
+        if self._catalog is None:
+            from crypto_data.data.catalog import DatabentoCatalog
 
-    def _load_data(self) -> List[Dict[str, Any]]:
-        """Load and parse the Databento CSV, filtering out spreads."""
-        if self._data is not None:
-            return self._data
+            self._catalog = DatabentoCatalog(
+                self.data_dir, use_cache=self.use_cache, registry=self.registry
+            )
+        return self._catalog
+
+    @staticmethod
+    def cache_path_for(csv_path: Path) -> Path:
+        """Path of the columnar cache for a given CSV."""
+        return csv_path.with_suffix(CACHE_SUFFIX)
+
+    def _load_columns(self, start_date: datetime = None, end_date: datetime = None) -> DatabentoColumns:
+        """
+        Load the columnar store for a date range (default: every file).
 
-        csv_path = self._find_csv()
-        if csv_path is None:
+        Only catalog files whose span overlaps the range are opened.
+        """
+        if start_date is None and end_date is None and self._columns is not None:
+            return self._columns
+
+        if not self.catalog.files:
             self.log(f"[X] No Databento CSV found in {self.data_dir}")
-            self._data = []
-            return self._data
+            return DatabentoColumns.empty()
 
-        self.log(f"[*] Loading Databento CSV: {csv_path}")
+        columns = self.catalog.load(start_date, end_date)
+        if start_date is None and end_date is None:
+            self._columns = columns
+        return columns
 
-        rows = []
-        with open(csv_path, "r") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                symbol = row["symbol"]
+    def _load_data(self) -> List[Dict[str, Any]]:
+        """
+        Load the Databento data as a list of row dicts, filtering out spreads.
 
-                # Filter out spread symbols (contain "-")
-                if "-" in symbol:
-                    continue
+        Rows are materialized from the columnar store on first call. Query
+        methods work on the columns directly and do not need this.
+        """
+        if self._data is not None:
+            return self._data
 
-                parsed = self._parse_symbol(symbol)
-                if parsed is None:
-                    continue
+        columns = self._load_columns()
+        self._data = [columns.row(i) for i in range(len(columns))]
+        return self._data
 
-                base_symbol, year, month = parsed
+    def iter_bars(
+        self,
+        schema: str = "ohlcv-1d",
+        symbols: Optional[Iterable[str]] = None,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        batch_size: int = 65_536,
+    ) -> Iterator[OHLCVBatch]:
+        """
+        Stream bars of any OHLCV schema in bounded-memory column batches.
 
-                date_str = row["ts_event"][:10]
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d")
+        Intended for large intraday exports (``ohlcv-1h``, ``ohlcv-1m``) that
+        do not fit in memory; see iter_ohlcv_batches() for details.
 
-                close_price = float(row["close"])
-                expiry_date = get_last_friday_of_month(year, month)
-                expiry_yyyymm = f"{year:04d}{month:02d}"
+        Args:
+            schema: Databento schema suffix of the CSV to read
+            symbols: Only these symbols, e.g. {'MBTG6'} (None = all outrights)
+            start_date: Inclusive lower timestamp bound (UTC)
+            end_date: Inclusive upper timestamp bound (UTC)
+            batch_size: Maximum rows per batch
 
-                rows.append({
-                    "date": date_obj,
-                    "futures_price": close_price,
-                    "expiry": expiry_date,
-                    "expiry_yyyymm": expiry_yyyymm,
-                    "symbol": symbol,
-                    "base_symbol": base_symbol,
-                    "volume": int(row["volume"]),
-                })
+        Yields:
+            OHLCVBatch objects
+        """
+        from crypto_data.data.catalog import DatabentoCatalog
 
-        self._data = rows
-        self.log(f"[OK] Loaded {len(rows)} rows from Databento CSV")
-        return self._data
+        catalog = DatabentoCatalog(self.data_dir, schema=schema, use_cache=False)
+        files = catalog.select(start_date, end_date)
+        if not catalog.files:
+            self.log(f"[X] No Databento {schema} CSV found in {self.data_dir}")
+            return
+        for entry in files:
+            self.log(f"[*] Streaming Databento CSV: {entry.path}")
+            yield from iter_ohlcv_batches(
+                entry.path,
+                symbols=symbols,
+                start=start_date,
+                end=end_date,
+                batch_size=batch_size,
+            )
 
     @staticmethod
-    def _parse_symbol(symbol: str) -> Optional[Tuple[str, int, int]]:
+    def _parse_symbol(symbol: str, reference: Optional[datetime] = None) -> Optional[Tuple[str, int, int]]:
         """
         Parse Databento symbol like 'MBTG6' into (base_symbol, year, month).
 
+        Args:
+            symbol: Databento symbol
+            reference: Date the contract traded, to resolve the year digit
+
         Returns:
             Tuple of (base_symbol, year, month) or None if invalid.
         """
@@ -133,7 +922,7 @@ class DatabentoLocalFetcher(LoggingMixin):
             return None
 
         month = CME_MONTH_CODES[month_code]
-        year = YEAR_DIGIT_BASE + int(year_digit)
+        year = resolve_year_digit(int(year_digit), reference)
 
         return (base, year, month)
 
@@ -173,8 +962,8 @@ class DatabentoLocalFetcher(LoggingMixin):
         Returns:
             List of dicts with keys: date, futures_price, expiry
         """
-        data = self._load_data()
-        if not data:
+        columns = self._load_columns(start_date, end_date)
+        if not len(columns):
             return []
 
         if expiry is None:
@@ -184,26 +973,93 @@ class DatabentoLocalFetcher(LoggingMixin):
         target_symbol = f"{symbol}{target_suffix}"
 
         self.log(f"[*] Databento: filtering for {target_symbol} (expiry {expiry})")
+        result = self._contract_bars(columns, symbol, expiry, start_date, end_date)
+        self.log(f"[OK] Databento: {len(result)} bars for {target_symbol}")
+        return result
 
-        result = []
-        for row in data:
-            if row["symbol"] != target_symbol:
-                continue
-            if start_date and row["date"] < start_date:
-                continue
-            if end_date and row["date"] > end_date:
-                continue
+    def get_historical_futures_many(
+        self,
+        windows: List[Tuple[str, datetime, datetime]],
+        symbol: str = "MBT",
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get historical futures prices for several contracts in one load.
 
-            result.append({
-                "date": row["date"],
-                "futures_price": row["futures_price"],
-                "expiry": row["expiry"],
-            })
+        The store is loaded once for the union of the windows and each
+        contract is sliced from it through the contract index.
 
-        result.sort(key=lambda x: x["date"])
-        self.log(f"[OK] Databento: {len(result)} bars for {target_symbol}")
+        Args:
+            windows: List of (expiry YYYYMM, start_date, end_date)
+            symbol: Base symbol (e.g., 'MBT')
+
+        Returns:
+            Dict mapping expiry to the same bars get_historical_futures() returns
+        """
+        if not windows:
+            return {}
+        columns = self._load_columns(min(w[1] for w in windows), max(w[2] for w in windows))
+        result = {
+            expiry: self._contract_bars(columns, symbol, expiry, start_date, end_date)
+            for expiry, start_date, end_date in windows
+        }
+        self.log(
+            f"[OK] Databento: {sum(len(bars) for bars in result.values())} bars "
+            f"for {len(result)} {symbol} contracts"
+        )
         return result
 
+    @staticmethod
+    def _contract_bars(
+        columns: DatabentoColumns,
+        symbol: str,
+        expiry: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+    ) -> List[Dict[str, Any]]:
+        """Bars of one contract within [start_date, end_date] from the contract index."""
+        contract_id = columns.contract_by_expiry.get((symbol, expiry))
+        if contract_id is None:
+            return []
+        start, stop = columns.contract_range(contract_id, *ordinal_bounds(start_date, end_date))
+        expiry_date = columns.contract_expiry[contract_id]
+        dates, closes = columns.date, columns.close
+        return [
+            {
+                "date": datetime.fromordinal(dates[i]),
+                "futures_price": closes[i],
+                "expiry": expiry_date,
+            }
+            for i in range(start, stop)
+        ]
+
+    def get_term_structure(
+        self,
+        symbol: str = "MBT",
+        tenors: int = DEFAULT_TENORS,
+        start_date: datetime = None,
+        end_date: datetime = None,
+    ) -> TermStructure:
+        """
+        Get the date x tenor cube of outright closes and calendar spreads.
+
+        Replaces one get_historical_futures() call per contract when a whole
+        curve is needed; see crypto_data.data.term_structure for analytics
+        (calendar_basis, roll_yield, slope).
+
+        Args:
+            symbol: Base symbol (e.g., 'MBT')
+            tenors: Number of monthly tenors (front month = tenor 0)
+            start_date: Start date filter
+            end_date: End date filter
+
+        Returns:
+            TermStructure restricted to the date range
+        """
+        columns = self._load_columns(start_date, end_date)
+        cube = columns.term_structure(symbol, tenors).window(start_date, end_date)
+        self.log(f"[OK] Databento term structure: {len(cube)} dates x {tenors} tenors for {symbol}")
+        return cube
+
     def get_historical_continuous_futures(
         self,
         symbol: str = "MBT",
@@ -211,11 +1067,15 @@ class DatabentoLocalFetcher(LoggingMixin):
         start_date: datetime = None,
         end_date: datetime = None,
         bar_size: str = "1 day",
+        roll: str = "calendar",
+        roll_days: int = 0,
+        adjustment: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Build a continuous futures series by rolling front-month contracts.
 
-        For each trading date, selects the front-month contract's close price.
+        For each trading date, selects the close of the contract chosen by
+        the roll policy (see crypto_data.data.continuous).
 
         Args:
             symbol: Base symbol (e.g., 'MBT')
@@ -223,12 +1083,17 @@ class DatabentoLocalFetcher(LoggingMixin):
             start_date: Start date filter
             end_date: End date filter
             bar_size: Ignored
+            roll: Roll policy: 'calendar' (default), 'business_days' or 'volume'
+            roll_days: Business days before expiry to roll (roll='business_days')
+            adjustment: Back-adjustment: None (default), 'difference' or 'ratio'
 
         Returns:
-            List of dicts with keys: date, futures_price
+            List of dicts with keys: date, futures_price, contract
         """
-        data = self._load_data()
-        if not data:
+        from crypto_data.data.continuous import build_continuous_series
+
+        columns = self._load_columns()
+        if not len(columns):
             return []
 
         if start_date is None:
@@ -236,40 +1101,19 @@ class DatabentoLocalFetcher(LoggingMixin):
         if end_date is None:
             end_date = datetime.now()
 
-        filtered = [
-            row for row in data
-            if row["base_symbol"] == symbol
-            and start_date <= row["date"] <= end_date
-        ]
+        result = build_continuous_series(
+            columns,
+            symbol,
+            start_date,
+            end_date,
+            roll=roll,
+            roll_days=roll_days,
+            adjustment=adjustment,
+        )
 
-        if not filtered:
+        if not result:
             self.log(f"[X] No data for {symbol} in {start_date.date()}-{end_date.date()}")
             return []
 
-        expiry_schedule = generate_expiry_schedule(start_date, end_date)
-
-        by_date = defaultdict(list)
-        for row in filtered:
-            by_date[row["date"].date()].append(row)
-
-        result = []
-        for date_key in sorted(by_date.keys()):
-            date_obj = datetime.combine(date_key, datetime.min.time())
-            front_expiry = get_front_month_expiry(date_obj, expiry_schedule)
-            front_yyyymm = f"{front_expiry.year:04d}{front_expiry.month:02d}"
-
-            bars_on_date = by_date[date_key]
-            front_bar = None
-            for bar in bars_on_date:
-                if bar["expiry_yyyymm"] == front_yyyymm:
-                    front_bar = bar
-                    break
-
-            if front_bar is not None:
-                result.append({
-                    "date": date_obj,
-                    "futures_price": front_bar["futures_price"],
-                })
-
         self.log(f"[OK] Databento continuous: {len(result)} bars for {symbol}")
         return result
@@ -11,11 +11,11 @@ CONSOLIDATED from 5 files:
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Union
 import csv
-import time
 
 from crypto_data.data.base import BaseFetcher
+from crypto_data.data.ibkr_pacing import HistoricalPlan, HistoricalRequest, HistoricalScheduler
 from crypto_data.utils.expiry import get_last_friday_of_month, get_front_month_expiry_str
 
 
@@ -442,6 +442,15 @@ class IBKRHistoricalFetcher(IBKRFetcher):
         timeout: int = 10,
     ):
         super().__init__(host, port, client_id, timeout)
+        self._scheduler: Optional[HistoricalScheduler] = None
+
+    @property
+    def scheduler(self) -> HistoricalScheduler:
+        """Pacing-aware scheduler for historical requests on the current IB connection."""
+        ib = self._get_ib()
+        if self._scheduler is None or self._scheduler.ib is not ib:
+            self._scheduler = HistoricalScheduler(ib)
+        return self._scheduler
 
     def get_historical_spot(
         self,
@@ -482,7 +491,7 @@ class IBKRHistoricalFetcher(IBKRFetcher):
             duration_days = (end_date - start_date).days
             duration_str = f"{duration_days} D"
 
-            bars = self.ib.reqHistoricalData(
+            bars = self.scheduler.fetch(HistoricalRequest(
                 stock,
                 endDateTime=end_date,
                 durationStr=duration_str,
@@ -490,7 +499,7 @@ class IBKRHistoricalFetcher(IBKRFetcher):
                 whatToShow="TRADES",
                 useRTH=True,
                 formatDate=1,
-            )
+            ))
 
             self.log(f"[OK] Fetched {len(bars)} bars for {symbol}")
 
@@ -528,7 +537,8 @@ class IBKRHistoricalFetcher(IBKRFetcher):
         start_date: datetime = None,
         end_date: datetime = None,
         bar_size: str = "1 day",
-    ) -> List[Dict[str, Any]]:
+        plan: bool = False,
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
         """
         Get historical futures prices.
 
@@ -539,9 +549,11 @@ class IBKRHistoricalFetcher(IBKRFetcher):
             start_date: Start date
             end_date: End date
             bar_size: Bar size
+            plan: Return a HistoricalPlan instead of fetching, so the request
+                  can be sent with others through scheduler.fetch_all()
 
         Returns:
-            List of dicts with date, futures_price
+            List of dicts with date, futures_price (or the plan producing it)
         """
         if not self.connected:
             if not self.connect():
@@ -551,65 +563,135 @@ class IBKRHistoricalFetcher(IBKRFetcher):
         if expiry is None:
             expiry = get_front_month_expiry_str()
 
-        from ib_insync import Future
-
         try:
-            future = Future(symbol, expiry, exchange)
-            self.ib.qualifyContracts(future)
+            request, actual_expiry = self._futures_request(expiry, symbol, exchange, start_date, end_date, bar_size)
 
-            self.log(f"Fetching historical futures: {future.localSymbol}...")
+            def finish(chunks: List[List[Any]]) -> List[Dict[str, Any]]:
+                self.log(f"[OK] Fetched {len(chunks[0])} bars for {request.contract.localSymbol}")
+                return self._futures_rows(chunks[0], actual_expiry)
 
-            actual_expiry = None
-            if future.lastTradeDateOrContractMonth:
-                expiry_str = future.lastTradeDateOrContractMonth
-                if len(expiry_str) == 8:
-                    actual_expiry = datetime.strptime(expiry_str, "%Y%m%d")
-                    self.log(
-                        f"[*] Contract expiry: {actual_expiry.strftime('%Y-%m-%d (%A)')}"
-                    )
+            if plan:
+                return HistoricalPlan([request], finish)
+            return finish([self.scheduler.fetch(request)])
 
-            if not end_date:
-                end_date = datetime.now()
-            if not start_date:
-                start_date = end_date - timedelta(days=90)
+        except Exception as e:
+            self.log(f"[X] Failed to fetch futures historical data: {e}")
+            return []
 
-            duration_days = (end_date - start_date).days
-            duration_str = f"{duration_days} D"
+    def get_historical_futures_many(
+        self,
+        windows: List[Tuple[str, datetime, datetime]],
+        symbol: str = "MBT",
+        exchange: str = "CME",
+        bar_size: str = "1 day",
+        plan: bool = False,
+    ) -> Union[Dict[str, List[Dict[str, Any]]], HistoricalPlan]:
+        """
+        Get historical futures prices for several contracts concurrently.
 
-            bars = self.ib.reqHistoricalData(
-                future,
-                endDateTime=end_date,
-                durationStr=duration_str,
-                barSizeSetting=bar_size,
-                whatToShow="TRADES",
-                useRTH=True,
-                formatDate=1,
-            )
+        Requests go out through the pacing scheduler, as many at a time as
+        IB's pacing rules allow.
 
-            self.log(f"[OK] Fetched {len(bars)} bars for {future.localSymbol}")
+        Args:
+            windows: List of (expiry YYYYMM, start_date, end_date)
+            symbol: MBT or BTC
+            exchange: Futures exchange (default: 'CME')
+            bar_size: Bar size
+            plan: Return a HistoricalPlan instead of fetching
 
-            result = []
-            for bar in bars:
-                futures_price = bar.close
+        Returns:
+            Dict mapping expiry to the bars get_historical_futures() returns
+            (empty list for contracts that failed), or the plan producing it
+        """
+        result: Dict[str, List[Dict[str, Any]]] = {expiry: [] for expiry, _, _ in windows}
+        if not self.connected:
+            if not self.connect():
+                return result
 
-                if isinstance(bar.date, datetime):
-                    date_obj = bar.date
-                else:
-                    date_obj = datetime.combine(bar.date, datetime.min.time())
+        pending = []
+        for expiry, start_date, end_date in windows:
+            try:
+                request, actual_expiry = self._futures_request(expiry, symbol, exchange, start_date, end_date, bar_size)
+                pending.append((expiry, request, actual_expiry))
+            except Exception as e:
+                self.log(f"[X] Failed to qualify {symbol} {expiry}: {e}")
 
-                result.append(
-                    {
-                        "date": date_obj,
-                        "futures_price": futures_price,
-                        "expiry": actual_expiry,
-                    }
+        def finish(chunks: List[List[Any]]) -> Dict[str, List[Dict[str, Any]]]:
+            for (expiry, request, actual_expiry), bars in zip(pending, chunks):
+                self.log(f"[OK] Fetched {len(bars)} bars for {request.contract.localSymbol}")
+                result[expiry] = self._futures_rows(bars, actual_expiry)
+            return result
+
+        requests = [request for _, request, _ in pending]
+        if plan:
+            return HistoricalPlan(requests, finish)
+        return finish(self.scheduler.fetch_all(requests))
+
+    def _futures_request(
+        self,
+        expiry: str,
+        symbol: str,
+        exchange: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        bar_size: str,
+    ) -> Tuple[HistoricalRequest, Optional[datetime]]:
+        """Qualify a futures contract and build its historical request."""
+        from ib_insync import Future
+
+        future = Future(symbol, expiry, exchange)
+        self.ib.qualifyContracts(future)
+
+        self.log(f"Fetching historical futures: {future.localSymbol}...")
+
+        actual_expiry = None
+        if future.lastTradeDateOrContractMonth:
+            expiry_str = future.lastTradeDateOrContractMonth
+            if len(expiry_str) == 8:
+                actual_expiry = datetime.strptime(expiry_str, "%Y%m%d")
+                self.log(
+                    f"[*] Contract expiry: {actual_expiry.strftime('%Y-%m-%d (%A)')}"
                 )
 
-            return result
+        if not end_date:
+            end_date = datetime.now()
+        if not start_date:
+            start_date = end_date - timedelta(days=90)
+
+        duration_days = (end_date - start_date).days
+        duration_str = f"{duration_days} D"
+
+        request = HistoricalRequest(
+            future,
+            endDateTime=end_date,
+            durationStr=duration_str,
+            barSizeSetting=bar_size,
+            whatToShow="TRADES",
+            useRTH=True,
+            formatDate=1,
+        )
+        return request, actual_expiry
 
-        except Exception as e:
-            self.log(f"[X] Failed to fetch futures historical data: {e}")
-            return []
+    @staticmethod
+    def _futures_rows(bars, actual_expiry: Optional[datetime]) -> List[Dict[str, Any]]:
+        """Convert futures bars to dicts with date, futures_price, expiry."""
+        result = []
+        for bar in bars:
+            futures_price = bar.close
+
+            if isinstance(bar.date, datetime):
+                date_obj = bar.date
+            else:
+                date_obj = datetime.combine(bar.date, datetime.min.time())
+
+            result.append(
+                {
+                    "date": date_obj,
+                    "futures_price": futures_price,
+                    "expiry": actual_expiry,
+                }
+            )
+        return result
 
     def get_historical_continuous_futures(
         self,
@@ -618,7 +700,8 @@ class IBKRHistoricalFetcher(IBKRFetcher):
         start_date: datetime = None,
         end_date: datetime = None,
         bar_size: str = "1 day",
-    ) -> List[Dict[str, Any]]:
+        plan: bool = False,
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
         """
         Get historical continuous futures prices using IBKR ContFuture.
 
@@ -631,9 +714,10 @@ class IBKRHistoricalFetcher(IBKRFetcher):
             start_date: Start date
             end_date: End date
             bar_size: Bar size
+            plan: Return a HistoricalPlan instead of fetching
 
         Returns:
-            List of dicts with date, futures_price
+            List of dicts with date, futures_price (or the plan producing it)
         """
         if not self.connected:
             if not self.connect():
@@ -660,7 +744,7 @@ class IBKRHistoricalFetcher(IBKRFetcher):
                 duration_str = f"{duration_days} D"
 
             # ContFuture does not allow endDateTime; use empty string (= now)
-            bars = self.ib.reqHistoricalData(
+            request = HistoricalRequest(
                 cont,
                 endDateTime="",
                 durationStr=duration_str,
@@ -670,25 +754,31 @@ class IBKRHistoricalFetcher(IBKRFetcher):
                 formatDate=1,
             )
 
-            self.log(f"[OK] Fetched {len(bars)} continuous bars for {symbol}")
+            def finish(chunks: List[List[Any]]) -> List[Dict[str, Any]]:
+                bars = chunks[0]
+                self.log(f"[OK] Fetched {len(bars)} continuous bars for {symbol}")
 
-            result = []
-            for bar in bars:
-                if isinstance(bar.date, datetime):
-                    date_obj = bar.date
-                else:
-                    date_obj = datetime.combine(bar.date, datetime.min.time())
+                result = []
+                for bar in bars:
+                    if isinstance(bar.date, datetime):
+                        date_obj = bar.date
+                    else:
+                        date_obj = datetime.combine(bar.date, datetime.min.time())
 
-                # Filter to requested date range
-                if date_obj.date() < start_date.date():
-                    continue
+                    # Filter to requested date range
+                    if date_obj.date() < start_date.date():
+                        continue
 
-                result.append({
-                    "date": date_obj,
-                    "futures_price": bar.close,
-                })
+                    result.append({
+                        "date": date_obj,
+                        "futures_price": bar.close,
+                    })
 
-            return result
+                return result
+
+            if plan:
+                return HistoricalPlan([request], finish)
+            return finish([self.scheduler.fetch(request)])
 
         except Exception as e:
             self.log(f"[X] Failed to fetch continuous futures data: {e}")
@@ -744,17 +834,15 @@ class IBKRHistoricalFetcher(IBKRFetcher):
             self.log("[X] Failed to get spot data")
             return
 
-        # Fetch futures for each contract
+        # Fetch futures for every contract at once, paced by the scheduler
+        futures_by_expiry = self.get_historical_futures_many(
+            [(expiry, start_date, end_date) for expiry in futures_contracts],
+            symbol="MBT",
+            bar_size="1 day",
+        )
         all_futures_data = {}
         for expiry in futures_contracts:
-            futures_data = self.get_historical_futures(
-                expiry=expiry,
-                symbol="MBT",
-                start_date=start_date,
-                end_date=end_date,
-                bar_size="1 day",
-            )
-
+            futures_data = futures_by_expiry.get(expiry)
             if futures_data:
                 for entry in futures_data:
                     date_key = entry["date"].date()
@@ -767,8 +855,6 @@ class IBKRHistoricalFetcher(IBKRFetcher):
                             "expiry": expiry_date,
                         }
 
-            time.sleep(1)  # Rate limiting
-
         # Merge spot and futures data
         merged_data = []
         for spot_entry in spot_data:
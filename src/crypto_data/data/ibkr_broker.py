@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+One IBKR connection shared by several worker processes.
+
+ib_insync binds a connection to the event loop of the thread that opened
+it, so a connection cannot be handed to other processes, and each process
+opening its own would multiply client ids and split IB's pacing budget.
+The broker instead owns the only connection in the parent process. Workers
+send their IBKR calls over manager queues and block for the reply. Each
+poll of serve() takes every pending call, plans them on the broker side
+and sends all their requests in one fetcher.scheduler.fetch_all(), so the
+pairs' requests run concurrently as pacing allows. A worker's own planned
+fetches (spot and futures of one accumulate call) travel as one message.
+
+Usage (parent):
+    with multiprocessing.Manager() as manager:
+        broker = IBKRBroker(FuturesAccumulator.from_config(config.ibkr), manager)
+        futures = [pool.submit(work, broker.client()) for ...]
+        broker.serve(done=lambda: all(f.done() for f in futures))
+
+Usage (worker):
+    acc = BrokeredAccumulator(client, spot_cache=SpotCache(path))
+    acc.accumulate_many(...)  # IBKR spot/futures go through the broker
+"""
+
+import queue
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.ibkr_pacing import HistoricalPlan, as_plan, split_bars
+from crypto_data.data.spot_cache import SpotCache
+from crypto_data.utils.logging import LoggingMixin
+
+# Seconds serve() waits for a request before re-checking ``done``
+DEFAULT_POLL = 0.05
+
+# (method, kwargs) of one broker call; a worker sends a list of them
+BrokerCall = Tuple[str, Dict[str, Any]]
+# ("ok", value) or ("error", message)
+BrokerReply = Tuple[str, Any]
+
+
+class BrokerClient:
+    """Picklable handle a worker uses to call the broker."""
+
+    def __init__(self, requests, replies, client_id: int):
+        self.requests = requests
+        self.replies = replies
+        self.client_id = client_id
+
+    def call_many(self, calls: List[BrokerCall]) -> List[BrokerReply]:
+        """Send ``calls`` as one message and wait for their replies, in order."""
+        self.requests.put((self.client_id, list(calls)))
+        return self.replies.get()
+
+    def call(self, method: str, **kwargs: Any) -> Any:
+        """
+        Run ``method`` on the broker and wait for its result.
+
+        Raises:
+            RuntimeError: If the call failed in the broker
+        """
+        return self.unwrap(method, self.call_many([(method, kwargs)])[0])
+
+    @staticmethod
+    def unwrap(method: str, reply: BrokerReply) -> Any:
+        """Value of a reply, raising RuntimeError if the call failed."""
+        status, value = reply
+        if status == "error":
+            raise RuntimeError(f"IBKR broker {method} failed: {value}")
+        return value
+
+
+class IBKRBroker(LoggingMixin):
+    """Serve IBKR requests from worker processes over one connection."""
+
+    def __init__(self, accumulator: FuturesAccumulator, manager):
+        """
+        Args:
+            accumulator: Accumulator owning the IBKR fetcher (connected on
+                         first use). Its spot cache is bypassed; workers
+                         cache on their side.
+            manager: multiprocessing Manager used to create the queues
+        """
+        self.accumulator = accumulator
+        self.requests = manager.Queue()
+        self.served = 0
+        self._manager = manager
+        self._replies: Dict[int, Any] = {}
+
+    def client(self) -> BrokerClient:
+        """Create a client with its own reply queue."""
+        client_id = len(self._replies)
+        self._replies[client_id] = self._manager.Queue()
+        return BrokerClient(self.requests, self._replies[client_id], client_id)
+
+    def _plan(self, method: str, kwargs: Dict[str, Any]) -> HistoricalPlan:
+        fetcher = self.accumulator.fetcher
+        if method == "spot_history":
+            return as_plan(self.accumulator._fetch_ibkr_spot_history(plan=True, **kwargs))
+        if method == "futures":
+            return as_plan(fetcher.get_historical_futures(plan=True, **kwargs))
+        if method == "futures_many":
+            return as_plan(fetcher.get_historical_futures_many(plan=True, **kwargs))
+        if method == "continuous":
+            return as_plan(fetcher.get_historical_continuous_futures(plan=True, **kwargs))
+        raise ValueError(f"Unknown broker method '{method}'")
+
+    def _error(self, method: str, error: Exception) -> BrokerReply:
+        self.log(f"[X] Broker {method} failed: {error}")
+        return ("error", str(error))
+
+    def handle(self, batch: List[Tuple[int, List[BrokerCall]]]) -> None:
+        """
+        Plan every call in ``batch``, send all their requests in one
+        scheduler.fetch_all() and reply to each message.
+
+        Args:
+            batch: (client_id, calls) messages from the request queue
+        """
+        calls = [call for _, client_calls in batch for call in client_calls]
+        replies: List[Optional[BrokerReply]] = [None] * len(calls)
+
+        fetcher = self.accumulator.fetcher
+        connect_error: Optional[Exception] = None
+        try:
+            if not fetcher.connected and not fetcher.connect():
+                raise ConnectionError("Failed to connect to IBKR")
+        except Exception as e:
+            connect_error = e
+
+        planned: List[Tuple[int, HistoricalPlan]] = []
+        for i, (method, kwargs) in enumerate(calls):
+            try:
+                if connect_error is not None:
+                    raise connect_error
+                planned.append((i, self._plan(method, kwargs)))
+            except Exception as e:
+                replies[i] = self._error(method, e)
+
+        plans = [plan for _, plan in planned]
+        requests = [request for plan in plans for request in plan.requests]
+        try:
+            bars = fetcher.scheduler.fetch_all(requests) if requests else []
+        except Exception as e:
+            for i, _ in planned:
+                replies[i] = self._error(calls[i][0], e)
+        else:
+            for (i, plan), chunks in zip(planned, split_bars(plans, bars)):
+                try:
+                    replies[i] = ("ok", plan.finish(chunks))
+                except Exception as e:
+                    replies[i] = self._error(calls[i][0], e)
+
+        offset = 0
+        for client_id, client_calls in batch:
+            self._replies[client_id].put(replies[offset : offset + len(client_calls)])
+            offset += len(client_calls)
+        self.served += len(calls)
+
+    def serve(self, done: Callable[[], bool], poll: float = DEFAULT_POLL) -> None:
+        """Serve requests on this thread until ``done()`` returns True."""
+        while not done():
+            try:
+                batch = [self.requests.get(timeout=poll)]
+            except queue.Empty:
+                continue
+            # Everything already queued goes out in the same fetch_all()
+            while True:
+                try:
+                    batch.append(self.requests.get_nowait())
+                except queue.Empty:
+                    break
+            self.handle(batch)
+
+    def close(self) -> None:
+        """Disconnect the shared IBKR connection if it was opened."""
+        if self.accumulator.fetcher.connected:
+            self.accumulator.fetcher.disconnect()
+
+
+class BrokerScheduler:
+    """Worker-side stand-in for HistoricalScheduler: requests are broker calls."""
+
+    def __init__(self, client: BrokerClient):
+        self.client = client
+
+    def fetch_all(self, requests: List[BrokerCall]) -> List[BrokerReply]:
+        """Send the calls in one message; one reply per call."""
+        return self.client.call_many(requests)
+
+
+class BrokeredFetcher(LoggingMixin):
+    """
+    Stand-in for IBKRHistoricalFetcher that forwards calls to an IBKRBroker.
+
+    With ``plan`` a method returns a HistoricalPlan whose one request is
+    the broker call, so the accumulator's planned fetches reach the broker
+    together through ``scheduler.fetch_all()``.
+    """
+
+    connected = True
+
+    def __init__(self, client: BrokerClient):
+        self.client = client
+        self.scheduler = BrokerScheduler(client)
+
+    def connect(self, port: int = None) -> bool:
+        return True
+
+    def disconnect(self) -> None:
+        pass
+
+    def call(self, method: str, kwargs: Dict[str, Any], plan: bool = False) -> Union[Any, HistoricalPlan]:
+        """Run a broker call now, or with ``plan`` return it as a HistoricalPlan."""
+        if plan:
+            return HistoricalPlan([(method, kwargs)], lambda replies: BrokerClient.unwrap(method, replies[0]))
+        return self.client.call(method, **kwargs)
+
+    def get_historical_futures(self, plan: bool = False, **kwargs: Any) -> Union[List[Dict[str, Any]], HistoricalPlan]:
+        return self.call("futures", kwargs, plan)
+
+    def get_historical_futures_many(
+        self, windows, plan: bool = False, **kwargs: Any
+    ) -> Union[Dict[str, List[Dict[str, Any]]], HistoricalPlan]:
+        return self.call("futures_many", dict(kwargs, windows=windows), plan)
+
+    def get_historical_continuous_futures(
+        self, plan: bool = False, **kwargs: Any
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
+        return self.call("continuous", kwargs, plan)
+
+
+class BrokeredAccumulator(FuturesAccumulator):
+    """FuturesAccumulator for worker processes; IBKR calls go through a broker."""
+
+    def __init__(self, client: BrokerClient, spot_cache: Optional[SpotCache] = None):
+        super().__init__(BrokeredFetcher(client), spot_cache=spot_cache)
+
+    def _fetch_ibkr_spot_history(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        bar_size: str = "1 day",
+        spot_config: Dict[str, str] = None,
+        plan: bool = False,
+    ) -> Union[List[Dict[str, Any]], HistoricalPlan]:
+        kwargs = {"start_date": start_date, "end_date": end_date, "bar_size": bar_size, "spot_config": spot_config}
+        return self.fetcher.call("spot_history", kwargs, plan)
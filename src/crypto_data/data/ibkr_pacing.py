@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Pacing-aware scheduler for IBKR historical data requests.
+
+IB rejects historical requests that break its pacing rules:
+
+    - an identical request within 15 seconds
+    - six or more requests for the same contract and data type within 2 seconds
+    - more than 60 requests within any 10-minute period
+
+and allows at most 50 historical requests open at once.
+
+PacingPolicy books each request the earliest start time that keeps every
+rule, in submission order. HistoricalScheduler sends requests at those
+times: one at a time through the blocking ib_insync API (fetch), or
+concurrently through reqHistoricalDataAsync with as many requests in
+flight as the rules allow (fetch_all). Requests are never delayed more
+than the rules require, so short jobs run without fixed sleeps.
+
+A HistoricalPlan splits a fetch into its requests and the parsing of
+their bars, so the requests of several independent fetches (spot,
+futures, continuous) can go out together in one fetch_all.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from crypto_data.utils.logging import LoggingMixin
+
+# IB historical data pacing limits
+IDENTICAL_INTERVAL = 15.0
+BURST_LIMIT = 5
+BURST_WINDOW = 2.0
+WINDOW_LIMIT = 60
+WINDOW = 600.0
+MAX_IN_FLIGHT = 50
+
+
+class HistoricalRequest(NamedTuple):
+    """Arguments of one reqHistoricalData call."""
+
+    contract: Any
+    endDateTime: Any
+    durationStr: str
+    barSizeSetting: str
+    whatToShow: str = "TRADES"
+    useRTH: bool = True
+    formatDate: int = 1
+
+    def contract_key(self) -> Tuple:
+        """Contract + data type, the unit of IB's 2-second burst rule."""
+        contract = self.contract
+        con_id = getattr(contract, "conId", 0)
+        if not isinstance(con_id, int) or not con_id:
+            con_id = repr(contract)
+        return (con_id, getattr(contract, "exchange", ""), self.whatToShow)
+
+    def identity(self) -> Tuple:
+        """Key under which two requests count as identical."""
+        return self.contract_key() + (
+            str(self.endDateTime),
+            self.durationStr,
+            self.barSizeSetting,
+            self.useRTH,
+        )
+
+
+class HistoricalPlan(NamedTuple):
+    """
+    A historical fetch split in two: the requests to send, and a function
+    turning their bars (one list per request, in order) into the result.
+    """
+
+    requests: List[HistoricalRequest]
+    finish: Callable[[List[List[Any]]], Any]
+
+    @classmethod
+    def done(cls, result: Any) -> "HistoricalPlan":
+        """A plan with nothing left to request (cached, empty or failed fetches)."""
+        return cls([], lambda bars: result)
+
+    def then(self, fn: Callable[[Any], Any]) -> "HistoricalPlan":
+        """This plan with ``fn`` applied to its result."""
+        return HistoricalPlan(self.requests, lambda bars: fn(self.finish(bars)))
+
+
+def as_plan(result: Any) -> HistoricalPlan:
+    """``result`` if it is a plan, else a plan already done with it."""
+    return result if isinstance(result, HistoricalPlan) else HistoricalPlan.done(result)
+
+
+def split_bars(plans: Sequence[HistoricalPlan], bars: Sequence[List[Any]]) -> List[List[List[Any]]]:
+    """Split fetch_all() results for the concatenated requests of ``plans`` per plan."""
+    chunks = []
+    start = 0
+    for plan in plans:
+        stop = start + len(plan.requests)
+        chunks.append(list(bars[start:stop]))
+        start = stop
+    return chunks
+
+
+def combine_plans(plans: Sequence[HistoricalPlan], finish: Callable[[List[Any]], Any]) -> HistoricalPlan:
+    """One plan sending the requests of ``plans``; ``finish`` gets their results in order."""
+    plans = list(plans)
+
+    def run(bars: List[List[Any]]) -> Any:
+        return finish([plan.finish(chunk) for plan, chunk in zip(plans, split_bars(plans, bars))])
+
+    return HistoricalPlan([request for plan in plans for request in plan.requests], run)
+
+
+class PacingPolicy:
+    """
+    Books request start times that respect IB's historical pacing rules.
+
+    Requests are booked in submission order, so booked times never
+    decrease. Limits are parameters so tests can run on a shorter clock.
+    """
+
+    def __init__(
+        self,
+        identical_interval: float = IDENTICAL_INTERVAL,
+        burst_limit: int = BURST_LIMIT,
+        burst_window: float = BURST_WINDOW,
+        window_limit: int = WINDOW_LIMIT,
+        window: float = WINDOW,
+    ):
+        self.identical_interval = identical_interval
+        self.burst_limit = burst_limit
+        self.burst_window = burst_window
+        self.window_limit = window_limit
+        self.window = window
+        self._all: Deque[float] = deque()
+        self._by_contract: Dict[Tuple, Deque[float]] = {}
+        # Identity -> last start, oldest first (re-booked identities move to the end)
+        self._identical: Dict[Tuple, float] = {}
+        self._last = float("-inf")
+
+    def earliest(self, request: HistoricalRequest, now: float) -> float:
+        """Earliest time ``request`` may start, without booking it."""
+        start = max(now, self._last)
+        last_identical = self._identical.get(request.identity())
+        if last_identical is not None:
+            start = max(start, last_identical + self.identical_interval)
+        same_contract = self._by_contract.get(request.contract_key())
+        if same_contract and len(same_contract) >= self.burst_limit:
+            start = max(start, same_contract[-self.burst_limit] + self.burst_window)
+        if len(self._all) >= self.window_limit:
+            start = max(start, self._all[-self.window_limit] + self.window)
+        return start
+
+    def reserve(self, request: HistoricalRequest, now: float) -> float:
+        """
+        Book ``request`` at its earliest allowed time.
+
+        Returns:
+            Seconds from ``now`` until the request may be sent
+        """
+        start = self.earliest(request, now)
+        self._last = start
+        self._all.append(start)
+        while self._all and self._all[0] <= start - self.window:
+            self._all.popleft()
+        same_contract = self._by_contract.setdefault(request.contract_key(), deque())
+        same_contract.append(start)
+        while same_contract and same_contract[0] <= start - self.burst_window:
+            same_contract.popleft()
+        identity = request.identity()
+        self._identical.pop(identity, None)
+        self._identical[identity] = start
+        while self._identical:
+            oldest = next(iter(self._identical))
+            if self._identical[oldest] > start - self.identical_interval:
+                break
+            del self._identical[oldest]
+        return start - now
+
+
+class HistoricalScheduler(LoggingMixin):
+    """
+    Send IBKR historical data requests as fast as IB's pacing rules allow.
+
+    Usage:
+        scheduler = HistoricalScheduler(ib)
+        bars = scheduler.fetch(HistoricalRequest(contract, end, "30 D", "1 day"))
+        chunks = scheduler.fetch_all([request_1, request_2, ...])
+    """
+
+    def __init__(
+        self,
+        ib,
+        policy: Optional[PacingPolicy] = None,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ib = ib
+        self.policy = policy or PacingPolicy()
+        self.max_in_flight = max_in_flight
+        self.clock = clock
+
+    def _sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            return
+        # ib.sleep keeps the ib_insync event loop serving while waiting
+        sleep = getattr(self.ib, "sleep", None)
+        if callable(sleep):
+            sleep(seconds)
+        else:
+            time.sleep(seconds)
+
+    def fetch(self, request: HistoricalRequest) -> List[Any]:
+        """Send one request through the blocking API once pacing allows it."""
+        delay = self.policy.reserve(request, self.clock())
+        if delay > 0:
+            self.log(f"    Pacing: waiting {delay:.1f}s before next historical request")
+        self._sleep(delay)
+        return self.ib.reqHistoricalData(**request._asdict())
+
+    async def fetch_all_async(self, requests: Sequence[HistoricalRequest]) -> List[List[Any]]:
+        """
+        Send ``requests`` concurrently and return their bars in input order.
+
+        Each request is booked a start time by the pacing policy and at most
+        ``max_in_flight`` are open at once. A failed request is logged and
+        yields an empty list.
+        """
+        slots = asyncio.Semaphore(self.max_in_flight)
+        results: List[List[Any]] = [[] for _ in requests]
+
+        async def run(index: int, request: HistoricalRequest, delay: float) -> None:
+            try:
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                bars = await self.ib.reqHistoricalDataAsync(**request._asdict())
+                results[index] = list(bars or [])
+            except Exception as e:
+                self.log(f"[X] Historical request {index + 1}/{len(requests)} failed: {e}")
+            finally:
+                slots.release()
+
+        tasks = []
+        for index, request in enumerate(requests):
+            await slots.acquire()
+            delay = self.policy.reserve(request, self.clock())
+            tasks.append(asyncio.ensure_future(run(index, request, delay)))
+        await asyncio.gather(*tasks)
+        return results
+
+    def fetch_all(self, requests: Sequence[HistoricalRequest]) -> List[List[Any]]:
+        """Blocking wrapper around fetch_all_async on the IB event loop."""
+        if not requests:
+            return []
+        # ib_insync's IB.run drives the loop the connection lives on
+        run = getattr(self.ib, "run", None)
+        if callable(run):
+            return run(self.fetch_all_async(requests))
+        return asyncio.run(self.fetch_all_async(requests))
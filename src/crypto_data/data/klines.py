@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Pooled, parallel, rate-limit-aware pagination of Binance /klines.
+
+For a fixed-length interval the page windows of a range are known up front
+(``limit`` bars per page), so pages are requested concurrently over one
+pooled ``requests.Session`` and reassembled in order. Month-length
+intervals ("1M") fall back to sequential closeTime chaining.
+
+Request weight is rationed by a token bucket that is kept in sync with the
+``X-MBX-USED-WEIGHT-1M`` header Binance returns on every response, and
+HTTP 429/418 responses are retried after their ``Retry-After`` delay.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crypto_data.utils.logging import LoggingMixin
+
+# Milliseconds per kline for fixed-length intervals
+INTERVAL_MS = {
+    "1s": 1_000,
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "6h": 6 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+    "3d": 3 * 86_400_000,
+    "1w": 7 * 86_400_000,
+}
+
+# Request weight budget per minute (per IP)
+SPOT_WEIGHT_PER_MINUTE = 6000
+FUTURES_WEIGHT_PER_MINUTE = 2400
+
+DEFAULT_MAX_WORKERS = 4
+MAX_RETRIES = 5
+
+WEIGHT_HEADERS = ("X-MBX-USED-WEIGHT-1M", "X-MBX-USED-WEIGHT")
+
+
+def kline_weight(limit: int) -> int:
+    """Request weight of one /klines call returning up to ``limit`` bars."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def page_windows(start_ms: int, end_ms: int, interval_ms: int, limit: int) -> List[Tuple[int, int]]:
+    """
+    Split [start_ms, end_ms] into windows of at most ``limit`` klines each.
+
+    Args:
+        start_ms: Range start (ms since epoch)
+        end_ms: Range end (ms since epoch, inclusive)
+        interval_ms: Kline length in milliseconds
+        limit: Klines per page
+
+    Returns:
+        List of (startTime, endTime) pairs in order
+    """
+    span = interval_ms * limit
+    windows = []
+    page_start = start_ms
+    while page_start <= end_ms:
+        windows.append((page_start, min(page_start + span - 1, end_ms)))
+        page_start += span
+    return windows
+
+
+class WeightBucket:
+    """
+    Token bucket over a per-minute request weight budget.
+
+    Tokens refill continuously at ``capacity`` per minute. Every response's
+    used-weight header resets the estimate to what Binance reports, so the
+    bucket also accounts for weight spent by other clients on the same IP.
+    """
+
+    def __init__(self, capacity: int, period: float = 60.0):
+        self.capacity = capacity
+        self.period = period
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.capacity / self.period)
+        self._updated = now
+
+    def acquire(self, weight: int) -> None:
+        """Block until ``weight`` tokens are available, then take them."""
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= weight:
+                    self._tokens -= weight
+                    return
+                wait = (weight - self._tokens) * self.period / self.capacity
+            time.sleep(wait)
+
+    def update(self, used_weight: int) -> None:
+        """Sync with the server-reported weight used in the current minute."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, float(self.capacity - used_weight))
+
+    def pause(self, seconds: float) -> None:
+        """Empty the bucket so no request is sent for about ``seconds``."""
+        with self._lock:
+            self._tokens = -seconds * self.capacity / self.period
+            self._updated = time.monotonic()
+
+
+class KlineClient(LoggingMixin):
+    """
+    Fetch /klines ranges concurrently over a pooled session.
+
+    Usage:
+        client = KlineClient("https://api.binance.com/api/v3")
+        klines = client.fetch("BTCUSDT", "1m", start_ms, end_ms)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        weight_per_minute: int = SPOT_WEIGHT_PER_MINUTE,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        timeout: int = 10,
+        session: Optional[requests.Session] = None,
+    ):
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.bucket = WeightBucket(weight_per_minute)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def _get_page(self, params: Dict[str, Any]) -> List[List[Any]]:
+        """GET one page, honouring the weight budget and 429/418 backoff."""
+        weight = kline_weight(params["limit"])
+        for attempt in range(MAX_RETRIES):
+            self.bucket.acquire(weight)
+            response = self.session.get(f"{self.base_url}/klines", params=params, timeout=self.timeout)
+            for header in WEIGHT_HEADERS:
+                if header in response.headers:
+                    self.bucket.update(int(response.headers[header]))
+                    break
+            if response.status_code in (418, 429):
+                retry_after = float(response.headers.get("Retry-After", 2 ** attempt))
+                self.log(f"[!] Binance rate limit ({response.status_code}), retrying in {retry_after:.0f}s")
+                self.bucket.pause(retry_after)
+                continue
+            response.raise_for_status()
+            return response.json()
+        raise requests.HTTPError(
+            f"Binance rate limit persisted after {MAX_RETRIES} attempts", response=response
+        )
+
+    def fetch(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: int,
+        limit: int = 1000,
+    ) -> List[List[Any]]:
+        """
+        Fetch every kline with open time in [start_ms, end_ms], in order.
+
+        Args:
+            symbol: Binance symbol (e.g., 'BTCUSDT', 'BTCUSD_250627')
+            interval: Kline interval (1m, 1h, 1d, ...)
+            start_ms: Range start (ms since epoch)
+            end_ms: Range end (ms since epoch)
+            limit: Klines per request
+
+        Returns:
+            Raw kline arrays as returned by Binance
+        """
+        interval_ms = INTERVAL_MS.get(interval)
+        if interval_ms is None:
+            return self._fetch_sequential(symbol, interval, start_ms, end_ms, limit)
+
+        windows = page_windows(start_ms, end_ms, interval_ms, limit)
+        params = [
+            {"symbol": symbol, "interval": interval, "startTime": lo, "endTime": hi, "limit": limit}
+            for lo, hi in windows
+        ]
+        if len(params) == 1 or self.max_workers <= 1:
+            pages = [self._get_page(p) for p in params]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(params))) as pool:
+                pages = list(pool.map(self._get_page, params))
+
+        klines = []
+        last_open = None
+        for page in pages:
+            for k in page:
+                if last_open is None or k[0] > last_open:
+                    klines.append(k)
+                    last_open = k[0]
+        return klines
+
+    def _fetch_sequential(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: int,
+        limit: int,
+    ) -> List[List[Any]]:
+        """Chain pages on closeTime for intervals without a fixed length."""
+        klines = []
+        current_start = start_ms
+        while current_start < end_ms:
+            page = self._get_page({
+                "symbol": symbol,
+                "interval": interval,
+                "startTime": current_start,
+                "endTime": end_ms,
+                "limit": limit,
+            })
+            if not page:
+                break
+            klines.extend(page)
+            current_start = int(page[-1][6]) + 1  # closeTime + 1ms
+            if len(page) < limit:
+                break
+        return klines
+
+    def close(self) -> None:
+        """Close the pooled session."""
+        self.session.close()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Process-wide registry of loaded datasets.
+
+Loaded datasets (e.g. the DatabentoColumns of one CSV) are shared between
+fetchers so a file is parsed or mapped once per process, however many
+fetchers, accumulate() calls or threads ask for it. Loads are single-flight:
+threads that miss on the same file wait for the one loading it instead of
+parsing it again. Entries are keyed by the
+resolved file path plus its fingerprint (size, mtime, sha256), so a changed
+file is never served stale. Least-recently-used entries are evicted once the
+registry holds more than its memory budget.
+"""
+
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+# Default memory budget for cached datasets
+DEFAULT_MAX_BYTES = 1 << 30  # 1 GiB
+
+
+def _dataset_nbytes(dataset: Any) -> int:
+    """Size of a dataset as reported by its ``nbytes`` attribute (0 if absent)."""
+    return int(getattr(dataset, "nbytes", 0) or 0)
+
+
+class DatasetRegistry:
+    """
+    Thread-safe LRU cache of datasets keyed by (resolved path, fingerprint).
+
+    Usage:
+        registry = get_registry()
+        with registry.loading([path]):
+            dataset = registry.get(path, fingerprint)
+            if dataset is None:
+                dataset = load(path)
+                registry.put(path, fingerprint, dataset)
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        # Last fingerprint seen per path, to skip rehashing unchanged files
+        self._fingerprints: Dict[str, Dict[str, Any]] = {}
+        # Per-path locks held while a file is being loaded
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _path_key(path) -> str:
+        return str(Path(path).resolve())
+
+    @classmethod
+    def _key(cls, path, fingerprint: Dict[str, Any]) -> Tuple:
+        return (
+            cls._path_key(path),
+            fingerprint.get("size"),
+            fingerprint.get("mtime_ns"),
+            fingerprint.get("sha256"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the datasets currently held."""
+        return self._nbytes
+
+    def fingerprint(self, path) -> Optional[Dict[str, Any]]:
+        """Most recent fingerprint registered for ``path``, if any."""
+        with self._lock:
+            return self._fingerprints.get(self._path_key(path))
+
+    @contextmanager
+    def loading(self, paths: Iterable) -> Iterator[None]:
+        """
+        Hold the load locks of ``paths`` (single-flight loading).
+
+        Check the registry and load missing files inside the block: a thread
+        asking for a file another thread is loading waits, then finds it
+        registered. Locks are taken in sorted path order, so overlapping
+        sets of files cannot deadlock.
+        """
+        keys = sorted({self._path_key(path) for path in paths})
+        with self._lock:
+            locks = [self._load_locks.setdefault(key, threading.Lock()) for key in keys]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+    def get(self, path, fingerprint: Dict[str, Any]) -> Optional[Any]:
+        """Return the dataset for ``path`` at ``fingerprint``, or None."""
+        key = self._key(path, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, path, fingerprint: Dict[str, Any], dataset: Any) -> None:
+        """
+        Register a loaded dataset, replacing older versions of the same file.
+
+        Evicts least-recently-used datasets while over the memory budget;
+        the dataset just added is always kept.
+        """
+        key = self._key(path, fingerprint)
+        nbytes = _dataset_nbytes(dataset)
+        with self._lock:
+            for old_key in [k for k in self._entries if k[0] == key[0]]:
+                self._nbytes -= self._entries.pop(old_key)[1]
+            self._entries[key] = (dataset, nbytes)
+            self._fingerprints[key[0]] = fingerprint
+            self._nbytes += nbytes
+            self.loads += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop LRU entries until within budget (caller holds the lock)."""
+        while self._nbytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self._nbytes -= nbytes
+            self.evictions += 1
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the memory budget, evicting as needed."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop every dataset."""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+            self._nbytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for reporting: entries, nbytes, loads, hits, misses, evictions."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "nbytes": self._nbytes,
+                "loads": self.loads,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_default_registry: Optional[DatasetRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_registry() -> DatasetRegistry:
+    """The process-wide registry shared by fetchers and scripts."""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = DatasetRegistry()
+        return _default_registry
+
+
+def configure_registry(max_mb: Optional[float] = None) -> DatasetRegistry:
+    """
+    Set the memory budget of the process-wide registry.
+
+    Args:
+        max_mb: Budget in megabytes (None keeps the current budget)
+
+    Returns:
+        The process-wide registry
+    """
+    registry = get_registry()
+    if max_mb is not None:
+        registry.resize(int(max_mb * (1 << 20)))
+    return registry
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Persistent, gap-aware cache of spot price history.
+
+Spot bars are stored in SQLite keyed by (source, symbol, exchange, currency,
+bar size) together with the time ranges that have already been fetched. A
+request only goes to the network for the parts of its range that are not
+covered yet, so repeated runs over the same history fetch just the newest
+bars.
+
+Ranges ending within SETTLE_WINDOW of now are not marked as covered: the
+latest bar may still be forming and is fetched again next time.
+
+Timestamps are stored in UTC. Naive datetimes are taken as UTC; tz-aware
+ones (IBKR intraday bars) are converted. Reads return the kind of datetime
+they were asked with: naive for a naive range, aware in the range's time
+zone otherwise.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from crypto_data.utils.logging import LoggingMixin
+
+# Default cache location (relative to the working directory)
+DEFAULT_CACHE_PATH = "data/spot_cache.sqlite"
+
+# Bars newer than this may still change and are never treated as cached
+SETTLE_WINDOW = timedelta(days=1)
+
+# Datetimes are stored as whole UTC seconds since this epoch
+_EPOCH = datetime(1970, 1, 1)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    source TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    bar_size TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    price REAL NOT NULL,
+    PRIMARY KEY (source, symbol, exchange, currency, bar_size, ts)
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    source TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    exchange TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    bar_size TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL
+);
+"""
+
+_KEY_WHERE = "source = ? AND symbol = ? AND exchange = ? AND currency = ? AND bar_size = ?"
+
+
+class SpotKey(NamedTuple):
+    """Identity of one spot price series."""
+
+    source: str
+    symbol: str
+    exchange: str = ""
+    currency: str = ""
+    bar_size: str = "1 day"
+
+
+def _to_ts(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((value - _EPOCH).total_seconds())
+
+
+def _from_ts(ts: int, tz: Optional[tzinfo] = None) -> datetime:
+    """Naive UTC datetime of ``ts``, or aware in ``tz`` when given."""
+    value = _EPOCH + timedelta(seconds=ts)
+    if tz is None:
+        return value
+    return value.replace(tzinfo=timezone.utc).astimezone(tz)
+
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Union of closed ranges, sorted and with touching ranges joined."""
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(start: int, end: int, covered: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Parts of [start, end] not inside any covered range.
+
+    Args:
+        start: Range start
+        end: Range end
+        covered: Merged, sorted covered ranges (see merge_ranges)
+
+    Returns:
+        Sorted list of (start, end) gaps
+    """
+    gaps = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class SpotCache(LoggingMixin):
+    """
+    SQLite-backed spot history cache that fetches only missing ranges.
+
+    Usage:
+        cache = SpotCache("data/spot_cache.sqlite")
+        key = SpotKey("binance", "BTCUSDT", bar_size="1d")
+        bars = cache.get(key, start_date, end_date, fetch=download)
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per call, so the cache can be used from
+        # the worker threads accumulate() fetches spot on
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _coverage(conn: sqlite3.Connection, key: SpotKey) -> List[Tuple[int, int]]:
+        rows = conn.execute(
+            f"SELECT start_ts, end_ts FROM coverage WHERE {_KEY_WHERE}", tuple(key)
+        ).fetchall()
+        return merge_ranges(rows)
+
+    def covered(self, key: SpotKey) -> List[Tuple[datetime, datetime]]:
+        """Ranges of ``key`` already fetched, merged and sorted."""
+        with self._connect() as conn:
+            spans = self._coverage(conn, key)
+        return [(_from_ts(s), _from_ts(e)) for s, e in spans]
+
+    def read(self, key: SpotKey, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        """
+        Cached bars of ``key`` in [start_date, end_date], sorted by date.
+
+        Dates are tz-aware (in start_date's time zone) when start_date is.
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT ts, price FROM bars WHERE {_KEY_WHERE} AND ts BETWEEN ? AND ? ORDER BY ts",
+                tuple(key) + (_to_ts(start_date), _to_ts(end_date)),
+            ).fetchall()
+        tz = start_date.tzinfo
+        return [{"date": _from_ts(ts, tz), "spot_price": price} for ts, price in rows]
+
+    def store(
+        self,
+        key: SpotKey,
+        start_date: datetime,
+        end_date: datetime,
+        bars: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Save fetched bars and mark [start_date, end_date] as covered.
+
+        The covered range is clipped to SETTLE_WINDOW before now, and
+        coverage rows of the key are rewritten merged.
+        """
+        settled = min(_to_ts(end_date), _to_ts(datetime.now(timezone.utc) - SETTLE_WINDOW))
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [tuple(key) + (_to_ts(bar["date"]), float(bar["spot_price"])) for bar in bars],
+            )
+            if settled > _to_ts(start_date):
+                merged = merge_ranges(self._coverage(conn, key) + [(_to_ts(start_date), settled)])
+                conn.execute(f"DELETE FROM coverage WHERE {_KEY_WHERE}", tuple(key))
+                conn.executemany(
+                    "INSERT INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    [tuple(key) + span for span in merged],
+                )
+
+    def gaps(self, key: SpotKey, start_date: datetime, end_date: datetime) -> List[Tuple[datetime, datetime]]:
+        """Parts of [start_date, end_date] not yet fetched for ``key``, sorted (same kind of datetime)."""
+        with self._connect() as conn:
+            covered = self._coverage(conn, key)
+        gaps = missing_ranges(_to_ts(start_date), _to_ts(end_date), covered)
+
+        label = f"{key.source} {key.symbol}"
+        if not gaps:
+            self.log(f"[OK] Spot cache: {label} fully cached")
+        else:
+            self.log(f"[*] Spot cache: {label} fetching {len(gaps)} missing range(s)")
+        tz = start_date.tzinfo
+        return [(_from_ts(gap_start, tz), _from_ts(gap_end, tz)) for gap_start, gap_end in gaps]
+
+    def get(
+        self,
+        key: SpotKey,
+        start_date: datetime,
+        end_date: datetime,
+        fetch: Callable[[datetime, datetime], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Return bars of ``key`` in [start_date, end_date], fetching only gaps.
+
+        Args:
+            key: Series identity
+            start_date: Range start
+            end_date: Range end
+            fetch: Downloader called as fetch(gap_start, gap_end) for each
+                   uncovered gap; an empty result leaves the gap uncovered
+
+        Returns:
+            List of dicts with date and spot_price, sorted by date
+        """
+        for gap_start, gap_end in self.gaps(key, start_date, end_date):
+            bars = fetch(gap_start, gap_end)
+            if bars:
+                self.store(key, gap_start, gap_end, bars)
+
+        return self.read(key, start_date, end_date)
+
+    def clear(self, key: SpotKey = None) -> None:
+        """Drop cached bars and coverage of ``key`` (every key if None)."""
+        where, params = (f"WHERE {_KEY_WHERE}", tuple(key)) if key else ("", ())
+        with self._lock, self._connect() as conn:
+            conn.execute(f"DELETE FROM bars {where}", params)
+            conn.execute(f"DELETE FROM coverage {where}", params)
+
+
+def spot_cache_from_config(config: Dict[str, Any] = None) -> Optional[SpotCache]:
+    """
+    Create the spot cache described by the ``spot_cache`` config section.
+
+    Args:
+        config: Dict with 'enabled' (default True) and 'path' keys
+
+    Returns:
+        SpotCache, or None when caching is disabled
+    """
+    config = config or {}
+    if not config.get("enabled", True):
+        return None
+    return SpotCache(config.get("path") or DEFAULT_CACHE_PATH)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Futures term-structure cube built from Databento outrights and spreads.
+
+A TermStructure is a dense date x tenor matrix for one base symbol:
+
+    outright[row, k]   close of the k-th monthly contract (0 = front month)
+    spread[row, k]     exchange calendar spread between tenors k and k+1
+                       (far minus near, as CME quotes it)
+    contract[row, k]   contract id in the source DatabentoColumns (-1 = not listed)
+    expiry[row, k]     expiry date ordinal of tenor k
+
+Tenors follow the calendar: on each date tenor 0 is the first monthly
+contract expiring on or after that date (the same rule as the calendar roll
+in crypto_data.data.continuous). Missing cells are NaN.
+
+Matrices are stored row-major in flat typed arrays, so a single date's
+curve is one contiguous slice, ``price(date, tenor)`` is a dict lookup plus
+an index, and whole-curve analytics are single passes over the arrays.
+"""
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from crypto_data.utils.expiry import get_last_friday_of_month
+
+# Tenors kept in the columnar cache for each base symbol
+DEFAULT_TENORS = 6
+
+NAN = float("nan")
+
+
+def _months_between(year: int, month: int, first: Tuple[int, int]) -> int:
+    """Index of (year, month) counted in months from ``first``."""
+    return (year - first[0]) * 12 + (month - first[1])
+
+
+class TermStructure:
+    """Dense date x tenor matrix of futures prices for one base symbol."""
+
+    COLUMNS = ("dates", "outright", "spread", "contract", "expiry")
+
+    def __init__(self, symbol: str, tenors: int, dates, outright, spread, contract, expiry):
+        self.symbol = symbol
+        self.tenors = tenors
+        self.dates = dates
+        self.outright = outright
+        self.spread = spread
+        self.contract = contract
+        self.expiry = expiry
+        self.date_index = {d: i for i, d in enumerate(dates)}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the matrix columns."""
+        return sum(len(getattr(self, name)) * getattr(self, name).itemsize for name in self.COLUMNS)
+
+    def _row(self, date: datetime) -> Optional[int]:
+        return self.date_index.get(date.toordinal())
+
+    def price(self, date: datetime, tenor: int = 0) -> float:
+        """Outright close of ``tenor`` on ``date`` (NaN if missing)."""
+        row = self._row(date)
+        if row is None or not 0 <= tenor < self.tenors:
+            return NAN
+        return self.outright[row * self.tenors + tenor]
+
+    def spread_price(self, date: datetime, tenor: int = 0) -> float:
+        """Exchange spread between ``tenor`` and ``tenor + 1`` on ``date`` (NaN if missing)."""
+        row = self._row(date)
+        if row is None or not 0 <= tenor < self.tenors - 1:
+            return NAN
+        return self.spread[row * (self.tenors - 1) + tenor]
+
+    def curve(self, date: datetime) -> List[float]:
+        """All tenor closes on ``date`` (empty if no bars that day)."""
+        row = self._row(date)
+        if row is None:
+            return []
+        return list(self.outright[row * self.tenors:(row + 1) * self.tenors])
+
+    def column(self, tenor: int) -> array:
+        """Outright closes of one tenor across all dates."""
+        return array("d", self.outright[tenor::self.tenors])
+
+    def window(self, start_date: datetime = None, end_date: datetime = None) -> "TermStructure":
+        """Rows with dates in ``[start_date, end_date]`` (zero-copy views)."""
+        lo = bisect_left(self.dates, start_date.toordinal()) if start_date else 0
+        hi = bisect_right(self.dates, end_date.toordinal()) if end_date else len(self.dates)
+        hi = max(lo, hi)
+        t, s = self.tenors, self.tenors - 1
+        return TermStructure(
+            self.symbol,
+            self.tenors,
+            memoryview(self.dates)[lo:hi],
+            memoryview(self.outright)[lo * t:hi * t],
+            memoryview(self.spread)[lo * s:hi * s],
+            memoryview(self.contract)[lo * t:hi * t],
+            memoryview(self.expiry)[lo * t:hi * t],
+        )
+
+    def calendar_basis(self, near: int = 0, far: int = 1) -> array:
+        """
+        Far minus near price per date.
+
+        Adjacent tenors use the traded exchange spread when there is one,
+        falling back to the difference of the outright closes.
+        """
+        t, s = self.tenors, self.tenors - 1
+        outright, spread = self.outright, self.spread
+        result = array("d", bytes(8 * len(self.dates)))
+        for row in range(len(self.dates)):
+            value = spread[row * s + near] if far == near + 1 else NAN
+            if value != value:
+                value = outright[row * t + far] - outright[row * t + near]
+            result[row] = value
+        return result
+
+    def roll_yield(self, near: int = 0, far: int = 1) -> array:
+        """
+        Annualized roll yield of holding ``far`` into ``near`` per date.
+
+        (near - far) / far scaled by 365 / days between the two expiries:
+        positive in backwardation, negative in contango.
+        """
+        t = self.tenors
+        outright, expiry = self.outright, self.expiry
+        basis = self.calendar_basis(near, far)
+        result = array("d", bytes(8 * len(self.dates)))
+        for row in range(len(self.dates)):
+            far_price = outright[row * t + far]
+            days = expiry[row * t + far] - expiry[row * t + near]
+            if far_price and days > 0:
+                result[row] = -basis[row] / far_price * 365 / days
+            else:
+                result[row] = NAN
+        return result
+
+    def slope(self) -> array:
+        """
+        Curve slope per date: least-squares slope of ln(price) against
+        years to expiry across all quoted tenors (an implied annual carry
+        rate). NaN when fewer than two tenors are quoted.
+        """
+        t = self.tenors
+        outright, expiry, dates = self.outright, self.expiry, self.dates
+        result = array("d", bytes(8 * len(dates)))
+        for row in range(len(dates)):
+            xs = []
+            ys = []
+            for k in range(row * t, (row + 1) * t):
+                price = outright[k]
+                if price == price and price > 0:
+                    xs.append((expiry[k] - dates[row]) / 365.0)
+                    ys.append(math.log(price))
+            n = len(xs)
+            if n < 2:
+                result[row] = NAN
+                continue
+            mean_x = sum(xs) / n
+            mean_y = sum(ys) / n
+            var_x = sum((x - mean_x) ** 2 for x in xs)
+            if var_x == 0:
+                result[row] = NAN
+                continue
+            result[row] = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+        return result
+
+    def columns(self, prefix: str) -> Dict[str, Any]:
+        """Matrix columns keyed for storage in a columnar file."""
+        return {f"{prefix}{name}": getattr(self, name) for name in self.COLUMNS}
+
+    @classmethod
+    def from_columns(cls, symbol: str, tenors: int, stored, prefix: str) -> Optional["TermStructure"]:
+        """Rebuild from columns written by columns(), or None if any is missing."""
+        if any(f"{prefix}{name}" not in stored for name in cls.COLUMNS):
+            return None
+        return cls(symbol, tenors, *(stored[f"{prefix}{name}"] for name in cls.COLUMNS))
+
+
+def build_term_structure(columns, symbol: str, tenors: int = DEFAULT_TENORS) -> TermStructure:
+    """
+    Build the term-structure cube of one base symbol from a DatabentoColumns.
+
+    One pass over the base's outright rows and one over its spread rows.
+
+    Args:
+        columns: DatabentoColumns store
+        symbol: Base symbol (e.g., 'MBT')
+        tenors: Number of monthly tenors (front month = tenor 0)
+    """
+    base_id = columns.base_index.get(symbol)
+    empty = TermStructure(symbol, tenors, array("i"), array("d"), array("d"), array("i"), array("i"))
+    if base_id is None:
+        return empty
+    base_cids = [cid for cid, c in enumerate(columns.contracts) if c[1] == base_id]
+
+    dates = sorted({columns.date[i] for cid in base_cids for i in range(*columns.contract_range(cid))})
+    if not dates:
+        return empty
+
+    # Monthly schedule from the first date's month through the last tenor
+    first_day = datetime.fromordinal(dates[0])
+    first = (first_day.year, first_day.month)
+    last_day = datetime.fromordinal(dates[-1])
+    n_months = _months_between(last_day.year, last_day.month, first) + tenors + 1
+    month_expiry = []
+    for m in range(n_months):
+        year, month = first[0] + (first[1] - 1 + m) // 12, (first[1] - 1 + m) % 12 + 1
+        month_expiry.append(get_last_friday_of_month(year, month).toordinal())
+    month_contract = [-1] * n_months
+    contract_month = {}
+    for cid in base_cids:
+        _, _, year, month = columns.contracts[cid]
+        m = _months_between(year, month, first)
+        contract_month[cid] = m
+        if 0 <= m < n_months:
+            month_contract[m] = cid
+
+    # Front month per date: first month expiring on or after the date
+    front = []
+    m = 0
+    for day in dates:
+        while month_expiry[m] < day:
+            m += 1
+        front.append(m)
+
+    n, s = len(dates), tenors - 1
+    row_of = {day: r for r, day in enumerate(dates)}
+    outright = array("d", [NAN]) * (n * tenors)
+    spread = array("d", [NAN]) * (n * s)
+    contract = array("i", [-1]) * (n * tenors)
+    expiry = array("i", [0]) * (n * tenors)
+    for r, f in enumerate(front):
+        for k in range(tenors):
+            contract[r * tenors + k] = month_contract[f + k]
+            expiry[r * tenors + k] = month_expiry[f + k]
+
+    for cid in base_cids:
+        m = contract_month[cid]
+        for i in range(*columns.contract_range(cid)):
+            r = row_of[columns.date[i]]
+            k = m - front[r]
+            if 0 <= k < tenors:
+                outright[r * tenors + k] = columns.close[i]
+
+    near_col, far_col = columns.spread_near, columns.spread_far
+    for i in range(len(columns.spread_date)):
+        near_m = contract_month.get(near_col[i])
+        far_m = contract_month.get(far_col[i])
+        if near_m is None or far_m is None or far_m != near_m + 1:
+            continue
+        r = row_of.get(columns.spread_date[i])
+        if r is None:
+            continue
+        k = near_m - front[r]
+        if 0 <= k < s:
+            spread[r * s + k] = columns.spread_close[i]
+
+    return TermStructure(symbol, tenors, array("i", dates), outright, spread, contract, expiry)
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped columnar file format.
+
+A columnar file is a small JSON header followed by raw typed arrays
+(``array.array`` typecodes). Columns are exposed as ``memoryview`` objects
+over a read-only ``mmap``, so opening a file costs a header parse and no
+per-row work.
+
+Layout::
+
+    MAGIC (8 bytes) | header length (uint64 LE) | header JSON | column blobs
+
+Every column blob starts on an 8-byte boundary.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+MAGIC = b"CDCOL\x01\n\x00"
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+
+_LENGTH = struct.Struct("<Q")
+
+
+def _pad(size: int) -> int:
+    """Bytes needed to bring ``size`` up to the next alignment boundary."""
+    return (-size) % ALIGNMENT
+
+
+class ColumnarFile:
+    """An open, memory-mapped columnar file."""
+
+    def __init__(self, path: Path, meta: Dict[str, Any], columns: Dict[str, memoryview], mm: mmap.mmap):
+        self.path = path
+        self.meta = meta
+        self.columns = columns
+        self._mmap = mm
+
+    def __getitem__(self, name: str) -> memoryview:
+        return self.columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of all column data in bytes."""
+        return sum(col.nbytes for col in self.columns.values())
+
+    def close(self) -> None:
+        """Release column views and unmap the file."""
+        for col in self.columns.values():
+            col.release()
+        self.columns = {}
+        self._mmap.close()
+
+
+def write_columns(
+    path: Union[str, Path],
+    columns: Dict[str, Union[array, memoryview]],
+    meta: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Write typed columns to a columnar file.
+
+    The file is written to a temporary name and atomically renamed into
+    place, so readers never observe a partial file.
+
+    Args:
+        path: Destination file path
+        columns: Mapping of column name to ``array.array`` (or a typed
+                 ``memoryview``, e.g. a column of another ColumnarFile)
+        meta: JSON-serializable metadata stored in the header
+    """
+    path = Path(path)
+    specs = []
+    offset = 0
+    for name, values in columns.items():
+        nbytes = len(values) * values.itemsize
+        specs.append({
+            "name": name,
+            "typecode": values.typecode if isinstance(values, array) else values.format,
+            "length": len(values),
+            "offset": offset,
+        })
+        offset += nbytes + _pad(nbytes)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "byteorder": sys.byteorder,
+        "columns": specs,
+        "meta": meta or {},
+    }).encode("utf-8")
+    prefix_len = len(MAGIC) + _LENGTH.size + len(header)
+    header += b" " * _pad(prefix_len)
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_LENGTH.pack(len(header)))
+            f.write(header)
+            for values in columns.values():
+                data = values.tobytes()
+                f.write(data)
+                f.write(b"\x00" * _pad(len(data)))
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def read_columns(path: Union[str, Path]) -> Optional[ColumnarFile]:
+    """
+    Open a columnar file written by write_columns().
+
+    Returns:
+        ColumnarFile, or None if the file is missing, truncated, or was
+        written by an incompatible format version or byte order.
+    """
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    view = None
+    columns = {}
+    try:
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError("bad magic")
+        (header_len,) = _LENGTH.unpack_from(mm, len(MAGIC))
+        data_start = len(MAGIC) + _LENGTH.size + header_len
+        header = json.loads(mm[len(MAGIC) + _LENGTH.size:data_start].decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION or header.get("byteorder") != sys.byteorder:
+            raise ValueError("incompatible header")
+
+        view = memoryview(mm)
+        for spec in header["columns"]:
+            itemsize = array(spec["typecode"]).itemsize
+            start = data_start + spec["offset"]
+            end = start + spec["length"] * itemsize
+            if end > len(mm):
+                raise ValueError("truncated column")
+            columns[spec["name"]] = view[start:end].cast(spec["typecode"])
+        view.release()
+    except (ValueError, KeyError, TypeError, struct.error):
+        for col in columns.values():
+            col.release()
+        if view is not None:
+            view.release()
+        mm.close()
+        return None
+
+    return ColumnarFile(path, header.get("meta", {}), columns, mm)
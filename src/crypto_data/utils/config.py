@@ -37,6 +37,11 @@ class ConfigLoader:
         },
         "databento": {
             "data_dir": "databento",
+            "memory_budget_mb": 1024,
+        },
+        "spot_cache": {
+            "enabled": True,
+            "path": "data/spot_cache.sqlite",
         },
         "pairs": {
             "BTC": {
@@ -181,6 +186,11 @@ class ConfigLoader:
         """Get Databento configuration."""
         return self.get("databento")
 
+    @property
+    def spot_cache(self) -> Dict[str, Any]:
+        """Get spot history cache configuration."""
+        return self.get("spot_cache")
+
     @property
     def pairs(self) -> Dict[str, Any]:
         """Get all configured investment pairs."""
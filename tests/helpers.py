@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Random basis series and backtest configs shared by the backtest tests."""
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+
+def daily_rows(seed=0, days=365, tz=None, unnamed_every=0):
+    """
+    Daily rows with a mean-reverting basis and monthly contracts.
+
+    Args:
+        seed: Random seed
+        days: Number of rows, one per day from 2024-01-01
+        tz: tzinfo of the dates (naive by default)
+        unnamed_every: When set, every n-th month's rows have no contract
+    """
+    rnd = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=tz)
+    price, basis = 40000.0, 0.01
+    rows = []
+    for i in range(days):
+        month = i // 30
+        price *= 1 + rnd.gauss(0, 0.01)
+        basis = 0.95 * basis + 0.0005 + rnd.gauss(0, 0.003)
+        row = {
+            "date": start + timedelta(days=i),
+            "spot_price": price,
+            "futures_price": price * (1 + basis),
+            "futures_expiry": start + timedelta(days=30 * (month + 1)),
+        }
+        if not unnamed_every or month % unnamed_every:
+            row["contract"] = f"C{month}"
+        rows.append(row)
+    return rows
+
+
+def random_rows(seed, n=200, contracts=1.0, tz=None, shuffle=False, step_hours=(1, 6, 24)):
+    """
+    Random basis rows: noisy basis, expiries around the dates.
+
+    Args:
+        seed: Random seed
+        n: Number of rows
+        contracts: Share of rows with a contract (three contracts, rolled every 40 rows)
+        tz: tzinfo of the dates (naive by default)
+        shuffle: Return the rows in random order
+        step_hours: Hours between rows, one picked at random per row
+    """
+    rnd = random.Random(seed)
+    date = datetime(2024, 1, 1, tzinfo=tz)
+    price = 50000.0
+    rows = []
+    for i in range(n):
+        date += timedelta(hours=rnd.choice(step_hours))
+        row = {
+            "date": date,
+            "spot_price": price,
+            "futures_price": price * (1 + rnd.gauss(0.008, 0.01)),
+            "futures_expiry": date + timedelta(hours=rnd.randint(-48, 24 * 40)),
+        }
+        if contracts >= 1 or rnd.random() < contracts:
+            row["contract"] = f"C{(i // 40) % 3}"
+        rows.append(row)
+        price *= 1 + rnd.gauss(0, 0.01)
+    if shuffle:
+        rnd.shuffle(rows)
+    return rows
+
+
+def random_config(seed, account_size=200000, funding_cost_annual=0.05):
+    """Backtester config with random thresholds (stop < entry < exit)."""
+    rnd = random.Random(seed)
+    entry = rnd.uniform(0, 0.02)
+    return SimpleNamespace(
+        account_size=account_size,
+        funding_cost_annual=funding_cost_annual,
+        entry_threshold=entry,
+        stop_loss_threshold=rnd.uniform(-0.005, entry),
+        exit_threshold=rnd.uniform(entry, 0.05),
+    )
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Tests for the shared spot/futures join and basis columns."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.data.basis import merge_basis
+
+EXPIRY = datetime(2026, 1, 30)
+
+
+class TestMergeBasis:
+    """Tests for merge_basis."""
+
+    def test_inner_join_on_day(self):
+        spot = [
+            {"date": datetime(2026, 1, 15), "spot_price": 90000.0},
+            {"date": datetime(2026, 1, 16), "spot_price": 91000.0},
+            {"date": datetime(2026, 1, 17), "spot_price": 92000.0},
+        ]
+        futures = [
+            {"date": datetime(2026, 1, 15), "futures_price": 91000.0, "expiry": None},
+            {"date": datetime(2026, 1, 17), "futures_price": 93000.0, "expiry": datetime(2026, 2, 27)},
+        ]
+
+        rows = merge_basis(spot, futures, EXPIRY, "MBTF6")
+
+        assert [r["date"].day for r in rows] == [15, 17]
+        assert rows[0]["futures_expiry"] == EXPIRY
+        assert rows[0]["days_to_expiry"] == 15
+        assert rows[1]["futures_expiry"] == datetime(2026, 2, 27)
+        assert rows[0]["basis_absolute"] == 1000.0
+        assert "future_continuous" not in rows[0]
+
+    def test_basis_columns(self):
+        spot = [{"date": datetime(2026, 1, d), "spot_price": p} for d, p in ((20, 100.0), (21, 0.0), (30, 200.0))]
+        futures = [{"date": datetime(2026, 1, d), "futures_price": p} for d, p in ((20, 101.0), (21, 5.0), (30, 202.0))]
+
+        rows = merge_basis(spot, futures, EXPIRY, "MBTF6")
+
+        assert [r["basis_absolute"] for r in rows] == [1.0, 5.0, 2.0]
+        assert rows[0]["basis_percent"] == pytest.approx(1.0)
+        assert rows[1]["basis_percent"] == 0  # zero spot
+        assert rows[0]["monthly_basis"] == pytest.approx(3.0)
+        assert rows[0]["annualized_basis"] == pytest.approx(36.5)
+        assert rows[2]["annualized_basis"] == 0  # expired
+
+    def test_hourly_spot_shares_daily_futures_bar(self):
+        spot = [{"date": datetime(2026, 1, 15) + timedelta(hours=h), "spot_price": 90000.0 + h} for h in range(24)]
+        futures = [{"date": datetime(2026, 1, 15), "futures_price": 91000.0}]
+
+        rows = merge_basis(spot, futures, EXPIRY, "MBTF6")
+
+        assert len(rows) == 24
+        assert rows[-1]["basis_absolute"] == 977.0
+        assert rows[-1]["days_to_expiry"] == 14
+
+    def test_unsorted_inputs_keep_last_bar_per_day(self):
+        spot = [
+            {"date": datetime(2026, 1, 16), "spot_price": 91000.0},
+            {"date": datetime(2026, 1, 15), "spot_price": 90000.0},
+        ]
+        futures = [
+            {"date": datetime(2026, 1, 16), "futures_price": 92000.0},
+            {"date": datetime(2026, 1, 15), "futures_price": 1.0},
+            {"date": datetime(2026, 1, 15), "futures_price": 91000.0},
+        ]
+
+        rows = merge_basis(spot, futures, EXPIRY, "MBTF6")
+
+        assert [r["futures_price"] for r in rows] == [91000.0, 92000.0]
+
+    def test_continuous_is_left_joined(self):
+        spot = [{"date": datetime(2026, 1, d), "spot_price": 90000.0} for d in (15, 16)]
+        futures = [{"date": datetime(2026, 1, d), "futures_price": 91000.0} for d in (15, 16)]
+        continuous = [{"date": datetime(2026, 1, 16), "futures_price": 91500.0}]
+
+        rows = merge_basis(spot, futures, EXPIRY, "MBTF6", continuous_data=continuous)
+
+        assert [r["future_continuous"] for r in rows] == [None, 91500.0]
+        assert list(rows[0]) == [
+            "date", "contract", "spot_price", "futures_price", "future_continuous",
+            "futures_expiry", "basis_absolute", "basis_percent", "monthly_basis",
+            "annualized_basis", "days_to_expiry",
+        ]
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for binary columnar basis datasets."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.engine import Backtester
+from crypto_data.data.accumulator import CSV_FIELDNAMES, FuturesAccumulator
+from crypto_data.data.basis import merge_basis
+from crypto_data.data.basis_store import BASIS_COLUMNS, BasisColumns, from_micros, to_micros
+from crypto_data.data.ibkr import IBKRHistoricalFetcher
+
+
+def _rows(days=60, hourly=False, continuous=True):
+    """Accumulated rows with unrounded prices, spanning two contracts."""
+    step = timedelta(hours=1) if hourly else timedelta(days=1)
+    start = datetime(2026, 1, 1, 0, 0, 0, 123456 if hourly else 0)
+    spot = [{"date": start + i * step, "spot_price": 90000.0 + i / 7} for i in range(days)]
+    futures = [{"date": start + i * step, "futures_price": 91000.0 + i / 3} for i in range(days)]
+    cont = [{"date": start + i * step, "futures_price": 91500.0 + i / 9} for i in range(0, days, 2)]
+    half = days // 2
+    return (
+        merge_basis(spot[:half], futures[:half], datetime(2026, 1, 30), "MBTF6", cont if continuous else None)
+        + merge_basis(spot[half:], futures[half:], datetime(2026, 2, 27), "MBTG6", cont if continuous else None)
+    )
+
+
+class TestBasisColumns:
+    """Tests for BasisColumns."""
+
+    def test_schema_matches_csv(self):
+        assert list(BASIS_COLUMNS) == CSV_FIELDNAMES
+
+    def test_micros_round_trip(self):
+        value = datetime(2026, 3, 27, 16, 30, 5, 42)
+        assert from_micros(to_micros(value)) == value
+
+    def test_micros_of_aware_datetime_is_utc(self):
+        value = datetime(2026, 3, 27, 16, 30, tzinfo=timezone(timedelta(hours=-5)))
+        assert to_micros(value) == to_micros(datetime(2026, 3, 27, 21, 30))
+        assert from_micros(to_micros(value), timezone.utc) == value
+
+    def test_tz_aware_round_trip(self, tmp_path):
+        est = timezone(timedelta(hours=-5))
+        rows = _rows(days=4)
+        for row in rows:
+            row["date"] = row["date"].replace(tzinfo=est)
+            row["futures_expiry"] = row["futures_expiry"].replace(tzinfo=est)
+        BasisColumns.from_rows(rows).save(tmp_path / "basis.cols")
+
+        loaded = BasisColumns.load(tmp_path / "basis.cols")
+        try:
+            assert loaded.rows() == rows
+            assert loaded.dates()[0].tzinfo == timezone.utc
+            assert loaded.dates()[0].hour == 5
+        finally:
+            loaded.close()
+        # Naive datasets stay naive
+        BasisColumns.from_rows(_rows(days=4)).save(tmp_path / "naive.cols")
+        loaded = BasisColumns.load(tmp_path / "naive.cols")
+        assert loaded.dates()[0].tzinfo is None
+        loaded.close()
+
+    def test_round_trip_keeps_full_precision(self, tmp_path):
+        rows = _rows(hourly=True)
+        BasisColumns.from_rows(rows).save(tmp_path / "basis.cols")
+
+        loaded = BasisColumns.load(tmp_path / "basis.cols")
+        try:
+            assert loaded.rows() == rows
+            assert loaded.contracts == ["MBTF6", "MBTG6"]
+            assert isinstance(loaded["spot_price"], memoryview)
+        finally:
+            loaded.close()
+
+    def test_missing_continuous_is_none(self, tmp_path):
+        rows = _rows(days=4, continuous=False)
+        BasisColumns.from_rows(rows).save(tmp_path / "basis.cols")
+        loaded = BasisColumns.load(tmp_path / "basis.cols")
+        assert [r["future_continuous"] for r in loaded.rows()] == [None] * 4
+        loaded.close()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        (tmp_path / "junk.cols").write_bytes(b"not columnar")
+        assert BasisColumns.load(tmp_path / "junk.cols") is None
+        assert BasisColumns.load(tmp_path / "missing.cols") is None
+
+
+class TestBasisExport:
+    """Tests for accumulator export and backtester loading."""
+
+    def test_export_dispatches_on_suffix(self, tmp_path):
+        acc = FuturesAccumulator(IBKRHistoricalFetcher())
+        rows = _rows()
+
+        acc.export(rows, str(tmp_path / "basis.csv"))
+        acc.export(iter(rows), str(tmp_path / "basis.cols"))
+
+        assert (tmp_path / "basis.csv").read_text().startswith("date,contract")
+        loaded = BasisColumns.load(tmp_path / "basis.cols")
+        assert loaded.rows() == rows
+        loaded.close()
+
+    def test_backtester_loads_columns(self, tmp_path):
+        acc = FuturesAccumulator(IBKRHistoricalFetcher())
+        rows = _rows()
+        acc.to_csv(rows, str(tmp_path / "basis.csv"))
+        acc.to_columns(rows, str(tmp_path / "basis.cols"))
+        backtester = Backtester()
+
+        from_csv = backtester.load_historical_data(str(tmp_path / "basis.csv"))
+        from_cols = backtester.load_historical_data(str(tmp_path / "basis.cols"))
+
+        assert len(from_cols) == len(from_csv) == 60
+        for a, b in zip(from_cols, from_csv):
+            assert a["date"] == b["date"]
+            assert a["futures_expiry"] == b["futures_expiry"]
+            assert a["contract"] == b["contract"]
+            assert a["spot_price"] == pytest.approx(b["spot_price"], abs=0.005)
+        assert from_cols[1]["spot_price"] == rows[1]["spot_price"]
+
+    def test_backtester_rejects_bad_file(self, tmp_path):
+        (tmp_path / "junk.cols").write_bytes(b"")
+        with pytest.raises(ValueError):
+            Backtester().load_historical_data(str(tmp_path / "junk.cols"))
@@ -8,15 +8,26 @@ from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch
 import tempfile
+import json
+import math
 import os
+import threading
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from crypto_data.data.catalog import DatabentoCatalog
+from crypto_data.data.registry import DatasetRegistry
 from crypto_data.data.databento import (
+    DatabentoColumns,
     DatabentoLocalFetcher,
     CME_MONTH_CODES,
     MONTH_TO_CME_CODE,
+    decode_symbol,
+    iter_ohlcv_batches,
+    load_symbology,
+    parse_ts_event,
+    resolve_year_digit,
 )
 
 
@@ -235,6 +246,24 @@ class TestGetHistoricalFutures:
             result = fetcher.get_historical_futures(expiry="202602", symbol="BTC")
             assert result == []
 
+    def test_many_matches_single_queries(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir)
+            windows = [
+                ("202601", datetime(2026, 1, 5), datetime(2026, 1, 6)),
+                ("202603", datetime(2026, 1, 6), datetime(2026, 3, 31)),
+                ("202912", datetime(2026, 1, 1), datetime(2026, 1, 31)),
+            ]
+            result = fetcher.get_historical_futures_many(windows, symbol="MBT")
+            assert list(result) == ["202601", "202603", "202912"]
+            for expiry, start, end in windows:
+                assert result[expiry] == fetcher.get_historical_futures(
+                    expiry=expiry, symbol="MBT", start_date=start, end_date=end
+                )
+            assert len(result["202601"]) == 2
+            assert result["202912"] == []
+
 
 class TestGetHistoricalContinuousFutures:
     """Tests for get_historical_continuous_futures method."""
@@ -305,3 +334,510 @@ class TestGetHistoricalContinuousFutures:
             assert prices[5] == 95300.0
             assert prices[6] == 96600.0
             assert prices[7] == 97000.0
+
+
+class TestColumnarCache:
+    """Tests for the memory-mapped columnar cache next to the CSV."""
+
+    def test_cache_written_next_to_csv(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+            fetcher._load_columns()
+            assert DatabentoLocalFetcher.cache_path_for(csv_path).exists()
+
+    def test_second_load_is_memory_mapped(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            first = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+            assert not first._load_columns().memory_mapped
+
+            second = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+            assert second._load_columns().memory_mapped
+            assert second._load_data() == first._load_data()
+            assert second.get_historical_futures(expiry="202602", symbol="MBT") == \
+                first.get_historical_futures(expiry="202602", symbol="MBT")
+
+    def test_rebuilt_when_csv_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())._load_columns()
+
+            csv_path = _create_test_csv(tmp_dir, SAMPLE_CSV_ROWS[:3])
+            st = csv_path.stat()
+            os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+            columns = fetcher._load_columns()
+            assert not columns.memory_mapped
+            assert len(columns) == 3
+
+    def test_touched_csv_reuses_cache(self):
+        """Same content with a new mtime is detected via the hash."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())._load_columns()
+
+            st = csv_path.stat()
+            os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+            with patch.object(DatabentoColumns, "from_csv") as mock_parse:
+                columns = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())._load_columns()
+                mock_parse.assert_not_called()
+            assert len(columns) == 10
+
+    def test_use_cache_false_writes_nothing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, use_cache=False)
+            assert len(fetcher._load_columns()) == 10
+            assert not DatabentoLocalFetcher.cache_path_for(csv_path).exists()
+
+    def test_concurrent_writes_use_separate_tmp_files(self):
+        """Two threads writing the same cache must not share a tmp file."""
+        from array import array
+        from crypto_data.utils import columnar
+
+        barrier = threading.Barrier(2, timeout=5)
+        replace = os.replace
+
+        def replace_together(src, dst):
+            barrier.wait()
+            replace(src, dst)
+
+        errors = []
+
+        def write(value):
+            try:
+                columnar.write_columns(path, {"x": array("d", [value] * 100)})
+            except Exception as e:
+                errors.append(e)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "data.cols"
+            with patch.object(columnar.os, "replace", replace_together):
+                threads = [threading.Thread(target=write, args=(v,)) for v in (1.0, 2.0)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+            assert errors == []
+            result = columnar.read_columns(path)
+            assert set(result["x"]) in ({1.0}, {2.0})
+            result.close()
+            assert os.listdir(tmp_dir) == ["data.cols"]
+
+
+class TestContractIndex:
+    """Tests for the per-contract sorted index used by range queries."""
+
+    def test_contract_rows_are_contiguous_and_sorted(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            columns = DatabentoLocalFetcher(data_dir=tmp_dir)._load_columns()
+            for cid in range(len(columns.contracts)):
+                start, stop = columns.contract_range(cid)
+                assert all(columns.contract[i] == cid for i in range(start, stop))
+                dates = list(columns.date[start:stop])
+                assert dates == sorted(dates)
+            assert columns.offsets[-1] == len(columns)
+
+    def test_contract_range_bounds_are_inclusive(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            columns = DatabentoLocalFetcher(data_dir=tmp_dir)._load_columns()
+            cid = columns.contract_index["MBTG6"]
+            jan6 = datetime(2026, 1, 6).toordinal()
+            start, stop = columns.contract_range(cid, jan6, jan6)
+            assert stop - start == 1
+            assert columns.close[start] == 96800.0
+
+    def test_start_date_with_time_excludes_that_day(self):
+        """Midnight bars before a start_date with a time component are excluded."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir)
+            result = fetcher.get_historical_futures(
+                expiry="202602",
+                symbol="MBT",
+                start_date=datetime(2026, 1, 5, 12, 0),
+            )
+            assert [r["date"].day for r in result] == [6, 7]
+
+
+class TestContinuousRollPolicies:
+    """Tests for roll policies and back-adjustment of continuous futures."""
+
+    def _continuous(self, tmp_dir, **kwargs):
+        _create_test_csv(tmp_dir)
+        fetcher = DatabentoLocalFetcher(data_dir=tmp_dir)
+        return fetcher.get_historical_continuous_futures(
+            symbol="MBT",
+            start_date=datetime(2026, 1, 5),
+            end_date=datetime(2026, 1, 7),
+            **kwargs,
+        )
+
+    def test_calendar_reports_contract(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self._continuous(tmp_dir)
+            assert [r["contract"] for r in result] == ["MBTF6"] * 3
+
+    def test_business_days_rolls_early(self):
+        """Rolling 20 business days before the Jan 30 expiry selects Feb."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self._continuous(tmp_dir, roll="business_days", roll_days=20)
+            assert [r["contract"] for r in result] == ["MBTG6"] * 3
+            assert [r["futures_price"] for r in result] == [95500.0, 96800.0, 97200.0]
+
+    def test_volume_crossover_picks_busiest_contract(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self._continuous(tmp_dir, roll="volume")
+            assert [r["contract"] for r in result] == ["MBTG6"] * 3
+
+    def test_difference_adjustment(self):
+        """Roll after Jan 5: history shifts by the Jan 6 G6-F6 gap (200)."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self._continuous(
+                tmp_dir, roll="business_days", roll_days=19, adjustment="difference"
+            )
+            assert [r["contract"] for r in result] == ["MBTF6", "MBTG6", "MBTG6"]
+            assert [r["futures_price"] for r in result] == [95500.0, 96800.0, 97200.0]
+
+    def test_ratio_adjustment(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = self._continuous(
+                tmp_dir, roll="business_days", roll_days=19, adjustment="ratio"
+            )
+            assert result[0]["futures_price"] == pytest.approx(95300.0 * 96800.0 / 96600.0)
+            assert result[-1]["futures_price"] == 97200.0
+
+    def test_unknown_policy_raises(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with pytest.raises(ValueError):
+                self._continuous(tmp_dir, roll="open_interest")
+
+
+class TestStreamingReader:
+    """Tests for iter_ohlcv_batches / DatabentoLocalFetcher.iter_bars."""
+
+    def test_batches_are_bounded(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            batches = list(iter_ohlcv_batches(csv_path, batch_size=4))
+            assert [len(b) for b in batches] == [4, 4, 2]
+
+    def test_spreads_skipped_by_default(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            symbols = {b.symbol(i) for b in iter_ohlcv_batches(csv_path) for i in range(len(b))}
+            assert "MBTG6-MBTH6" not in symbols
+            spread_rows = sum(len(b) for b in iter_ohlcv_batches(csv_path, include_spreads=True))
+            assert spread_rows == 11
+
+    def test_symbol_and_window_filters(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            batches = list(iter_ohlcv_batches(
+                csv_path,
+                symbols={"MBTG6"},
+                start=datetime(2026, 1, 6),
+                end=datetime(2026, 1, 6, 23, 59),
+            ))
+            assert sum(len(b) for b in batches) == 1
+            batch = batches[0]
+            assert batch.symbol(0) == "MBTG6"
+            assert batch.timestamp(0) == datetime(2026, 1, 6)
+            assert batch["close"][0] == 96800.0
+            assert batch["volume"][0] == 1200
+            assert batch.instrument_id[0] == 42083749
+
+    def test_intraday_timestamps(self):
+        rows = [
+            "2026-01-05T14:30:00.000000000Z,33,1,7,1.0,2.0,0.5,1.5,10,MBTG6",
+            "2026-01-05T14:31:00.500000000Z,33,1,7,1.5,2.0,0.5,1.75,12,MBTG6",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = Path(tmp_dir) / "test.ohlcv-1m.csv"
+            csv_path.write_text("\n".join([SAMPLE_CSV_HEADER] + rows) + "\n")
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir)
+            batches = list(fetcher.iter_bars(schema="ohlcv-1m", start_date=datetime(2026, 1, 5, 14, 31)))
+            assert len(batches) == 1 and len(batches[0]) == 1
+            assert batches[0].timestamp(0) == datetime(2026, 1, 5, 14, 31, 0, 500000)
+
+    def test_raw_nanosecond_timestamps(self):
+        assert parse_ts_event("1767571200000000000") == 1767571200000000000
+        assert parse_ts_event("2026-01-05T00:00:00.000000000Z") == 1767571200000000000
+
+
+def _write_split_file(folder, name, rows):
+    """Write one file of a split Databento download."""
+    path = Path(folder) / name
+    path.write_text("\n".join([SAMPLE_CSV_HEADER] + rows) + "\n")
+    return path
+
+
+class TestCatalog:
+    """Tests for DatabentoCatalog over split downloads."""
+
+    def _split_download(self, tmp_dir):
+        jan = [r for r in SAMPLE_CSV_ROWS if r.startswith("2026-01")]
+        mar = [r for r in SAMPLE_CSV_ROWS if r.startswith("2026-03")]
+        jan_path = _write_split_file(tmp_dir, "glbx-mdp3-20260101-20260131.ohlcv-1d.csv", jan)
+        mar_path = _write_split_file(tmp_dir, "glbx-mdp3-20260301-20260331.ohlcv-1d.csv", mar)
+        manifest = {"files": [
+            {"filename": p.name, "size": p.stat().st_size} for p in (jan_path, mar_path)
+        ]}
+        (Path(tmp_dir) / "manifest.json").write_text(json.dumps(manifest))
+        return jan_path, mar_path
+
+    def test_file_spans_from_names(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._split_download(tmp_dir)
+            files = DatabentoCatalog(tmp_dir).files
+            assert [(f.start, f.end) for f in files] == [
+                (datetime(2026, 1, 1).toordinal(), datetime(2026, 1, 31).toordinal()),
+                (datetime(2026, 3, 1).toordinal(), datetime(2026, 3, 31).toordinal()),
+            ]
+            assert files[0].expected_size == files[0].path.stat().st_size
+
+    def test_query_opens_only_overlapping_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jan_path, mar_path = self._split_download(tmp_dir)
+            catalog = DatabentoCatalog(tmp_dir)
+            columns = catalog.load(datetime(2026, 3, 1), datetime(2026, 3, 31))
+            assert [c[0] for c in columns.contracts] == ["MBTJ6"]
+            assert mar_path.with_suffix(".cols").exists()
+            assert not jan_path.with_suffix(".cols").exists()
+
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir)
+            assert len(fetcher.get_historical_futures("202602", start_date=datetime(2026, 1, 1))) == 3
+            assert len(fetcher._load_columns()) == 10
+
+    def test_new_download_parses_only_new_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._split_download(tmp_dir)
+            DatabentoCatalog(tmp_dir).load()
+            _write_split_file(
+                tmp_dir,
+                "glbx-mdp3-20260401-20260430.ohlcv-1d.csv",
+                ["2026-04-01T00:00:00.000000000Z,35,1,42083752,1,1,1,101000.0,5,MBTJ6"],
+            )
+            real_from_csv = DatabentoColumns.from_csv
+            with patch.object(DatabentoColumns, "from_csv", side_effect=real_from_csv) as mock_parse:
+                columns = DatabentoCatalog(tmp_dir, max_workers=1).load()
+            assert mock_parse.call_count == 1
+            assert len(columns) == 11
+
+    def test_overlapping_files_deduplicated(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _, mar_path = self._split_download(tmp_dir)
+            newer = _write_split_file(
+                tmp_dir,
+                "glbx-mdp3-20260301-20260302.ohlcv-1d.csv",
+                ["2026-03-01T00:00:00.000000000Z,35,1,42083752,1,1,1,100600.0,9,MBTJ6"],
+            )
+            mtime = mar_path.stat().st_mtime_ns
+            os.utime(newer, ns=(mtime + 10**9, mtime + 10**9))
+            columns = DatabentoCatalog(tmp_dir).load()
+            cid = columns.contract_index["MBTJ6"]
+            start, stop = columns.contract_range(cid)
+            assert stop - start == 1
+            assert columns.close[start] == 100600.0
+
+    def test_parallel_parse_matches_single_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, tempfile.TemporaryDirectory() as single_dir:
+            self._split_download(tmp_dir)
+            _create_test_csv(single_dir)
+            split = DatabentoCatalog(tmp_dir, use_cache=False, max_workers=2).load()
+            single = DatabentoLocalFetcher(data_dir=single_dir, use_cache=False)._load_columns()
+            assert [split.row(i) for i in range(len(split))] == [single.row(i) for i in range(len(single))]
+
+    def test_bad_dates_from_condition_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self._split_download(tmp_dir)
+            (Path(tmp_dir) / "condition.json").write_text(json.dumps([
+                {"date": "2026-01-05", "condition": "available"},
+                {"date": "2026-01-06", "condition": "degraded"},
+            ]))
+            catalog = DatabentoCatalog(tmp_dir)
+            assert catalog.bad_dates() == [(datetime(2026, 1, 6), "degraded")]
+            assert catalog.bad_dates(start_date=datetime(2026, 1, 7)) == []
+
+
+class _Sized:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+class TestDatasetRegistry:
+    """Tests for the shared dataset registry."""
+
+    FP = {"size": 1, "mtime_ns": 1, "sha256": "a"}
+
+    def test_lru_eviction_over_budget(self):
+        registry = DatasetRegistry(max_bytes=100)
+        registry.put("a.csv", self.FP, _Sized(60))
+        registry.put("b.csv", self.FP, _Sized(30))
+        assert registry.get("a.csv", self.FP) is not None  # a is now most recent
+        registry.put("c.csv", self.FP, _Sized(30))
+        assert registry.get("b.csv", self.FP) is None
+        assert registry.get("a.csv", self.FP) is not None
+        assert registry.nbytes == 90
+        assert registry.stats()["evictions"] == 1
+
+    def test_changed_file_replaces_old_version(self):
+        registry = DatasetRegistry()
+        registry.put("a.csv", self.FP, _Sized(10))
+        changed = dict(self.FP, mtime_ns=2, sha256="b")
+        registry.put("a.csv", changed, _Sized(20))
+        assert len(registry) == 1
+        assert registry.get("a.csv", self.FP) is None
+        assert registry.fingerprint("a.csv") == changed
+
+    def test_fetchers_share_parsed_file(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            registry = DatasetRegistry()
+            real_from_csv = DatabentoColumns.from_csv
+            with patch.object(DatabentoColumns, "from_csv", side_effect=real_from_csv) as mock_parse:
+                for month in range(1, 13):
+                    fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, use_cache=False, registry=registry)
+                    fetcher.get_historical_futures(
+                        "202602", start_date=datetime(2026, month, 1), end_date=datetime(2026, month, 28)
+                    )
+            assert mock_parse.call_count == 1
+            assert registry.stats()["hits"] == 11
+
+    def test_concurrent_misses_parse_once(self):
+        """Threads missing on the same file wait for the one parsing it."""
+        import time
+        from crypto_data.data import catalog
+
+        real_parse = catalog._parse_file
+
+        def slow_parse(*args):
+            time.sleep(0.2)
+            return real_parse(*args)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir)
+            registry = DatasetRegistry()
+            start = threading.Barrier(2, timeout=5)
+            loaded = []
+
+            def load():
+                fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, registry=registry)
+                start.wait()
+                loaded.append(fetcher._load_columns())
+
+            with patch.object(catalog, "_parse_file", side_effect=slow_parse) as mock_parse:
+                threads = [threading.Thread(target=load) for _ in range(2)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+            assert mock_parse.call_count == 1
+            assert len(loaded) == 2 and loaded[0] is loaded[1]
+            assert registry.stats()["loads"] == 1
+
+    def test_accumulator_reuses_fetcher(self):
+        from crypto_data.data.accumulator import FuturesAccumulator
+
+        acc = FuturesAccumulator(fetcher=None, registry=DatasetRegistry())
+        first = acc._get_futures_fetcher("databento", "databento/BTC")
+        assert acc._get_futures_fetcher("databento", "databento/BTC") is first
+        assert first.registry is acc.registry
+
+
+class TestSymbology:
+    """Tests for instrument_id decoding and year-digit resolution."""
+
+    def test_year_digit_resolves_from_reference(self):
+        assert resolve_year_digit(6) == 2026
+        assert resolve_year_digit(1, datetime(2029, 6, 1)) == 2031
+        assert resolve_year_digit(0, datetime(2030, 1, 2)) == 2030
+        assert resolve_year_digit(9, datetime(2030, 1, 2)) == 2039
+
+    def test_load_symbology(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "symbology.json"
+            path.write_text(json.dumps({"result": {
+                "MBTG1": [{"d0": "2030-08-17", "d1": "2031-02-28", "s": "501"}],
+                "MBTG6-MBTH6": [{"d0": "2025-12-01", "d1": "2026-02-13", "s": "502"}],
+            }}))
+            table = load_symbology(path)
+            assert (table[501].base, table[501].year, table[501].month) == ("MBT", 2031, 2)
+            assert table[502].is_spread
+            assert load_symbology(Path(tmp_dir) / "missing.json") == {}
+
+    def test_same_symbol_a_decade_apart(self):
+        rows = [
+            "2021-01-04T00:00:00.000000000Z,35,1,100,1,1,1,30000.0,5,MBTG1",
+            "2031-01-06T00:00:00.000000000Z,35,1,900,1,1,1,250000.0,7,MBTG1",
+        ]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            _create_test_csv(tmp_dir, rows)
+            fetcher = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+            old = fetcher.get_historical_futures("202102", symbol="MBT")
+            new = fetcher.get_historical_futures("203102", symbol="MBT")
+            assert [r["futures_price"] for r in old] == [30000.0]
+            assert [r["futures_price"] for r in new] == [250000.0]
+            assert new[0]["expiry"] == datetime(2031, 2, 28)
+
+    def test_symbology_overrides_symbol_decoding(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            csv_path = _create_test_csv(tmp_dir)
+            instruments = {42083749: decode_symbol("MBTG6", 42083749, datetime(2035, 1, 1))}
+            columns = DatabentoColumns.from_csv(csv_path, instruments)
+            assert ("MBT", "203602") in columns.contract_by_expiry
+            assert ("MBT", "202603") in columns.contract_by_expiry
+
+
+class TestTermStructure:
+    """Tests for the date x tenor term-structure cube."""
+
+    def _fetcher(self, tmp_dir):
+        _create_test_csv(tmp_dir)
+        return DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())
+
+    def test_spreads_kept_with_legs(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            columns = self._fetcher(tmp_dir)._load_columns()
+            assert list(columns.spread_close) == [200.0]
+            near, far = columns.spread_near[0], columns.spread_far[0]
+            assert (columns.contracts[near][0], columns.contracts[far][0]) == ("MBTG6", "MBTH6")
+
+    def test_cube_lookup_by_tenor(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cube = self._fetcher(tmp_dir).get_term_structure("MBT", tenors=3)
+            day = datetime(2026, 1, 5)
+            assert cube.curve(day) == [95300.0, 95500.0, 95700.0]
+            assert cube.price(day, 2) == 95700.0
+            assert cube.spread_price(day, 1) == 200.0
+            # Mar 1: front month is H6 (no bar), J6 is the second tenor
+            assert math.isnan(cube.price(datetime(2026, 3, 1), 0))
+            assert cube.price(datetime(2026, 3, 1), 1) == 100500.0
+            assert list(cube.column(0))[:3] == [95300.0, 96600.0, 97000.0]
+
+    def test_curve_analytics(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cube = self._fetcher(tmp_dir).get_term_structure(
+                "MBT", tenors=3, start_date=datetime(2026, 1, 5), end_date=datetime(2026, 1, 7)
+            )
+            assert len(cube) == 3
+            assert list(cube.calendar_basis(0, 1)) == [200.0, 200.0, 200.0]
+            # Exchange spread used where it traded, outright difference elsewhere
+            assert list(cube.calendar_basis(1, 2)) == [200.0, 200.0, 200.0]
+            assert all(y < 0 for y in cube.roll_yield())  # contango
+            assert all(s > 0 for s in cube.slope())
+
+    def test_cube_read_from_cache(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            first = self._fetcher(tmp_dir)._load_columns().term_structure("MBT")
+            second = DatabentoLocalFetcher(data_dir=tmp_dir, registry=DatasetRegistry())._load_columns()
+            assert second.memory_mapped
+            assert "MBT" in second.term_structures
+            cached = second.term_structure("MBT")
+            assert list(cached.dates) == list(first.dates)
+            assert [x for x in cached.outright if x == x] == [x for x in first.outright if x == x]
@@ -3,16 +3,19 @@
 
 import sys
 import csv
+import time
+import asyncio
 import pytest
 from pathlib import Path
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import Mock, patch, MagicMock
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from crypto_data.data.ibkr import IBKRHistoricalFetcher
-from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.accumulator import FuturesAccumulator, date_chunks, read_last_csv_row
 from crypto_data.utils.expiry import get_front_month_expiry_str, get_last_friday_of_month
 
 
@@ -523,6 +526,393 @@ class TestAccumulateContinuous:
         assert mock_spot.call_args.kwargs["spot_config"] == custom_spot
 
 
+class TestAccumulateMany:
+    """Tests for FuturesAccumulator.accumulate_many."""
+
+    def _make_accumulator(self):
+        fetcher = IBKRHistoricalFetcher()
+        fetcher.connected = True
+        return FuturesAccumulator(fetcher)
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures_many")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_spot_fetched_once_and_sliced(self, mock_spot, mock_futures):
+        """Spot is fetched once over the union span and each contract gets its own window."""
+        mock_spot.return_value = [
+            {"date": datetime(2026, 1, d), "spot_price": 90000.0 + d} for d in range(10, 32)
+        ] + [
+            {"date": datetime(2026, 2, d), "spot_price": 95000.0 + d} for d in range(1, 11)
+        ]
+
+        def futures(windows, **kwargs):
+            result = {}
+            for expiry, _, _ in windows:
+                expiry_date = get_last_friday_of_month(int(expiry[:4]), int(expiry[4:6]))
+                result[expiry] = [
+                    {"date": datetime(2026, 1, 20), "futures_price": 91000.0, "expiry": expiry_date},
+                    {"date": datetime(2026, 2, 5), "futures_price": 96000.0, "expiry": expiry_date},
+                ]
+            return result
+
+        mock_futures.side_effect = futures
+
+        acc = self._make_accumulator()
+        windows = [
+            ("202601", datetime(2026, 1, 10), datetime(2026, 1, 29)),
+            ("202602", datetime(2026, 1, 30), datetime(2026, 2, 10)),
+        ]
+        result = acc.accumulate_many(windows, futures_source="ibkr")
+
+        mock_spot.assert_called_once()
+        assert mock_spot.call_args.kwargs["start_date"] == datetime(2026, 1, 10)
+        assert mock_spot.call_args.kwargs["end_date"] == datetime(2026, 2, 10)
+        mock_futures.assert_called_once()
+        assert mock_futures.call_args.args[0] == windows
+
+        assert list(result) == ["202601", "202602"]
+        assert [r["date"] for r in result["202601"]] == [datetime(2026, 1, 20)]
+        assert [r["date"] for r in result["202602"]] == [datetime(2026, 2, 5)]
+        assert result["202601"][0]["contract"] == "MBTF6"
+        assert result["202602"][0]["basis_absolute"] == pytest.approx(96000.0 - 95005.0)
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures_many")
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_matches_single_accumulate(self, mock_spot, mock_futures, mock_futures_many):
+        """Rows per contract are identical to separate accumulate() calls."""
+        expiry_date = get_last_friday_of_month(2026, 3)
+        mock_spot.return_value = [
+            {"date": datetime(2026, 3, d), "spot_price": 90000.0 + 100 * d} for d in range(1, 28)
+        ]
+        mock_futures.return_value = [
+            {"date": datetime(2026, 3, d), "futures_price": 91000.0 + 90 * d, "expiry": expiry_date}
+            for d in range(2, 27, 3)
+        ]
+        mock_futures_many.return_value = {"202603": mock_futures.return_value}
+
+        acc = self._make_accumulator()
+        window = ("202603", datetime(2026, 3, 1), datetime(2026, 3, 26))
+        many = acc.accumulate_many([window], futures_source="ibkr")
+        single = acc.accumulate(window[1], window[2], expiry="202603", futures_source="ibkr")
+
+        assert many["202603"] == single
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures_many")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_missing_contract_is_empty(self, mock_spot, mock_futures):
+        """A contract without futures bars maps to an empty list."""
+        mock_spot.return_value = [{"date": datetime(2026, 1, 15), "spot_price": 90000.0}]
+        mock_futures.return_value = {"202601": []}
+
+        acc = self._make_accumulator()
+        result = acc.accumulate_many(
+            [("202601", datetime(2026, 1, 1), datetime(2026, 1, 29))],
+            futures_source="ibkr",
+        )
+
+        assert result == {"202601": []}
+
+
+class _AsyncIB:
+    """IB stand-in whose historical requests each take 0.2s on the event loop."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = []
+
+    def qualifyContracts(self, *contracts):
+        return list(contracts)
+
+    async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, barSizeSetting, whatToShow, useRTH, formatDate):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.2)
+        self.in_flight -= 1
+        self.sent.append(whatToShow)
+        end = endDateTime or datetime(2026, 1, 20)
+        return [
+            SimpleNamespace(date=(end - timedelta(days=i)).date(), close=90000.0 + i)
+            for i in range(int(durationStr.split()[0]))
+        ]
+
+
+class TestConcurrentFetch:
+    """Tests for concurrent spot/futures fetching in FuturesAccumulator."""
+
+    def _make_accumulator(self):
+        fetcher = IBKRHistoricalFetcher()
+        fetcher.connected = True
+        return FuturesAccumulator(fetcher)
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_binance_spot_overlaps_futures_fetch(self, mock_spot, mock_futures):
+        """Binance spot runs on a worker thread while IBKR futures are fetched."""
+        expiry = get_last_friday_of_month(2026, 3)
+
+        def slow_spot(**kwargs):
+            time.sleep(0.3)
+            return [{"date": datetime(2026, 1, 15), "spot_price": 90000.0}]
+
+        def slow_futures(**kwargs):
+            time.sleep(0.3)
+            return [{"date": datetime(2026, 1, 15), "futures_price": 91000.0, "expiry": expiry}]
+
+        mock_spot.side_effect = slow_spot
+        mock_futures.side_effect = slow_futures
+
+        acc = self._make_accumulator()
+        started = time.monotonic()
+        result = acc.accumulate(
+            start_date=datetime(2026, 1, 15),
+            end_date=datetime(2026, 1, 15),
+            expiry="202603",
+            futures_source="ibkr",
+            spot_source="binance",
+        )
+        elapsed = time.monotonic() - started
+
+        assert len(result) == 1
+        assert result[0]["basis_absolute"] == pytest.approx(1000.0)
+        assert elapsed < 0.55
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_failure_attributed_to_source(self, mock_spot, mock_futures):
+        """An exception in one fetch is logged against its source and yields no rows."""
+        mock_spot.side_effect = ConnectionError("klines unavailable")
+        mock_futures.return_value = [
+            {"date": datetime(2026, 1, 15), "futures_price": 91000.0, "expiry": datetime(2026, 3, 27)},
+        ]
+
+        acc = self._make_accumulator()
+        with patch.object(acc, "log") as mock_log:
+            result = acc.accumulate(
+                start_date=datetime(2026, 1, 15),
+                end_date=datetime(2026, 1, 15),
+                expiry="202603",
+                futures_source="ibkr",
+                spot_source="binance",
+            )
+
+        assert result == []
+        messages = [c.args[0] for c in mock_log.call_args_list]
+        assert "[X] Spot (Binance BTCUSDT) fetch failed: klines unavailable" in messages
+        assert "[X] Failed to get spot data" in messages
+        assert not any("Futures" in m and "failed" in m for m in messages)
+
+    def test_ibkr_spot_and_futures_requests_overlap(self):
+        """IBKR spot and futures requests are in flight together on the IB loop."""
+        acc = self._make_accumulator()
+        acc.fetcher.ib = _AsyncIB()
+
+        started = time.monotonic()
+        result = acc.accumulate(
+            start_date=datetime(2026, 1, 1),
+            end_date=datetime(2026, 1, 20),
+            expiry="202603",
+            futures_source="ibkr",
+            spot_source="ibkr",
+        )
+        elapsed = time.monotonic() - started
+
+        assert sorted(acc.fetcher.ib.sent) == ["MIDPOINT", "TRADES"]
+        assert acc.fetcher.ib.max_in_flight == 2
+        assert elapsed < 0.35
+        assert len(result) == 19
+
+    def test_continuous_ibkr_series_overlap(self):
+        """Spot, front-month and continuous IBKR series are requested together."""
+        acc = self._make_accumulator()
+        acc.fetcher.ib = _AsyncIB()
+
+        result = acc.accumulate_continuous(
+            start_date=datetime(2026, 1, 1),
+            end_date=datetime(2026, 1, 20),
+            futures_source="ibkr",
+            spot_source="ibkr",
+        )
+
+        assert len(acc.fetcher.ib.sent) == 3
+        assert acc.fetcher.ib.max_in_flight == 3
+        assert len(result) == 19
+
+
+def _basis_rows(start, days, expiry=datetime(2026, 3, 27)):
+    """Accumulated rows for ``days`` consecutive days from ``start``."""
+    spot = [{"date": start + timedelta(days=i), "spot_price": 90000.0 + i} for i in range(days)]
+    futures = [{"date": start + timedelta(days=i), "futures_price": 91000.0 + 2 * i, "expiry": expiry} for i in range(days)]
+    return FuturesAccumulator._merge_basis(spot, futures, "202603", "MBTH6")
+
+
+class TestIncrementalCSV:
+    """Tests for tail reads and atomic appends of basis CSVs."""
+
+    def _make_accumulator(self):
+        fetcher = IBKRHistoricalFetcher()
+        fetcher.connected = True
+        return FuturesAccumulator(fetcher)
+
+    def test_append_matches_full_export(self, tmp_path):
+        acc = self._make_accumulator()
+        rows = _basis_rows(datetime(2026, 1, 1), 40)
+        full, incremental = tmp_path / "full.csv", tmp_path / "incremental.csv"
+
+        acc.to_csv(rows, str(full))
+        acc.to_csv(rows[:25], str(incremental))
+        appended = acc.append_csv(rows[10:], str(incremental))
+
+        assert appended == 15
+        assert incremental.read_bytes() == full.read_bytes()
+
+    def test_read_last_row_from_tail(self, tmp_path):
+        acc = self._make_accumulator()
+        output_file = tmp_path / "basis.csv"
+        acc.to_csv(_basis_rows(datetime(2026, 1, 1), 40), str(output_file))
+
+        last_row = read_last_csv_row(str(output_file), block_size=16)
+
+        assert last_row["date"] == "2026-02-09"
+        assert last_row["spot_price"] == "90039.00"
+        assert acc.last_csv_date(str(output_file)) == datetime(2026, 2, 9)
+
+    def test_header_only_and_missing_files(self, tmp_path):
+        acc = self._make_accumulator()
+        output_file = tmp_path / "basis.csv"
+        assert acc.last_csv_date(str(output_file)) is None
+        acc.to_csv([], str(output_file))
+        assert read_last_csv_row(str(output_file)) is None
+
+    def test_failed_append_leaves_file_unchanged(self, tmp_path):
+        acc = self._make_accumulator()
+        output_file = tmp_path / "basis.csv"
+        acc.to_csv(_basis_rows(datetime(2026, 1, 1), 5), str(output_file))
+        before = output_file.read_bytes()
+
+        with patch("crypto_data.data.accumulator.os.fsync", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                acc.append_csv(_basis_rows(datetime(2026, 1, 1), 10), str(output_file))
+
+        assert output_file.read_bytes() == before
+
+    def test_header_mismatch_raises(self, tmp_path):
+        output_file = tmp_path / "other.csv"
+        output_file.write_text("date,close\n2026-01-01,1\n")
+        with pytest.raises(ValueError):
+            self._make_accumulator().append_csv(_basis_rows(datetime(2026, 1, 2), 1), str(output_file))
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_accumulate_incremental_fetches_only_new_days(self, mock_spot, mock_futures, tmp_path):
+        expiry = datetime(2026, 3, 27)
+
+        def spot(start_date, end_date, **kwargs):
+            days = (end_date - start_date).days + 1
+            return [{"date": start_date + timedelta(days=i), "spot_price": 90000.0} for i in range(days)]
+
+        def futures(start_date, end_date, **kwargs):
+            days = (end_date - start_date).days + 1
+            return [{"date": start_date + timedelta(days=i), "futures_price": 91000.0, "expiry": expiry} for i in range(days)]
+
+        mock_spot.side_effect = spot
+        mock_futures.side_effect = futures
+        acc = self._make_accumulator()
+        output_file = str(tmp_path / "basis.csv")
+        kwargs = dict(expiry="202603", futures_source="ibkr")
+
+        acc.accumulate_incremental(output_file, datetime(2026, 1, 1), datetime(2026, 1, 20), **kwargs)
+        new_rows = acc.accumulate_incremental(output_file, datetime(2026, 1, 1), datetime(2026, 1, 23), **kwargs)
+        up_to_date = acc.accumulate_incremental(output_file, datetime(2026, 1, 1), datetime(2026, 1, 23), **kwargs)
+
+        assert mock_spot.call_args_list[1].kwargs["start_date"] == datetime(2026, 1, 21)
+        assert len(new_rows) == 3
+        assert up_to_date == []
+        assert mock_spot.call_count == 2
+        with open(output_file) as f:
+            dates = [row["date"] for row in csv.DictReader(f)]
+        assert dates[0] == "2026-01-01" and dates[-1] == "2026-01-23" and len(dates) == 23
+
+
+class TestAccumulateStream:
+    """Tests for chunked streaming accumulation."""
+
+    EXPIRY = datetime(2026, 6, 26)
+
+    def _make_accumulator(self):
+        fetcher = IBKRHistoricalFetcher()
+        fetcher.connected = True
+        return FuturesAccumulator(fetcher)
+
+    def _spot(self, start_date, end_date, **kwargs):
+        # One bar past each end, as sources sometimes return
+        days = (end_date - start_date).days + 2
+        return [{"date": start_date + timedelta(days=i), "spot_price": 90000.0 + (start_date + timedelta(days=i)).day}
+                for i in range(days)]
+
+    def _futures(self, start_date, end_date, **kwargs):
+        days = (end_date - start_date).days + 1
+        return [{"date": start_date + timedelta(days=i), "futures_price": 91000.0 + (start_date + timedelta(days=i)).weekday(),
+                 "expiry": self.EXPIRY} for i in range(days)]
+
+    def test_date_chunks(self):
+        chunks = date_chunks(datetime(2026, 1, 1), datetime(2026, 3, 5), 30)
+        assert chunks == [
+            (datetime(2026, 1, 1), datetime(2026, 1, 30)),
+            (datetime(2026, 1, 31), datetime(2026, 3, 1)),
+            (datetime(2026, 3, 2), datetime(2026, 3, 5)),
+        ]
+        with pytest.raises(ValueError):
+            date_chunks(datetime(2026, 1, 1), datetime(2026, 1, 2), 0)
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_stream_matches_full_accumulate(self, mock_spot, mock_futures):
+        mock_spot.side_effect = self._spot
+        mock_futures.side_effect = self._futures
+        acc = self._make_accumulator()
+        kwargs = dict(expiry="202606", futures_source="ibkr")
+        start, end = datetime(2026, 1, 1), datetime(2026, 4, 10)
+
+        full = acc.accumulate(start_date=start, end_date=end, **kwargs)
+        full = [row for row in full if row["date"] <= end]
+        streamed = list(acc.accumulate_stream(start, end, chunk_days=20, **kwargs))
+
+        assert streamed == full
+        assert len(streamed) == 100
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_stream_is_lazy(self, mock_spot, mock_futures):
+        mock_spot.side_effect = self._spot
+        mock_futures.side_effect = self._futures
+        acc = self._make_accumulator()
+
+        stream = acc.accumulate_stream(
+            datetime(2026, 1, 1), datetime(2026, 12, 31), expiry="202606", futures_source="ibkr", chunk_days=10,
+        )
+        next(stream)
+
+        assert mock_spot.call_count == 1
+        call = mock_spot.call_args.kwargs
+        assert (call["end_date"] - call["start_date"]).days == 9
+
+    @patch("crypto_data.data.ibkr.IBKRHistoricalFetcher.get_historical_futures")
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_spot")
+    def test_to_csv_consumes_stream(self, mock_spot, mock_futures, tmp_path):
+        mock_spot.side_effect = self._spot
+        mock_futures.side_effect = self._futures
+        acc = self._make_accumulator()
+        kwargs = dict(expiry="202606", futures_source="ibkr")
+        start, end = datetime(2026, 1, 1), datetime(2026, 2, 15)
+
+        written = acc.to_csv(acc.accumulate_stream(start, end, chunk_days=7, **kwargs), str(tmp_path / "stream.csv"))
+        acc.to_csv(list(acc.accumulate_stream(start, end, chunk_days=46, **kwargs)), str(tmp_path / "list.csv"))
+
+        assert written == 46
+        assert (tmp_path / "stream.csv").read_bytes() == (tmp_path / "list.csv").read_bytes()
+
+
 class TestGetHistoricalContinuousFutures:
     """Tests for IBKRHistoricalFetcher.get_historical_continuous_futures."""
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Tests for serial and multiprocess grid search."""
+
+import sys
+from pathlib import Path
+from datetime import timezone
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.grid import (
+    SharedSeries,
+    backtest_points,
+    grid_points,
+    run_grid,
+    run_grid_parallel,
+)
+from tests.helpers import daily_rows
+
+
+POINTS = grid_points([0.002, 0.006, 0.012], [0.001, 0.003], [0.02, 0.04], [10, 30])
+
+
+class TestGridPoints:
+    """Tests for grid_points."""
+
+    def test_product_order_without_invalid_points(self):
+        points = grid_points([0.002, 0.004], [0.001, 0.003], [0.003, 0.02], [10])
+        assert points == [
+            (0.002, 0.001, 0.003, 10),
+            (0.002, 0.001, 0.02, 10),
+            (0.004, 0.001, 0.02, 10),
+            (0.004, 0.003, 0.02, 10),
+        ]
+
+
+class TestSharedSeries:
+    """Tests for SharedSeries."""
+
+    @pytest.mark.parametrize("tz", [None, timezone.utc])
+    def test_rows_round_trip(self, tz):
+        rows = daily_rows(days=120, tz=tz, unnamed_every=4)
+        series = SharedSeries.create(rows)
+        try:
+            attached = SharedSeries.attach(series.handle)
+            assert attached.rows() == rows
+            attached.close()
+        finally:
+            series.close()
+            series.unlink()
+
+    def test_frame_views_shared_block(self):
+        pytest.importorskip("numpy")
+        rows = daily_rows(days=120, unnamed_every=4)
+        series = SharedSeries.create(rows)
+        try:
+            frame = series.frame()
+            assert frame.spot.tolist() == [row["spot_price"] for row in rows]
+            assert frame.days_to_expiry.tolist() == [
+                (row["futures_expiry"] - row["date"]).days for row in rows
+            ]
+            del frame
+        finally:
+            series.close()
+            series.unlink()
+
+
+class TestRunGrid:
+    """Tests for run_grid and run_grid_parallel."""
+
+    def test_run_grid_matches_one_backtest_per_point(self):
+        rows = daily_rows(days=120, unnamed_every=4)
+        expected = backtest_points(rows, POINTS, 200000, 0.05)
+        results = run_grid(rows, POINTS, 200000, 0.05)
+        assert results == expected
+
+    def test_parallel_matches_serial(self):
+        rows = daily_rows(seed=1, days=120, unnamed_every=4)
+        calls = []
+
+        results = run_grid_parallel(
+            rows, POINTS, 200000, 0.05, workers=2, chunk_size=5,
+            progress=lambda done, total: calls.append((done, total)),
+        )
+
+        assert results == run_grid(rows, POINTS, 200000, 0.05)
+        assert len(calls) == 4
+        assert calls[-1] == (len(POINTS), len(POINTS))
+
+    def test_empty_grid(self):
+        assert run_grid_parallel(daily_rows(days=120, unnamed_every=4), [], 200000, 0.05, workers=2) == []
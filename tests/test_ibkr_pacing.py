@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Tests for the IBKR historical request pacing scheduler."""
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.data.ibkr_pacing import (
+    HistoricalPlan,
+    HistoricalRequest,
+    HistoricalScheduler,
+    PacingPolicy,
+    combine_plans,
+)
+
+
+class _Contract:
+    def __init__(self, con_id, exchange="CME"):
+        self.conId = con_id
+        self.exchange = exchange
+
+
+class _Bar:
+    def __init__(self, date, close):
+        self.date = date
+        self.close = close
+
+
+class FakeIB:
+    """Local stand-in for ib_insync.IB that serves historical bars with latency."""
+
+    def __init__(self, latency=0.05, fail_on=()):
+        self.latency = latency
+        self.fail_on = set(fail_on)
+        self.sent = []
+        self.active = 0
+        self.max_active = 0
+        self.slept = []
+
+    def _bars(self, contract, durationStr):
+        return [_Bar(datetime(2026, 1, 1), float(contract.conId)), _Bar(datetime(2026, 1, 2), float(durationStr.split()[0]))]
+
+    async def reqHistoricalDataAsync(self, contract, endDateTime, durationStr, barSizeSetting,
+                                     whatToShow, useRTH, formatDate=1):
+        self.sent.append((time.monotonic(), contract.conId, str(endDateTime), durationStr))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            if contract.conId in self.fail_on:
+                raise RuntimeError("pacing violation")
+            return self._bars(contract, durationStr)
+        finally:
+            self.active -= 1
+
+    def reqHistoricalData(self, contract, endDateTime, durationStr, barSizeSetting,
+                          whatToShow, useRTH, formatDate=1):
+        self.sent.append((time.monotonic(), contract.conId, str(endDateTime), durationStr))
+        return self._bars(contract, durationStr)
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        time.sleep(seconds)
+
+
+def _request(con_id, duration="30 D", end=datetime(2026, 1, 31)):
+    return HistoricalRequest(_Contract(con_id), endDateTime=end, durationStr=duration, barSizeSetting="1 day")
+
+
+class TestPacingPolicy:
+    """Tests for pacing rule bookkeeping."""
+
+    def test_identical_request_waits(self):
+        policy = PacingPolicy()
+        assert policy.reserve(_request(1), now=100.0) == 0
+        assert policy.reserve(_request(1), now=100.0) == 15.0
+        assert policy.reserve(_request(1, duration="60 D"), now=100.0) == 15.0
+
+    def test_burst_on_same_contract(self):
+        policy = PacingPolicy()
+        delays = [policy.reserve(_request(1, duration=f"{d} D"), now=0.0) for d in range(1, 8)]
+        assert delays[:5] == [0, 0, 0, 0, 0]
+        assert delays[5] == 2.0
+        assert delays[6] == 2.0
+        assert policy.reserve(_request(2), now=0.0) == 2.0  # FIFO order is kept
+
+    def test_window_limit(self):
+        policy = PacingPolicy()
+        delays = [policy.reserve(_request(i), now=0.0) for i in range(61)]
+        assert max(delays[:60]) == 0
+        assert delays[60] == 600.0
+
+    def test_bookings_expire(self):
+        policy = PacingPolicy()
+        policy.reserve(_request(1), now=0.0)
+        assert policy.reserve(_request(1), now=20.0) == 0
+
+    def test_identical_bookings_are_pruned(self):
+        policy = PacingPolicy()
+        for i in range(100):
+            policy.reserve(_request(i), now=i * 20.0)
+        assert len(policy._identical) == 1
+        # A re-booked identity moves behind the older ones, which still expire
+        policy = PacingPolicy()
+        for now, con_id in ((0.0, 1), (10.0, 2), (16.0, 1), (26.0, 3)):
+            assert policy.reserve(_request(con_id), now=now) == 0
+        assert list(policy._identical.values()) == [16.0, 26.0]
+
+
+class TestHistoricalScheduler:
+    """Tests for HistoricalScheduler against a fake IB."""
+
+    def test_requests_run_concurrently_in_order(self):
+        ib = FakeIB(latency=0.1)
+        scheduler = HistoricalScheduler(ib)
+        requests = [_request(i) for i in range(1, 11)]
+
+        started = time.monotonic()
+        results = scheduler.fetch_all(requests)
+        elapsed = time.monotonic() - started
+
+        assert elapsed < 0.5
+        assert ib.max_active > 1
+        assert [bars[0].close for bars in results] == [float(i) for i in range(1, 11)]
+
+    def test_max_in_flight(self):
+        ib = FakeIB(latency=0.02)
+        scheduler = HistoricalScheduler(ib, max_in_flight=3)
+        scheduler.fetch_all([_request(i) for i in range(1, 13)])
+        assert ib.max_active == 3
+
+    def test_pacing_rules_hold_on_the_wire(self):
+        ib = FakeIB(latency=0.01)
+        policy = PacingPolicy(identical_interval=0.3, burst_limit=2, burst_window=0.2, window_limit=4, window=0.5)
+        scheduler = HistoricalScheduler(ib, policy=policy)
+        requests = [_request(1), _request(1), _request(1, duration="60 D"), _request(2), _request(3), _request(1)]
+
+        scheduler.fetch_all(requests)
+
+        sent = sorted(ib.sent)
+        slack = 0.02
+        for i, (t, con_id, end, duration) in enumerate(sent):
+            for t2, con_id2, end2, duration2 in sent[i + 1:]:
+                if (con_id, end, duration) == (con_id2, end2, duration2):
+                    assert t2 - t >= 0.3 - slack
+            same = [s for s in sent if s[1] == con_id and t <= s[0] < t + 0.2 - slack]
+            assert len(same) <= 2
+            assert len([s for s in sent if t <= s[0] < t + 0.5 - slack]) <= 4
+
+    def test_failed_request_yields_empty(self):
+        ib = FakeIB(latency=0.01, fail_on={2})
+        scheduler = HistoricalScheduler(ib)
+        results = scheduler.fetch_all([_request(1), _request(2), _request(3)])
+        assert [len(bars) for bars in results] == [2, 0, 2]
+
+    def test_blocking_fetch_waits_through_ib_sleep(self):
+        ib = FakeIB()
+        policy = PacingPolicy(identical_interval=0.1)
+        scheduler = HistoricalScheduler(ib, policy=policy)
+
+        scheduler.fetch(_request(1))
+        scheduler.fetch(_request(1))
+
+        assert len(ib.sent) == 2
+        assert len(ib.slept) == 1
+        assert 0 < ib.slept[0] <= 0.1
+        assert ib.sent[1][0] - ib.sent[0][0] >= 0.09
+
+    def test_plans_share_one_fetch_all(self):
+        ib = FakeIB()
+        plans = [
+            HistoricalPlan([_request(1), _request(2)], lambda bars: [b[0].close for b in bars]),
+            HistoricalPlan.done("cached"),
+            HistoricalPlan([_request(3)], lambda bars: len(bars[0])).then(str),
+        ]
+        combined = combine_plans(plans, list)
+
+        result = combined.finish(HistoricalScheduler(ib).fetch_all(combined.requests))
+
+        assert result == [[1.0, 2.0], "cached", "2"]
+        assert ib.max_active == 3
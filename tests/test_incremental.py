@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for the incremental (online) backtester."""
+
+import json
+import sys
+from pathlib import Path
+from datetime import timezone
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.incremental import IncrementalBacktester
+from tests.helpers import random_config, random_rows
+
+
+def _assert_matches(expected, actual):
+    summary = actual.to_dict()["summary"]
+    want = expected.to_dict()["summary"]
+    assert summary.pop("sharpe_ratio") == pytest.approx(want.pop("sharpe_ratio"), rel=1e-9, abs=1e-12)
+    assert summary == want
+    # Only the open trade is kept: run_backtest()'s final forced close
+    forced = [t for t in expected.trades if t.status == "forced_close"]
+    assert [vars(t) for t in actual.trades] == [vars(t) for t in forced]
+
+
+class TestIncrementalBacktester:
+    """Tests against Backtester.run_backtest."""
+
+    @pytest.mark.parametrize("holding_days", [0, 7, 30])
+    def test_matches_run_backtest_at_every_row(self, holding_days):
+        for seed in range(10):
+            rows = random_rows(seed, n=120, contracts=0.8, step_hours=(24,))
+            config = random_config(seed, 150000, 0.04)
+            backtester = Backtester(config)
+            incremental = IncrementalBacktester(config, holding_days=holding_days)
+            closed = 0
+            for i, row in enumerate(rows, 1):
+                closed += incremental.update(row) is not None
+                if i % 10 == 0 or i == len(rows):
+                    _assert_matches(backtester.run_backtest(rows[:i], holding_days), incremental.result())
+            assert closed == incremental.closed_trades
+
+    def test_resume_from_saved_state(self, tmp_path):
+        rows = random_rows(4, n=300, contracts=0.8, tz=timezone.utc, step_hours=(24,))
+        config = random_config(4, 150000, 0.04)
+        uninterrupted = IncrementalBacktester(config)
+        uninterrupted.update_many(rows)
+
+        path = tmp_path / "state" / "live.json"
+        incremental = IncrementalBacktester(config)
+        for day in range(0, len(rows), 45):
+            if day:
+                incremental = IncrementalBacktester.load(path)
+            # Each run sees the whole period so far; applied rows are skipped
+            incremental.update_many(rows[: day + 45])
+            incremental.save(path)
+
+        assert IncrementalBacktester.load(path).state_dict() == uninterrupted.state_dict()
+        assert json.loads(path.read_text())["rows"] == len(rows)
+        _assert_matches(Backtester(config).run_backtest(rows, 30), IncrementalBacktester.load(path).result())
+
+    def test_no_rows_and_no_trades(self):
+        config = SimpleNamespace(entry_threshold=5.0, exit_threshold=9.0)
+        incremental = IncrementalBacktester(config)
+        assert incremental.result().total_trades == 0
+        rows = random_rows(1, n=50, contracts=0.8, step_hours=(24,))
+        incremental.update_many(rows)
+        assert incremental.result().to_dict() == Backtester(config).run_backtest(rows).to_dict()
+
+    def test_unknown_state_version(self):
+        state = IncrementalBacktester().state_dict()
+        state["version"] = 99
+        with pytest.raises(ValueError):
+            IncrementalBacktester.from_state(state)
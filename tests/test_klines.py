@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Tests for pooled, parallel Binance kline pagination."""
+
+import sys
+import random
+import threading
+import time
+from pathlib import Path
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.binance import BinanceFetcher
+from crypto_data.data.ibkr import IBKRHistoricalFetcher
+from crypto_data.data.klines import (
+    INTERVAL_MS,
+    KlineClient,
+    WeightBucket,
+    page_windows,
+)
+
+MINUTE = INTERVAL_MS["1m"]
+
+
+class _Response:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    """Serves 1m klines for [startTime, endTime] like Binance, with random latency."""
+
+    def __init__(self, first_open, last_open, interval_ms=MINUTE, throttle_first=0, used_weight=None):
+        self.first_open = first_open
+        self.last_open = last_open
+        self.interval_ms = interval_ms
+        self.throttle_first = throttle_first
+        self.used_weight = used_weight
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self._lock:
+            self.calls.append(dict(params))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            throttled = len(self.calls) <= self.throttle_first
+        try:
+            time.sleep(random.uniform(0, 0.01))
+            if throttled:
+                return _Response([], 429, {"Retry-After": "0"})
+            start = max(params["startTime"], self.first_open)
+            start += (-(start - self.first_open)) % self.interval_ms
+            opens = range(start, min(params["endTime"], self.last_open) + 1, self.interval_ms)
+            klines = [[t, "1", "2", "0.5", str(t), "10", t + self.interval_ms - 1] for t in opens]
+            headers = {}
+            if self.used_weight is not None:
+                headers["X-MBX-USED-WEIGHT-1M"] = str(self.used_weight)
+            return _Response(klines[:params["limit"]], headers=headers)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestPageWindows:
+    """Tests for page window computation."""
+
+    def test_windows_cover_range_without_overlap(self):
+        windows = page_windows(0, 2500 * MINUTE, MINUTE, 1000)
+        assert windows == [
+            (0, 1000 * MINUTE - 1),
+            (1000 * MINUTE, 2000 * MINUTE - 1),
+            (2000 * MINUTE, 2500 * MINUTE),
+        ]
+
+    def test_single_window(self):
+        assert page_windows(0, 10 * MINUTE, MINUTE, 1000) == [(0, 10 * MINUTE)]
+
+
+class TestKlineClient:
+    """Tests for KlineClient."""
+
+    def test_parallel_pages_reassembled_in_order(self):
+        session = _FakeSession(0, 5432 * MINUTE)
+        client = KlineClient("https://example", session=session, max_workers=4)
+
+        klines = client.fetch("BTCUSDT", "1m", 0, 5432 * MINUTE, limit=1000)
+
+        assert [k[0] for k in klines] == list(range(0, 5433 * MINUTE, MINUTE))
+        assert len(session.calls) == 6
+        assert session.max_active > 1
+
+    def test_matches_sequential_pagination(self):
+        start, end = 123_456, 3333 * MINUTE
+        parallel = KlineClient("https://example", session=_FakeSession(0, end), max_workers=4)
+        sequential = KlineClient("https://example", session=_FakeSession(0, end))
+        assert parallel.fetch("BTCUSDT", "1m", start, end) == sequential._fetch_sequential(
+            "BTCUSDT", "1m", start, end, 1000
+        )
+
+    def test_month_interval_is_sequential(self):
+        session = _FakeSession(0, 30 * MINUTE)
+        client = KlineClient("https://example", session=session)
+        with patch.object(client, "_fetch_sequential", return_value=[]) as mock_sequential:
+            client.fetch("BTCUSDT", "1M", 0, 30 * MINUTE)
+        mock_sequential.assert_called_once()
+
+    def test_rate_limited_page_is_retried(self):
+        session = _FakeSession(0, 99 * MINUTE, throttle_first=1)
+        client = KlineClient("https://example", session=session)
+        klines = client.fetch("BTCUSDT", "1m", 0, 99 * MINUTE, limit=1000)
+        assert len(klines) == 100
+        assert len(session.calls) == 2
+
+    def test_used_weight_header_drains_bucket(self):
+        session = _FakeSession(0, 10 * MINUTE, used_weight=5990)
+        client = KlineClient("https://example", session=session)
+        client.fetch("BTCUSDT", "1m", 0, 10 * MINUTE)
+        assert client.bucket._tokens <= 10 + 1
+
+
+class TestWeightBucket:
+    """Tests for the request weight token bucket."""
+
+    def test_acquire_waits_for_refill(self):
+        bucket = WeightBucket(capacity=100, period=1.0)
+        bucket.acquire(100)
+        started = time.monotonic()
+        bucket.acquire(20)
+        assert time.monotonic() - started >= 0.15
+
+
+class TestCallers:
+    """Tests for the fetchers built on KlineClient."""
+
+    def test_accumulator_binance_spot(self):
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 10)
+        start_ms, end_ms = int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+        session = _FakeSession(start_ms, end_ms, interval_ms=INTERVAL_MS["1d"])
+        acc = FuturesAccumulator(IBKRHistoricalFetcher())
+        acc._spot_klines = KlineClient(acc.BINANCE_SPOT_API, session=session)
+
+        result = acc._fetch_binance_spot_history(start, end, "BTCUSDT")
+
+        assert len(result) == 10
+        assert result[0]["date"] == start
+        assert result[-1]["spot_price"] == pytest.approx(float(end_ms))
+
+    def test_binance_futures_klines(self):
+        session = _FakeSession(0, 10**13, interval_ms=INTERVAL_MS["1d"])
+        fetcher = BinanceFetcher()
+        fetcher._futures_klines = KlineClient(fetcher.COIN_FUTURES_API, session=session)
+
+        result = fetcher.get_historical_futures_klines("202506", days=30)
+
+        assert len(result) in (30, 31)
+        assert all(r["expiry"] == "202506" for r in result)
+        assert session.calls[0]["limit"] == 1500
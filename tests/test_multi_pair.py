@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""Tests for the IBKR broker and parallel multi-pair runs."""
+
+import sys
+import time
+import threading
+import multiprocessing
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.multi_pair import PairJob, format_pairs_report, pairs_report, run_pairs
+from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.ibkr import IBKRHistoricalFetcher
+from crypto_data.data.ibkr_broker import BrokeredAccumulator, IBKRBroker
+from crypto_data.data.ibkr_pacing import HistoricalPlan
+
+CSV_HEADER = "ts_event,rtype,publisher_id,instrument_id,open,high,low,close,volume,symbol"
+
+
+class _FakeScheduler:
+    """Records each fetch_all() batch; a request is (symbol, start, end)."""
+
+    def __init__(self):
+        self.batches = []
+
+    def fetch_all(self, requests):
+        self.batches.append(list(requests))
+        bars = []
+        for symbol, start_date, end_date in requests:
+            base = 90000.0 if symbol == "BTC" else 3000.0
+            days = (end_date - start_date).days + 1
+            bars.append([{"date": start_date + timedelta(days=i), "spot_price": base + i} for i in range(days)])
+        return bars
+
+
+class _FakeFetcher(IBKRHistoricalFetcher):
+    scheduler = None
+
+
+class _SpotAccumulator(FuturesAccumulator):
+    """Broker-side accumulator serving synthetic IBKR spot history."""
+
+    def __init__(self, fail=False):
+        fetcher = _FakeFetcher()
+        fetcher.connected = True
+        fetcher.scheduler = _FakeScheduler()
+        super().__init__(fetcher)
+        self.fail = fail
+        self.spot_calls = []
+
+    def _fetch_ibkr_spot_history(self, start_date, end_date, bar_size="1 day", spot_config=None, plan=False):
+        if self.fail:
+            raise ConnectionError("no gateway")
+        self.spot_calls.append(spot_config["symbol"])
+        request = (spot_config["symbol"], start_date, end_date)
+        if plan:
+            return HistoricalPlan([request], lambda bars: bars[0])
+        return self.fetcher.scheduler.fetch_all([request])[0]
+
+
+def _spot_config(symbol):
+    return {"symbol": symbol, "exchange": "PAXOS", "currency": "USD"}
+
+
+def _write_databento(directory, symbol, base):
+    """Daily bars for the Feb and Mar 2026 contracts of ``symbol``."""
+    directory.mkdir(parents=True)
+    lines = [CSV_HEADER]
+    for day in range(2, 28):
+        ts = f"2026-01-{day:02d}T00:00:00.000000000Z"
+        lines.append(f"{ts},35,1,1,0,0,0,{base * 1.01 + day},10,{symbol}G6")
+        lines.append(f"{ts},35,1,2,0,0,0,{base * 1.02 + day},10,{symbol}H6")
+    (directory / "test.ohlcv-1d.csv").write_text("\n".join(lines) + "\n")
+
+
+def _jobs(tmp_path, **kwargs):
+    _write_databento(tmp_path / "BTC", "MBT", 90000.0)
+    _write_databento(tmp_path / "ETH", "MET", 3000.0)
+    windows = [("202602", datetime(2026, 1, 2), datetime(2026, 1, 27))]
+    return [
+        PairJob(
+            pair=pair,
+            spot_config={"symbol": pair, "exchange": "PAXOS", "currency": "USD"},
+            futures_symbol=symbol,
+            windows=windows,
+            databento_dir=str(tmp_path / pair),
+            entry_threshold=0.001,
+            **kwargs,
+        )
+        for pair, symbol in (("BTC", "MBT"), ("ETH", "MET"))
+    ]
+
+
+class TestIBKRBroker:
+    """Tests for IBKRBroker request serving."""
+
+    def test_worker_calls_are_served_on_broker_thread(self):
+        acc = _SpotAccumulator()
+        with multiprocessing.Manager() as manager:
+            broker = IBKRBroker(acc, manager)
+            worker_acc = BrokeredAccumulator(broker.client())
+            result = {}
+
+            def work():
+                result["spot"] = worker_acc._fetch_spot(
+                    datetime(2026, 1, 1), datetime(2026, 1, 10),
+                    spot_config={"symbol": "ETH", "exchange": "PAXOS", "currency": "USD"},
+                )
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            broker.serve(done=lambda: not thread.is_alive())
+
+        assert len(result["spot"]) == 10
+        assert acc.spot_calls == ["ETH"]
+        assert broker.served == 1
+
+    def test_pending_calls_share_one_fetch_all(self):
+        acc = _SpotAccumulator()
+        with multiprocessing.Manager() as manager:
+            broker = IBKRBroker(acc, manager)
+            results = {}
+
+            def work(symbol, worker_acc):
+                results[symbol] = worker_acc._fetch_spot(
+                    datetime(2026, 1, 1), datetime(2026, 1, 10), spot_config=_spot_config(symbol),
+                )
+
+            threads = [
+                threading.Thread(target=work, args=(symbol, BrokeredAccumulator(broker.client())))
+                for symbol in ("BTC", "ETH")
+            ]
+            for thread in threads:
+                thread.start()
+            while broker.requests.qsize() < 2:
+                time.sleep(0.01)
+            broker.serve(done=lambda: not any(thread.is_alive() for thread in threads))
+
+        assert len(acc.fetcher.scheduler.batches) == 1
+        assert sorted(symbol for symbol, _, _ in acc.fetcher.scheduler.batches[0]) == ["BTC", "ETH"]
+        assert results["BTC"][0]["spot_price"] == 90000.0
+        assert results["ETH"][0]["spot_price"] == 3000.0
+        assert broker.served == 2
+
+    def test_worker_plans_go_out_in_one_message(self):
+        acc = _SpotAccumulator()
+        with multiprocessing.Manager() as manager:
+            broker = IBKRBroker(acc, manager)
+            worker_acc = BrokeredAccumulator(broker.client())
+            result = {}
+
+            def plan(symbol):
+                return lambda: worker_acc._fetch_spot(
+                    datetime(2026, 1, 1), datetime(2026, 1, 5), spot_config=_spot_config(symbol), plan=True,
+                )
+
+            def work():
+                result.update(worker_acc._fetch_ibkr([("BTC", plan("BTC")), ("ETH", plan("ETH"))]))
+
+            thread = threading.Thread(target=work)
+            thread.start()
+            broker.serve(done=lambda: not thread.is_alive())
+
+        assert [len(result[symbol]) for symbol in ("BTC", "ETH")] == [5, 5]
+        assert len(acc.fetcher.scheduler.batches) == 1
+        assert broker.served == 2
+
+    def test_broker_errors_reach_the_worker(self):
+        with multiprocessing.Manager() as manager:
+            broker = IBKRBroker(_SpotAccumulator(fail=True), manager)
+            client = broker.client()
+            errors = []
+
+            def work():
+                try:
+                    client.call("futures_many", windows=[])
+                except RuntimeError as e:
+                    errors.append(str(e))
+
+            broker.accumulator.fetcher.get_historical_futures_many = lambda **kw: 1 / 0
+            thread = threading.Thread(target=work)
+            thread.start()
+            broker.serve(done=lambda: not thread.is_alive())
+
+        assert errors and "futures_many failed" in errors[0]
+
+
+class TestRunPairs:
+    """Tests for run_pairs across worker processes."""
+
+    def test_pairs_run_in_parallel_through_one_broker(self, tmp_path):
+        broker_acc = _SpotAccumulator()
+        jobs = _jobs(tmp_path, spot_cache_path=str(tmp_path / "spot.sqlite"))
+
+        results = run_pairs(jobs, broker_accumulator=broker_acc)
+
+        assert [r.pair for r in results] == ["BTC", "ETH"]
+        assert all(r.error is None and r.rows == 26 for r in results)
+        assert sorted(broker_acc.spot_calls) == ["BTC", "ETH"]
+        assert all(r.result.total_trades > 0 for r in results)
+
+        # Second run is served from the shared spot cache
+        run_pairs(jobs, broker_accumulator=broker_acc)
+        assert len(broker_acc.spot_calls) == 2
+
+    def test_combined_report(self, tmp_path):
+        results = run_pairs(_jobs(tmp_path), broker_accumulator=_SpotAccumulator(), workers=1)
+
+        report = pairs_report(results)
+
+        assert set(report["pairs"]) == {"BTC", "ETH"}
+        combined = report["combined"]
+        assert combined["initial_capital"] == 400000
+        assert combined["final_capital"] == pytest.approx(sum(r.result.final_capital for r in results))
+        assert combined["total_trades"] == sum(r.result.total_trades for r in results)
+        assert "ALL" in format_pairs_report(results)
+
+    def test_pair_errors_are_reported(self, tmp_path):
+        results = run_pairs(_jobs(tmp_path), broker_accumulator=_SpotAccumulator(fail=True))
+        assert [r.error for r in results] == ["No data returned", "No data returned"]
+        assert "[X] No data returned" in format_pairs_report(results)
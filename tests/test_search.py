@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for budgeted random, successive-halving and coarse-to-fine search."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.grid import grid_points, run_grid
+from crypto_data.backtest.search import (
+    DEFAULT_SPACE,
+    Evaluator,
+    ParamRange,
+    SearchSpace,
+    coarse_to_fine,
+    random_search,
+    rank,
+    run_search,
+    successive_halving,
+)
+from tests.helpers import daily_rows
+
+
+SMALL_SPACE = SearchSpace(
+    entry=ParamRange(0.002, 0.012, 0.002),
+    stop=ParamRange(0.001, 0.003, 0.001),
+    exit=ParamRange(0.02, 0.05, 0.01),
+    hold=ParamRange(10, 30, 10),
+)
+
+
+def _evaluator(days=240):
+    return Evaluator(daily_rows(seed=2, days=days), 200000, 0.05)
+
+
+def _key(result):
+    return (result["entry"], result["stop"], result["exit"], result["hold"])
+
+
+class TestSearchSpace:
+    """Tests for ParamRange and SearchSpace."""
+
+    def test_values(self):
+        assert ParamRange(10, 60, 5).values() == [10, 15, 20, 25, 30, 35, 40, 45, 50, 55, 60]
+        assert ParamRange(0.02, 0.03, 0.0025).values() == [0.02, 0.0225, 0.025, 0.0275, 0.03]
+
+    def test_size_counts_valid_points(self):
+        assert SMALL_SPACE.size() == len(grid_points(*SMALL_SPACE.axes()))
+        assert DEFAULT_SPACE.size() > 40 * 2346
+
+
+class TestEvaluator:
+    """Tests for Evaluator caching and cost."""
+
+    def test_windows_cost_their_share_of_rows(self):
+        evaluator = _evaluator(days=100)
+        points = grid_points([0.004], [0.001, 0.002], [0.03], [10])
+
+        evaluator.evaluate(points, fraction=0.25)
+        evaluator.evaluate(points, fraction=0.25)
+        full = evaluator.evaluate(points)
+
+        assert evaluator.backtests == 4
+        assert evaluator.cost == pytest.approx(2 * 0.25 + 2)
+        assert full == run_grid(evaluator.bt_data, points, 200000, 0.05)
+
+
+class TestStrategies:
+    """Tests for the search strategies."""
+
+    def test_random_search_spends_budget_on_distinct_points(self):
+        search = random_search(_evaluator(), DEFAULT_SPACE, budget=50, seed=3)
+        keys = [_key(r) for r in search.results]
+        assert len(set(keys)) == len(keys) == 50
+        assert search.cost == 50
+        assert all(DEFAULT_SPACE.valid(k) for k in keys)
+        assert search.results == rank(search.results)
+
+    def test_successive_halving_promotes_to_full_window(self):
+        evaluator = _evaluator()
+        search = successive_halving(evaluator, DEFAULT_SPACE, budget=60, eta=3, min_fraction=1 / 9, seed=1)
+
+        assert search.cost <= 60
+        assert search.backtests > 60
+        assert len(search.rounds) == 3
+        assert search.rounds[-1].endswith(f"on {len(evaluator.bt_data)} rows")
+        full = run_grid(evaluator.bt_data, [_key(r) for r in search.results], 200000, 0.05)
+        assert search.results == full
+
+    def test_coarse_to_fine_stays_within_budget(self):
+        evaluator = _evaluator()
+        search = coarse_to_fine(evaluator, DEFAULT_SPACE, budget=120)
+        assert search.cost <= 120
+        assert search.rounds[0].startswith("stride ")
+        assert len(search.rounds) > 1
+
+    def test_coarse_to_fine_with_full_budget_finds_grid_best(self):
+        evaluator = _evaluator()
+        exhaustive = rank(run_grid(evaluator.bt_data, grid_points(*SMALL_SPACE.axes()), 200000, 0.05))
+        search = coarse_to_fine(evaluator, SMALL_SPACE, budget=2 * SMALL_SPACE.size())
+        assert search.results[0]["return"] == exhaustive[0]["return"]
+
+    def test_unknown_strategy(self):
+        with pytest.raises(ValueError):
+            run_search("anneal", _evaluator(), budget=10)
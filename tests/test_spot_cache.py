@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""Tests for the persistent spot price cache."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.data.accumulator import FuturesAccumulator
+from crypto_data.data.ibkr import IBKRHistoricalFetcher
+from crypto_data.data.spot_cache import (
+    SpotCache,
+    SpotKey,
+    merge_ranges,
+    missing_ranges,
+    spot_cache_from_config,
+)
+
+
+def _daily_bars(start, end):
+    """One bar per day in [start, end] with a price derived from the date."""
+    bars = []
+    day = start
+    while day <= end:
+        bars.append({"date": day, "spot_price": 50000.0 + day.toordinal() % 100})
+        day += timedelta(days=1)
+    return bars
+
+
+class _Downloader:
+    """Records requested ranges and returns daily bars for them."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, start, end):
+        self.calls.append((start, end))
+        return _daily_bars(start, end)
+
+
+class TestRanges:
+    """Tests for range arithmetic."""
+
+    def test_merge_joins_overlapping_and_touching(self):
+        assert merge_ranges([(5, 8), (1, 3), (3, 4), (7, 10)]) == [(1, 4), (5, 10)]
+
+    def test_missing_ranges(self):
+        covered = [(10, 20), (30, 40)]
+        assert missing_ranges(0, 50, covered) == [(0, 10), (20, 30), (40, 50)]
+        assert missing_ranges(12, 18, covered) == []
+        assert missing_ranges(15, 35, covered) == [(20, 30)]
+        assert missing_ranges(0, 5, []) == [(0, 5)]
+
+
+class TestSpotCache:
+    """Tests for SpotCache."""
+
+    KEY = SpotKey("binance", "BTCUSDT", bar_size="1d")
+
+    def test_second_request_is_served_from_disk(self, tmp_path):
+        download = _Downloader()
+        start, end = datetime(2024, 1, 1), datetime(2024, 3, 31)
+
+        first = SpotCache(tmp_path / "spot.sqlite").get(self.KEY, start, end, fetch=download)
+        second = SpotCache(tmp_path / "spot.sqlite").get(self.KEY, start, end, fetch=download)
+
+        assert len(download.calls) == 1
+        assert first == second == _daily_bars(start, end)
+
+    def test_only_gaps_are_fetched(self, tmp_path):
+        cache = SpotCache(tmp_path / "spot.sqlite")
+        download = _Downloader()
+        cache.get(self.KEY, datetime(2024, 2, 1), datetime(2024, 2, 29), fetch=download)
+        download.calls.clear()
+
+        result = cache.get(self.KEY, datetime(2024, 1, 1), datetime(2024, 3, 31), fetch=download)
+
+        assert download.calls == [
+            (datetime(2024, 1, 1), datetime(2024, 2, 1)),
+            (datetime(2024, 2, 29), datetime(2024, 3, 31)),
+        ]
+        assert result == _daily_bars(datetime(2024, 1, 1), datetime(2024, 3, 31))
+        assert cache.covered(self.KEY) == [(datetime(2024, 1, 1), datetime(2024, 3, 31))]
+
+    def test_recent_bars_are_refetched(self, tmp_path):
+        cache = SpotCache(tmp_path / "spot.sqlite")
+        download = _Downloader()
+        today = datetime.combine(datetime.now().date(), datetime.min.time())
+        start = today - timedelta(days=10)
+
+        cache.get(self.KEY, start, today, fetch=download)
+        cache.get(self.KEY, start, today, fetch=download)
+
+        assert len(download.calls) == 2
+        assert download.calls[1][0] > start
+        assert download.calls[1][1] == today
+
+    def test_empty_fetch_leaves_gap_uncovered(self, tmp_path):
+        cache = SpotCache(tmp_path / "spot.sqlite")
+        cache.get(self.KEY, datetime(2024, 1, 1), datetime(2024, 1, 31), fetch=lambda s, e: [])
+        assert cache.covered(self.KEY) == []
+
+    def test_tz_aware_bars(self, tmp_path):
+        """Aware datetimes (IBKR intraday) are stored as UTC and read back aware."""
+        cache = SpotCache(tmp_path / "spot.sqlite")
+        key = SpotKey("ibkr", "BTC", "PAXOS", "USD", "1 hour")
+        eastern = timezone(timedelta(hours=-5))
+        start = datetime(2024, 1, 2, 9, tzinfo=eastern)
+        end = start + timedelta(hours=5)
+
+        def hourly(s, e):
+            return [{"date": s + timedelta(hours=i), "spot_price": 100.0 + i} for i in range(6)]
+
+        bars = cache.get(key, start, end, fetch=hourly)
+        assert bars == hourly(start, end)
+        assert all(bar["date"].tzinfo is eastern for bar in bars)
+
+        # Naive queries are UTC and get naive dates back
+        naive = cache.read(key, datetime(2024, 1, 2, 14), datetime(2024, 1, 2, 19))
+        assert [bar["date"] for bar in naive] == [datetime(2024, 1, 2, 14 + i) for i in range(6)]
+
+        # The same instants in another zone are fully cached
+        download = _Downloader()
+        utc = cache.get(key, start.astimezone(timezone.utc), end.astimezone(timezone.utc), fetch=download)
+        assert download.calls == []
+        assert utc == bars and utc[0]["date"].tzinfo is timezone.utc
+
+    def test_keys_are_isolated(self, tmp_path):
+        cache = SpotCache(tmp_path / "spot.sqlite")
+        download = _Downloader()
+        start, end = datetime(2024, 1, 1), datetime(2024, 1, 31)
+        cache.get(self.KEY, start, end, fetch=download)
+        cache.get(SpotKey("ibkr", "BTC", "PAXOS", "USD", "1 day"), start, end, fetch=download)
+        cache.get(SpotKey("ibkr", "BTC", "PAXOS", "USD", "1 hour"), start, end, fetch=download)
+        assert len(download.calls) == 3
+
+    def test_disabled_in_config(self, tmp_path):
+        assert spot_cache_from_config({"enabled": False}) is None
+        cache = spot_cache_from_config({"path": str(tmp_path / "spot.sqlite")})
+        assert (tmp_path / "spot.sqlite").exists()
+        assert isinstance(cache, SpotCache)
+
+
+class TestAccumulatorSpotCache:
+    """Tests for spot caching in FuturesAccumulator."""
+
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_binance_spot_history")
+    def test_fetch_spot_goes_through_cache(self, mock_binance, tmp_path):
+        mock_binance.side_effect = lambda start, end, symbol: _daily_bars(start, end)
+        acc = FuturesAccumulator(IBKRHistoricalFetcher(), spot_cache=SpotCache(tmp_path / "spot.sqlite"))
+
+        kwargs = dict(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 31), spot_source="binance")
+        first = acc._fetch_spot(**kwargs)
+        second = acc._fetch_spot(**kwargs)
+
+        mock_binance.assert_called_once()
+        assert first == second
+        assert len(first) == 31
+
+    @patch("crypto_data.data.accumulator.FuturesAccumulator._fetch_binance_spot_history")
+    def test_no_cache_downloads_every_time(self, mock_binance):
+        mock_binance.side_effect = lambda start, end, symbol: _daily_bars(start, end)
+        acc = FuturesAccumulator(IBKRHistoricalFetcher())
+
+        kwargs = dict(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 31), spot_source="binance")
+        acc._fetch_spot(**kwargs)
+        acc._fetch_spot(**kwargs)
+
+        assert mock_binance.call_count == 2
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Tests for batched parameter sweeps."""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("numpy")
+
+from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.sweep import parameter_grid, rank_results, result_dicts, run_sweep
+from crypto_data.backtest.vectorized import BacktestFrame
+from tests.helpers import daily_rows
+
+
+class TestParameterGrid:
+    """Tests for parameter_grid and rank_results."""
+
+    def test_skips_invalid_points_in_product_order(self):
+        params = parameter_grid([0.002, 0.004], [0.001, 0.003], [0.003, 0.02], [10, 20])
+        points = params.tolist()
+        assert all(entry > stop and exit_t > entry for entry, stop, exit_t, _ in points)
+        assert points[:3] == [(0.002, 0.001, 0.003, 10), (0.002, 0.001, 0.003, 20), (0.002, 0.001, 0.02, 10)]
+        assert len(points) == 8
+
+    def test_ranking_keeps_grid_order_for_ties(self):
+        results = run_sweep(BacktestFrame.build(daily_rows(0)), parameter_grid([0.004], [0.001, 0.002], [0.03], [30]))
+        results["return"] = [0.1, 0.1]
+        assert rank_results(results).tolist() == [0, 1]
+
+
+class TestRunSweep:
+    """Tests for run_sweep against one Backtester per combination."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_backtester(self, seed):
+        rows = daily_rows(seed)
+        params = parameter_grid(
+            [0.002, 0.006, 0.01, 0.016], [0.001, 0.004], [0.02, 0.035, 0.05], [0, 10, 30]
+        )
+
+        results = result_dicts(run_sweep(BacktestFrame.build(rows), params, 150000, 0.04))
+
+        assert len(results) == len(params)
+        for r in results:
+            result = Backtester(SimpleNamespace(
+                account_size=150000,
+                funding_cost_annual=0.04,
+                entry_threshold=r["entry"],
+                stop_loss_threshold=r["stop"],
+                exit_threshold=r["exit"],
+            )).run_backtest(rows, holding_days=r["hold"])
+            assert (r["return"], r["sharpe"], r["max_dd"]) == (
+                result.total_return, result.sharpe_ratio, result.max_drawdown
+            )
+            assert (r["trades"], r["wins"], r["losses"], r["win_rate"]) == (
+                result.total_trades, result.winning_trades, result.losing_trades, result.win_rate
+            )
+            assert (r["avg_win"], r["avg_loss"]) == (result.avg_win, result.avg_loss)
+
+    def test_no_trades(self):
+        rows = daily_rows(0, days=30)
+        results = run_sweep(BacktestFrame.build(rows), parameter_grid([0.5], [0.001], [0.9], [30]))
+        assert results["trades"].tolist() == [0]
+        assert results["return"].tolist() == [0.0]
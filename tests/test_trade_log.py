@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for run_backtest trade logs: Trade objects, TradeLedger columns, statistics only."""
+
+import pickle
+import random
+import sys
+from pathlib import Path
+from datetime import datetime
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.engine import Backtester, TradeLedger
+from tests.helpers import random_config, random_rows
+
+
+class TestTradeLog:
+    """Tests for the trade_log modes of run_backtest."""
+
+    @pytest.mark.parametrize("holding_days", [0, 7, 30])
+    def test_modes_report_the_same_backtest(self, holding_days):
+        for seed in range(30):
+            rows = random_rows(seed, n=random.Random(seed).randint(1, 300), contracts=0.8)
+            backtester = Backtester(random_config(seed))
+            objects = backtester.run_backtest(rows, holding_days)
+            ledger = backtester.run_backtest(rows, holding_days, trade_log="ledger")
+            stats = backtester.run_backtest(rows, holding_days, trade_log="none")
+
+            assert ledger.to_dict() == objects.to_dict()
+            assert ledger.trades == [] and len(ledger.ledger) == objects.total_trades
+            assert [vars(t) for t in ledger.ledger] == [vars(t) for t in objects.trades]
+            assert ledger.ledger.return_pcts() == [t.return_pct for t in objects.trades]
+
+            assert stats.trades == [] and stats.ledger is None
+            assert stats.to_dict()["summary"] == objects.to_dict()["summary"]
+
+    def test_vectorized_modes(self):
+        pytest.importorskip("numpy")
+        rows = random_rows(7, n=400, contracts=0.8)
+        backtester = Backtester(random_config(7))
+        expected = backtester.run_backtest(rows, 10)
+        assert expected.total_trades > 0
+        for mode in ("ledger", "none"):
+            result = backtester.run_backtest_vectorized(rows, 10, trade_log=mode)
+            assert result.to_dict()["summary"] == expected.to_dict()["summary"]
+        ledger = backtester.run_backtest_vectorized(rows, 10, trade_log="ledger").ledger
+        assert [vars(t) for t in ledger] == [vars(t) for t in expected.trades]
+
+    def test_ledger_pickles_compactly(self):
+        rows = random_rows(2, n=2000, contracts=0.8)
+        result = Backtester(random_config(2)).run_backtest(rows, 7, trade_log="ledger")
+        assert len(result.ledger) > 20
+        restored = pickle.loads(pickle.dumps(result))
+        assert [vars(t) for t in restored.ledger] == [vars(t) for t in result.ledger]
+
+    def test_forced_close_has_no_exit_basis(self):
+        ledger = TradeLedger()
+        ledger.append(datetime(2024, 1, 1), 100.0, 101.0, 1.0, datetime(2024, 1, 5), 102.0, 102.5, None, 1.5, "forced_close")
+        trade = ledger[0]
+        assert (trade.exit_basis, trade.status, trade.holding_days) == (None, "forced_close", 4)
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            Backtester(random_config(0)).run_backtest(random_rows(0, n=10, contracts=0.8), trade_log="dicts")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Tests for the NumPy backtest engine against Backtester.run_backtest."""
+
+import random
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+pytest.importorskip("numpy")
+
+from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.vectorized import SIGNALS, BacktestFrame, run_frame, signal_codes
+from crypto_data.data.basis import merge_basis
+from crypto_data.data.basis_store import BasisColumns
+from tests.helpers import random_config, random_rows
+
+
+def _assert_same(expected, actual):
+    assert actual.to_dict() == expected.to_dict()
+    assert [vars(t) for t in actual.trades] == [vars(t) for t in expected.trades]
+
+
+class TestSignalCodes:
+    """Tests for signal_codes."""
+
+    def test_matches_generate_signal(self):
+        rows = random_rows(1, n=500)
+        backtester = Backtester(random_config(1))
+        codes = signal_codes(
+            BacktestFrame.from_rows(rows),
+            backtester.entry_threshold,
+            backtester.stop_loss_threshold,
+            backtester.exit_threshold,
+        )
+        for row, code in zip(rows, codes):
+            days = (row["futures_expiry"] - row["date"]).days
+            assert SIGNALS[int(code)] == backtester.generate_signal(
+                row["spot_price"], row["futures_price"], days
+            )
+
+
+class TestRunFrame:
+    """Tests for identical trades and statistics."""
+
+    @pytest.mark.parametrize("contracts", [1.0, 0.0, 0.7])
+    @pytest.mark.parametrize("holding_days", [0, 2.5, 7, 30])
+    def test_matches_reference_engine(self, contracts, holding_days):
+        for seed in range(40):
+            rows = random_rows(seed, n=random.Random(seed).randint(1, 300), contracts=contracts)
+            backtester = Backtester(random_config(seed))
+            _assert_same(
+                backtester.run_backtest(rows, holding_days),
+                backtester.run_backtest_vectorized(rows, holding_days),
+            )
+
+    def test_unsorted_and_tz_aware_dates(self):
+        for seed in range(20):
+            backtester = Backtester(random_config(seed))
+            for rows in (random_rows(seed, shuffle=True), random_rows(seed, tz=timezone.utc)):
+                _assert_same(backtester.run_backtest(rows, 10), backtester.run_backtest_vectorized(rows, 10))
+
+    def test_frame_is_reusable(self):
+        rows = random_rows(3, n=400)
+        frame = BacktestFrame.from_rows(rows)
+        for seed in range(10):
+            backtester = Backtester(random_config(seed))
+            _assert_same(backtester.run_backtest(rows, 30), run_frame(backtester, frame, 30))
+
+    @pytest.mark.parametrize("contracts", [1.0, 0.7])
+    @pytest.mark.parametrize("shuffle", [False, True])
+    def test_window_matches_sliced_rows(self, contracts, shuffle):
+        rows = random_rows(5, n=400, contracts=contracts, shuffle=shuffle)
+        frame = BacktestFrame.from_rows(rows)
+        rnd = random.Random(5)
+        for seed in range(20):
+            start = rnd.randrange(len(rows))
+            stop = rnd.randint(start + 1, len(rows))
+            backtester = Backtester(random_config(seed))
+            _assert_same(
+                backtester.run_backtest(rows[start:stop], 7),
+                run_frame(backtester, frame.window(start, stop), 7),
+            )
+
+    @pytest.mark.parametrize("tz", [None, timezone.utc])
+    def test_columnar_dataset(self, tmp_path, tz):
+        start = datetime(2026, 1, 1, tzinfo=tz)
+        spot = [{"date": start + timedelta(hours=i), "spot_price": 90000.0 + 7 * (i % 13)} for i in range(1200)]
+        futures = [
+            {"date": start + timedelta(hours=i), "futures_price": 90500.0 + 11 * (i % 17)} for i in range(1200)
+        ]
+        rows = merge_basis(spot[:600], futures[:600], datetime(2026, 1, 30, tzinfo=tz), "MBTF6") + merge_basis(
+            spot[600:], futures[600:], datetime(2026, 2, 27, tzinfo=tz), "MBTG6"
+        )
+        BasisColumns.from_rows(rows).save(tmp_path / "basis.cols")
+        backtester = Backtester(SimpleNamespace(entry_threshold=0.004, exit_threshold=0.02))
+
+        expected = backtester.run_backtest(backtester.load_historical_data(str(tmp_path / "basis.cols")), 5)
+        basis = BasisColumns.load(tmp_path / "basis.cols")
+        frame = BacktestFrame.build(basis)
+        basis.close()
+
+        assert expected.total_trades > 0
+        _assert_same(expected, backtester.run_backtest_vectorized(frame, 5))
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Tests for walk-forward optimization."""
+
+import sys
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from crypto_data.backtest.engine import Backtester
+from crypto_data.backtest.grid import backtest_points, grid_points
+from crypto_data.backtest.walkforward import (
+    best_result,
+    stitch_results,
+    walk_forward,
+    window_bounds,
+)
+from tests.helpers import daily_rows
+
+
+POINTS = grid_points([0.002, 0.006, 0.012], [0.001, 0.003], [0.02, 0.04], [10, 30])
+
+
+def _backtester(best):
+    return Backtester(type("Config", (), {
+        "account_size": 200000,
+        "funding_cost_annual": 0.05,
+        "entry_threshold": best["entry"],
+        "stop_loss_threshold": best["stop"],
+        "exit_threshold": best["exit"],
+    })())
+
+
+class TestWindowBounds:
+    """Tests for window_bounds."""
+
+    def test_test_windows_tile_the_series(self):
+        dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(30)]
+        assert window_bounds(dates, 10, 7) == [(0, 10, 17), (7, 17, 24), (14, 24, 30)]
+
+    def test_step_and_gaps(self):
+        # No rows on days 10-14
+        dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(30) if not 10 <= i < 15]
+        # The test window of days 10-14 has no rows and is skipped
+        assert window_bounds(dates, 10, 5, step_days=5) == [(5, 10, 15), (10, 15, 20), (10, 20, 25)]
+
+    def test_too_short_and_invalid(self):
+        dates = [datetime(2024, 1, 1) + timedelta(days=i) for i in range(10)]
+        assert window_bounds(dates, 10, 5) == []
+        assert window_bounds([], 10, 5) == []
+        with pytest.raises(ValueError):
+            window_bounds(dates, 0, 5)
+        with pytest.raises(ValueError):
+            window_bounds(dates, 10, 5, step_days=3)
+
+
+class TestWalkForward:
+    """Tests for walk_forward and stitch_results."""
+
+    def test_matches_per_window_backtests(self):
+        rows = daily_rows(0, days=3 * 365)
+        wf = walk_forward(rows, POINTS, 200000, 0.05, train_days=365, test_days=90)
+
+        assert len(wf.windows) == 9  # the last test window is 10 days
+        for window, (train_start, test_start, test_stop) in zip(
+            wf.windows, window_bounds([r["date"] for r in rows], 365, 90)
+        ):
+            expected = best_result(backtest_points(rows[train_start:test_start], POINTS, 200000, 0.05))
+            assert {key: window.best[key] for key in expected} == expected
+            assert (window.train_rows, window.test_rows) == (test_start - train_start, test_stop - test_start)
+
+            test = _backtester(expected).run_backtest(rows[test_start:test_stop], expected["hold"])
+            assert window.test.to_dict() == test.to_dict()
+
+        assert wf.oos.total_trades == sum(w.test.total_trades for w in wf.windows)
+        assert wf.oos.start_date == rows[365]["date"]
+        assert wf.oos.end_date == rows[-1]["date"]
+
+    def test_stitched_equity_chains_windows(self):
+        results = [
+            _backtester({"entry": 0.006, "stop": 0.001, "exit": 0.04}).run_backtest(rows, 30)
+            for rows in (daily_rows(1, 200), daily_rows(2, 200))
+        ]
+        stitched = stitch_results(results, 200000)
+        pnl = sum(r.total_return * 200000 for r in results)
+        assert stitched.total_trades == sum(r.total_trades for r in results)
+        assert stitched.total_return == pytest.approx(pnl / 200000)
+
+    def test_no_trades_in_train_window(self):
+        wf = walk_forward(daily_rows(0, days=200), grid_points([5.0], [0.001], [9.0], [30]), 200000, 0.05, 100, 50)
+        assert [w.best for w in wf.windows] == [None, None]
+        assert wf.oos.total_trades == 0
+
+    def test_gap_longer_than_test_window(self):
+        rows = daily_rows(0, days=120)
+        later = daily_rows(1, days=120)
+        for row in later:
+            row["date"] += timedelta(days=120 + 180)
+            row["futures_expiry"] += timedelta(days=120 + 180)
+        rows += later
+
+        wf = walk_forward(rows, POINTS, 200000, 0.05, train_days=60, test_days=30)
+
+        assert all(w.test_rows > 0 for w in wf.windows)
+        for window in wf.windows:
+            assert window.test_start <= window.test_end < window.test_start + timedelta(days=30)
+        test_days = sorted(d for w in wf.windows for d in range(w.test_start.toordinal(), w.test_end.toordinal() + 1))
+        assert len(test_days) == len(set(test_days))
+
+    def test_unsorted_rows(self):
+        rows = daily_rows(0, days=100)
+        rows[3], rows[4] = rows[4], rows[3]
+        with pytest.raises(ValueError):
+            walk_forward(rows, POINTS, 200000, 0.05, 30, 10)